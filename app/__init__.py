@@ -8,6 +8,10 @@ from flask import Flask, jsonify
 
 from app.config import config, get_config
 from app.extensions import db, init_extensions, limiter
+from app.json_provider import FastJSONProvider
+
+# Marks responses that were not built by FastJSONProvider.response()
+_NO_PAYLOAD = object()
 
 
 def create_app(config_name=None):
@@ -22,6 +26,7 @@ def create_app(config_name=None):
         Configured Flask application instance.
     """
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
 
     # Load configuration
     if config_name is None:
@@ -48,6 +53,9 @@ def create_app(config_name=None):
     # Register response wrapper for consistent API format
     _register_response_wrapper(app)
 
+    # Register cleanup of request-scoped state
+    _register_request_teardown(app)
+
     # Register shell context
     _register_shell_context(app)
 
@@ -176,7 +184,6 @@ def create_app(config_name=None):
 
 def _register_response_wrapper(app):
     """Wrap all API JSON responses in standardized {success, data} format."""
-    import json as _json
 
     @app.after_request
     def wrap_json_response(response):
@@ -190,10 +197,14 @@ def _register_response_wrapper(app):
         if not _req.path.startswith("/api/"):
             return response
 
-        try:
-            data = response.get_json(silent=True)
-        except Exception:
-            return response
+        # jsonify responses carry the object they serialized; anything else
+        # has to be parsed
+        data = getattr(response, "json_payload", _NO_PAYLOAD)
+        if data is _NO_PAYLOAD:
+            try:
+                data = response.get_json(silent=True)
+            except Exception:
+                return response
 
         if data is None:
             return response
@@ -202,25 +213,34 @@ def _register_response_wrapper(app):
         if isinstance(data, dict) and "success" in data:
             return response
 
-        # Wrap based on status code
+        # Wrap based on status code; a success body is spliced in as is
         if response.status_code < 400:
-            wrapped = {"success": True, "data": data}
-        else:
-            wrapped = {
-                "success": False,
-                "error": data.get("error", "unknown_error") if isinstance(data, dict) else "error",
-                "message": (
-                    data.get("message", data.get("error", "An error occurred"))
-                    if isinstance(data, dict)
-                    else str(data)
-                ),
-            }
+            response.set_data(b'{"success":true,"data":' + response.get_data().rstrip() + b"}\n")
+            return response
 
-        response.data = _json.dumps(wrapped)
-        response.content_length = len(response.data)
+        wrapped = {
+            "success": False,
+            "error": data.get("error", "unknown_error") if isinstance(data, dict) else "error",
+            "message": (
+                data.get("message", data.get("error", "An error occurred"))
+                if isinstance(data, dict)
+                else str(data)
+            ),
+        }
+        response.set_data(app.json.dumps(wrapped))
         return response
 
 
+def _register_request_teardown(app):
+    """Set up per-request state on flask.g, and flush and drop it once the request ends."""
+    from app.services.activity_buffer import ActivityBuffer
+    from app.utils.decorators import clear_current_user
+
+    app.before_request(ActivityBuffer.start)
+    app.teardown_request(ActivityBuffer.flush)
+    app.teardown_request(clear_current_user)
+
+
 def _register_blueprints(app):
     """Register Flask blueprints."""
     from app.routes.activity import activity_bp
@@ -228,6 +248,7 @@ def _register_blueprints(app):
     from app.routes.ai import ai_bp
     from app.routes.auth import auth_bp
     from app.routes.dashboard import dashboard_bp
+    from app.routes.events import events_bp
     from app.routes.labor_market import labor_market_bp
     from app.routes.linkedin import linkedin_bp
     from app.routes.message import message_bp
@@ -254,6 +275,7 @@ def _register_blueprints(app):
     # Phase 4 routes
     app.register_blueprint(subscription_bp)  # url_prefix in blueprint
     app.register_blueprint(notification_bp)  # url_prefix in blueprint
+    app.register_blueprint(events_bp)  # url_prefix in blueprint
 
     # Admin routes
     app.register_blueprint(admin_bp, url_prefix="/api/admin")
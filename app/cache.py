@@ -0,0 +1,484 @@
+"""
+Jobezie Cache Layer
+
+Two-tier cache for read-heavy service functions: a small per-process LRU in
+front of Redis (through the shared connection pool). Keys are namespaced and
+versioned, so bumping CACHE_VERSION on deploy invalidates every entry written
+by the previous release without a flush.
+
+Stampedes are avoided in two ways: concurrent misses for the same key are
+collapsed into a single computation (single-flight), and entries close to
+expiry are refreshed early with a probability that grows as expiry approaches
+(XFetch), so a hot key is recomputed by one caller before it ever expires.
+"""
+
+import hashlib
+import inspect
+import json
+import logging
+import math
+import random
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, ParamSpec, Tuple, TypeVar
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+class CacheMetrics:
+    """Thread-safe hit/miss/latency counters, aggregated per namespace."""
+
+    FIELDS = ("local_hits", "redis_hits", "misses", "early_refreshes", "errors")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(lambda: dict.fromkeys(self.FIELDS, 0))
+        self._timings = defaultdict(lambda: {"lookup_ms": 0.0, "compute_ms": 0.0})
+
+    def incr(self, namespace: str, field: str) -> None:
+        with self._lock:
+            self._counters[namespace][field] += 1
+
+    def observe(self, namespace: str, field: str, seconds: float) -> None:
+        with self._lock:
+            self._timings[namespace][field] += seconds * 1000
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._timings.clear()
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Per-namespace counters with hit ratio and mean latencies."""
+        with self._lock:
+            result = {}
+            for namespace, counters in self._counters.items():
+                timings = self._timings[namespace]
+                hits = counters["local_hits"] + counters["redis_hits"]
+                lookups = hits + counters["misses"]
+                computes = counters["misses"] + counters["early_refreshes"]
+                result[namespace] = {
+                    **counters,
+                    "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+                    "avg_lookup_ms": round(timings["lookup_ms"] / lookups, 3) if lookups else 0.0,
+                    "avg_compute_ms": (
+                        round(timings["compute_ms"] / computes, 3) if computes else 0.0
+                    ),
+                }
+            return result
+
+
+class _LocalLRU:
+    """
+    Bounded in-process LRU of (payload, delta, expires_at) entries.
+
+    Each entry is kept until its own local deadline, which may come before
+    its expires_at; expires_at stays the entry's real (Redis) expiry.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[str, float, float]]:
+        with self._lock:
+            stored = self._entries.get(key)
+            if stored is None:
+                return None
+            entry, deadline = stored
+            if deadline <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: Tuple[str, float, float], deadline: float) -> None:
+        with self._lock:
+            self._entries[key] = (entry, deadline)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class TwoTierCache:
+    """
+    Namespaced, versioned two-tier cache.
+
+    CACHE_TYPE selects the tiers: "null" disables caching entirely, "simple"
+    uses only the in-process LRU, and "redis" adds the shared Redis tier.
+    Values must be JSON serializable; every hit returns a fresh copy, so
+    callers may mutate results freely.
+    """
+
+    LOCK_TIMEOUT_MS = 10000  # upper bound on a single computation holding the Redis lock
+    LOCK_WAIT_SECONDS = 2.0  # how long followers wait for the leader's result
+
+    def __init__(self):
+        self.enabled = False
+        self.use_redis = False
+        self.prefix = "jobezie"
+        self.version = "1"
+        self.default_timeout = 300
+        self.local_timeout = 30
+        self.early_refresh_beta = 1.0
+        self.metrics = CacheMetrics()
+        self._local = _LocalLRU()
+        self._inflight_lock = threading.Lock()
+        self._inflight = {}
+
+    def init_app(self, app):
+        """Configure tiers and key versioning from app config."""
+        cache_type = app.config.get("CACHE_TYPE", "simple")
+        self.enabled = cache_type != "null"
+        self.use_redis = cache_type == "redis"
+        self.prefix = app.config.get("CACHE_KEY_PREFIX", "jobezie")
+        self.version = str(app.config.get("CACHE_VERSION", "1"))
+        self.default_timeout = app.config.get("CACHE_DEFAULT_TIMEOUT", 300)
+        self.local_timeout = app.config.get("CACHE_LOCAL_TIMEOUT", 30)
+        self.early_refresh_beta = app.config.get("CACHE_EARLY_REFRESH_BETA", 1.0)
+        self._local = _LocalLRU(app.config.get("CACHE_LOCAL_MAX_ENTRIES", 1024))
+        self.metrics.reset()
+
+    # ─── Keys ───────────────────────────────────────────────────────────
+
+    def make_key(self, namespace: str, key: str) -> str:
+        """Build the fully qualified key: prefix:version:namespace:key."""
+        return f"{self.prefix}:{self.version}:{namespace}:{key}"
+
+    @staticmethod
+    def hash_args(*args, **kwargs) -> str:
+        """Stable short digest of call arguments, for use as a key."""
+        raw = json.dumps([args, kwargs], sort_keys=True, default=repr, separators=(",", ":"))
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    @property
+    def _redis(self):
+        if not self.use_redis:
+            return None
+        from app.extensions import redis_pool
+
+        return redis_pool.client
+
+    # ─── Basic operations ───────────────────────────────────────────────
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        """Return the cached value, or default on miss."""
+        entry = self._lookup(namespace, self.make_key(namespace, key))
+        if entry is None:
+            if self.enabled:
+                self.metrics.incr(namespace, "misses")
+            return default
+        return json.loads(entry[0])
+
+    def set(self, namespace: str, key: str, value: Any, timeout: Optional[int] = None) -> None:
+        """Store a value in both tiers."""
+        if self.enabled:
+            self._store(namespace, self.make_key(namespace, key), value, 0.0, timeout)
+
+    def delete(self, namespace: str, key: str) -> None:
+        """Remove a single key from both tiers."""
+        full_key = self.make_key(namespace, key)
+        self._local.delete(full_key)
+        client = self._redis
+        if client:
+            try:
+                client.delete(full_key)
+            except redis.RedisError as e:
+                self._record_error(namespace, e)
+
+    def invalidate_namespace(self, namespace: str) -> int:
+        """
+        Drop every key in a namespace for the current version.
+
+        Other processes' local tiers converge within CACHE_LOCAL_TIMEOUT.
+
+        Returns:
+            Number of Redis keys removed
+        """
+        prefix = self.make_key(namespace, "")
+        self._local.delete_prefix(prefix)
+        client = self._redis
+        removed = 0
+        if client:
+            try:
+                batch = []
+                for key in client.scan_iter(match=f"{prefix}*", count=500):
+                    batch.append(key)
+                    if len(batch) >= 500:
+                        removed += client.delete(*batch)
+                        batch = []
+                if batch:
+                    removed += client.delete(*batch)
+            except redis.RedisError as e:
+                self._record_error(namespace, e)
+        return removed
+
+    def clear_local(self) -> None:
+        """Empty this process's local tier."""
+        self._local.clear()
+
+    # ─── Read-through with stampede protection ─────────────────────────
+
+    def get_or_compute(
+        self,
+        namespace: str,
+        key: str,
+        compute: Callable[[], R],
+        timeout: Optional[int] = None,
+    ) -> R:
+        """
+        Return the cached value for key, computing and storing it on a miss.
+
+        Args:
+            namespace: Logical group, used for metrics and invalidation
+            key: Key within the namespace
+            compute: Zero-argument callable producing the value
+            timeout: TTL in seconds (defaults to CACHE_DEFAULT_TIMEOUT)
+
+        Returns:
+            The cached or freshly computed value
+        """
+        if not self.enabled:
+            return compute()
+
+        full_key = self.make_key(namespace, key)
+        entry = self._lookup(namespace, full_key)
+
+        if entry is not None:
+            payload, delta, expires_at = entry
+            if not self._should_refresh_early(delta, expires_at):
+                return json.loads(payload)
+            # Exactly one caller refreshes; everyone else keeps serving the current value
+            if not self._try_lead(full_key):
+                return json.loads(payload)
+            self.metrics.incr(namespace, "early_refreshes")
+            try:
+                return self._compute_and_store(namespace, full_key, compute, timeout)
+            finally:
+                self._release(full_key)
+
+        self.metrics.incr(namespace, "misses")
+        if self._try_lead(full_key):
+            try:
+                return self._compute_and_store(namespace, full_key, compute, timeout)
+            finally:
+                self._release(full_key)
+
+        # Another caller is computing this key; wait briefly for its result
+        entry = self._wait_for_leader(namespace, full_key)
+        if entry is not None:
+            return json.loads(entry[0])
+        return self._compute_and_store(namespace, full_key, compute, timeout)
+
+    def cached(
+        self,
+        namespace: str,
+        timeout: Optional[int] = None,
+        key: Optional[Callable[..., str]] = None,
+    ) -> Callable[[Callable[P, R]], Callable[P, R]]:
+        """
+        Decorator caching a function's JSON-serializable result.
+
+        Args:
+            namespace: Cache namespace for the function
+            timeout: TTL in seconds (defaults to CACHE_DEFAULT_TIMEOUT)
+            key: Optional callable building the key from the call arguments;
+                defaults to a digest of all arguments
+
+        Returns:
+            Decorated function with `uncached` (the original) and
+            `invalidate(*args, **kwargs)` attributes
+        """
+
+        def decorator(func: Callable[P, R]) -> Callable[P, R]:
+            signature = inspect.signature(func)
+
+            def build_key(*args, **kwargs) -> str:
+                if key is not None:
+                    return key(*args, **kwargs)
+                # Bind so positional and keyword calls share a key; skip cls/self
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                arguments = {
+                    name: value
+                    for name, value in bound.arguments.items()
+                    if name not in ("cls", "self")
+                }
+                return self.hash_args(func.__qualname__, **arguments)
+
+            @wraps(func)
+            def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                return self.get_or_compute(
+                    namespace,
+                    build_key(*args, **kwargs),
+                    lambda: func(*args, **kwargs),
+                    timeout,
+                )
+
+            wrapper.uncached = func
+            wrapper.invalidate = lambda *a, **kw: self.delete(namespace, build_key(*a, **kw))
+            return wrapper
+
+        return decorator
+
+    def stats(self) -> Dict[str, Dict]:
+        """Hit/miss/latency metrics per namespace."""
+        return self.metrics.snapshot()
+
+    # ─── Internals ──────────────────────────────────────────────────────
+
+    def _lookup(self, namespace: str, full_key: str) -> Optional[Tuple[str, float, float]]:
+        if not self.enabled:
+            return None
+
+        started = time.perf_counter()
+        entry = self._local.get(full_key)
+        if entry is not None:
+            self.metrics.incr(namespace, "local_hits")
+            self.metrics.observe(namespace, "lookup_ms", time.perf_counter() - started)
+            return entry
+
+        client = self._redis
+        if client:
+            try:
+                raw = client.get(full_key)
+            except redis.RedisError as e:
+                self._record_error(namespace, e)
+                raw = None
+            if raw is not None:
+                entry = self._from_redis(full_key, raw)
+                self.metrics.incr(namespace, "redis_hits")
+                self.metrics.observe(namespace, "lookup_ms", time.perf_counter() - started)
+                return entry
+
+        self.metrics.observe(namespace, "lookup_ms", time.perf_counter() - started)
+        return None
+
+    def _compute_and_store(
+        self, namespace: str, full_key: str, compute: Callable[[], R], timeout: Optional[int]
+    ) -> R:
+        started = time.perf_counter()
+        value = compute()
+        delta = time.perf_counter() - started
+        self.metrics.observe(namespace, "compute_ms", delta)
+        self._store(namespace, full_key, value, delta, timeout)
+        return value
+
+    def _store(
+        self, namespace: str, full_key: str, value: Any, delta: float, timeout: Optional[int]
+    ) -> None:
+        ttl = timeout or self.default_timeout
+        entry = (json.dumps(value), delta, time.time() + ttl)
+        self._local.set(full_key, entry, self._local_deadline(entry[2]))
+
+        client = self._redis
+        if client:
+            try:
+                envelope = json.dumps({"v": entry[0], "d": delta, "e": entry[2]})
+                client.set(full_key, envelope, ex=ttl)
+            except redis.RedisError as e:
+                self._record_error(namespace, e)
+
+    def _local_deadline(self, expires_at: float) -> float:
+        """
+        Evict local copies after local_timeout, so other processes'
+        invalidations converge quickly. Early refresh still uses expires_at.
+        """
+        return min(expires_at, time.time() + self.local_timeout)
+
+    def _from_redis(self, full_key: str, raw: str) -> Tuple[str, float, float]:
+        """Decode a Redis envelope and keep a local copy."""
+        envelope = json.loads(raw)
+        entry = (envelope["v"], envelope["d"], envelope["e"])
+        self._local.set(full_key, entry, self._local_deadline(entry[2]))
+        return entry
+
+    def _should_refresh_early(self, delta: float, expires_at: float) -> bool:
+        """XFetch: refresh with probability rising as expiry nears, scaled by compute cost."""
+        if delta <= 0 or self.early_refresh_beta <= 0:
+            return False
+        jitter = -delta * self.early_refresh_beta * math.log(1.0 - random.random())
+        return time.time() + jitter >= expires_at
+
+    def _try_lead(self, full_key: str) -> bool:
+        """Claim the right to compute full_key, in this process and across processes."""
+        with self._inflight_lock:
+            if full_key in self._inflight:
+                return False
+            self._inflight[full_key] = threading.Event()
+
+        client = self._redis
+        if client:
+            try:
+                acquired = client.set(f"{full_key}:lock", "1", nx=True, px=self.LOCK_TIMEOUT_MS)
+            except redis.RedisError:
+                acquired = True  # Redis trouble should never block computation
+            if not acquired:
+                self._release(full_key, locked=False)
+                return False
+        return True
+
+    def _release(self, full_key: str, locked: bool = True) -> None:
+        with self._inflight_lock:
+            event = self._inflight.pop(full_key, None)
+        if event is not None:
+            event.set()
+
+        client = self._redis
+        if locked and client:
+            try:
+                client.delete(f"{full_key}:lock")
+            except redis.RedisError:
+                pass  # Lock expires on its own
+
+    def _wait_for_leader(self, namespace: str, full_key: str) -> Optional[Tuple[str, float, float]]:
+        with self._inflight_lock:
+            event = self._inflight.get(full_key)
+
+        if event is not None:
+            event.wait(self.LOCK_WAIT_SECONDS)
+            return self._local.get(full_key)
+
+        # Leader lives in another process: poll the shared tier. Polls are
+        # part of one miss, so they are not recorded as lookups
+        client = self._redis
+        if client is None:
+            return None
+        deadline = time.monotonic() + self.LOCK_WAIT_SECONDS
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            try:
+                raw = client.get(full_key)
+            except redis.RedisError as e:
+                self._record_error(namespace, e)
+                return None
+            if raw is not None:
+                return self._from_redis(full_key, raw)
+        return None
+
+    def _record_error(self, namespace: str, error: Exception) -> None:
+        self.metrics.incr(namespace, "errors")
+        logger.warning(f"Cache: Redis error in namespace {namespace}: {error}")
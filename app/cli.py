@@ -367,31 +367,31 @@ def _fetch_bls_data_merged(series_ids):
 
 
 @click.command("reset-usage")
+@click.option("--chunk-size", default=1000, show_default=True, help="Users reset per UPDATE")
 @with_appcontext
-def reset_usage():
+def reset_usage(chunk_size):
     """
     Reset monthly usage for users whose reset date has passed.
 
     This can be run as a cron job to ensure usage resets happen
-    even if users don't log in.
+    even if users don't log in (the reset_expired_usage Celery task
+    does the same on a schedule).
 
     Example:
         flask reset-usage
+        flask reset-usage --chunk-size 5000
     """
-    from app.models.user import User
+    from app.services.usage_meter import usage_meter
 
     click.echo("Checking for users needing usage reset...")
 
-    users = User.query.filter(User.usage_reset_date <= datetime.utcnow()).all()
+    stats = usage_meter.reset_expired_periods(chunk_size=chunk_size)
 
-    if not users:
+    if not stats["rows"]:
         click.echo("No users need usage reset.")
         return
 
-    count = 0
-    for user in users:
-        user.reset_monthly_usage()
-        count += 1
-
-    db.session.commit()
-    click.echo(f"Reset usage for {count} users")
+    click.echo(
+        f"Reset usage for {stats['rows']} users in {stats['chunks']} chunks "
+        f"({stats['seconds']}s, {stats['rows_per_second']} rows/s)"
+    )
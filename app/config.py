@@ -33,10 +33,24 @@ class Config:
     JWT_HEADER_NAME = "Authorization"
     JWT_HEADER_TYPE = "Bearer"
 
+    # Redis connection pool (shared by the blocklist, caches and metering)
+    REDIS_URL = os.environ.get("REDIS_URL") or "redis://localhost:6379/0"
+    REDIS_MAX_CONNECTIONS = int(os.environ.get("REDIS_MAX_CONNECTIONS", 10))
+    REDIS_POOL_TIMEOUT = 2  # seconds to wait for a free pooled connection
+    REDIS_SOCKET_TIMEOUT = 1.0
+
+    # Seconds a "not revoked" blocklist answer is trusted without asking Redis
+    TOKEN_BLOCKLIST_LOCAL_TTL = 10
+
     # Redis Cache
     CACHE_TYPE = "redis"
-    CACHE_REDIS_URL = os.environ.get("REDIS_URL") or "redis://localhost:6379/0"
+    CACHE_REDIS_URL = REDIS_URL
     CACHE_DEFAULT_TIMEOUT = 300
+    CACHE_KEY_PREFIX = "jobezie"
+    # Bump (or set per release) to invalidate every cached entry on deploy
+    CACHE_VERSION = os.environ.get("CACHE_VERSION") or os.environ.get("RENDER_GIT_COMMIT", "1")[:12]
+    CACHE_LOCAL_MAX_ENTRIES = 1024
+    CACHE_LOCAL_TIMEOUT = 30  # local tier never outlives this, so invalidations converge
 
     # CORS
     CORS_ORIGINS = os.environ.get("CORS_ORIGINS", "*").split(",")
@@ -49,6 +63,34 @@ class Config:
     DEFAULT_PAGE_SIZE = 20
     MAX_PAGE_SIZE = 100
 
+    # Whole months of raw activity rows kept before they are rolled up into
+    # per-user daily summaries
+    ACTIVITY_RETENTION_MONTHS = int(os.environ.get("ACTIVITY_RETENTION_MONTHS", 13))
+
+    # Activities logged during a request are written in one INSERT at
+    # teardown ("buffer"), or published to a Redis stream that a worker
+    # bulk-inserts ("stream")
+    ACTIVITY_LOG_MODE = os.environ.get("ACTIVITY_LOG_MODE", "buffer")
+
+    # Longest a GET /api/notifications/unread-count?wait= request may be held
+    # waiting for the count to change. Each held request occupies a worker
+    # thread, so leave at 0 (clients poll) unless serving with an async
+    # worker class such as gevent. Keep it under the frontend's 30s request timeout
+    NOTIFICATION_LONG_POLL_SECONDS = int(os.environ.get("NOTIFICATION_LONG_POLL_SECONDS", 0))
+
+    # Longest a GET /api/events/stream response stays open pushing events.
+    # Like long-polls, an open stream occupies a worker thread, so leave at 0
+    # (each response replays missed events and closes, and the client
+    # reconnects after EVENT_STREAM_RETRY_SECONDS) unless serving with an
+    # async worker class such as gevent
+    EVENT_STREAM_SECONDS = int(os.environ.get("EVENT_STREAM_SECONDS", 0))
+    EVENT_STREAM_RETRY_SECONDS = int(os.environ.get("EVENT_STREAM_RETRY_SECONDS", 30))
+
+    # Internal nginx location that serves EXPORT_DIR (e.g. "/internal/exports/").
+    # When set, export downloads are handed to nginx with X-Accel-Redirect
+    # instead of being streamed by a Python worker
+    EXPORT_ACCEL_REDIRECT_PREFIX = os.environ.get("EXPORT_ACCEL_REDIRECT_PREFIX")
+
     # External Services
     ANTHROPIC_API_KEY = os.environ.get("ANTHROPIC_API_KEY")
     OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY")
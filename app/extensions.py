@@ -5,10 +5,12 @@ Centralized extension initialization to avoid circular imports.
 Extensions are initialized without app context and bound later in the app factory.
 """
 
-import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
 
 import redis
-from flask_caching import Cache
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from flask_limiter import Limiter
@@ -16,6 +18,8 @@ from flask_limiter.util import get_remote_address
 from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
 
+from app.cache import TwoTierCache
+
 # Database
 db = SQLAlchemy()
 
@@ -28,56 +32,180 @@ migrate = Migrate()
 # CORS
 cors = CORS()
 
-# Caching
-cache = Cache()
+# Caching (in-process LRU + Redis)
+cache = TwoTierCache()
 
 # Rate Limiting
 limiter = Limiter(key_func=get_remote_address, default_limits=["100 per minute"])
 
 
+class RedisPool:
+    """
+    Shared, explicitly sized Redis connection pool.
+
+    Every Redis consumer in the app (token blocklist, caches, background
+    helpers) borrows connections from this single pool instead of opening
+    its own, so the number of sockets per worker process is bounded by
+    REDIS_MAX_CONNECTIONS.
+    """
+
+    def __init__(self):
+        self._pool = None
+        self._client = None
+
+    def init_app(self, app):
+        """Create the pool from app config and verify the server is reachable."""
+        self.close()
+        redis_url = app.config.get("REDIS_URL") or app.config.get("CACHE_REDIS_URL")
+
+        if not redis_url:
+            app.logger.info("Redis pool: No Redis URL configured, Redis features disabled")
+            return
+
+        pool = redis.BlockingConnectionPool.from_url(
+            redis_url,
+            max_connections=app.config.get("REDIS_MAX_CONNECTIONS", 10),
+            timeout=app.config.get("REDIS_POOL_TIMEOUT", 2),
+            socket_timeout=app.config.get("REDIS_SOCKET_TIMEOUT", 1.0),
+            socket_connect_timeout=app.config.get("REDIS_SOCKET_TIMEOUT", 1.0),
+            health_check_interval=30,
+            decode_responses=True,
+        )
+        client = redis.Redis(connection_pool=pool)
+
+        try:
+            client.ping()
+        except (redis.ConnectionError, redis.RedisError) as e:
+            app.logger.warning(f"Redis pool: Redis unavailable ({e}), Redis features disabled")
+            pool.disconnect()
+            return
+
+        self._pool = pool
+        self._client = client
+        app.logger.info(f"Redis pool: Connected (max_connections={pool.max_connections})")
+
+    def set_client(self, client) -> None:
+        """Bind an already constructed client (used by tests and maintenance scripts)."""
+        self.close()
+        self._client = client
+
+    def close(self) -> None:
+        """Release all pooled connections."""
+        if self._pool is not None:
+            self._pool.disconnect()
+        self._pool = None
+        self._client = None
+
+    @property
+    def client(self) -> Optional[redis.Redis]:
+        """Redis client bound to the shared pool, or None when Redis is unavailable."""
+        return self._client
+
+    @property
+    def available(self) -> bool:
+        """Whether a Redis server is configured and reachable."""
+        return self._client is not None
+
+
 class TokenBlocklist:
     """
     Token blocklist manager with Redis backend and in-memory fallback.
 
     Stores revoked JWT token IDs (JTIs) to invalidate tokens on logout.
     Tokens automatically expire after the JWT access token lifetime.
+
+    Every authenticated request checks the blocklist, so JTIs confirmed as
+    not revoked are remembered in a small local cache for LOCAL_TTL seconds.
+    Revocations are broadcast over Redis pub/sub and evict the local entry in
+    every worker immediately; the TTL bounds staleness if a message is missed.
     """
 
     BLOCKLIST_PREFIX = "token_blocklist:"
+    INVALIDATION_CHANNEL = "token_blocklist:revoked"
     DEFAULT_EXPIRY = 3600  # 1 hour (matches JWT_ACCESS_TOKEN_EXPIRES)
+    LOCAL_TTL = 10  # seconds a "not revoked" answer is trusted without Redis
+    LOCAL_MAX_ENTRIES = 10000
 
-    def __init__(self):
-        self._redis_client = None
+    def __init__(self, pool: RedisPool):
+        self._pool = pool
         self._fallback_set = set()
         self._use_redis = False
+        self._local_ttl = self.LOCAL_TTL
+        self._not_revoked = OrderedDict()
+        self._lock = threading.Lock()
+        self._subscriber = None
 
-    def init_app(self, app):
-        """Initialize with Flask app to get Redis URL from config."""
-        redis_url = app.config.get("CACHE_REDIS_URL") or os.environ.get("REDIS_URL")
+    @property
+    def _redis_client(self):
+        return self._pool.client if self._use_redis else None
 
-        if redis_url:
-            try:
-                self._redis_client = redis.from_url(redis_url, decode_responses=True)
-                # Test connection
-                self._redis_client.ping()
-                self._use_redis = True
-                app.logger.info("Token blocklist: Using Redis backend")
-            except (redis.ConnectionError, redis.RedisError) as e:
-                app.logger.warning(
-                    f"Token blocklist: Redis unavailable ({e}), using in-memory fallback"
-                )
-                self._use_redis = False
+    def init_app(self, app):
+        """Initialize with Flask app; Redis access goes through the shared pool."""
+        self._local_ttl = app.config.get("TOKEN_BLOCKLIST_LOCAL_TTL", self.LOCAL_TTL)
+        self._not_revoked.clear()
+        self._use_redis = self._pool.available
+
+        if self._use_redis:
+            self._start_subscriber(app)
+            app.logger.info("Token blocklist: Using Redis backend")
         else:
-            app.logger.info("Token blocklist: No Redis URL configured, using in-memory storage")
+            self._stop_subscriber()
+            app.logger.info("Token blocklist: Redis unavailable, using in-memory storage")
+
+    def _start_subscriber(self, app):
+        """Listen for revocations published by other workers (one thread per process)."""
+        self._stop_subscriber()
+
+        try:
+            pubsub = self._pool.client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{self.INVALIDATION_CHANNEL: self._on_revoked_message})
+            self._subscriber = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+        except redis.RedisError as e:
+            # Without invalidation messages the local TTL still bounds staleness
+            app.logger.warning(f"Token blocklist: pub/sub unavailable ({e})")
+
+    def _stop_subscriber(self):
+        if self._subscriber is not None:
+            self._subscriber.stop()
+            self._subscriber = None
+
+    def _on_revoked_message(self, message) -> None:
+        self._forget(message["data"])
+
+    def _forget(self, jti: str) -> None:
+        with self._lock:
+            self._not_revoked.pop(jti, None)
+
+    def _remember_not_revoked(self, jti: str) -> None:
+        with self._lock:
+            self._not_revoked[jti] = time.monotonic() + self._local_ttl
+            self._not_revoked.move_to_end(jti)
+            while len(self._not_revoked) > self.LOCAL_MAX_ENTRIES:
+                self._not_revoked.popitem(last=False)
+
+    def _known_not_revoked(self, jti: str) -> bool:
+        with self._lock:
+            expires_at = self._not_revoked.get(jti)
+            if expires_at is None:
+                return False
+            if expires_at <= time.monotonic():
+                del self._not_revoked[jti]
+                return False
+            return True
 
     def add(self, jti: str, expires_in: int = None) -> None:
-        """Add a token JTI to the blocklist."""
+        """Add a token JTI to the blocklist and notify the other workers."""
         expiry = expires_in or self.DEFAULT_EXPIRY
+        self._forget(jti)
 
-        if self._use_redis and self._redis_client:
+        client = self._redis_client
+        if client:
             try:
                 key = f"{self.BLOCKLIST_PREFIX}{jti}"
-                self._redis_client.setex(key, expiry, "revoked")
+                pipe = client.pipeline(transaction=False)
+                pipe.setex(key, expiry, "revoked")
+                pipe.publish(self.INVALIDATION_CHANNEL, jti)
+                pipe.execute()
                 return
             except redis.RedisError:
                 pass  # Fall through to in-memory
@@ -86,18 +214,27 @@ class TokenBlocklist:
 
     def __contains__(self, jti: str) -> bool:
         """Check if a token JTI is in the blocklist."""
-        if self._use_redis and self._redis_client:
+        client = self._redis_client
+        if client:
+            if self._known_not_revoked(jti):
+                return False
             try:
                 key = f"{self.BLOCKLIST_PREFIX}{jti}"
-                return self._redis_client.exists(key) > 0
+                revoked = client.exists(key) > 0
             except redis.RedisError:
-                pass  # Fall through to in-memory
+                return jti in self._fallback_set  # Fall through to in-memory
+            if not revoked:
+                self._remember_not_revoked(jti)
+            return revoked
 
         return jti in self._fallback_set
 
 
+# Shared Redis connection pool
+redis_pool = RedisPool()
+
 # Token Blocklist instance
-token_blocklist = TokenBlocklist()
+token_blocklist = TokenBlocklist(redis_pool)
 
 
 def init_extensions(app):
@@ -108,6 +245,7 @@ def init_extensions(app):
     cors.init_app(app, resources={r"/api/*": {"origins": app.config.get("CORS_ORIGINS", "*")}})
     cache.init_app(app)
     limiter.init_app(app)
+    redis_pool.init_app(app)
     token_blocklist.init_app(app)
 
     # Configure JWT callbacks
@@ -0,0 +1,82 @@
+"""
+JSON Provider
+
+orjson-backed replacement for Flask's default JSON provider.
+
+Output matches DefaultJSONProvider: keys sorted, datetimes and dates as
+HTTP dates, UUIDs and Decimals as strings, dataclasses as objects, compact
+unless debugging. The one visible difference is that non-ASCII text is
+written as UTF-8 instead of \\u escapes. Values orjson cannot encode (such
+as integers wider than 64 bits) fall back to the standard library, as does
+everything when orjson is not installed.
+
+Responses built by response() (and so by jsonify) keep the serialized
+object as `json_payload`, so the API envelope check in after_request can
+inspect it without parsing the body again.
+"""
+
+import logging
+import typing as t
+
+from flask.json.provider import DefaultJSONProvider
+
+logger = logging.getLogger(__name__)
+
+# orjson is optional — the standard library encoder is used without it
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+    logger.info("orjson not installed — using the standard library JSON encoder")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """DefaultJSONProvider with orjson encoding and decoding."""
+
+    def dumps(self, obj: t.Any, **kwargs: t.Any) -> str:
+        """Serialize to a compact JSON string; kwargs select the stdlib encoder."""
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        encoded = self._orjson_dumps(obj) if HAS_ORJSON else None
+        if encoded is not None:
+            return encoded.decode()
+        return super().dumps(obj, separators=(",", ":"))
+
+    def loads(self, s: t.Union[str, bytes], **kwargs: t.Any) -> t.Any:
+        """Deserialize JSON, retrying with the stdlib for input orjson rejects."""
+        if HAS_ORJSON and not kwargs:
+            try:
+                return orjson.loads(s)
+            except orjson.JSONDecodeError:
+                # e.g. NaN or integers wider than 64 bits; still invalid
+                # input raises the stdlib's JSONDecodeError below
+                pass
+        return super().loads(s, **kwargs)
+
+    def response(self, *args: t.Any, **kwargs: t.Any):
+        """Serialize the arguments into a JSON response that keeps the payload."""
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+
+        body = self._orjson_dumps(obj, indent=indent) if HAS_ORJSON else None
+        if body is None:
+            dump_args = {"indent": 2} if indent else {"separators": (",", ":")}
+            body = super().dumps(obj, **dump_args).encode()
+
+        response = self._app.response_class(body + b"\n", mimetype=self.mimetype)
+        response.json_payload = obj
+        return response
+
+    def _orjson_dumps(self, obj: t.Any, indent: bool = False) -> t.Optional[bytes]:
+        """Encode with orjson, or None if the object needs the stdlib encoder."""
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=self.default, option=option)
+        except orjson.JSONEncodeError:
+            return None
@@ -5,7 +5,14 @@ Import all models here for easy access and to ensure they're registered
 with SQLAlchemy before migrations are created.
 """
 
-from app.models.activity import Activity, ActivityType, PipelineItem, PipelineStage
+from app.models.account_deletion_job import AccountDeletionJob
+from app.models.activity import (
+    Activity,
+    ActivityDailySummary,
+    ActivityType,
+    PipelineItem,
+    PipelineStage,
+)
 from app.models.admin_audit_log import AdminAuditLog
 from app.models.data_export_request import DataExportRequest
 from app.models.labor_market import (
@@ -44,6 +51,7 @@ __all__ = [
     "NotificationType",
     # Activity
     "Activity",
+    "ActivityDailySummary",
     "ActivityType",
     "PipelineStage",
     "PipelineItem",
@@ -57,4 +65,6 @@ __all__ = [
     "AdminAuditLog",
     # Data Export
     "DataExportRequest",
+    # Account Deletion
+    "AccountDeletionJob",
 ]
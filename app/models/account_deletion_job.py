@@ -0,0 +1,50 @@
+"""
+Account deletion job model - tracks hard-delete progress per user.
+
+One record per account being permanently deleted, so a deletion that is
+interrupted (worker crash, deploy, lock timeout) resumes where it stopped.
+Status lifecycle: pending -> deleting -> completed/failed
+
+No foreign key to users: the record outlives the user row it describes.
+"""
+
+from datetime import datetime
+
+from app.extensions import db
+from app.models.user import GUID
+
+
+class AccountDeletionJob(db.Model):
+    __tablename__ = "account_deletion_jobs"
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(GUID(), nullable=False, unique=True, index=True)
+    status = db.Column(db.String(20), nullable=False, default="pending", index=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+
+    # Progress
+    current_table = db.Column(db.String(50), nullable=True)
+    rows_deleted = db.Column(db.BigInteger, nullable=False, default=0)
+    files_deleted = db.Column(db.Integer, nullable=False, default=0)
+    error_message = db.Column(db.Text, nullable=True)
+
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    completed_at = db.Column(db.DateTime, nullable=True)
+
+    def to_dict(self):
+        return {
+            "user_id": str(self.user_id),
+            "status": self.status,
+            "attempts": self.attempts,
+            "current_table": self.current_table,
+            "rows_deleted": self.rows_deleted,
+            "files_deleted": self.files_deleted,
+            "error_message": self.error_message,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+        }
+
+    def __repr__(self):
+        return f"<AccountDeletionJob {self.id}: user={self.user_id} status={self.status}>"
@@ -8,6 +8,8 @@ import uuid
 from datetime import datetime
 from enum import Enum
 
+from sqlalchemy.dialects.postgresql import VARCHAR as PG_VARCHAR
+
 from app.extensions import db
 from app.models.user import GUID, JSONType
 
@@ -87,6 +89,13 @@ class Activity(db.Model):
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
 
+    # Covers per-user counts by type and time bucket without touching the table
+    __table_args__ = (
+        db.Index("ix_activities_user_created_type", "user_id", "created_at", "activity_type"),
+        # Account deletion walks a user's rows in id order
+        db.Index("ix_activities_user_id_id", "user_id", "id"),
+    )
+
     # Relationships
     user = db.relationship("User", backref=db.backref("activities", lazy="dynamic"))
     recruiter = db.relationship("Recruiter", backref=db.backref("activities", lazy="dynamic"))
@@ -125,6 +134,30 @@ class Activity(db.Model):
         }
 
 
+class ActivityDailySummary(db.Model):
+    """
+    Per-user daily activity counts by type, kept after raw activities expire.
+
+    Months older than the retention window are rolled up into this table
+    and their activity rows dropped; counts and time series add these rows
+    to live activities.
+    """
+
+    __tablename__ = "activity_daily_summaries"
+
+    user_id = db.Column(
+        GUID(),
+        db.ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    day = db.Column(db.Date, primary_key=True)
+    activity_type = db.Column(db.String(50), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<ActivityDailySummary {self.day} {self.activity_type}: {self.count}>"
+
+
 class PipelineItem(db.Model):
     """
     Pipeline item for Kanban board management.
@@ -141,7 +174,12 @@ class PipelineItem(db.Model):
 
     # Stage & Position
     stage = db.Column(db.String(50), nullable=False, index=True)
-    position = db.Column(db.Integer, default=0)  # For ordering within column
+    position = db.Column(db.Integer, default=0)  # Legacy; columns are ordered by rank
+    # Lexicographic order key within the stage (app.utils.lexorank). Compared
+    # bytewise, hence the "C" collation on PostgreSQL
+    rank = db.Column(
+        db.String(64).with_variant(PG_VARCHAR(64, collation="C"), "postgresql"), nullable=True
+    )
 
     # Quick Stats (denormalized for performance)
     last_activity_date = db.Column(db.DateTime, nullable=True)
@@ -157,6 +195,8 @@ class PipelineItem(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    __table_args__ = (db.Index("ix_pipeline_items_user_stage_rank", "user_id", "stage", "rank"),)
+
     # Relationships
     user = db.relationship("User", backref=db.backref("pipeline_items", lazy="dynamic"))
     recruiter = db.relationship("Recruiter", backref=db.backref("pipeline_item", uselist=False))
@@ -164,6 +204,13 @@ class PipelineItem(db.Model):
     def __repr__(self):
         return f"<PipelineItem {self.recruiter_id} @ {self.stage}>"
 
+    @property
+    def current_days_in_stage(self) -> int:
+        """Days in the current stage as of now; the stored column is refreshed nightly."""
+        if self.entered_stage_at:
+            return (datetime.utcnow() - self.entered_stage_at).days
+        return self.days_in_stage or 0
+
     def to_dict(self) -> dict:
         """Convert pipeline item to dictionary representation."""
         return {
@@ -172,8 +219,9 @@ class PipelineItem(db.Model):
             "recruiter_id": str(self.recruiter_id),
             "stage": self.stage,
             "position": self.position,
+            "rank": self.rank,
             "priority_score": self.priority_score,
-            "days_in_stage": self.days_in_stage,
+            "days_in_stage": self.current_days_in_stage,
             "last_activity_date": (
                 self.last_activity_date.isoformat() if self.last_activity_date else None
             ),
@@ -24,12 +24,18 @@ class DataExportRequest(db.Model):
     status = db.Column(db.String(20), default="pending", index=True)
     file_path = db.Column(db.Text, nullable=True)
     file_size_bytes = db.Column(db.BigInteger, nullable=True)
+    file_sha256 = db.Column(db.String(64), nullable=True)  # download ETag
     download_token = db.Column(db.String(64), unique=True, index=True)
     expires_at = db.Column(db.DateTime, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     completed_at = db.Column(db.DateTime, nullable=True)
     error_message = db.Column(db.Text, nullable=True)
 
+    # Progress while the export is being built
+    current_section = db.Column(db.String(50), nullable=True)
+    records_exported = db.Column(db.BigInteger, nullable=False, default=0)
+    records_total = db.Column(db.BigInteger, nullable=True)
+
     # Relationship
     user = db.relationship("User", backref=db.backref("export_requests", lazy="dynamic"))
 
@@ -42,7 +48,20 @@ class DataExportRequest(db.Model):
             "expires_at": self.expires_at.isoformat() if self.expires_at else None,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "current_section": self.current_section,
+            "records_exported": self.records_exported,
+            "records_total": self.records_total,
+            "progress_percent": self.progress_percent,
         }
 
+    @property
+    def progress_percent(self) -> int:
+        """Share of records written so far, 100 once completed."""
+        if self.status == "completed":
+            return 100
+        if not self.records_total:
+            return 0
+        return min(99, int(100 * (self.records_exported or 0) / self.records_total))
+
     def __repr__(self):
         return f"<DataExportRequest {self.id}: user={self.user_id} status={self.status}>"
@@ -33,6 +33,12 @@ class Notification(db.Model):
     """
 
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Duplicate checks while generating notifications
+        db.Index(
+            "ix_notifications_user_type_created", "user_id", "notification_type", "created_at"
+        ),
+    )
 
     id = db.Column(GUID(), primary_key=True, default=uuid.uuid4)
     user_id = db.Column(
@@ -51,6 +57,9 @@ class Notification(db.Model):
     is_read = db.Column(db.Boolean, default=False, nullable=False)
     action_url = db.Column(db.String(500), nullable=True)
     extra_data = db.Column("metadata", JSONType, default=dict)
+    # What the notification is about (recruiter id, usage type), so a
+    # generator skips subjects it has already notified the user about
+    dedup_key = db.Column(db.String(64), nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
 
     # Relationships
@@ -161,7 +161,7 @@ class User(db.Model):
     monthly_tailoring_count = db.Column(db.Integer, default=0)
     daily_coach_count = db.Column(db.Integer, default=0)
     monthly_interview_prep_count = db.Column(db.Integer, default=0)
-    usage_reset_date = db.Column(db.DateTime, nullable=True)
+    usage_reset_date = db.Column(db.DateTime, nullable=True, index=True)
 
     # Onboarding
     onboarding_completed = db.Column(db.Boolean, default=False)
@@ -188,6 +188,46 @@ class User(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Usage limits per subscription tier (-1 = unlimited); unknown tiers get basic
+    TIER_LIMITS = {
+        SubscriptionTier.BASIC.value: {
+            "recruiters": 5,
+            "tailored_resumes": 2,
+            "ai_messages": 10,
+            "research": 5,
+            "coach_daily": 10,
+            "interview_prep": 0,
+            "skills_gap": 1,
+        },
+        SubscriptionTier.PRO.value: {
+            "recruiters": 50,
+            "tailored_resumes": 10,
+            "ai_messages": 100,
+            "research": 25,
+            "coach_daily": 50,
+            "interview_prep": 3,
+            "skills_gap": 5,
+        },
+        SubscriptionTier.EXPERT.value: {
+            "recruiters": -1,  # Unlimited
+            "tailored_resumes": -1,
+            "ai_messages": -1,
+            "research": -1,
+            "coach_daily": -1,
+            "interview_prep": -1,
+            "skills_gap": -1,
+        },
+        SubscriptionTier.CAREER_KEEPER.value: {
+            "recruiters": 5,
+            "tailored_resumes": 1,
+            "ai_messages": 10,
+            "research": 2,
+            "coach_daily": 10,
+            "interview_prep": 1,
+            "skills_gap": 1,
+        },
+    }
+
     def __repr__(self):
         return f"<User {self.email}>"
 
@@ -209,45 +249,9 @@ class User(db.Model):
     @property
     def tier_limits(self) -> dict:
         """Return usage limits based on subscription tier."""
-        limits = {
-            SubscriptionTier.BASIC.value: {
-                "recruiters": 5,
-                "tailored_resumes": 2,
-                "ai_messages": 10,
-                "research": 5,
-                "coach_daily": 10,
-                "interview_prep": 0,
-                "skills_gap": 1,
-            },
-            SubscriptionTier.PRO.value: {
-                "recruiters": 50,
-                "tailored_resumes": 10,
-                "ai_messages": 100,
-                "research": 25,
-                "coach_daily": 50,
-                "interview_prep": 3,
-                "skills_gap": 5,
-            },
-            SubscriptionTier.EXPERT.value: {
-                "recruiters": -1,  # Unlimited
-                "tailored_resumes": -1,
-                "ai_messages": -1,
-                "research": -1,
-                "coach_daily": -1,
-                "interview_prep": -1,
-                "skills_gap": -1,
-            },
-            SubscriptionTier.CAREER_KEEPER.value: {
-                "recruiters": 5,
-                "tailored_resumes": 1,
-                "ai_messages": 10,
-                "research": 2,
-                "coach_daily": 10,
-                "interview_prep": 1,
-                "skills_gap": 1,
-            },
-        }
-        return limits.get(self.subscription_tier, limits[SubscriptionTier.BASIC.value])
+        return self.TIER_LIMITS.get(
+            self.subscription_tier, self.TIER_LIMITS[SubscriptionTier.BASIC.value]
+        )
 
     def reset_monthly_usage(self) -> None:
         """Reset all monthly usage counters and set next reset date."""
@@ -329,6 +333,10 @@ class User(db.Model):
             )
 
         if include_private:
+            # Imported here: the meter imports this module
+            from app.services.usage_meter import usage_meter
+
+            usage = usage_meter.get_usage(self)
             data.update(
                 {
                     "phone": self.phone,
@@ -346,12 +354,12 @@ class User(db.Model):
                     ),
                     "tier_limits": self.tier_limits,
                     "usage": {
-                        "recruiters": self.monthly_recruiter_count,
-                        "messages": self.monthly_message_count,
-                        "research": self.monthly_research_count,
-                        "tailoring": self.monthly_tailoring_count,
-                        "coach_today": self.daily_coach_count,
-                        "interview_prep": self.monthly_interview_prep_count,
+                        "recruiters": usage["monthly_recruiter_count"],
+                        "messages": usage["monthly_message_count"],
+                        "research": usage["monthly_research_count"],
+                        "tailoring": usage["monthly_tailoring_count"],
+                        "coach_today": usage["daily_coach_count"],
+                        "interview_prep": usage["monthly_interview_prep_count"],
                     },
                     "last_login_at": (
                         self.last_login_at.isoformat() if self.last_login_at else None
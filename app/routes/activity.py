@@ -4,13 +4,14 @@ Activity Routes
 API endpoints for activity tracking and Kanban pipeline management.
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import get_jwt_identity, jwt_required
 
 from app.models.activity import ActivityType, PipelineStage
 from app.services.activity_service import ActivityService
+from app.utils.pagination import InvalidCursorError, parse_total_mode
 
 activity_bp = Blueprint("activity", __name__, url_prefix="/api/activities")
 
@@ -91,6 +92,9 @@ def get_activities():
         end_date: Filter activities before this date (ISO format)
         limit: Maximum results (default: 50)
         offset: Pagination offset (default: 0)
+        cursor: Use keyset pagination; empty for the first page, then the
+            previous response's next_cursor (offset is ignored)
+        total: With cursor, include a total: none (default), approximate, exact
 
     Returns:
         JSON with activities array and pagination info
@@ -119,6 +123,22 @@ def get_activities():
         except ValueError:
             pass
 
+    if "cursor" in request.args:
+        try:
+            page = ActivityService.get_user_activities_page(
+                user_id=user_id,
+                activity_type=activity_type,
+                recruiter_id=recruiter_id,
+                start_date=start_date,
+                end_date=end_date,
+                limit=limit,
+                cursor=request.args.get("cursor") or None,
+                total=parse_total_mode(request.args.get("total")),
+            )
+        except InvalidCursorError as e:
+            return jsonify({"success": False, "data": {"error": str(e)}}), 400
+        return jsonify({"success": True, "data": page.to_dict("activities", limit)}), 200
+
     activities, total = ActivityService.get_user_activities(
         user_id=user_id,
         activity_type=activity_type,
@@ -196,6 +216,50 @@ def get_counts():
     return jsonify({"success": True, "data": counts}), 200
 
 
+@activity_bp.route("/series", methods=["GET"])
+@jwt_required()
+def get_series():
+    """
+    Get activity counts per time bucket for charts and reports.
+
+    Query params:
+        bucket: day (default), week or month
+        start: ISO start of the range (default: 30 days before end)
+        end: ISO end of the range, exclusive (default: now)
+        types: Comma-separated activity types to count (default: all)
+
+    Returns:
+        JSON with zero-filled buckets, oldest first, and totals by type
+    """
+    user_id = get_jwt_identity()
+
+    try:
+        end = _parse_utc(request.args.get("end")) or datetime.utcnow()
+        start = _parse_utc(request.args.get("start")) or end - timedelta(days=30)
+        activity_types = [t for t in request.args.get("types", "").split(",") if t]
+        series = ActivityService.get_activity_series(
+            user_id,
+            start,
+            end,
+            bucket=request.args.get("bucket", "day"),
+            activity_types=activity_types,
+        )
+    except ValueError as e:
+        return jsonify({"success": False, "data": {"error": str(e)}}), 400
+
+    return jsonify({"success": True, "data": series}), 200
+
+
+def _parse_utc(value):
+    """Parse an ISO timestamp to naive UTC; None when absent."""
+    if not value:
+        return None
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
 @activity_bp.route("/timeline", methods=["GET"])
 @jwt_required()
 def get_timeline():
@@ -328,6 +392,8 @@ def move_item(item_id):
     Request body:
         stage: Target stage
         position: Position within stage (optional)
+        before_id: Place directly before this item (optional)
+        after_id: Place directly after this item (optional)
 
     Returns:
         JSON with updated pipeline item
@@ -345,6 +411,8 @@ def move_item(item_id):
             item_id=item_id,
             new_stage=stage,
             new_position=data.get("position"),
+            before_id=data.get("before_id"),
+            after_id=data.get("after_id"),
         )
 
         return (
@@ -364,6 +432,61 @@ def move_item(item_id):
         return jsonify({"success": False, "data": {"error": str(e)}}), 400
 
 
+@activity_bp.route("/pipeline/move", methods=["POST"])
+@jwt_required()
+def move_items():
+    """
+    Move several pipeline items at once (multi-select drag and drop).
+
+    The items land together, in the order given, at the target spot.
+
+    Request body:
+        item_ids: Pipeline item IDs in their new order
+        stage: Target stage
+        position: Position of the first item within the stage (optional)
+        before_id: Place the items directly before this item (optional)
+        after_id: Place the items directly after this item (optional)
+
+    Returns:
+        JSON with the updated pipeline items
+    """
+    user_id = get_jwt_identity()
+    data = request.get_json() or {}
+
+    stage = data.get("stage")
+    item_ids = data.get("item_ids")
+    if not stage:
+        return jsonify({"success": False, "data": {"error": "stage is required"}}), 400
+    if not isinstance(item_ids, list) or not item_ids:
+        return jsonify({"success": False, "data": {"error": "item_ids is required"}}), 400
+
+    try:
+        items = ActivityService.move_pipeline_items(
+            user_id=user_id,
+            item_ids=item_ids,
+            new_stage=stage,
+            new_position=data.get("position"),
+            before_id=data.get("before_id"),
+            after_id=data.get("after_id"),
+        )
+
+        return (
+            jsonify(
+                {
+                    "success": True,
+                    "data": {
+                        "message": f"Moved {len(items)} items to {stage}",
+                        "items": [item.to_dict() for item in items],
+                    },
+                }
+            ),
+            200,
+        )
+
+    except ValueError as e:
+        return jsonify({"success": False, "data": {"error": str(e)}}), 400
+
+
 @activity_bp.route("/pipeline/refresh", methods=["POST"])
 @jwt_required()
 def refresh_pipeline():
@@ -7,11 +7,12 @@ Handles admin authentication and administrative operations.
 from datetime import datetime
 
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import create_access_token, create_refresh_token
+from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required
 
-from app.extensions import db
+from app.extensions import cache, db
 from app.models.user import User
 from app.utils.admin_helpers import log_admin_action
+from app.utils.decorators import admin_required
 
 admin_bp = Blueprint("admin", __name__)
 
@@ -128,3 +129,28 @@ def admin_login():
         ),
         200,
     )
+
+
+@admin_bp.route("/cache/stats", methods=["GET"])
+@jwt_required()
+@admin_required
+def cache_stats():
+    """
+    Get cache hit/miss/latency metrics for this worker process.
+
+    Returns:
+        200: Metrics per cache namespace
+    """
+    return (
+        jsonify(
+            {
+                "success": True,
+                "data": {
+                    "version": cache.version,
+                    "redis_enabled": cache.use_redis,
+                    "namespaces": cache.stats(),
+                },
+            }
+        ),
+        200,
+    )
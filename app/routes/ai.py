@@ -7,7 +7,6 @@ API endpoints for AI-powered career assistance features.
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import get_jwt_identity, jwt_required
 
-from app.extensions import db
 from app.services.ai_service import (
     AIService,
     career_coaching_sync,
@@ -18,7 +17,7 @@ from app.services.ai_service import (
 )
 from app.services.message_service import MessageService
 from app.services.resume_service import ResumeService
-from app.utils.decorators import feature_limit
+from app.utils.decorators import feature_limit, load_current_user
 from app.utils.validators import validate_text_fields
 
 ai_bp = Blueprint("ai", __name__, url_prefix="/api/ai")
@@ -122,14 +121,6 @@ def generate_message():
         response_data["quality_score"] = quality["total_score"]
         response_data["quality_feedback"] = quality["feedback"]
 
-    # Increment usage counter
-    from app.models.user import User
-
-    current_user = User.query.get(user_id)
-    if current_user:
-        current_user.monthly_message_count += 1
-        db.session.commit()
-
     return jsonify(response_data), 200
 
 
@@ -181,14 +172,6 @@ def optimize_resume():
             500,
         )
 
-    # Increment usage counter
-    from app.models.user import User
-
-    current_user = User.query.get(user_id)
-    if current_user:
-        current_user.monthly_research_count += 1
-        db.session.commit()
-
     return (
         jsonify(
             {
@@ -235,9 +218,7 @@ def career_coach():
     question = validated["question"]
 
     # Get user context from profile
-    from app.models.user import User
-
-    user = User.query.get(user_id)
+    user = load_current_user()
 
     user_context = None
     algorithm_context = None
@@ -274,12 +255,6 @@ def career_coach():
             500,
         )
 
-    # Increment usage counter
-    user = User.query.get(user_id)
-    if user:
-        user.daily_coach_count += 1
-        db.session.commit()
-
     return (
         jsonify(
             {
@@ -481,14 +456,6 @@ def interview_prep():
             500,
         )
 
-    # Increment usage counter
-    from app.models.user import User
-
-    current_user = User.query.get(user_id)
-    if current_user:
-        current_user.monthly_interview_prep_count += 1
-        db.session.commit()
-
     return (
         jsonify(
             {
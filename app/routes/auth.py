@@ -19,6 +19,9 @@ from flask_jwt_extended import (
 from app.extensions import db, token_blocklist
 from app.models.user import User
 from app.services.email_service import EmailService
+from app.services.recruiter_service import RecruiterService
+from app.tasks import enqueue, rescore_recruiter_fit
+from app.utils.decorators import load_current_user
 from app.utils.validators import ValidationError, validate_email, validate_password
 
 auth_bp = Blueprint("auth", __name__)
@@ -264,8 +267,7 @@ def resend_verification():
         200: Verification email sent
         400: Email already verified
     """
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = load_current_user()
 
     if not user:
         return (
@@ -431,7 +433,7 @@ def refresh():
     current_user_id = get_jwt_identity()
 
     # Verify user still exists and is active
-    user = User.query.get(current_user_id)
+    user = load_current_user()
     if not user or not user.is_active:
         return (
             jsonify(
@@ -481,8 +483,7 @@ def get_current_user():
         401: Not authenticated
         404: User not found
     """
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = load_current_user()
 
     if not user:
         return (
@@ -520,8 +521,7 @@ def change_password():
         400: Validation error
         401: Current password incorrect
     """
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = load_current_user()
 
     if not user:
         return (
@@ -746,8 +746,7 @@ def update_profile():
         400: Validation error
         404: User not found
     """
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = load_current_user()
 
     if not user:
         return (
@@ -775,6 +774,8 @@ def update_profile():
             400,
         )
 
+    fit_inputs = _fit_inputs(user)
+
     # Update basic profile fields
     if "first_name" in data:
         user.first_name = data["first_name"].strip() if data["first_name"] else None
@@ -837,8 +838,14 @@ def update_profile():
     if "onboarding_completed" in data:
         user.onboarding_completed = data["onboarding_completed"]
 
+    rescore_fit = _fit_inputs(user) != fit_inputs
+
     db.session.commit()
 
+    # Fit scores depend on the profile; rescore the pipeline off the request path
+    if rescore_fit:
+        enqueue(rescore_recruiter_fit, str(user.id), inline=RecruiterService.rescore_fit)
+
     return (
         jsonify(
             {
@@ -851,6 +858,16 @@ def update_profile():
     )
 
 
+def _fit_inputs(user: User) -> tuple:
+    """Profile fields that recruiter fit scores are calculated from."""
+    return (
+        list(user.target_industries or []),
+        list(user.target_roles or []),
+        user.location,
+        user.salary_expectation,
+    )
+
+
 @auth_bp.route("/tour/status", methods=["GET"])
 @jwt_required()
 def get_tour_status():
@@ -864,8 +881,7 @@ def get_tour_status():
         200: Tour status
         404: User not found
     """
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = load_current_user()
 
     if not user:
         return (
@@ -907,8 +923,7 @@ def complete_tour():
         200: Tour marked as completed
         404: User not found
     """
-    current_user_id = get_jwt_identity()
-    user = User.query.get(current_user_id)
+    user = load_current_user()
 
     if not user:
         return (
@@ -8,16 +8,20 @@ from datetime import datetime, timedelta
 
 from flask import Blueprint, jsonify
 from flask_jwt_extended import get_jwt_identity, jwt_required
+from sqlalchemy import func
 
+from app.extensions import db
 from app.models.activity import Activity
 from app.models.message import Message, MessageStatus
 from app.models.recruiter import Recruiter, RecruiterStatus
 from app.models.resume import Resume
-from app.models.user import User
+from app.services.activity_service import ActivityService
 from app.services.scoring.readiness import (
     calculate_career_readiness,
     calculate_profile_completeness,
 )
+from app.services.usage_meter import usage_meter
+from app.utils.decorators import load_current_user
 
 dashboard_bp = Blueprint("dashboard", __name__, url_prefix="/api/dashboard")
 
@@ -33,7 +37,7 @@ def get_dashboard():
         404: User not found
     """
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = load_current_user()
 
     if not user:
         return (
@@ -118,6 +122,9 @@ def get_dashboard():
         career_stage=user.career_stage or "mid_level",
     )
 
+    # Metered counters, including uses not yet written back from Redis
+    usage = usage_meter.get_usage(user)
+
     return (
         jsonify(
             {
@@ -154,19 +161,19 @@ def get_dashboard():
                     ],
                     "usage": {
                         "recruiters": {
-                            "used": user.monthly_recruiter_count,
+                            "used": usage["monthly_recruiter_count"],
                             "limit": user.tier_limits.get("recruiters", 5),
                         },
                         "messages": {
-                            "used": user.monthly_message_count,
+                            "used": usage["monthly_message_count"],
                             "limit": user.tier_limits.get("ai_messages", 10),
                         },
                         "research": {
-                            "used": user.monthly_research_count,
+                            "used": usage["monthly_research_count"],
                             "limit": user.tier_limits.get("research", 5),
                         },
                         "tailored_resumes": {
-                            "used": user.monthly_tailoring_count,
+                            "used": usage["monthly_tailoring_count"],
                             "limit": user.tier_limits.get("tailored_resumes", 2),
                         },
                     },
@@ -188,7 +195,7 @@ def get_career_readiness():
         404: User not found
     """
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = load_current_user()
 
     if not user:
         return (
@@ -281,12 +288,16 @@ def get_weekly_stats():
     """
     user_id = get_jwt_identity()
 
+    today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    activity_series = ActivityService.get_activity_series(
+        user_id, today - timedelta(days=6), today + timedelta(days=1)
+    )
+    activities_by_day = {day["bucket"]: day["total"] for day in activity_series["series"]}
+
     # Get stats for each day of the past week
     daily_stats = []
     for i in range(7):
-        day_start = datetime.utcnow().replace(
-            hour=0, minute=0, second=0, microsecond=0
-        ) - timedelta(days=i)
+        day_start = today - timedelta(days=i)
         day_end = day_start + timedelta(days=1)
 
         messages_sent = Message.query.filter(
@@ -307,11 +318,7 @@ def get_weekly_stats():
             Recruiter.created_at < day_end,
         ).count()
 
-        activities = Activity.query.filter(
-            Activity.user_id == user_id,
-            Activity.created_at >= day_start,
-            Activity.created_at < day_end,
-        ).count()
+        activities = activities_by_day.get(day_start.date().isoformat(), 0)
 
         daily_stats.append(
             {
@@ -362,9 +369,11 @@ def _get_pipeline_summary(user_id: str) -> dict:
         RecruiterStatus.DECLINED.value,
     ]
 
-    summary = {}
-    for stage in stages:
-        count = Recruiter.query.filter_by(user_id=user_id, status=stage).count()
-        summary[stage] = count
+    counts = dict(
+        db.session.query(Recruiter.status, func.count())
+        .filter(Recruiter.user_id == user_id, Recruiter.status.in_(stages))
+        .group_by(Recruiter.status)
+        .all()
+    )
 
-    return summary
+    return {stage: counts.get(stage, 0) for stage in stages}
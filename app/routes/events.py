@@ -0,0 +1,47 @@
+"""
+Event Routes
+
+Server-Sent Events stream of the current user's pipeline, activity,
+notification and subscription changes.
+"""
+
+from flask import Blueprint, Response, current_app, request, stream_with_context
+from flask_jwt_extended import get_jwt_identity, jwt_required
+
+from app.services.event_stream import event_stream
+
+events_bp = Blueprint("events", __name__, url_prefix="/api/events")
+
+
+@events_bp.route("/stream", methods=["GET"])
+@jwt_required()
+def stream():
+    """
+    Stream the current user's events (text/event-stream).
+
+    Headers:
+        Last-Event-ID: Resume after this event id (sent by reconnecting clients)
+
+    Query Parameters:
+        last_event_id (str): Same as Last-Event-ID, for clients that cannot
+            set headers
+
+    Returns:
+        200: A stream.ready event whose id is the resume point (stream.reset
+            when events after Last-Event-ID are no longer kept; re-fetch
+            instead), the events since, and new events for up to
+            EVENT_STREAM_SECONDS
+    """
+    user_id = get_jwt_identity()
+    last_event_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    events = event_stream.sse(
+        user_id,
+        last_event_id,
+        seconds=current_app.config.get("EVENT_STREAM_SECONDS", 0),
+        retry_ms=current_app.config.get("EVENT_STREAM_RETRY_SECONDS", 30) * 1000,
+    )
+
+    response = Response(stream_with_context(events), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"  # nginx: send events as written
+    return response
@@ -4,48 +4,20 @@ Labor Market Routes
 Provides labor market intelligence endpoints.
 """
 
-import json
 import logging
 
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import get_jwt_identity, jwt_required
+from flask_jwt_extended import jwt_required
 
-from app.extensions import db, token_blocklist
-from app.models.user import User
+from app.extensions import cache
 from app.services.labor_market_service import LaborMarketService, get_market_overview_sync
-from app.utils.decorators import feature_limit
+from app.utils.decorators import feature_limit, load_current_user
 
 logger = logging.getLogger(__name__)
 
 labor_market_bp = Blueprint("labor_market", __name__, url_prefix="/api/labor-market")
 
 
-# --- Redis cache helpers ---
-
-
-def _cache_get(key: str):
-    """Get a value from Redis cache, returns None on miss or error."""
-    try:
-        client = token_blocklist._redis_client
-        if client:
-            val = client.get(key)
-            if val:
-                return json.loads(val)
-    except Exception:
-        pass
-    return None
-
-
-def _cache_set(key: str, data, ttl: int = 60):
-    """Set a value in Redis cache with TTL (seconds)."""
-    try:
-        client = token_blocklist._redis_client
-        if client:
-            client.setex(key, ttl, json.dumps(data))
-    except Exception:
-        pass
-
-
 @labor_market_bp.route("/overview", methods=["GET"])
 @jwt_required()
 def get_market_overview():
@@ -55,12 +27,7 @@ def get_market_overview():
     Returns:
         200: Market overview with key indicators
     """
-    cached = _cache_get("market:overview")
-    if cached:
-        return jsonify({"success": True, "data": cached}), 200
-
     overview = get_market_overview_sync()
-    _cache_set("market:overview", overview, ttl=600)
 
     return jsonify({"success": True, "data": overview}), 200
 
@@ -97,17 +64,11 @@ def get_shortage_score():
     industry = request.args.get("industry")
     location = request.args.get("location")
 
-    cache_key = f"shortage:{role}:{industry or ''}:{location or ''}"
-    cached = _cache_get(cache_key)
-    if cached:
-        return jsonify({"success": True, "data": cached}), 200
-
     shortage = LaborMarketService.calculate_shortage_score(
         role=role,
         industry=industry,
         location=location,
     )
-    _cache_set(cache_key, shortage, ttl=60)
 
     return jsonify({"success": True, "data": shortage}), 200
 
@@ -169,8 +130,7 @@ def calculate_opportunity():
         200: Opportunity score with recommendations
         400: Missing required fields
     """
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = load_current_user()
 
     if not user:
         return (
@@ -212,10 +172,6 @@ def calculate_opportunity():
         target_industry=target_industry,
     )
 
-    # Increment usage counter
-    user.monthly_research_count += 1
-    db.session.commit()
-
     return jsonify({"success": True, "data": opportunity}), 200
 
 
@@ -300,8 +256,7 @@ def get_skills_map():
     """
     from app.models.labor_market import Skill
 
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = load_current_user()
 
     if not user:
         return (
@@ -348,37 +303,19 @@ def search_occupations():
     Returns:
         200: List of matching occupations with shortage preview
     """
-    from app.models.labor_market import Occupation
-
     query = request.args.get("q", "").strip()
     limit = min(int(request.args.get("limit", 10)), 50)
 
     if len(query) < 2:
         return jsonify({"success": True, "data": []}), 200
 
-    cache_key = f"onet:search:occ:{query.lower()}:{limit}"
-    cached = _cache_get(cache_key)
-    if cached:
-        return jsonify({"success": True, "data": cached}), 200
-
-    occupations = (
-        Occupation.query.filter(Occupation.title.ilike(f"%{query}%"))
-        .order_by(Occupation.bright_outlook.desc(), Occupation.title)
-        .limit(limit)
-        .all()
+    results = cache.get_or_compute(
+        "labor_market.occupations",
+        f"{query.lower()}:{limit}",
+        lambda: _search_occupations(query, limit),
+        timeout=300,
     )
 
-    results = []
-    for occ in occupations:
-        item = occ.to_dict()
-        # Add a quick shortage preview
-        shortage = LaborMarketService.calculate_shortage_score(occ.title)
-        item["shortage_score"] = shortage["total_score"]
-        item["demand_level"] = shortage["interpretation"]
-        results.append(item)
-
-    _cache_set(cache_key, results, ttl=300)
-
     return jsonify({"success": True, "data": results}), 200
 
 
@@ -396,8 +333,6 @@ def search_skills():
     Returns:
         200: List of matching skills grouped by category
     """
-    from app.models.labor_market import Skill
-
     query = request.args.get("q", "").strip()
     category = request.args.get("category")
     limit = min(int(request.args.get("limit", 20)), 50)
@@ -405,20 +340,15 @@ def search_skills():
     if len(query) < 2:
         return jsonify({"success": True, "data": []}), 200
 
-    cache_key = f"onet:search:skill:{query.lower()}:{category or 'all'}:{limit}"
-    cached = _cache_get(cache_key)
-    if cached:
-        return jsonify({"success": True, "data": cached}), 200
-
-    q = Skill.query.filter(Skill.name.ilike(f"%{query}%"))
-
-    if category and category in ("skills", "abilities", "knowledge"):
-        q = q.filter(Skill.category == category)
+    if category not in ("skills", "abilities", "knowledge"):
+        category = None
 
-    skills = q.order_by(Skill.category, Skill.name).limit(limit).all()
-
-    results = [s.to_dict() for s in skills]
-    _cache_set(cache_key, results, ttl=300)
+    results = cache.get_or_compute(
+        "labor_market.skills",
+        f"{query.lower()}:{category or 'all'}:{limit}",
+        lambda: _search_skills(query, category, limit),
+        timeout=300,
+    )
 
     return jsonify({"success": True, "data": results}), 200
 
@@ -437,8 +367,7 @@ def get_skills_gap():
     Returns:
         200: Skills gap breakdown by category (skills, abilities, knowledge)
     """
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = load_current_user()
 
     if not user:
         return (
@@ -486,8 +415,41 @@ def get_skills_gap():
             404,
         )
 
-    # Increment usage counter (skills_gap shares with research)
-    user.monthly_research_count += 1
-    db.session.commit()
-
     return jsonify({"success": True, "data": gap_analysis}), 200
+
+
+def _search_occupations(query: str, limit: int) -> list:
+    """Occupations matching a title fragment, with a shortage preview."""
+    from app.models.labor_market import Occupation
+
+    occupations = (
+        Occupation.query.filter(Occupation.title.ilike(f"%{query}%"))
+        .order_by(Occupation.bright_outlook.desc(), Occupation.title)
+        .limit(limit)
+        .all()
+    )
+
+    results = []
+    for occ in occupations:
+        item = occ.to_dict()
+        # Add a quick shortage preview
+        shortage = LaborMarketService.calculate_shortage_score(occ.title)
+        item["shortage_score"] = shortage["total_score"]
+        item["demand_level"] = shortage["interpretation"]
+        results.append(item)
+
+    return results
+
+
+def _search_skills(query: str, category, limit: int) -> list:
+    """Skills matching a name fragment, optionally within one category."""
+    from app.models.labor_market import Skill
+
+    q = Skill.query.filter(Skill.name.ilike(f"%{query}%"))
+
+    if category:
+        q = q.filter(Skill.category == category)
+
+    skills = q.order_by(Skill.category, Skill.name).limit(limit).all()
+
+    return [s.to_dict() for s in skills]
@@ -5,10 +5,10 @@ Provides LinkedIn profile optimization endpoints.
 """
 
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import get_jwt_identity, jwt_required
+from flask_jwt_extended import jwt_required
 
-from app.models.user import User
 from app.services.linkedin_service import LinkedInService
+from app.utils.decorators import load_current_user
 
 linkedin_bp = Blueprint("linkedin", __name__, url_prefix="/api/linkedin")
 
@@ -56,8 +56,7 @@ def generate_headline():
         200: Multiple headline options with scores
         400: Missing current_role
     """
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = load_current_user()
 
     data = request.get_json() or {}
 
@@ -122,8 +121,7 @@ def generate_summary():
         200: Generated summary with structure
         400: Missing required fields
     """
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = load_current_user()
 
     data = request.get_json() or {}
 
@@ -287,6 +285,60 @@ def calculate_visibility():
     return jsonify({"success": True, "data": visibility}), 200
 
 
+@linkedin_bp.route("/report", methods=["POST"])
+@jwt_required()
+def get_profile_report():
+    """
+    Profile analysis, visibility, keyword coverage and headline options in
+    one response, computed from a single read of the profile.
+
+    Request Body:
+        headline, summary, experience, skills, education, photo, location,
+        industry: Profile sections, as for /analyze (optional)
+        current_role: Current job title for headline options (optional)
+        target_role: Target job title (optional)
+        key_skills: List of skills to highlight in headlines (optional)
+        achievements: List of achievements to mention (optional)
+
+    Returns:
+        200: analysis, visibility, keywords and headlines (null when no
+             current role is given or on the user's profile)
+    """
+    user = load_current_user()
+
+    data = request.get_json() or {}
+    report_fields = ("current_role", "target_role", "key_skills", "achievements")
+    profile_data = {key: value for key, value in data.items() if key not in report_fields}
+
+    # Fall back to the user's profile, as /headline/generate does
+    current_role = data.get("current_role")
+    if not current_role and user:
+        current_role = user.current_role
+
+    target_role = data.get("target_role")
+    if not target_role and user and user.target_roles:
+        target_role = user.target_roles[0]
+
+    industry = data.get("industry")
+    if not industry and user and user.target_industries:
+        industry = user.target_industries[0]
+
+    key_skills = data.get("key_skills")
+    if not key_skills and not data.get("skills") and user:
+        key_skills = (user.technical_skills or [])[:3]
+
+    report = LinkedInService.build_report(
+        profile_data,
+        current_role=current_role,
+        target_role=target_role,
+        industry=industry,
+        key_skills=key_skills,
+        achievements=data.get("achievements", []),
+    )
+
+    return jsonify({"success": True, "data": report}), 200
+
+
 @linkedin_bp.route("/keywords/<industry>", methods=["GET"])
 @jwt_required()
 def get_industry_keywords(industry: str):
@@ -303,7 +355,7 @@ def get_industry_keywords(industry: str):
 
     if not keywords:
         # Return generic keywords if industry not found
-        keywords = ["professional", "experienced", "dedicated", "results-driven"]
+        keywords = LinkedInService.GENERIC_KEYWORDS
 
     return (
         jsonify(
@@ -312,12 +364,7 @@ def get_industry_keywords(industry: str):
                 "data": {
                     "industry": industry,
                     "keywords": keywords,
-                    "usage_tips": [
-                        "Include 3-5 keywords in your headline",
-                        "Weave keywords naturally into your summary",
-                        "Use keywords in experience descriptions",
-                        "Add relevant keywords as skills",
-                    ],
+                    "usage_tips": LinkedInService.KEYWORD_USAGE_TIPS,
                 },
             }
         ),
@@ -7,10 +7,9 @@ API endpoints for message management and quality scoring.
 from flask import Blueprint, current_app, jsonify, request
 from flask_jwt_extended import get_jwt_identity, jwt_required
 
-from app.extensions import db
-from app.models.user import User
 from app.services.message_service import MessageService
 from app.utils.decorators import feature_limit
+from app.utils.pagination import InvalidCursorError, parse_total_mode
 from app.utils.validators import validate_text_fields
 
 message_bp = Blueprint("message", __name__, url_prefix="/api/messages")
@@ -65,12 +64,6 @@ def create_message():
             ai_model_used=data.get("ai_model_used"),
         )
 
-        # Increment usage counter
-        current_user = User.query.get(user_id)
-        if current_user:
-            current_user.monthly_message_count += 1
-            db.session.commit()
-
         return (
             jsonify(
                 {
@@ -108,6 +101,9 @@ def get_messages():
         message_type: Filter by message type
         limit: Maximum results (default: 50)
         offset: Pagination offset (default: 0)
+        cursor: Use keyset pagination; empty for the first page, then the
+            previous response's next_cursor (offset is ignored)
+        total: With cursor, include a total: none (default), approximate, exact
 
     Returns:
         JSON with messages array and pagination info
@@ -118,6 +114,22 @@ def get_messages():
     status = request.args.get("status")
     message_type = request.args.get("message_type")
     limit = min(int(request.args.get("limit", 50)), 100)
+
+    if "cursor" in request.args:
+        try:
+            page = MessageService.get_user_messages_page(
+                user_id=user_id,
+                recruiter_id=recruiter_id,
+                status=status,
+                message_type=message_type,
+                limit=limit,
+                cursor=request.args.get("cursor") or None,
+                total=parse_total_mode(request.args.get("total")),
+            )
+        except InvalidCursorError as e:
+            return jsonify({"success": False, "data": {"error": str(e)}}), 400
+        return jsonify({"success": True, "data": page.to_dict("messages", limit)}), 200
+
     offset = int(request.args.get("offset", 0))
 
     messages, total = MessageService.get_user_messages(
@@ -197,6 +209,58 @@ def validate_message():
     return jsonify({"success": True, "data": result}), 200
 
 
+@message_bp.route("/score-batch", methods=["POST"])
+@jwt_required()
+def score_batch():
+    """
+    Score several unsaved drafts in one request.
+
+    Request body:
+        messages: Required - List of up to 100 drafts, each with
+            body: Required - Draft text
+            message_type: Type of message (default: initial_outreach)
+            recruiter_id: Recruiter whose name and company count as personalization
+            id: Optional client key, echoed back with the draft's score
+
+    Returns:
+        JSON with a quality analysis per draft, in request order
+    """
+    user_id = get_jwt_identity()
+    data = request.get_json() or {}
+    drafts = data.get("messages")
+
+    try:
+        results = MessageService.score_drafts(user_id, drafts)
+    except ValueError as e:
+        return jsonify({"success": False, "data": {"error": str(e)}}), 400
+
+    return (
+        jsonify(
+            {
+                "success": True,
+                "data": {
+                    "results": [
+                        {
+                            "id": draft.get("id"),
+                            "score": result["total_score"],
+                            "components": result["components"],
+                            "feedback": result["feedback"],
+                            "suggestions": result["suggestions"],
+                            "word_count": result["word_count"],
+                            "is_within_word_limit": result["word_count"] <= 150,
+                            "has_personalization": result["has_personalization"],
+                            "has_metrics": result["has_metrics"],
+                            "has_cta": result["has_cta"],
+                        }
+                        for draft, result in zip(drafts, results)
+                    ]
+                },
+            }
+        ),
+        200,
+    )
+
+
 @message_bp.route("/context", methods=["POST"])
 @jwt_required()
 def get_generation_context():
@@ -5,10 +5,11 @@ Provides notification management endpoints including listing, marking as read,
 and generating follow-up reminders.
 """
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, current_app, jsonify, request
 from flask_jwt_extended import get_jwt_identity, jwt_required
 
 from app.services.notification_service import NotificationService
+from app.utils.pagination import InvalidCursorError, parse_total_mode
 
 notification_bp = Blueprint("notification", __name__, url_prefix="/api/notifications")
 
@@ -23,15 +24,33 @@ def get_notifications():
         limit (int): Max notifications to return (default 20)
         offset (int): Pagination offset (default 0)
         unread_only (bool): If true, only return unread (default false)
+        cursor (str): Use keyset pagination; empty for the first page, then the
+            previous response's next_cursor (offset is ignored)
+        total (str): With cursor, include a total: none (default), approximate, exact
 
     Returns:
         200: List of notifications with pagination info
+        400: Invalid cursor
     """
     user_id = get_jwt_identity()
     limit = min(int(request.args.get("limit", 20)), 50)
-    offset = int(request.args.get("offset", 0))
     unread_only = request.args.get("unread_only", "false").lower() == "true"
 
+    if "cursor" in request.args:
+        try:
+            page = NotificationService.get_notifications_page(
+                user_id,
+                limit=limit,
+                cursor=request.args.get("cursor") or None,
+                unread_only=unread_only,
+                total=parse_total_mode(request.args.get("total")),
+            )
+        except InvalidCursorError as e:
+            return jsonify({"success": False, "data": {"error": str(e)}}), 400
+        return jsonify({"success": True, "data": page.to_dict("notifications", limit)}), 200
+
+    offset = int(request.args.get("offset", 0))
+
     notifications, total = NotificationService.get_notifications(
         user_id, limit=limit, offset=offset, unread_only=unread_only
     )
@@ -59,13 +78,27 @@ def get_unread_count():
     """
     Get count of unread notifications.
 
+    Query Parameters:
+        wait (int): Long-poll: hold the request up to this many seconds
+            (capped at NOTIFICATION_LONG_POLL_SECONDS) until the count differs
+            from known
+        known (int): Count the client already shows
+
     Returns:
-        200: Unread notification count
+        200: Unread notification count, and long_poll: the longest wait the
+            server allows (0 when clients should poll instead)
     """
     user_id = get_jwt_identity()
-    count = NotificationService.get_unread_count(user_id)
+    long_poll = current_app.config.get("NOTIFICATION_LONG_POLL_SECONDS", 0)
+    wait = min(request.args.get("wait", 0, type=float), long_poll)
+    known = request.args.get("known", type=int)
+
+    if wait > 0 and known is not None:
+        count = NotificationService.wait_for_unread_count(user_id, known, wait)
+    else:
+        count = NotificationService.get_unread_count(user_id)
 
-    return jsonify({"success": True, "data": {"count": count}}), 200
+    return jsonify({"success": True, "data": {"count": count, "long_poll": long_poll}}), 200
 
 
 @notification_bp.route("/<notification_id>/read", methods=["PUT"])
@@ -129,25 +162,24 @@ def generate_notifications():
     """
     Generate notifications (follow-up reminders and usage warnings).
 
-    This endpoint is called on dashboard load or periodically to create
-    new notifications based on user activity.
+    The generate_notifications task sweeps every user hourly; this endpoint
+    catches one user up on demand.
 
     Returns:
         200: Count of new notifications generated
     """
     user_id = get_jwt_identity()
 
-    follow_ups = NotificationService.generate_follow_up_reminders(user_id)
-    usage_warnings = NotificationService.generate_usage_warnings(user_id)
+    result = NotificationService.generate_notifications(user_id)
 
     return (
         jsonify(
             {
                 "success": True,
                 "data": {
-                    "follow_up_reminders": follow_ups,
-                    "usage_warnings": usage_warnings,
-                    "total_generated": follow_ups + usage_warnings,
+                    "follow_up_reminders": result["follow_up_reminders"],
+                    "usage_warnings": result["usage_warnings"],
+                    "total_generated": result["total_generated"],
                 },
             }
         ),
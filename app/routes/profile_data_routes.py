@@ -4,7 +4,7 @@ User data rights routes - account deletion + DSAR data export.
 Endpoints:
     DELETE /api/profile/account                - Request account deletion
     POST  /api/profile/account/cancel-deletion - Cancel pending deletion
-    POST  /api/profile/export                  - Request data export
+    POST  /api/profile/export                  - Request data export (built in the background)
     GET   /api/profile/export/status           - Check export status
     GET   /api/profile/export/download/<token> - Download export ZIP (token-based)
 
@@ -13,20 +13,26 @@ Register:
     app.register_blueprint(profile_data_bp)
 """
 
-from flask import Blueprint, jsonify, request, send_file
+import os
+
+from flask import Blueprint, current_app, jsonify, request, send_file
 from flask_jwt_extended import get_jwt_identity, jwt_required
 
-from app.models.user import User
 from app.services.account_service import (
     cancel_account_deletion,
     create_data_export,
     get_export_download,
     get_export_status,
     request_account_deletion,
+    run_data_export,
 )
+from app.tasks import build_data_export, enqueue
+from app.utils.decorators import load_current_user
 
 profile_data_bp = Blueprint("profile_data", __name__, url_prefix="/api/profile")
 
+EXPORT_DOWNLOAD_NAME = "jobezie_data_export.zip"
+
 
 # ───────────────────────────────────────────
 # Account Deletion
@@ -47,8 +53,7 @@ def delete_account():
     - Data retained for 30 days (can cancel)
     - After 30 days, hard-delete cascade runs
     """
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = load_current_user()
     if not user:
         return jsonify({"error": "Authentication required"}), 401
 
@@ -93,16 +98,23 @@ def request_export():
     """
     Request a full data export (DSAR compliance).
 
-    Generates a ZIP containing: profile, recruiters, messages,
+    Queues a ZIP containing: profile, recruiters, messages,
     activities, resumes, scores, coach history, subscriptions.
 
-    Returns a download_token valid for 7 days.
+    Returns 202 with the export status; poll /export/status for progress.
+    Once completed it includes a download_token valid for 7 days, which is
+    also emailed to the user.
     """
     user_id = get_jwt_identity()
 
     result = create_data_export(user_id)
-    status_code = result.pop("status_code", 200)
-    return jsonify(result), status_code
+    if "error" in result:
+        status_code = result.pop("status_code", 400)
+        return jsonify(result), status_code
+
+    enqueue(build_data_export, result["id"], inline=run_data_export)
+
+    return jsonify({"message": "Data export started", **get_export_status(user_id)}), 202
 
 
 @profile_data_bp.route("/export/status", methods=["GET"])
@@ -122,6 +134,12 @@ def download_export(token):
 
     No JWT required - uses secure one-time token from email.
     Token expires after 7 days.
+
+    The archive's SHA-256 is its ETag, so If-None-Match, Range and If-Range
+    requests get 304 and 206 responses and interrupted downloads can be
+    resumed. With EXPORT_ACCEL_REDIRECT_PREFIX set, the file itself is sent
+    by nginx, which then answers ranges and validators on its own, and the
+    worker only returns headers.
     """
     if not token or len(token) < 16:
         return jsonify({"error": "Invalid download token"}), 400
@@ -132,9 +150,24 @@ def download_export(token):
         status_code = result.pop("status_code", 404)
         return jsonify(result), status_code
 
-    return send_file(
-        result["file_path"],
-        mimetype="application/zip",
-        as_attachment=True,
-        download_name="jobezie_data_export.zip",
-    )
+    accel_prefix = current_app.config.get("EXPORT_ACCEL_REDIRECT_PREFIX")
+    if accel_prefix:
+        response = current_app.response_class(mimetype="application/zip")
+        response.headers["X-Accel-Redirect"] = (
+            accel_prefix.rstrip("/") + "/" + os.path.basename(result["file_path"])
+        )
+        response.headers.set("Content-Disposition", "attachment", filename=EXPORT_DOWNLOAD_NAME)
+    else:
+        response = send_file(
+            result["file_path"],
+            mimetype="application/zip",
+            as_attachment=True,
+            download_name=EXPORT_DOWNLOAD_NAME,
+            conditional=True,
+            etag=result["sha256"],
+            last_modified=result["completed_at"],
+        )
+
+    # Personal data: browsers may revalidate but shared caches must not keep it
+    response.cache_control.private = True
+    return response
@@ -9,11 +9,11 @@ from datetime import datetime
 from flask import Blueprint, current_app, jsonify, request
 from flask_jwt_extended import get_jwt_identity, jwt_required
 
-from app.extensions import db
 from app.models.activity import PipelineStage
-from app.models.user import User
+from app.services.recruiter_import import ImportLimitError, RecruiterImportService
 from app.services.recruiter_service import RecruiterService
-from app.utils.decorators import feature_limit
+from app.utils.decorators import feature_limit, load_current_user
+from app.utils.pagination import InvalidCursorError, parse_total_mode
 from app.utils.validators import validate_text_fields
 
 recruiter_bp = Blueprint("recruiter", __name__, url_prefix="/api/recruiters")
@@ -48,20 +48,7 @@ def create_recruiter():
     data = request.get_json() or {}
 
     # Validate and sanitize text fields
-    schema = {
-        "first_name": {"required": True, "max_length": 100},
-        "last_name": {"required": True, "max_length": 100},
-        "email": {"required": False, "max_length": 254},
-        "company": {"required": False, "max_length": 200},
-        "title": {"required": False, "max_length": 200},
-        "linkedin_url": {"required": False, "max_length": 500},
-        "phone": {"required": False, "max_length": 30},
-        "specialty": {"required": False, "max_length": 200},
-        "company_type": {"required": False, "max_length": 50},
-        "source": {"required": False, "max_length": 200},
-        "notes": {"required": False, "max_length": 5000},
-    }
-    validated, errors = validate_text_fields(data, schema)
+    validated, errors = validate_text_fields(data, RecruiterService.FIELD_SCHEMA)
     if errors:
         return jsonify({"success": False, "data": {"errors": errors}}), 400
 
@@ -83,12 +70,6 @@ def create_recruiter():
             notes=validated.get("notes"),
         )
 
-        # Increment usage counter
-        current_user = User.query.get(user_id)
-        if current_user:
-            current_user.monthly_recruiter_count += 1
-            db.session.commit()
-
         return (
             jsonify(
                 {
@@ -107,6 +88,63 @@ def create_recruiter():
         return jsonify({"success": False, "data": {"error": "Failed to create recruiter"}}), 500
 
 
+@recruiter_bp.route("/import", methods=["POST"])
+@jwt_required()
+def import_recruiters():
+    """
+    Bulk-import recruiters from a CSV file.
+
+    Accepts our CSV template or a LinkedIn Connections.csv export. Rows are
+    validated like single creates; rows whose email or LinkedIn URL is
+    already in the CRM (or earlier in the file) are skipped as duplicates.
+    The import counts against the recruiter limit as one use per imported row.
+
+    Request (multipart/form-data):
+        file: CSV file (a text/csv request body is also accepted)
+        source: Source recorded on rows without one (default: csv_import)
+
+    Returns:
+        JSON with imported, duplicate and invalid counts and row errors
+    """
+    user = load_current_user()
+    if not user:
+        return jsonify({"success": False, "data": {"error": "User not found"}}), 404
+
+    upload = request.files.get("file")
+    if upload is not None:
+        stream = upload.stream
+    elif request.mimetype == "text/csv":
+        stream = request.stream
+    else:
+        return jsonify({"success": False, "data": {"error": "No CSV file provided"}}), 400
+
+    source = (request.form.get("source") or "csv_import")[:200]
+
+    try:
+        result = RecruiterImportService.import_csv(user, stream, source=source)
+    except ImportLimitError as e:
+        return (
+            jsonify(
+                {
+                    "success": False,
+                    "error": "limit_exceeded",
+                    "message": str(e),
+                    "limit": e.limit,
+                    "current_tier": user.subscription_tier,
+                    "upgrade_url": "/api/subscriptions/checkout",
+                }
+            ),
+            429,
+        )
+    except ValueError as e:
+        return jsonify({"success": False, "data": {"error": str(e)}}), 400
+    except Exception as e:
+        current_app.logger.error(f"Recruiter import error: {str(e)}")
+        return jsonify({"success": False, "data": {"error": "Failed to import recruiters"}}), 500
+
+    return jsonify({"success": True, "data": result}), 201 if result["imported"] else 200
+
+
 @recruiter_bp.route("", methods=["GET"])
 @jwt_required()
 def get_recruiters():
@@ -120,6 +158,9 @@ def get_recruiters():
         sort_by: Sort field (priority, name, company, last_contact, engagement, fit)
         limit: Maximum results (default: 50)
         offset: Pagination offset (default: 0)
+        cursor: Use keyset pagination; empty for the first page, then the
+            previous response's next_cursor (offset is ignored)
+        total: With cursor, include a total: none (default), approximate, exact
 
     Returns:
         JSON with recruiters array and pagination info
@@ -131,6 +172,21 @@ def get_recruiters():
     location = request.args.get("location")
     sort_by = request.args.get("sort_by", "priority")
     limit = min(int(request.args.get("limit", 50)), 100)
+
+    if "cursor" in request.args:
+        try:
+            page = RecruiterService.get_user_recruiters_page(
+                user_id=user_id,
+                status=status,
+                sort_by=sort_by,
+                limit=limit,
+                cursor=request.args.get("cursor") or None,
+                total=parse_total_mode(request.args.get("total")),
+            )
+        except InvalidCursorError as e:
+            return jsonify({"success": False, "data": {"error": str(e)}}), 400
+        return jsonify({"success": True, "data": page.to_dict("recruiters", limit)}), 200
+
     offset = int(request.args.get("offset", 0))
 
     recruiters, total = RecruiterService.get_user_recruiters(
@@ -7,8 +7,6 @@ API endpoints for resume management and ATS scoring.
 from flask import Blueprint, current_app, jsonify, request
 from flask_jwt_extended import get_jwt_identity, jwt_required
 
-from app.extensions import db
-from app.models.user import User
 from app.services.resume_service import ResumeService
 from app.utils.decorators import feature_limit
 
@@ -288,12 +286,6 @@ def create_tailored_version(resume_id):
             optimized_text=optimized_text,
         )
 
-        # Increment usage counter
-        current_user = User.query.get(user_id)
-        if current_user:
-            current_user.monthly_tailoring_count += 1
-            db.session.commit()
-
         return (
             jsonify(
                 {
@@ -7,10 +7,10 @@ Handles subscription management endpoints.
 import os
 
 from flask import Blueprint, jsonify, request
-from flask_jwt_extended import get_jwt_identity, jwt_required
+from flask_jwt_extended import jwt_required
 
-from app.models.user import User
 from app.services.stripe_service import StripeService
+from app.utils.decorators import load_current_user
 
 subscription_bp = Blueprint("subscription", __name__, url_prefix="/api/subscription")
 
@@ -38,8 +38,7 @@ def get_status():
         200: Current subscription status
         404: User not found
     """
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = load_current_user()
 
     if not user:
         return (
@@ -68,8 +67,7 @@ def create_checkout():
         400: Missing tier or invalid tier
         404: User not found
     """
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = load_current_user()
 
     if not user:
         return (
@@ -143,8 +141,7 @@ def create_portal():
         400: No Stripe customer
         404: User not found
     """
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = load_current_user()
 
     if not user:
         return (
@@ -195,8 +192,7 @@ def cancel_subscription():
         400: No active subscription
         404: User not found
     """
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = load_current_user()
 
     if not user:
         return (
@@ -243,8 +239,7 @@ def reactivate_subscription():
         400: No subscription to reactivate
         404: User not found
     """
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = load_current_user()
 
     if not user:
         return (
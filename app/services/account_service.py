@@ -7,19 +7,30 @@ Handles:
   - DSAR data export to downloadable ZIP
   - Email notifications for each stage
 
-Design: Synchronous now. When Celery arrives (Phase 2), wrap
-create_data_export() and process_expired_deletions() in @celery.task.
-The logic stays identical - only the invocation changes.
+Design: Hard deletes run per user in primary-key batches with a resumable
+AccountDeletionJob, queued one task per user by the daily
+process_expired_deletions task. Data exports are recorded by
+create_data_export() and built by run_data_export() in the
+build_data_export Celery task, which streams each table into the ZIP a
+batch at a time so memory stays flat however much history a user has.
+Finished archives are hashed so downloads can be validated and resumed.
 """
 
+import hashlib
+import io
 import json
 import logging
 import os
 import uuid
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+from sqlalchemy import and_, inspect, or_, select, update
+from sqlalchemy.exc import IntegrityError
+
 from app.extensions import db
+from app.models.account_deletion_job import AccountDeletionJob
 from app.models.data_export_request import DataExportRequest
 from app.models.user import User
 
@@ -36,6 +47,66 @@ RESUME_DIR = os.environ.get("RESUME_DIR", "data/resumes/uploads")
 
 os.makedirs(EXPORT_DIR, exist_ok=True)
 
+# Rows removed per DELETE during a hard delete; each batch is its own
+# short transaction
+DELETE_BATCH_SIZE = 5000
+
+# Threads removing a user's resume and export files
+FILE_DELETE_WORKERS = 8
+
+# A deletion still running with no progress saved for this long has lost
+# its worker and is picked up again
+DELETION_STALE_AFTER = timedelta(minutes=30)
+
+# An export still pending or processing this long after it was requested
+# has lost its worker; it is marked failed so the user can request again
+EXPORT_STALE_AFTER = timedelta(hours=6)
+
+# Failed deletions are retried by later runs up to this many attempts
+MAX_DELETION_ATTEMPTS = 5
+
+# Tables holding user data, children before parents:
+# (table, condition selecting the user's rows, self-referencing column)
+DELETION_TABLES = [
+    ("activity_daily_summaries", "user_id = :uid", None),
+    ("user_milestones", "user_id = :uid", None),
+    ("user_streaks", "user_id = :uid", None),
+    ("data_export_requests", "user_id = :uid", None),
+    ("coach_conversations", "user_id = :uid", None),
+    ("activities", "user_id = :uid", None),
+    ("pipeline_items", "user_id = :uid", None),
+    ("recruiter_notes", "recruiter_id IN (SELECT id FROM recruiters WHERE user_id = :uid)", None),
+    ("messages", "user_id = :uid", "parent_message_id"),
+    ("resume_versions", "resume_id IN (SELECT id FROM resumes WHERE user_id = :uid)", None),
+    ("resumes", "user_id = :uid", "source_resume_id"),
+    ("recruiters", "user_id = :uid", None),
+    ("subscriptions", "user_id = :uid", None),
+    ("notifications", "user_id = :uid", None),
+]
+
+# Batch key of tables without an id column (default: id)
+DELETION_BATCH_KEYS = {"activity_daily_summaries": "day"}
+
+# Bytes read per chunk while hashing a finished archive
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Rows fetched per round trip while exporting, and between progress updates
+EXPORT_BATCH_SIZE = 1000
+
+# Tables streamed into the export as JSON arrays: (archive name, table)
+EXPORT_TABLES = [
+    ("recruiters.json", "recruiters"),
+    ("messages.json", "messages"),
+    ("activities.json", "activities"),
+    ("resumes/resume_metadata.json", "resumes"),
+    ("coach_history.json", "coach_conversations"),
+    ("subscriptions.json", "subscriptions"),
+    ("activity_daily_summaries.json", "activity_daily_summaries"),
+]
+# Row order of exported tables without an id column (default: id)
+EXPORT_ORDER_BY = {"activity_daily_summaries": "day, activity_type"}
+ENGAGEMENT_TABLES = [("streaks", "user_streaks"), ("milestones", "user_milestones")]
+
 
 # ───────────────────────────────────────────
 # ACCOUNT DELETION
@@ -103,107 +174,128 @@ def hard_delete_user(user_id) -> dict:
     Permanently delete ALL user data from PostgreSQL + files.
 
     Deletion order (children before parent):
-      1. Resume files on disk (or S3)
-      2. Export ZIP files on disk (or S3)
-      3. Child table records (explicit SQL for safety)
-      4. User record itself
+      1. Resume and export files on disk (or S3), removed in parallel
+      2. Child table records, in primary-key batches (DELETION_TABLES)
+      3. User record itself
+
+    Every batch commits together with the user's AccountDeletionJob, so no
+    transaction holds locks on more than DELETE_BATCH_SIZE rows, and a
+    deletion that is interrupted carries on from what is left when it is
+    run again.
 
     Called by:
-      - Scheduled task after grace period expires
+      - delete_expired_account task after grace period expires
       - Admin action (immediate)
     """
     user = User.query.get(user_id)
     if not user:
         return {"error": "User not found", "status_code": 404}
 
+    job = _claim_deletion_job(user.id)
+    if not job:
+        return {"error": "Deletion already in progress", "status_code": 409}
+
     user_email = user.email
     warnings = []
 
-    # -- Step 1: Delete resume files --
     try:
-        _delete_user_resume_files(user_id)
-    except Exception as e:
-        logger.warning(f"Resume file cleanup for user {user_id}: {e}")
-        warnings.append(f"Resume file cleanup: {str(e)}")
+        # Some tables only exist once their feature ships
+        inspector = inspect(db.engine)
+        tables = [spec for spec in DELETION_TABLES if inspector.has_table(spec[0])]
+
+        # -- Step 1: Delete resume and export files --
+        removed, errors = _remove_files(_user_file_paths(user.id, {spec[0] for spec in tables}))
+        for error in errors:
+            logger.warning(f"File cleanup for user {user_id}: {error}")
+            warnings.append(f"File cleanup: {error}")
+        job.files_deleted += removed
+        db.session.commit()
 
-    # -- Step 2: Delete export ZIP files --
-    try:
-        _delete_user_export_files(user_id)
-    except Exception as e:
-        logger.warning(f"Export file cleanup for user {user_id}: {e}")
-        warnings.append(f"Export file cleanup: {str(e)}")
-
-    # -- Step 3: Delete child table records --
-    child_tables = [
-        "user_milestones",
-        "user_streaks",
-        "data_export_requests",
-        "coach_conversations",
-        "activities",
-        "messages",
-        "resumes",
-        "recruiters",
-        "subscriptions",
-        "notifications",
-    ]
+        # -- Step 2: Delete child table records --
+        for table, owned, self_ref in tables:
+            _delete_in_batches(job, table, owned, self_ref)
 
-    for table in child_tables:
-        try:
-            db.session.execute(
-                db.text(f"DELETE FROM {table} WHERE user_id = :uid"),
-                {"uid": str(user_id)},
-            )
-        except Exception as e:
-            err_str = str(e).lower()
-            if "does not exist" in err_str or "relation" in err_str:
-                pass  # Table not created yet
-            else:
-                db.session.rollback()
-                logger.warning(f"Delete from {table} for user {user_id}: {e}")
-                warnings.append(f"{table}: {str(e)[:100]}")
-
-    # -- Step 4: Delete user record --
-    try:
+        # -- Step 3: Delete user record --
         db.session.delete(user)
+        job.status = "completed"
+        job.current_table = None
+        job.completed_at = datetime.utcnow()
         db.session.commit()
+
     except Exception as e:
         db.session.rollback()
         logger.error(f"Failed to delete user {user_id}: {e}")
+        job.status = "failed"
+        job.error_message = str(e)[:500]
+        db.session.commit()
         return {
-            "error": "Failed to delete user record",
+            "error": "Failed to delete user data",
             "details": str(e),
             "status_code": 500,
         }
 
-    # -- Step 5: Final confirmation email --
+    # -- Step 4: Final confirmation email --
     _send_deletion_complete_email(user_email)
 
-    result = {"message": "Account permanently deleted"}
+    result = {
+        "message": "Account permanently deleted",
+        "rows_deleted": job.rows_deleted,
+        "files_deleted": job.files_deleted,
+    }
     if warnings:
         result["warnings"] = warnings
     return result
 
 
+def find_expired_deletions() -> list:
+    """
+    Ids of users whose grace period has ended and whose deletion should run.
+
+    Deletions that failed (fewer than MAX_DELETION_ATTEMPTS times) or whose
+    worker stopped saving progress are included, so they resume; ones
+    running now are not.
+    """
+    now = datetime.utcnow()
+    unavailable = select(AccountDeletionJob.user_id).where(
+        or_(
+            and_(
+                AccountDeletionJob.status == "deleting",
+                AccountDeletionJob.updated_at >= now - DELETION_STALE_AFTER,
+            ),
+            and_(
+                AccountDeletionJob.status == "failed",
+                AccountDeletionJob.attempts >= MAX_DELETION_ATTEMPTS,
+            ),
+        )
+    )
+    expired = (
+        select(User.id)
+        .where(
+            User.deletion_scheduled_for <= now,
+            User.deletion_requested_at.isnot(None),
+            User.is_deleted == False,  # noqa: E712
+            User.id.not_in(unavailable),
+        )
+        .order_by(User.id)
+    )
+    return [str(user_id) for user_id in db.session.execute(expired).scalars()]
+
+
 def process_expired_deletions():
     """
-    Batch job: hard-delete all accounts past their grace period.
+    Batch job: hard-delete all accounts past their grace period, one by one.
+
+    The process_expired_deletions Celery task (daily at 2 AM UTC) queues a
+    delete_expired_account task per user instead, so the worker pool
+    deletes several accounts at once.
 
     Call this from:
-      - Celery beat (Phase 2): daily at 2 AM UTC
       - Admin manual trigger: POST /api/admin/data/process-deletions
       - CLI: flask process-deletions
     """
-    now = datetime.utcnow()
-    expired_users = User.query.filter(
-        User.deletion_scheduled_for <= now,
-        User.deletion_requested_at.isnot(None),
-        User.is_deleted == False,  # noqa: E712
-    ).all()
-
-    results = []
-    for user in expired_users:
-        result = hard_delete_user(user.id)
-        results.append({"user_id": str(user.id), **result})
+    results = [
+        {"user_id": user_id, **hard_delete_user(user_id)} for user_id in find_expired_deletions()
+    ]
 
     return {
         "processed": len(results),
@@ -218,80 +310,109 @@ def process_expired_deletions():
 
 def create_data_export(user_id) -> dict:
     """
-    Generate a ZIP containing all user data.
-
-    Contents:
-      profile.json, recruiters.json, messages.json, activities.json,
-      resumes/ (metadata + files), scores.json, coach_history.json,
-      subscriptions.json, engagement.json, metadata.json
+    Record a request for a ZIP containing all user data.
 
-    Returns dict with download_token on success.
+    The archive is built by run_data_export(), queued as the
+    build_data_export task. Returns the new request's id on success.
     """
     user = User.query.get(user_id)
     if not user:
         return {"error": "User not found", "status_code": 404}
 
-    # Throttle: one active export at a time
-    active = DataExportRequest.query.filter_by(user_id=user_id, status="processing").first()
-    if active:
+    # Throttle: one active export at a time. Requests that never finished
+    # lost their worker and no longer count.
+    now = datetime.utcnow()
+    active = DataExportRequest.query.filter(
+        DataExportRequest.user_id == user_id,
+        DataExportRequest.status.in_(("pending", "processing")),
+    ).all()
+    for stale in active:
+        if stale.created_at < now - EXPORT_STALE_AFTER:
+            stale.status = "failed"
+            stale.error_message = "Export did not finish in time"
+    if any(export_req.status != "failed" for export_req in active):
         return {"error": "An export is already in progress", "status_code": 409}
 
     # Create tracking record
-    download_token = uuid.uuid4().hex
     export_req = DataExportRequest(
         user_id=user_id,
-        status="processing",
-        download_token=download_token,
-        expires_at=datetime.utcnow() + timedelta(days=EXPORT_EXPIRY_DAYS),
+        status="pending",
+        download_token=uuid.uuid4().hex,
+        expires_at=now + timedelta(days=EXPORT_EXPIRY_DAYS),
     )
     db.session.add(export_req)
     db.session.commit()
 
-    try:
-        zip_name = f'jobezie_export_{user_id}_{datetime.utcnow().strftime("%Y%m%d_%H%M%S")}.zip'
-        zip_path = os.path.join(EXPORT_DIR, zip_name)
+    return {"id": export_req.id}
 
-        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
-            # Profile
-            profile = _export_profile(user)
-            zf.writestr("profile.json", _to_json(profile))
 
-            # Recruiters
-            recruiters = _query_table("recruiters", user_id)
-            zf.writestr("recruiters.json", _to_json(recruiters))
+def run_data_export(export_id) -> dict:
+    """
+    Build the ZIP for an export request.
+
+    Contents:
+      profile.json, recruiters.json, messages.json, activities.json,
+      resumes/ (metadata + files), scores.json, coach_history.json,
+      subscriptions.json, activity_daily_summaries.json, engagement.json,
+      metadata.json
+
+    Tables are read through a separate streaming connection and written to
+    their ZIP entries a batch at a time, never held in memory whole. Progress
+    (current_section, records_exported of records_total) is committed to the
+    request after every batch.
+    """
+    export_req = db.session.get(DataExportRequest, export_id)
+    if not export_req or export_req.status not in ("pending", "processing"):
+        return {"error": "Export request not found or already finished", "status_code": 404}
 
-            # Messages
-            messages = _query_table("messages", user_id)
-            zf.writestr("messages.json", _to_json(messages))
+    user_id = export_req.user_id
+    user = User.query.get(user_id)
+    zip_name = f'jobezie_export_{user_id}_{datetime.utcnow().strftime("%Y%m%d_%H%M%S")}.zip'
+    zip_path = os.path.join(EXPORT_DIR, zip_name)
 
-            # Activities
-            activities = _query_table("activities", user_id)
-            zf.writestr("activities.json", _to_json(activities))
+    try:
+        # Some tables only exist once their feature ships
+        inspector = inspect(db.engine)
+        tables = [
+            table for _, table in EXPORT_TABLES + ENGAGEMENT_TABLES if inspector.has_table(table)
+        ]
+
+        with db.engine.connect() as reader, zipfile.ZipFile(
+            zip_path, "w", zipfile.ZIP_DEFLATED
+        ) as zf:
+            export_req.status = "processing"
+            export_req.records_exported = 0
+            export_req.records_total = _count_records(reader, tables, user_id)
+            db.session.commit()
+
+            def rows(table):
+                if table not in tables:
+                    return iter(())
+                return _stream_rows(reader, table, user_id, export_req)
 
-            # Resume files + metadata
-            resumes = _query_table("resumes", user_id)
-            zf.writestr("resumes/resume_metadata.json", _to_json(resumes))
-            _add_resume_files_to_zip(user_id, zf)
+            # Profile
+            zf.writestr("profile.json", _to_json(_export_profile(user)))
 
-            # Score history (from resume records)
-            scores = _export_scores(user_id)
-            zf.writestr("scores.json", _to_json(scores))
+            # Recruiters, messages, activities, resume metadata, coach
+            # conversations, subscriptions and activity summaries
+            counts = {}
+            for archive_name, table in EXPORT_TABLES:
+                with _open_entry(zf, archive_name) as out:
+                    counts[table] = _write_array(out, rows(table))
 
-            # Coach conversations
-            coach = _query_table("coach_conversations", user_id)
-            zf.writestr("coach_history.json", _to_json(coach))
+                # Resume files alongside their metadata
+                if table == "resumes":
+                    _add_resume_files_to_zip(user_id, zf)
 
-            # Subscriptions
-            subs = _query_table("subscriptions", user_id)
-            zf.writestr("subscriptions.json", _to_json(subs))
+            # Score history (from resume records)
+            zf.writestr("scores.json", _to_json(_export_scores(user_id)))
 
             # Streaks + milestones
-            streaks = _query_table("user_streaks", user_id)
-            milestones = _query_table("user_milestones", user_id)
-            zf.writestr(
-                "engagement.json",
-                _to_json({"streaks": streaks, "milestones": milestones}),
-            )
+            with _open_entry(zf, "engagement.json") as out:
+                for i, (key, table) in enumerate(ENGAGEMENT_TABLES):
+                    out.write((",\n" if i else "{\n") + f'  "{key}": ')
+                    counts[table] = _write_array(out, rows(table), level=1)
+                out.write("\n}")
 
             # Export metadata
             metadata = {
@@ -307,15 +428,16 @@ def create_data_export(user_id) -> dict:
                     "scores",
                     "coach_history",
                     "subscriptions",
+                    "activity_summaries",
                     "streaks",
                     "milestones",
                 ],
                 "record_counts": {
-                    "recruiters": len(recruiters),
-                    "messages": len(messages),
-                    "activities": len(activities),
-                    "resumes": len(resumes),
-                    "coach_messages": len(coach),
+                    "recruiters": counts["recruiters"],
+                    "messages": counts["messages"],
+                    "activities": counts["activities"],
+                    "resumes": counts["resumes"],
+                    "coach_messages": counts["coach_conversations"],
                 },
                 "expires_at": export_req.expires_at.isoformat(),
                 "note": "AI provider (Anthropic/OpenAI) conversation logs are not retained by Jobezie.",
@@ -325,22 +447,27 @@ def create_data_export(user_id) -> dict:
         # Finalize record
         file_size = os.path.getsize(zip_path)
         export_req.status = "completed"
+        export_req.current_section = None
         export_req.file_path = zip_path
         export_req.file_size_bytes = file_size
+        export_req.file_sha256 = _file_sha256(zip_path)
         export_req.completed_at = datetime.utcnow()
         db.session.commit()
 
-        _send_export_ready_email(user, download_token)
+        _send_export_ready_email(user, export_req.download_token)
 
         return {
             "message": "Data export ready for download",
-            "download_token": download_token,
+            "download_token": export_req.download_token,
             "expires_at": export_req.expires_at.isoformat(),
             "file_size_bytes": file_size,
         }
 
     except Exception as e:
         logger.error(f"Data export failed for user {user_id}: {e}")
+        db.session.rollback()
+        if os.path.exists(zip_path):
+            os.remove(zip_path)
         export_req.status = "failed"
         export_req.error_message = str(e)[:500]
         db.session.commit()
@@ -363,7 +490,8 @@ def get_export_status(user_id) -> dict:
 
 def get_export_download(download_token: str) -> dict:
     """
-    Validate a download token and return the file path.
+    Validate a download token and return the file path, with the archive's
+    SHA-256 and completion time for conditional and range requests.
     Token-based auth - no JWT needed (link from email).
     """
     export = DataExportRequest.query.filter_by(
@@ -385,7 +513,17 @@ def get_export_download(download_token: str) -> dict:
     if not export.file_path or not os.path.exists(export.file_path):
         return {"error": "Export file no longer available", "status_code": 404}
 
-    return {"file_path": export.file_path, "user_id": str(export.user_id)}
+    # Exports built before archives were hashed get their hash on first download
+    if not export.file_sha256:
+        export.file_sha256 = _file_sha256(export.file_path)
+        db.session.commit()
+
+    return {
+        "file_path": export.file_path,
+        "user_id": str(export.user_id),
+        "sha256": export.file_sha256,
+        "completed_at": export.completed_at,
+    }
 
 
 # ───────────────────────────────────────────
@@ -393,16 +531,75 @@ def get_export_download(download_token: str) -> dict:
 # ───────────────────────────────────────────
 
 
-def _query_table(table_name: str, user_id) -> list:
-    """Generic query: SELECT * FROM table WHERE user_id = :uid."""
-    try:
-        rows = db.session.execute(
-            db.text(f"SELECT * FROM {table_name} WHERE user_id = :uid ORDER BY id"),
+def _count_records(reader, tables: list, user_id) -> int:
+    """Total rows across the exported tables, for progress reporting."""
+    return sum(
+        reader.execute(
+            db.text(f"SELECT count(*) FROM {table} WHERE user_id = :uid"),
             {"uid": str(user_id)},
-        ).fetchall()
-        return [dict(row._mapping) for row in rows]
-    except Exception:
-        return []
+        ).scalar()
+        for table in tables
+    )
+
+
+def _stream_rows(reader, table_name: str, user_id, export_req):
+    """
+    Yield a user's rows from a table in id order (or its EXPORT_ORDER_BY
+    columns), fetched in batches.
+
+    yield_per makes PostgreSQL use a server-side cursor, so only one batch
+    is held at a time. Each full batch is added to the request's progress.
+    """
+    order_by = EXPORT_ORDER_BY.get(table_name, "id")
+    result = reader.execute(
+        db.text(f"SELECT * FROM {table_name} WHERE user_id = :uid ORDER BY {order_by}"),
+        {"uid": str(user_id)},
+        execution_options={"yield_per": EXPORT_BATCH_SIZE},
+    )
+    export_req.current_section = table_name
+    count = 0
+    for row in result.mappings():
+        yield dict(row)
+        count += 1
+        if count % EXPORT_BATCH_SIZE == 0:
+            export_req.records_exported += EXPORT_BATCH_SIZE
+            db.session.commit()
+    export_req.records_exported += count % EXPORT_BATCH_SIZE
+    db.session.commit()
+
+
+def _open_entry(zf: zipfile.ZipFile, archive_name: str) -> io.TextIOWrapper:
+    """Open a ZIP entry for writing text; it is compressed as it is written."""
+    # Size is unknown up front, so allow entries past 2 GiB
+    return io.TextIOWrapper(zf.open(archive_name, "w", force_zip64=True), encoding="utf-8")
+
+
+def _write_array(out, rows, level: int = 0) -> int:
+    """
+    Write rows as a JSON array, one element at a time.
+
+    Output matches _to_json() of the whole list nested `level` deep.
+
+    Returns:
+        Number of rows written
+    """
+    pad = "  " * (level + 1)
+    count = 0
+    for row in rows:
+        out.write(",\n" if count else "[\n")
+        out.write(pad + _to_json(row).replace("\n", "\n" + pad))
+        count += 1
+    out.write(f"\n{'  ' * level}]" if count else "[]")
+    return count
+
+
+def _file_sha256(path: str) -> str:
+    """Hex SHA-256 of a file, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
 
 
 def _export_profile(user) -> dict:
@@ -426,17 +623,22 @@ def _export_scores(user_id) -> dict:
         rows = db.session.execute(
             db.text(
                 """
-                SELECT id, title, ats_score, ats_breakdown, created_at, updated_at
+                SELECT id, title, ats_total_score, ats_compatibility_score,
+                       ats_keywords_score, ats_achievements_score, ats_formatting_score,
+                       ats_progression_score, ats_completeness_score, ats_fit_score,
+                       created_at, updated_at
                 FROM resumes
-                WHERE user_id = :uid AND ats_score IS NOT NULL
+                WHERE user_id = :uid AND ats_total_score IS NOT NULL
                 ORDER BY created_at
             """
             ),
             {"uid": str(user_id)},
         ).fetchall()
         scores["ats_scores"] = [dict(r._mapping) for r in rows]
-    except Exception:
-        pass
+    except Exception as e:
+        # A failed statement aborts the transaction on PostgreSQL
+        db.session.rollback()
+        logger.warning(f"Data export: score history unavailable for user {user_id}: {e}")
     return scores
 
 
@@ -446,7 +648,7 @@ def _add_resume_files_to_zip(user_id, zf: zipfile.ZipFile):
         rows = db.session.execute(
             db.text(
                 """
-                SELECT file_path, original_filename, saved_filename
+                SELECT file_path, file_name
                 FROM resumes WHERE user_id = :uid
             """
             ),
@@ -455,16 +657,18 @@ def _add_resume_files_to_zip(user_id, zf: zipfile.ZipFile):
 
         for row in rows:
             r = dict(row._mapping)
-            filename = r.get("saved_filename") or r.get("file_path")
+            filename = r.get("file_path")
             if not filename:
                 continue
 
             full_path = os.path.join(RESUME_DIR, os.path.basename(filename))
             if os.path.exists(full_path):
-                archive_name = r.get("original_filename") or os.path.basename(filename)
+                archive_name = r.get("file_name") or os.path.basename(filename)
                 zf.write(full_path, f"resumes/{archive_name}")
-    except Exception:
-        pass
+    except Exception as e:
+        # A failed statement aborts the transaction on PostgreSQL
+        db.session.rollback()
+        logger.warning(f"Data export: resume files unavailable for user {user_id}: {e}")
 
 
 def _to_json(data) -> str:
@@ -472,39 +676,152 @@ def _to_json(data) -> str:
     return json.dumps(data, indent=2, default=str, ensure_ascii=False)
 
 
-# -- File Cleanup --
+# -- Account deletion --
 
 
-def _delete_user_resume_files(user_id):
-    """Delete all resume files from disk for a user."""
-    rows = db.session.execute(
-        db.text("SELECT file_path, saved_filename FROM resumes WHERE user_id = :uid"),
-        {"uid": str(user_id)},
-    ).fetchall()
+def _claim_deletion_job(user_id):
+    """
+    Mark the user's deletion job as running, creating it if needed.
 
-    for row in rows:
-        r = dict(row._mapping)
-        filename = r.get("saved_filename") or r.get("file_path")
-        if filename:
-            full_path = os.path.join(RESUME_DIR, os.path.basename(filename))
-            if os.path.exists(full_path):
-                os.remove(full_path)
-                logger.info(f"Deleted resume file: {full_path}")
-    # TODO Phase 2: s3.delete_objects(Bucket='jobezie-resumes', ...)
+    The claim is one conditional UPDATE, so two workers never run the same
+    deletion. A job still "deleting" with no progress for
+    DELETION_STALE_AFTER has lost its worker and can be claimed again.
 
+    Returns:
+        The claimed AccountDeletionJob, or None while another worker holds it
+    """
+    if not AccountDeletionJob.query.filter_by(user_id=user_id).first():
+        db.session.add(AccountDeletionJob(user_id=user_id))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()  # created by a concurrent claim
 
-def _delete_user_export_files(user_id):
-    """Delete all export ZIPs from disk for a user."""
-    rows = db.session.execute(
-        db.text("SELECT file_path FROM data_export_requests WHERE user_id = :uid"),
-        {"uid": str(user_id)},
-    ).fetchall()
+    now = datetime.utcnow()
+    claimed = db.session.execute(
+        update(AccountDeletionJob)
+        .where(
+            AccountDeletionJob.user_id == user_id,
+            or_(
+                AccountDeletionJob.status.in_(("pending", "failed")),
+                and_(
+                    AccountDeletionJob.status == "deleting",
+                    AccountDeletionJob.updated_at < now - DELETION_STALE_AFTER,
+                ),
+            ),
+        )
+        .values(
+            status="deleting",
+            attempts=AccountDeletionJob.attempts + 1,
+            error_message=None,
+            started_at=now,
+            updated_at=now,
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.session.commit()
 
-    for row in rows:
-        path = dict(row._mapping).get("file_path")
-        if path and os.path.exists(path):
+    if not claimed:
+        return None
+    return AccountDeletionJob.query.filter_by(user_id=user_id).first()
+
+
+def _delete_in_batches(job, table: str, owned: str, self_ref=None):
+    """
+    Delete a user's rows from one table, DELETE_BATCH_SIZE at a time.
+
+    Each DELETE covers the next range of the user's primary keys and
+    commits with the job's progress. Batches walk the keys from where the
+    last one ended, so each reads only its own rows through the
+    (user_id, id) index. A self-referencing column is cleared first so no
+    batch deletes a row that a later one still points at.
+    """
+    key = DELETION_BATCH_KEYS.get(table, "id")
+    params = {"uid": str(job.user_id), "limit": DELETE_BATCH_SIZE}
+    job.current_table = table
+
+    def next_batch(condition, after):
+        after_clause = f" AND {key} > :after" if after is not None else ""
+        return (
+            db.session.execute(
+                db.text(
+                    f"SELECT {key} FROM {table} WHERE {owned}{condition}{after_clause} "
+                    f"ORDER BY {key} LIMIT :limit"
+                ),
+                {**params, "after": after},
+            )
+            .scalars()
+            .all()
+        )
+
+    if self_ref:
+        after = None
+        while keys := next_batch(f" AND {self_ref} IS NOT NULL", after):
+            db.session.execute(
+                db.text(
+                    f"UPDATE {table} SET {self_ref} = NULL "
+                    f"WHERE {owned} AND {key} >= :first AND {key} <= :last"
+                ),
+                {**params, "first": keys[0], "last": keys[-1]},
+            )
+            db.session.commit()
+            after = keys[-1]
+
+    after = None
+    while keys := next_batch("", after):
+        job.rows_deleted += db.session.execute(
+            db.text(f"DELETE FROM {table} WHERE {owned} AND {key} >= :first AND {key} <= :last"),
+            {**params, "first": keys[0], "last": keys[-1]},
+        ).rowcount
+        db.session.commit()
+        after = keys[-1]
+
+
+def _user_file_paths(user_id, tables: set) -> list:
+    """Paths of a user's resume uploads and export ZIPs on disk."""
+    params = {"uid": str(user_id)}
+    paths = []
+
+    if "resumes" in tables:
+        rows = db.session.execute(
+            db.text("SELECT file_path FROM resumes WHERE user_id = :uid"), params
+        ).scalars()
+        paths.extend(os.path.join(RESUME_DIR, os.path.basename(path)) for path in rows if path)
+        # TODO Phase 2: s3.delete_objects(Bucket='jobezie-resumes', ...)
+
+    if "data_export_requests" in tables:
+        rows = db.session.execute(
+            db.text("SELECT file_path FROM data_export_requests WHERE user_id = :uid"),
+            params,
+        ).scalars()
+        paths.extend(path for path in rows if path)
+
+    return paths
+
+
+def _remove_files(paths: list) -> tuple:
+    """
+    Remove files on FILE_DELETE_WORKERS threads, skipping any already gone.
+
+    Returns:
+        (number removed, list of error messages)
+    """
+
+    def remove(path):
+        try:
             os.remove(path)
-            logger.info(f"Deleted export file: {path}")
+        except FileNotFoundError:
+            return False, None
+        except OSError as e:
+            return False, f"{os.path.basename(path)}: {e}"
+        logger.info(f"Deleted file: {path}")
+        return True, None
+
+    if not paths:
+        return 0, []
+    with ThreadPoolExecutor(max_workers=min(FILE_DELETE_WORKERS, len(paths))) as pool:
+        results = list(pool.map(remove, paths))
+    return sum(removed for removed, _ in results), [error for _, error in results if error]
 
 
 # -- Subscription --
@@ -0,0 +1,240 @@
+"""
+Activity Buffer
+
+Write-behind logging for activity rows.
+
+Activities recorded while handling a request are collected on flask.g and
+written at request teardown as one multi-row INSERT in one transaction,
+instead of a row and a commit per event. With ACTIVITY_LOG_MODE = "stream"
+and Redis available, the teardown flush appends the rows to a Redis stream
+instead, and the drain_activity_stream task bulk-inserts them through a
+consumer group. Entries are acknowledged only after their rows commit, so
+a batch held by a crashed worker is claimed and written again; those
+inserts skip ids that already exist.
+
+Outside a request (Celery tasks, scripts, shell) rows are inserted at
+once, in the caller's transaction.
+
+Once rows are written or published, announce_activities pushes them to
+their users' event streams.
+"""
+
+import json
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import redis
+from flask import current_app, g, has_app_context
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.extensions import db, redis_pool
+from app.models.activity import Activity
+from app.services.event_stream import EventType, event_stream
+
+logger = logging.getLogger(__name__)
+
+STREAM_KEY = "activities:stream"
+STREAM_GROUP = "activity-writers"
+STREAM_MAXLEN = 1_000_000  # approximate cap if writers fall far behind
+
+# Pending entries idle this long are assumed to belong to a dead consumer
+STREAM_CLAIM_IDLE_MS = 60_000
+DRAIN_BATCH_SIZE = 5000
+
+
+def activity_row(
+    user_id: str,
+    activity_type: str,
+    description: Optional[str] = None,
+    recruiter_id: Optional[str] = None,
+    resume_id: Optional[str] = None,
+    message_id: Optional[str] = None,
+    extra_data: Optional[Dict] = None,
+    pipeline_stage: Optional[str] = None,
+    previous_stage: Optional[str] = None,
+) -> Dict:
+    """
+    Build an activities row, with its id and timestamp assigned now.
+
+    Every row has the same keys, so any mix of rows can go in one
+    multi-row INSERT.
+    """
+    return {
+        "id": str(uuid.uuid4()),
+        "user_id": str(user_id),
+        "activity_type": activity_type,
+        "description": description,
+        "recruiter_id": str(recruiter_id) if recruiter_id else None,
+        "resume_id": str(resume_id) if resume_id else None,
+        "message_id": str(message_id) if message_id else None,
+        "extra_data": extra_data or {},
+        "pipeline_stage": pipeline_stage,
+        "previous_stage": previous_stage,
+        "created_at": datetime.utcnow(),
+    }
+
+
+def announce_activities(rows: List[Dict]) -> None:
+    """Push committed activity rows to their users' event streams."""
+    event_stream.publish_many(
+        (row["user_id"], EventType.ACTIVITY_LOGGED, Activity(**row).to_dict()) for row in rows
+    )
+
+
+class ActivityBuffer:
+    """Request-scoped buffer of activity rows, flushed at teardown."""
+
+    @staticmethod
+    def start() -> None:
+        """Open this request's buffer (before_request handler)."""
+        g._activity_buffer = []
+
+    @staticmethod
+    def add(*rows: Dict) -> bool:
+        """
+        Record activity rows.
+
+        Returns:
+            True if the rows were buffered for the end of the request, False
+            if they were inserted into the current transaction instead
+        """
+        buffer = g.get("_activity_buffer") if has_app_context() else None
+        if buffer is not None:
+            buffer.extend(rows)
+            return True
+        if rows:
+            db.session.execute(Activity.__table__.insert(), list(rows))
+        return False
+
+    @staticmethod
+    def flush(exc=None) -> int:
+        """
+        Write this request's buffered activities (teardown_request handler).
+
+        Rows from a request that raised are discarded. The write uses its
+        own connection and transaction, so it never commits whatever the
+        request left uncommitted in the session.
+
+        Returns:
+            Number of rows written or published
+        """
+        rows = g.pop("_activity_buffer", None)
+        if not rows or exc is not None:
+            return 0
+
+        if current_app.config.get("ACTIVITY_LOG_MODE") == "stream" and redis_pool.available:
+            try:
+                ActivityBuffer._publish(redis_pool.client, rows)
+                announce_activities(rows)
+                return len(rows)
+            except redis.RedisError as e:
+                logger.warning(f"Activity stream unavailable ({e}), writing directly")
+
+        try:
+            with db.engine.begin() as connection:
+                _insert_rows(connection, rows)
+        except SQLAlchemyError as e:
+            logger.error(f"Dropped {len(rows)} buffered activities: {e}")
+            return 0
+        announce_activities(rows)
+        return len(rows)
+
+    @staticmethod
+    def drain_stream(batch_size: int = DRAIN_BATCH_SIZE, max_batches: int = 20) -> int:
+        """
+        Bulk-insert activities published to the Redis stream.
+
+        Args:
+            batch_size: Entries read and inserted per transaction
+            max_batches: Batches per call, so one run cannot hog a worker
+
+        Returns:
+            Number of activity rows written
+        """
+        client = redis_pool.client
+        if client is None:
+            return 0
+
+        try:
+            client.xgroup_create(STREAM_KEY, STREAM_GROUP, id="0", mkstream=True)
+        except redis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        consumer = f"{socket.gethostname()}:{os.getpid()}"
+
+        # Take over entries another consumer read but never acknowledged
+        claimed = client.xautoclaim(
+            STREAM_KEY,
+            STREAM_GROUP,
+            consumer,
+            min_idle_time=STREAM_CLAIM_IDLE_MS,
+            count=batch_size,
+        )[1]
+        written = ActivityBuffer._write_entries(client, claimed)
+
+        for _ in range(max_batches):
+            response = client.xreadgroup(
+                STREAM_GROUP, consumer, {STREAM_KEY: ">"}, count=batch_size
+            )
+            entries = response[0][1] if response else []
+            if not entries:
+                break
+            written += ActivityBuffer._write_entries(client, entries)
+
+        return written
+
+    @staticmethod
+    def _publish(client, rows: List[Dict]) -> None:
+        """Append rows to the stream in one round trip."""
+        pipe = client.pipeline(transaction=False)
+        for row in rows:
+            pipe.xadd(
+                STREAM_KEY,
+                {"row": json.dumps(row, default=_encode)},
+                maxlen=STREAM_MAXLEN,
+                approximate=True,
+            )
+        pipe.execute()
+
+    @staticmethod
+    def _write_entries(client, entries) -> int:
+        """Insert one batch of stream entries, then acknowledge and trim them."""
+        if not entries:
+            return 0
+        # Claimed entries deleted from the stream come back without fields
+        rows = [_decode(fields["row"]) for _, fields in entries if fields]
+        if rows:
+            with db.engine.begin() as connection:
+                _insert_rows(connection, rows, skip_existing=True)
+
+        ids = [entry_id for entry_id, _ in entries]
+        client.xack(STREAM_KEY, STREAM_GROUP, *ids)
+        client.xdel(STREAM_KEY, *ids)
+        return len(rows)
+
+
+def _insert_rows(connection, rows: List[Dict], skip_existing: bool = False) -> None:
+    """One multi-row INSERT; optionally ignore rows whose key already exists."""
+    if not skip_existing:
+        connection.execute(Activity.__table__.insert(), rows)
+        return
+    insert = pg_insert if connection.dialect.name == "postgresql" else sqlite_insert
+    connection.execute(insert(Activity.__table__).on_conflict_do_nothing(), rows)
+
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _decode(payload: str) -> Dict:
+    row = json.loads(payload)
+    row["created_at"] = datetime.fromisoformat(row["created_at"])
+    return row
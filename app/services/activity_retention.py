@@ -0,0 +1,241 @@
+"""
+Activity Retention Service
+
+Monthly partition upkeep and roll-up for the activities table.
+
+On PostgreSQL, activities is range-partitioned by month on created_at
+(migration 011), so queries bounded to a recent window only touch the
+newest partitions. ensure_partitions() creates partitions ahead of time so
+inserts never pile up in the default partition, and roll_up() turns months
+older than the retention window into per-user daily counts in
+activity_daily_summaries, then drops the month's partition instead of
+deleting its rows one by one. On an unpartitioned table (SQLite in tests
+and development) the same roll-up deletes the month's rows.
+"""
+
+import logging
+import re
+from datetime import datetime
+from typing import Dict, List, Optional, Set
+
+from flask import current_app
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.extensions import db
+from app.models.activity import Activity, ActivityDailySummary
+from app.utils.sql import date_bucket
+
+logger = logging.getLogger(__name__)
+
+# Whole months of raw activities kept before roll-up (overridable in config)
+DEFAULT_RETENTION_MONTHS = 13
+
+# Partitions kept ready beyond the current month
+PARTITION_MONTHS_AHEAD = 3
+
+DEFAULT_PARTITION = "activities_default"
+
+_PARTITION_NAME = re.compile(r"^activities_p(\d{4})_(\d{2})$")
+
+
+def month_start(value: datetime) -> datetime:
+    """Midnight on the first day of value's month."""
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, months: int) -> datetime:
+    """First of the month `months` after (or before) a month start."""
+    index = month.year * 12 + month.month - 1 + months
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+class ActivityRetentionService:
+    """Service for activity partition upkeep and retention roll-ups."""
+
+    @staticmethod
+    def is_partitioned() -> bool:
+        """Whether activities is a partitioned PostgreSQL table."""
+        if db.engine.dialect.name != "postgresql":
+            return False
+        kind = db.session.execute(
+            text("SELECT relkind FROM pg_class WHERE oid = to_regclass('activities')")
+        ).scalar()
+        return kind == "p"
+
+    @staticmethod
+    def partition_name(month: datetime) -> str:
+        """Name of the partition holding a month, e.g. activities_p2026_10."""
+        return f"activities_p{month:%Y_%m}"
+
+    @staticmethod
+    def ensure_partitions(
+        months_ahead: int = PARTITION_MONTHS_AHEAD, now: Optional[datetime] = None
+    ) -> List[str]:
+        """
+        Create monthly partitions from the current month through months_ahead.
+
+        Args:
+            months_ahead: Months beyond the current one to prepare
+            now: Reference time (defaults to now, UTC)
+
+        Returns:
+            Names of the partitions created; empty when not partitioned
+        """
+        if not ActivityRetentionService.is_partitioned():
+            return []
+
+        existing = ActivityRetentionService._partitions()
+        current = month_start(now or datetime.utcnow())
+        created = []
+        for offset in range(months_ahead + 1):
+            start = add_months(current, offset)
+            name = ActivityRetentionService.partition_name(start)
+            if name not in existing:
+                ActivityRetentionService._create_partition(name, start, add_months(start, 1))
+                created.append(name)
+
+        db.session.commit()
+        if created:
+            logger.info(f"Created activity partitions: {', '.join(created)}")
+        return created
+
+    @staticmethod
+    def roll_up(retention_months: Optional[int] = None, now: Optional[datetime] = None) -> Dict:
+        """
+        Summarize and remove activities older than the retention window.
+
+        Each expired month is handled in its own transaction: per-user daily
+        counts by type are added to activity_daily_summaries, then the
+        month's partition is dropped (and any of its rows still in the
+        default partition, or in an unpartitioned table, deleted).
+
+        Args:
+            retention_months: Whole months of raw activities to keep
+                (defaults to ACTIVITY_RETENTION_MONTHS)
+            now: Reference time (defaults to now, UTC)
+
+        Returns:
+            Dictionary with the cutoff, months rolled up and summary rows written
+        """
+        if retention_months is None:
+            retention_months = current_app.config.get(
+                "ACTIVITY_RETENTION_MONTHS", DEFAULT_RETENTION_MONTHS
+            )
+        cutoff = add_months(month_start(now or datetime.utcnow()), -retention_months)
+        partitioned = ActivityRetentionService.is_partitioned()
+        partitions = ActivityRetentionService._partitions() if partitioned else set()
+
+        summary_rows = 0
+        months = ActivityRetentionService._expired_months(cutoff, partitions)
+        for month in months:
+            end = add_months(month, 1)
+            summary_rows += ActivityRetentionService._summarize(month, end)
+
+            name = ActivityRetentionService.partition_name(month)
+            if name in partitions:
+                db.session.execute(text(f"DROP TABLE {name}"))
+            db.session.execute(
+                delete(Activity).where(Activity.created_at >= month, Activity.created_at < end)
+            )
+            db.session.commit()
+            logger.info(f"Rolled up activities for {month:%Y-%m}")
+
+        return {
+            "cutoff": cutoff.isoformat(),
+            "months_rolled_up": len(months),
+            "summary_rows": summary_rows,
+        }
+
+    @staticmethod
+    def _expired_months(cutoff: datetime, partitions: Set[str]) -> List[datetime]:
+        """Month starts before the cutoff that still hold rows or a partition."""
+        months = set()
+        for name in partitions:
+            match = _PARTITION_NAME.match(name)
+            if match:
+                month = datetime(int(match.group(1)), int(match.group(2)), 1)
+                if month < cutoff:
+                    months.add(month)
+
+        oldest = db.session.execute(
+            select(func.min(Activity.created_at)).where(Activity.created_at < cutoff)
+        ).scalar()
+        if oldest is not None:
+            month = month_start(oldest)
+            while month < cutoff:
+                months.add(month)
+                month = add_months(month, 1)
+
+        return sorted(months)
+
+    @staticmethod
+    def _summarize(start: datetime, end: datetime) -> int:
+        """Add per-user daily counts for [start, end) to the summary table."""
+        day = date_bucket("day", Activity.created_at)
+        counts = (
+            select(Activity.user_id, day, Activity.activity_type, func.count())
+            .where(Activity.created_at >= start, Activity.created_at < end)
+            .group_by(Activity.user_id, day, Activity.activity_type)
+        )
+
+        insert = pg_insert if db.engine.dialect.name == "postgresql" else sqlite_insert
+        statement = insert(ActivityDailySummary).from_select(
+            ["user_id", "day", "activity_type", "count"], counts
+        )
+        # A month is normally summarized once; merging keeps a rerun after a
+        # partial failure (or late rows for an expired month) from losing counts
+        statement = statement.on_conflict_do_update(
+            index_elements=["user_id", "day", "activity_type"],
+            set_={"count": ActivityDailySummary.count + statement.excluded["count"]},
+        )
+        return db.session.execute(statement).rowcount
+
+    @staticmethod
+    def _partitions() -> Set[str]:
+        """Names of the partitions currently attached to activities."""
+        return set(
+            db.session.execute(
+                text(
+                    "SELECT c.relname FROM pg_inherits i "
+                    "JOIN pg_class c ON c.oid = i.inhrelid "
+                    "WHERE i.inhparent = 'activities'::regclass"
+                )
+            ).scalars()
+        )
+
+    @staticmethod
+    def _create_partition(name: str, start: datetime, end: datetime) -> None:
+        """Create one month's partition, moving any of its rows out of the default."""
+        bounds = {"start": start, "end": end}
+        stray = db.session.execute(
+            text(
+                f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} "
+                "WHERE created_at >= :start AND created_at < :end)"
+            ),
+            bounds,
+        ).scalar()
+
+        # A new partition may not overlap rows already in the default
+        # partition, so detach it while those rows are moved
+        if stray:
+            db.session.execute(text(f"ALTER TABLE activities DETACH PARTITION {DEFAULT_PARTITION}"))
+        db.session.execute(
+            text(
+                f"CREATE TABLE {name} PARTITION OF activities "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
+        )
+        if stray:
+            db.session.execute(
+                text(
+                    f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+                    "WHERE created_at >= :start AND created_at < :end RETURNING *) "
+                    "INSERT INTO activities SELECT * FROM moved"
+                ),
+                bounds,
+            )
+            db.session.execute(
+                text(f"ALTER TABLE activities ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT")
+            )
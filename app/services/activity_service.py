@@ -4,18 +4,49 @@ Activity Service
 Handles activity tracking, pipeline management, and Kanban board functionality.
 """
 
-from datetime import datetime, timedelta
+from datetime import date, datetime, time, timedelta
 from typing import Dict, List, Optional, Tuple
 
+from sqlalchemy import and_, bindparam, case, func, select, update
+
 from app.extensions import db
-from app.models.activity import Activity, ActivityType, PipelineItem, PipelineStage
+from app.models.activity import (
+    Activity,
+    ActivityDailySummary,
+    ActivityType,
+    PipelineItem,
+    PipelineStage,
+)
 from app.models.recruiter import Recruiter
-from app.services.scoring.engagement import calculate_priority_score
+from app.services.activity_buffer import ActivityBuffer, activity_row, announce_activities
+from app.services.event_stream import EventType, event_stream
+from app.services.scoring.engagement import score_priorities
+from app.utils.lexorank import spread
+from app.utils.pagination import KeysetPage, keyset_order, keyset_paginate, order_clauses
+from app.utils.sql import BUCKETS, date_bucket, days_since
+
+
+class RankConflict(Exception):
+    """Neighbouring rank keys leave no room; the stage needs rebalancing."""
 
 
 class ActivityService:
     """Service for activity tracking and pipeline management."""
 
+    # Most items one batch move may touch
+    MAX_BATCH_MOVE = 500
+
+    # Stages with rank keys longer than this are renumbered by the nightly
+    # rebalance; a move that would exceed RANK_MAX_LENGTH renumbers at once
+    RANK_REBALANCE_LENGTH = 16
+    RANK_MAX_LENGTH = 64
+
+    # Most buckets one activity series may return (a year of days)
+    MAX_SERIES_BUCKETS = 366
+
+    # Recent-activity lists try this window before scanning all history
+    RECENT_WINDOW = timedelta(days=60)
+
     @staticmethod
     def log_activity(
         user_id: str,
@@ -43,24 +74,27 @@ class ActivityService:
             previous_stage: Previous stage (for stage changes)
 
         Returns:
-            New Activity object
+            New Activity object (not yet written when buffered in a request)
         """
-        activity = Activity(
-            user_id=user_id,
-            activity_type=activity_type,
+        row = activity_row(
+            user_id,
+            activity_type,
             description=description,
             recruiter_id=recruiter_id,
             resume_id=resume_id,
             message_id=message_id,
-            extra_data=extra_data or {},
+            extra_data=extra_data,
             pipeline_stage=pipeline_stage,
             previous_stage=previous_stage,
         )
 
-        db.session.add(activity)
-        db.session.commit()
+        # Inside a request the row is written at teardown with the
+        # request's other activities
+        if not ActivityBuffer.add(row):
+            db.session.commit()
+            announce_activities([row])
 
-        return activity
+        return Activity(**row)
 
     @staticmethod
     def get_user_activities(
@@ -87,6 +121,66 @@ class ActivityService:
         Returns:
             Tuple of (activity list, total count)
         """
+        query = ActivityService._user_activities_query(
+            user_id, activity_type, recruiter_id, start_date, end_date
+        )
+
+        total = query.count()
+
+        order = keyset_order([(Activity.created_at, True)], Activity.id)
+        activities = query.order_by(*order_clauses(order)).offset(offset).limit(limit).all()
+
+        return activities, total
+
+    @staticmethod
+    def get_user_activities_page(
+        user_id: str,
+        activity_type: Optional[str] = None,
+        recruiter_id: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        total: str = "none",
+    ) -> KeysetPage:
+        """
+        Get one keyset-paginated page of a user's activities, newest first.
+
+        Args:
+            user_id: User's ID
+            activity_type: Filter by activity type
+            recruiter_id: Filter by recruiter
+            start_date: Filter activities after this date
+            end_date: Filter activities before this date
+            limit: Page size
+            cursor: next_cursor from the previous page, None for the first page
+            total: "none", "approximate" or "exact"
+
+        Returns:
+            KeysetPage of activities
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+        """
+        return keyset_paginate(
+            ActivityService._user_activities_query(
+                user_id, activity_type, recruiter_id, start_date, end_date
+            ),
+            keyset_order([(Activity.created_at, True)], Activity.id),
+            sort="created",
+            limit=limit,
+            cursor=cursor,
+            total=total,
+        )
+
+    @staticmethod
+    def _user_activities_query(
+        user_id: str,
+        activity_type: Optional[str] = None,
+        recruiter_id: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ):
         query = Activity.query.filter_by(user_id=user_id)
 
         if activity_type:
@@ -98,21 +192,28 @@ class ActivityService:
         if end_date:
             query = query.filter(Activity.created_at <= end_date)
 
-        total = query.count()
-
-        activities = query.order_by(Activity.created_at.desc()).offset(offset).limit(limit).all()
-
-        return activities, total
+        return query
 
     @staticmethod
     def get_recent_activities(user_id: str, limit: int = 10) -> List[Activity]:
         """Get most recent activities for dashboard timeline."""
-        return (
-            Activity.query.filter_by(user_id=user_id)
-            .order_by(Activity.created_at.desc())
-            .limit(limit)
-            .all()
-        )
+        return ActivityService._newest(Activity.query.filter_by(user_id=user_id), limit)
+
+    @staticmethod
+    def _newest(query, limit: int) -> List[Activity]:
+        """
+        Newest activities matching a query, looking in the recent window first.
+
+        The bounded first attempt lets PostgreSQL prune the activities table
+        to its newest monthly partitions; only users with fewer than `limit`
+        recent activities pay for the unbounded query.
+        """
+        newest = query.order_by(Activity.created_at.desc())
+        since = datetime.utcnow() - ActivityService.RECENT_WINDOW
+        recent = newest.filter(Activity.created_at >= since).limit(limit).all()
+        if len(recent) == limit:
+            return recent
+        return newest.limit(limit).all()
 
     @staticmethod
     def get_activity_counts(user_id: str, days: int = 30) -> Dict:
@@ -127,22 +228,161 @@ class ActivityService:
             Dictionary with counts by activity type
         """
         start_date = datetime.utcnow() - timedelta(days=days)
-
-        activities = Activity.query.filter(
-            Activity.user_id == user_id, Activity.created_at >= start_date
-        ).all()
+        by_type = ActivityService._counts_by_type(user_id, start_date)
 
         counts = {t.value: 0 for t in ActivityType}
-        for activity in activities:
-            if activity.activity_type in counts:
-                counts[activity.activity_type] += 1
+        for activity_type, count in by_type.items():
+            if activity_type in counts:
+                counts[activity_type] = count
 
         return {
             "period_days": days,
-            "total": len(activities),
+            "total": sum(by_type.values()),
             "by_type": counts,
         }
 
+    @staticmethod
+    def get_activity_series(
+        user_id: str,
+        start: datetime,
+        end: Optional[datetime] = None,
+        bucket: str = "day",
+        activity_types: Optional[List[str]] = None,
+    ) -> Dict:
+        """
+        Get activity counts per time bucket and type, aggregated in SQL.
+
+        Args:
+            user_id: User's ID
+            start: Start of the range (inclusive)
+            end: End of the range (exclusive), defaults to now
+            bucket: "day", "week" (starting Monday) or "month"
+            activity_types: Optional list of types to count
+
+        Returns:
+            Dictionary with one entry per bucket, oldest first and zero-filled,
+            each counting only the types that occurred, plus range totals
+
+        Raises:
+            ValueError: For an unknown bucket, an empty range or too many buckets
+        """
+        end = end or datetime.utcnow()
+        if bucket not in BUCKETS:
+            raise ValueError(f"bucket must be one of: {', '.join(BUCKETS)}")
+        if end <= start:
+            raise ValueError("end must be after start")
+
+        buckets = {}
+        key = ActivityService._bucket_start(start, bucket)
+        while datetime.combine(key, time.min) < end:
+            buckets[key] = {}
+            if len(buckets) > ActivityService.MAX_SERIES_BUCKETS:
+                raise ValueError(
+                    f"Range spans more than {ActivityService.MAX_SERIES_BUCKETS} buckets"
+                )
+            key = ActivityService._next_bucket(key, bucket)
+
+        bucket_start = date_bucket(bucket, Activity.created_at).label("bucket")
+        query = (
+            select(bucket_start, Activity.activity_type, func.count())
+            .where(
+                Activity.user_id == user_id,
+                Activity.created_at >= start,
+                Activity.created_at < end,
+            )
+            .group_by(bucket_start, Activity.activity_type)
+        )
+        # Days past raw retention survive only as daily summaries
+        first_day, stop_day = ActivityService._summary_days(start, end)
+        summary_bucket = date_bucket(bucket, ActivityDailySummary.day).label("bucket")
+        summaries = (
+            select(
+                summary_bucket,
+                ActivityDailySummary.activity_type,
+                func.sum(ActivityDailySummary.count),
+            )
+            .where(
+                ActivityDailySummary.user_id == user_id,
+                ActivityDailySummary.day >= first_day,
+                ActivityDailySummary.day < stop_day,
+            )
+            .group_by(summary_bucket, ActivityDailySummary.activity_type)
+        )
+        if activity_types:
+            query = query.where(Activity.activity_type.in_(activity_types))
+            summaries = summaries.where(ActivityDailySummary.activity_type.in_(activity_types))
+
+        totals: Dict[str, int] = {}
+        for statement in (summaries, query):
+            for day, activity_type, count in db.session.execute(statement):
+                by_type = buckets.setdefault(day, {})
+                by_type[activity_type] = by_type.get(activity_type, 0) + count
+                totals[activity_type] = totals.get(activity_type, 0) + count
+
+        return {
+            "bucket": bucket,
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "series": [
+                {"bucket": day.isoformat(), "total": sum(by_type.values()), "by_type": by_type}
+                for day, by_type in sorted(buckets.items())
+            ],
+            "totals": totals,
+            "total": sum(totals.values()),
+        }
+
+    @staticmethod
+    def _counts_by_type(
+        user_id: str, start: datetime, end: Optional[datetime] = None
+    ) -> Dict[str, int]:
+        """Count a user's activities per type in a range, including rolled-up days."""
+        query = select(Activity.activity_type, func.count()).where(
+            Activity.user_id == user_id, Activity.created_at >= start
+        )
+        if end is not None:
+            query = query.where(Activity.created_at < end)
+        counts = dict(db.session.execute(query.group_by(Activity.activity_type)).all())
+
+        first_day, stop_day = ActivityService._summary_days(start, end)
+        summaries = select(
+            ActivityDailySummary.activity_type, func.sum(ActivityDailySummary.count)
+        ).where(ActivityDailySummary.user_id == user_id, ActivityDailySummary.day >= first_day)
+        if end is not None:
+            summaries = summaries.where(ActivityDailySummary.day < stop_day)
+        for activity_type, count in db.session.execute(
+            summaries.group_by(ActivityDailySummary.activity_type)
+        ):
+            counts[activity_type] = counts.get(activity_type, 0) + count
+        return counts
+
+    @staticmethod
+    def _summary_days(start: datetime, end: Optional[datetime]) -> Tuple[date, Optional[date]]:
+        """Daily summaries in range: days whose midnight falls in [start, end)."""
+        first_day = start.date() if start.time() == time.min else start.date() + timedelta(days=1)
+        if end is None:
+            return first_day, None
+        stop_day = end.date() if end.time() == time.min else end.date() + timedelta(days=1)
+        return first_day, stop_day
+
+    @staticmethod
+    def _bucket_start(value: datetime, bucket: str) -> date:
+        """First day of the bucket containing value, matching date_bucket."""
+        day = value.date()
+        if bucket == "week":
+            return day - timedelta(days=day.weekday())
+        if bucket == "month":
+            return day.replace(day=1)
+        return day
+
+    @staticmethod
+    def _next_bucket(day: date, bucket: str) -> date:
+        """First day of the bucket after the one starting on day."""
+        if bucket == "week":
+            return day + timedelta(days=7)
+        if bucket == "month":
+            return (day + timedelta(days=32)).replace(day=1)
+        return day + timedelta(days=1)
+
     # Pipeline / Kanban Management
 
     @staticmethod
@@ -155,7 +395,13 @@ class ActivityService:
         """
         pipeline = {stage.value: [] for stage in PipelineStage}
 
-        items = PipelineItem.query.filter_by(user_id=user_id).order_by(PipelineItem.position).all()
+        items = (
+            PipelineItem.query.filter_by(user_id=user_id)
+            .order_by(
+                PipelineItem.rank.asc().nulls_last(), PipelineItem.created_at, PipelineItem.id
+            )
+            .all()
+        )
 
         for item in items:
             recruiter = Recruiter.query.get(item.recruiter_id)
@@ -166,9 +412,10 @@ class ActivityService:
                         "recruiter_id": str(item.recruiter_id),
                         "recruiter_name": recruiter.full_name,
                         "company": recruiter.company,
-                        "position": item.position,
+                        "position": len(pipeline[item.stage]),
+                        "rank": item.rank,
                         "priority_score": item.priority_score,
-                        "days_in_stage": item.days_in_stage,
+                        "days_in_stage": item.current_days_in_stage,
                         "last_activity_date": (
                             item.last_activity_date.isoformat() if item.last_activity_date else None
                         ),
@@ -189,107 +436,368 @@ class ActivityService:
         item_id: str,
         new_stage: str,
         new_position: Optional[int] = None,
+        before_id: Optional[str] = None,
+        after_id: Optional[str] = None,
     ) -> PipelineItem:
         """
         Move a pipeline item to a new stage or position.
 
+        Only the moved item's row is written: it gets a rank key between its
+        new neighbours. The target spot is given by a neighbour card
+        (before_id/after_id) or a 0-based position; with neither the item
+        goes to the end of the stage.
+
         Args:
             user_id: User's ID for verification
             item_id: Pipeline item ID
             new_stage: Target stage
             new_position: Position within stage (optional)
+            before_id: Place the item directly before this item (optional)
+            after_id: Place the item directly after this item (optional)
 
         Returns:
             Updated PipelineItem
         """
-        item = PipelineItem.query.filter_by(id=item_id, user_id=user_id).first()
+        return ActivityService.move_pipeline_items(
+            user_id,
+            [item_id],
+            new_stage,
+            new_position=new_position,
+            before_id=before_id,
+            after_id=after_id,
+        )[0]
 
-        if not item:
-            raise ValueError("Pipeline item not found")
+    @staticmethod
+    def move_pipeline_items(
+        user_id: str,
+        item_ids: List[str],
+        new_stage: str,
+        new_position: Optional[int] = None,
+        before_id: Optional[str] = None,
+        after_id: Optional[str] = None,
+    ) -> List[PipelineItem]:
+        """
+        Move several pipeline items to one spot as a contiguous block.
+
+        Items keep the order given in item_ids. Each moved item is one row
+        update; the rest of the stage is not touched.
+
+        Args:
+            user_id: User's ID for verification
+            item_ids: Pipeline item IDs, in their new order
+            new_stage: Target stage
+            new_position: Position of the first item within the stage (optional)
+            before_id: Place the block directly before this item (optional)
+            after_id: Place the block directly after this item (optional)
 
-        # Validate stage
+        Returns:
+            Updated PipelineItems in the given order
+        """
         valid_stages = [s.value for s in PipelineStage]
         if new_stage not in valid_stages:
             raise ValueError(f"Invalid stage: {new_stage}")
 
-        old_stage = item.stage
-
-        # Update stage if changed
-        if old_stage != new_stage:
-            item.stage = new_stage
-            item.entered_stage_at = datetime.utcnow()
-            item.days_in_stage = 0
-
-            # Log stage change activity
-            ActivityService.log_activity(
-                user_id=user_id,
-                activity_type=ActivityType.STATUS_CHANGE.value,
-                description=f"Moved to {new_stage}",
-                recruiter_id=item.recruiter_id,
-                pipeline_stage=new_stage,
-                previous_stage=old_stage,
+        item_ids = list(dict.fromkeys(str(item_id) for item_id in item_ids))
+        if not item_ids:
+            raise ValueError("No pipeline items given")
+        if len(item_ids) > ActivityService.MAX_BATCH_MOVE:
+            raise ValueError(
+                f"Cannot move more than {ActivityService.MAX_BATCH_MOVE} items at once"
             )
 
-            # Update recruiter status
-            recruiter = Recruiter.query.get(item.recruiter_id)
-            if recruiter:
-                recruiter.status = new_stage
-
-        # Update position
-        if new_position is not None:
-            # Reorder items in the stage
-            items_in_stage = (
-                PipelineItem.query.filter_by(user_id=user_id, stage=new_stage)
-                .filter(PipelineItem.id != item_id)
-                .order_by(PipelineItem.position)
-                .all()
+        found = {
+            str(item.id): item
+            for item in PipelineItem.query.filter(
+                PipelineItem.user_id == user_id, PipelineItem.id.in_(item_ids)
             )
+        }
+        if len(found) != len(item_ids):
+            raise ValueError("Pipeline item not found")
+        items = [found[item_id] for item_id in item_ids]
 
-            # Insert at new position
-            for i, other_item in enumerate(items_in_stage):
-                if i >= new_position:
-                    other_item.position = i + 1
-                else:
-                    other_item.position = i
+        try:
+            low, high = ActivityService._rank_bounds(
+                user_id, new_stage, item_ids, new_position, before_id, after_id
+            )
+            ranks = spread(low, high, len(items))
+        except RankConflict:
+            ranks = None
+        if ranks is None or max(len(rank) for rank in ranks) > ActivityService.RANK_MAX_LENGTH:
+            # Neighbours unranked, tied or out of room: renumber the stage once
+            ActivityService.rebalance_stage(user_id, new_stage)
+            low, high = ActivityService._rank_bounds(
+                user_id, new_stage, item_ids, new_position, before_id, after_id
+            )
+            ranks = spread(low, high, len(items))
+
+        now = datetime.utcnow()
+        changed = []
+        activities = []
+        for item, rank in zip(items, ranks):
+            item.rank = rank
+            item.updated_at = now
+            if item.stage != new_stage:
+                changed.append((item, item.stage))
+                item.stage = new_stage
+                item.entered_stage_at = now
+                item.days_in_stage = 0
+
+        if changed:
+            # Log stage change activities
+            activities = [
+                activity_row(
+                    user_id,
+                    ActivityType.STATUS_CHANGE.value,
+                    description=f"Moved to {new_stage}",
+                    recruiter_id=item.recruiter_id,
+                    pipeline_stage=new_stage,
+                    previous_stage=old_stage,
+                )
+                for item, old_stage in changed
+            ]
+            if ActivityBuffer.add(*activities):
+                activities = []  # Announced when the buffer is written
 
-            item.position = new_position
-        else:
-            # Add to end of stage
-            max_pos = (
-                db.session.query(db.func.max(PipelineItem.position))
-                .filter_by(user_id=user_id, stage=new_stage)
-                .scalar()
-                or -1
+            # Update recruiter status
+            db.session.execute(
+                update(Recruiter)
+                .where(
+                    Recruiter.user_id == user_id,
+                    Recruiter.id.in_([item.recruiter_id for item, _ in changed]),
+                )
+                .values(status=new_stage)
+                .execution_options(synchronize_session="fetch")
             )
-            item.position = max_pos + 1
 
-        item.updated_at = datetime.utcnow()
+        # Built before the commit expires the items
+        moved = {
+            "stage": new_stage,
+            "items": [
+                {
+                    "id": str(item.id),
+                    "recruiter_id": str(item.recruiter_id),
+                    "stage": item.stage,
+                    "rank": item.rank,
+                }
+                for item in items
+            ],
+        }
         db.session.commit()
+        event_stream.publish(user_id, EventType.PIPELINE_MOVED, moved)
+        announce_activities(activities)
+
+        return items
+
+    @staticmethod
+    def last_rank(user_id: str, stage: str) -> Optional[str]:
+        """Highest rank key in a stage (one index lookup), or None if it has none."""
+        return db.session.execute(
+            select(func.max(PipelineItem.rank)).where(
+                PipelineItem.user_id == user_id, PipelineItem.stage == stage
+            )
+        ).scalar()
+
+    @staticmethod
+    def rebalance_stage(user_id: str, stage: str) -> int:
+        """
+        Give every item in a stage a fresh, short, evenly spaced rank key.
+
+        Keeps the current order; unranked items go last, oldest first.
+
+        Returns:
+            Number of items reranked
+        """
+        ids = (
+            db.session.execute(
+                select(PipelineItem.id)
+                .where(PipelineItem.user_id == user_id, PipelineItem.stage == stage)
+                .order_by(
+                    PipelineItem.rank.asc().nulls_last(),
+                    PipelineItem.position,
+                    PipelineItem.created_at,
+                    PipelineItem.id,
+                )
+            )
+            .scalars()
+            .all()
+        )
+        if not ids:
+            return 0
+
+        table = PipelineItem.__table__
+        db.session.execute(
+            update(table)
+            .where(table.c.id == bindparam("item_id"))
+            .values(rank=bindparam("new_rank")),
+            [
+                {"item_id": item_id, "new_rank": rank}
+                for item_id, rank in zip(ids, spread(None, None, len(ids)))
+            ],
+        )
+        # Loaded items would otherwise keep their old keys
+        db.session.expire_all()
+        return len(ids)
+
+    @staticmethod
+    def rebalance_ranks(max_length: Optional[int] = None) -> int:
+        """
+        Rebalance every stage with unranked items or keys over max_length.
+
+        Returns:
+            Number of stages rebalanced
+        """
+        max_length = max_length or ActivityService.RANK_REBALANCE_LENGTH
+        stages = db.session.execute(
+            select(PipelineItem.user_id, PipelineItem.stage)
+            .group_by(PipelineItem.user_id, PipelineItem.stage)
+            .having(
+                (func.max(func.length(PipelineItem.rank)) > max_length)
+                | (func.count() > func.count(PipelineItem.rank))
+            )
+        ).all()
+
+        for user_id, stage in stages:
+            ActivityService.rebalance_stage(user_id, stage)
+            db.session.commit()
 
-        return item
+        return len(stages)
 
     @staticmethod
-    def update_days_in_stage(user_id: str) -> int:
+    def _rank_bounds(
+        user_id: str,
+        stage: str,
+        moving_ids: List[str],
+        position: Optional[int],
+        before_id: Optional[str],
+        after_id: Optional[str],
+    ) -> Tuple[Optional[str], Optional[str]]:
         """
-        Update days_in_stage for all pipeline items.
+        Rank keys of the neighbours around the target spot in a stage.
 
-        Should be run periodically (e.g., daily).
+        Raises:
+            RankConflict: If a neighbour is unranked or two neighbours share a key
+        """
+        ranked = select(PipelineItem.rank).where(
+            PipelineItem.user_id == user_id,
+            PipelineItem.stage == stage,
+            PipelineItem.rank.isnot(None),
+            PipelineItem.id.notin_(moving_ids),
+        )
+
+        def anchor_rank(item_id):
+            if str(item_id) in moving_ids:
+                raise ValueError("Cannot place items next to an item being moved")
+            row = db.session.execute(
+                select(PipelineItem.rank).where(
+                    PipelineItem.id == item_id,
+                    PipelineItem.user_id == user_id,
+                    PipelineItem.stage == stage,
+                )
+            ).first()
+            if row is None:
+                raise ValueError("Neighbour item not found in target stage")
+            if row[0] is None:
+                raise RankConflict()
+            return row[0]
+
+        if after_id:
+            low = anchor_rank(after_id)
+            high = db.session.execute(
+                ranked.with_only_columns(func.min(PipelineItem.rank)).where(PipelineItem.rank > low)
+            ).scalar()
+        elif before_id:
+            high = anchor_rank(before_id)
+            low = db.session.execute(
+                ranked.with_only_columns(func.max(PipelineItem.rank)).where(
+                    PipelineItem.rank < high
+                )
+            ).scalar()
+        elif position is not None and position > 0:
+            rows = (
+                db.session.execute(ranked.order_by(PipelineItem.rank).offset(position - 1).limit(2))
+                .scalars()
+                .all()
+            )
+            if rows:
+                low, high = rows[0], rows[1] if len(rows) > 1 else None
+            else:
+                low, high = (
+                    db.session.execute(
+                        ranked.with_only_columns(func.max(PipelineItem.rank))
+                    ).scalar(),
+                    None,
+                )
+        elif position is not None:
+            low = None
+            high = db.session.execute(
+                ranked.with_only_columns(func.min(PipelineItem.rank))
+            ).scalar()
+        else:
+            low = db.session.execute(ranked.with_only_columns(func.max(PipelineItem.rank))).scalar()
+            high = None
+
+        if low is not None and high is not None and low >= high:
+            raise RankConflict()
+        return low, high
+
+    @staticmethod
+    def update_days_in_stage(user_id: Optional[str] = None, chunk_size: int = 10000) -> int:
+        """
+        Bring stored days_in_stage up to date from entered_stage_at.
+
+        Runs nightly for all users. The table is walked in primary-key
+        ranges of chunk_size items, each brought up to date by one UPDATE
+        that only rewrites rows whose value changed, committed per chunk.
+        API responses derive days in stage at read time
+        (PipelineItem.current_days_in_stage); the stored value feeds
+        aggregate stats and sorting.
+
+        Args:
+            user_id: Only update this user's items (default: all users)
+            chunk_size: Primary-key range size per UPDATE
 
         Returns:
             Number of items updated
         """
-        items = PipelineItem.query.filter_by(user_id=user_id).all()
+        now = datetime.utcnow()
+        days = days_since(now, PipelineItem.entered_stage_at)
+
+        updated = 0
+        last_id = None
+        while True:
+            # Upper bound of the next range: an index-only read, no rows fetched
+            bound_query = (
+                select(PipelineItem.id).order_by(PipelineItem.id).offset(chunk_size - 1).limit(1)
+            )
+            conditions = [
+                PipelineItem.entered_stage_at.isnot(None),
+                PipelineItem.days_in_stage.is_distinct_from(days),
+            ]
+            if user_id is not None:
+                bound_query = bound_query.where(PipelineItem.user_id == user_id)
+                conditions.append(PipelineItem.user_id == user_id)
+            if last_id is not None:
+                bound_query = bound_query.where(PipelineItem.id > last_id)
+                conditions.append(PipelineItem.id > last_id)
+
+            bound = db.session.execute(bound_query).scalar()
+            if bound is not None:
+                conditions.append(PipelineItem.id <= bound)
+
+            result = db.session.execute(
+                update(PipelineItem)
+                .where(*conditions)
+                .values(days_in_stage=days)
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+            updated += result.rowcount
 
-        count = 0
-        for item in items:
-            if item.entered_stage_at:
-                days = (datetime.utcnow() - item.entered_stage_at).days
-                if days != item.days_in_stage:
-                    item.days_in_stage = days
-                    count += 1
+            if bound is None:
+                break
+            last_id = bound
 
-        db.session.commit()
-        return count
+        return updated
 
     @staticmethod
     def update_priority_scores(user_id: str) -> int:
@@ -301,42 +809,54 @@ class ActivityService:
         Returns:
             Number of items updated
         """
-        items = PipelineItem.query.filter_by(user_id=user_id).all()
-
-        count = 0
-        for item in items:
-            recruiter = Recruiter.query.get(item.recruiter_id)
-            if not recruiter:
-                continue
-
-            days_since = 0
-            if recruiter.last_contact_date:
-                days_since = (datetime.utcnow() - recruiter.last_contact_date).days
-
-            pending_actions = 1 if item.next_action else 0
-
-            new_score = calculate_priority_score(
-                days_since_contact=days_since,
-                pending_actions=pending_actions,
-                engagement_score=recruiter.engagement_score or 50,
-                fit_score=recruiter.fit_score or 50,
-                has_responded=recruiter.has_responded or False,
-                status=item.stage,
+        rows = db.session.execute(
+            select(
+                PipelineItem.id,
+                PipelineItem.recruiter_id,
+                PipelineItem.priority_score,
+                Recruiter.last_contact_date,
+                PipelineItem.next_action,
+                Recruiter.has_responded,
+                Recruiter.engagement_score,
+                Recruiter.fit_score,
+                PipelineItem.stage,
             )
+            .join(Recruiter, Recruiter.id == PipelineItem.recruiter_id)
+            .where(PipelineItem.user_id == user_id)
+        ).all()
+
+        # Pipeline items count only their own next action as pending, so
+        # messages_sent is passed as 0
+        scores = score_priorities(
+            (last_contact, next_action, 0, responded, engagement, fit, stage)
+            for _, _, _, last_contact, next_action, responded, engagement, fit, stage in rows
+        )
 
-            if new_score != item.priority_score:
-                item.priority_score = new_score
-                recruiter.priority_score = new_score
-                count += 1
+        changed = [(row, score) for row, score in zip(rows, scores) if score != row[2]]
+        if changed:
+            db.session.execute(
+                update(PipelineItem.__table__)
+                .where(PipelineItem.__table__.c.id == bindparam("item_id"))
+                .values(priority_score=bindparam("score")),
+                [{"item_id": row[0], "score": score} for row, score in changed],
+            )
+            db.session.execute(
+                update(Recruiter.__table__)
+                .where(Recruiter.__table__.c.id == bindparam("recruiter_id"))
+                .values(priority_score=bindparam("score")),
+                [{"recruiter_id": row[1], "score": score} for row, score in changed],
+            )
 
         db.session.commit()
-        return count
+        return len(changed)
 
     @staticmethod
     def get_pipeline_stats(user_id: str) -> Dict:
         """
         Get pipeline statistics for dashboard.
 
+        Computed with one grouped aggregate rather than loading every item.
+
         Returns:
             Dictionary with stage counts and metrics
         """
@@ -348,34 +868,41 @@ class ActivityService:
             "stale_items": 0,  # No activity in 14+ days
         }
 
-        items = PipelineItem.query.filter_by(user_id=user_id).all()
-        stats["total"] = len(items)
-
         # Initialize stage counts
         for stage in PipelineStage:
             stats["by_stage"][stage.value] = 0
             stats["avg_days_in_stage"][stage.value] = 0
 
-        if not items:
-            return stats
-
-        # Calculate metrics
-        stage_days = {stage.value: [] for stage in PipelineStage}
-
-        for item in items:
-            stats["by_stage"][item.stage] += 1
-            stage_days[item.stage].append(item.days_in_stage or 0)
-
-            if item.next_action:
-                stats["items_needing_action"] += 1
-
-            if item.days_in_stage and item.days_in_stage >= 14:
-                stats["stale_items"] += 1
+        days = func.coalesce(PipelineItem.days_in_stage, 0)
+        rows = db.session.execute(
+            select(
+                PipelineItem.stage,
+                func.count(),
+                func.sum(days),
+                func.sum(
+                    case(
+                        (
+                            and_(
+                                PipelineItem.next_action.isnot(None), PipelineItem.next_action != ""
+                            ),
+                            1,
+                        ),
+                        else_=0,
+                    )
+                ),
+                func.sum(case((PipelineItem.days_in_stage >= 14, 1), else_=0)),
+            )
+            .where(PipelineItem.user_id == user_id)
+            .group_by(PipelineItem.stage)
+        ).all()
 
-        # Calculate averages
-        for stage, days_list in stage_days.items():
-            if days_list:
-                stats["avg_days_in_stage"][stage] = round(sum(days_list) / len(days_list), 1)
+        for stage, count, days_total, needing_action, stale in rows:
+            stats["total"] += count
+            stats["items_needing_action"] += needing_action or 0
+            stats["stale_items"] += stale or 0
+            if stage in stats["by_stage"]:
+                stats["by_stage"][stage] = count
+                stats["avg_days_in_stage"][stage] = round((days_total or 0) / count, 1)
 
         return stats
 
@@ -401,7 +928,7 @@ class ActivityService:
         if recruiter_id:
             query = query.filter_by(recruiter_id=recruiter_id)
 
-        activities = query.order_by(Activity.created_at.desc()).limit(limit).all()
+        activities = ActivityService._newest(query, limit)
 
         timeline = []
         for activity in activities:
@@ -458,33 +985,18 @@ class ActivityService:
             Dictionary with weekly metrics and highlights
         """
         start_of_week = datetime.utcnow() - timedelta(days=7)
-
-        activities = Activity.query.filter(
-            Activity.user_id == user_id, Activity.created_at >= start_of_week
-        ).all()
+        by_type = ActivityService._counts_by_type(user_id, start_of_week)
 
         summary = {
-            "total_activities": len(activities),
-            "messages_sent": 0,
-            "responses_received": 0,
-            "interviews_scheduled": 0,
-            "recruiters_added": 0,
-            "resumes_tailored": 0,
+            "total_activities": sum(by_type.values()),
+            "messages_sent": by_type.get(ActivityType.MESSAGE_SENT.value, 0),
+            "responses_received": by_type.get(ActivityType.RESPONSE_RECEIVED.value, 0),
+            "interviews_scheduled": by_type.get(ActivityType.INTERVIEW_SCHEDULED.value, 0),
+            "recruiters_added": by_type.get(ActivityType.RECRUITER_ADDED.value, 0),
+            "resumes_tailored": by_type.get(ActivityType.RESUME_TAILORED.value, 0),
             "highlights": [],
         }
 
-        for activity in activities:
-            if activity.activity_type == ActivityType.MESSAGE_SENT.value:
-                summary["messages_sent"] += 1
-            elif activity.activity_type == ActivityType.RESPONSE_RECEIVED.value:
-                summary["responses_received"] += 1
-            elif activity.activity_type == ActivityType.INTERVIEW_SCHEDULED.value:
-                summary["interviews_scheduled"] += 1
-            elif activity.activity_type == ActivityType.RECRUITER_ADDED.value:
-                summary["recruiters_added"] += 1
-            elif activity.activity_type == ActivityType.RESUME_TAILORED.value:
-                summary["resumes_tailored"] += 1
-
         # Generate highlights
         if summary["responses_received"] > 0:
             summary["highlights"].append(f"Received {summary['responses_received']} response(s)")
@@ -0,0 +1,257 @@
+"""
+Event Stream
+
+Typed per-user events pushed to clients with Server-Sent Events, so open
+tabs see pipeline moves, new activities and notifications, and webhook
+subscription changes without re-fetching the dashboard.
+
+Each event is appended to the user's Redis stream (events:<user_id>),
+capped at HISTORY entries. The entry id is the SSE event id, so a client
+that reconnects with Last-Event-ID receives exactly what it missed. Every
+append is followed by a PUBLISH on the user's channel
+(events:notify:<user_id>); one pattern subscription per web process wakes
+that user's open responses, which then read the new entries with a
+non-blocking XRANGE. An idle open stream holds no Redis connection.
+
+Events are published after the change commits and publishing never
+raises: without Redis, events are dropped and clients keep fetching.
+"""
+
+import json
+import logging
+import re
+import threading
+import time
+from collections import defaultdict
+from enum import Enum
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import redis
+
+from app.extensions import db, redis_pool
+
+logger = logging.getLogger(__name__)
+
+_EVENT_ID = re.compile(r"^\d+-\d+$")
+
+
+class EventType(str, Enum):
+    """Type of a pushed event."""
+
+    PIPELINE_MOVED = "pipeline.moved"
+    ACTIVITY_LOGGED = "activity.logged"
+    NOTIFICATION_CREATED = "notification.created"
+    SUBSCRIPTION_UPDATED = "subscription.updated"
+    # Sent by the stream itself: where it starts, or that history was lost
+    # and the client should re-fetch everything
+    STREAM_READY = "stream.ready"
+    STREAM_RESET = "stream.reset"
+
+
+class EventStream:
+    """Per-user event history in Redis streams, with pub/sub wake-ups."""
+
+    STREAM_PREFIX = "events:"
+    CHANNEL_PREFIX = "events:notify:"
+    HISTORY = 500  # events kept per user for resuming
+    STREAM_TTL = 86400  # history of users with no new events expires after a day
+    READ_BATCH = 100
+    POLL_SECONDS = 1.0  # re-read interval while pub/sub is unavailable
+
+    def __init__(self):
+        self._subscriber = None
+        self._subscriber_client = None
+        self._waiters = defaultdict(set)
+        self._lock = threading.Lock()
+
+    # ─── Publishing ─────────────────────────────────────────────────────
+
+    def publish(self, user_id, event_type: EventType, data: Dict) -> None:
+        """Append one event to a user's stream and wake their open streams."""
+        self.publish_many([(user_id, event_type, data)])
+
+    def publish_many(self, events: Iterable[Tuple]) -> None:
+        """Publish (user_id, event_type, data) events in one round trip."""
+        client = redis_pool.client
+        events = list(events)
+        if client is None or not events:
+            return
+
+        try:
+            pipe = client.pipeline(transaction=False)
+            user_ids = []
+            for user_id, event_type, data in events:
+                user_id = str(user_id)
+                key = self._key(user_id)
+                pipe.xadd(
+                    key,
+                    {"type": EventType(event_type).value, "data": json.dumps(data, default=str)},
+                    maxlen=self.HISTORY,
+                    approximate=True,
+                )
+                pipe.expire(key, self.STREAM_TTL)
+                user_ids.append(user_id)
+            for user_id in dict.fromkeys(user_ids):
+                pipe.publish(f"{self.CHANNEL_PREFIX}{user_id}", "")
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Event stream: Redis error ({e}), {len(events)} events dropped")
+
+    # ─── Reading ────────────────────────────────────────────────────────
+
+    def read(self, user_id, after: str, count: int = READ_BATCH) -> List[Dict]:
+        """Events after the given event id, oldest first."""
+        client = redis_pool.client
+        if client is None:
+            return []
+        try:
+            entries = client.xrange(self._key(str(user_id)), min=f"({after}", count=count)
+        except redis.RedisError as e:
+            logger.warning(f"Event stream: Redis error ({e})")
+            return []
+        return [self._decode(entry_id, fields) for entry_id, fields in entries]
+
+    def wait(self, user_id, after: str, timeout: float) -> List[Dict]:
+        """
+        Events after the given id, waiting up to `timeout` seconds for one.
+
+        The session's database connection is released while waiting.
+        """
+        client = redis_pool.client
+        if client is None or timeout <= 0:
+            return self.read(user_id, after)
+
+        user_id = str(user_id)
+        published = threading.Event()
+        # Registered before reading, so an event in between still wakes us
+        with self._lock:
+            self._waiters[user_id].add(published)
+        try:
+            events = self.read(user_id, after)
+            if events:
+                return events
+            if not self._ensure_subscriber(client):
+                timeout = min(timeout, self.POLL_SECONDS)  # no wake-ups: poll instead
+            db.session.close()
+            published.wait(timeout)
+        finally:
+            with self._lock:
+                waiters = self._waiters[user_id]
+                waiters.discard(published)
+                if not waiters:
+                    del self._waiters[user_id]
+
+        return self.read(user_id, after)
+
+    def sse(self, user_id, last_event_id: Optional[str], seconds: float, retry_ms: int) -> Iterator:
+        """
+        Server-Sent Events for one response.
+
+        Starts with a stream.ready event (or stream.reset, when events after
+        last_event_id are no longer kept) whose id is the resume point, then
+        sends events as they are published for `seconds` and ends. With
+        seconds = 0 the response only carries what was missed, and the
+        client reconnects after retry_ms.
+        """
+        user_id = str(user_id)
+        cursor, reset = self._start(user_id, last_event_id)
+        if redis_pool.client is None:
+            seconds = 0  # Nothing will arrive; let the client back off
+
+        yield f"retry: {retry_ms}\n\n"
+        start_type = EventType.STREAM_RESET if reset else EventType.STREAM_READY
+        yield self._format({"id": cursor, "type": start_type.value, "data": {}})
+
+        deadline = time.monotonic() + seconds
+        while True:
+            remaining = deadline - time.monotonic()
+            events = self.wait(user_id, cursor, remaining)
+            for event in events:
+                cursor = event["id"]
+                yield self._format(event)
+            if len(events) >= self.READ_BATCH:
+                continue  # More backlog
+            if time.monotonic() >= deadline:
+                return
+            if not events:
+                yield ": keepalive\n\n"
+
+    # ─── Helpers ────────────────────────────────────────────────────────
+
+    def _key(self, user_id: str) -> str:
+        return f"{self.STREAM_PREFIX}{user_id}"
+
+    def _start(self, user_id: str, last_event_id: Optional[str]) -> Tuple[str, bool]:
+        """Resume point for a new response, and whether history was lost."""
+        client = redis_pool.client
+        if client is None:
+            return "0-0", False
+
+        key = self._key(user_id)
+        try:
+            newest = client.xrevrange(key, count=1)
+            latest = newest[0][0] if newest else "0-0"
+            if not last_event_id or not _EVENT_ID.match(last_event_id):
+                return latest, False
+            if self._id_tuple(last_event_id) >= self._id_tuple(latest):
+                return last_event_id if newest else latest, not newest and last_event_id != "0-0"
+
+            # The resume point is no longer kept (trimmed, or the stream
+            # expired and restarted), so events after it may be gone too.
+            # "0-0" (a stream that was empty) only loses them once trimmed.
+            oldest = client.xrange(key, count=1)[0][0]
+            if self._id_tuple(last_event_id) < self._id_tuple(oldest):
+                if last_event_id != "0-0" or client.xlen(key) >= self.HISTORY:
+                    return latest, True
+            return last_event_id, False
+        except redis.RedisError as e:
+            logger.warning(f"Event stream: Redis error ({e})")
+            return "0-0", False
+
+    @staticmethod
+    def _id_tuple(event_id: str) -> Tuple[int, int]:
+        milliseconds, sequence = event_id.split("-")
+        return int(milliseconds), int(sequence)
+
+    @staticmethod
+    def _decode(entry_id: str, fields: Dict) -> Dict:
+        return {"id": entry_id, "type": fields["type"], "data": json.loads(fields["data"])}
+
+    @staticmethod
+    def _format(event: Dict) -> str:
+        data = json.dumps(event["data"], default=str)
+        return f"id: {event['id']}\nevent: {event['type']}\ndata: {data}\n\n"
+
+    def _ensure_subscriber(self, client) -> bool:
+        """Start this process's event listener if it is not running."""
+        with self._lock:
+            if (
+                self._subscriber is not None
+                and self._subscriber_client is client
+                and self._subscriber.is_alive()
+            ):
+                return True
+            if self._subscriber is not None:
+                self._subscriber.stop()
+                self._subscriber = None
+
+            try:
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(**{f"{self.CHANNEL_PREFIX}*": self._on_publish})
+                self._subscriber = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+                self._subscriber_client = client
+            except redis.RedisError as e:
+                logger.warning(f"Event stream: pub/sub unavailable ({e})")
+                return False
+            return True
+
+    def _on_publish(self, message) -> None:
+        user_id = message["channel"][len(self.CHANNEL_PREFIX) :]
+        with self._lock:
+            waiters = list(self._waiters.get(user_id, ()))
+        for published in waiters:
+            published.set()
+
+
+# Shared instance
+event_stream = EventStream()
@@ -12,6 +12,8 @@ from typing import Dict, List, Optional
 
 import httpx
 
+from app.extensions import cache
+
 
 class LaborMarketService:
     """
@@ -169,6 +171,7 @@ class LaborMarketService:
         }
 
     @classmethod
+    @cache.cached("labor_market.shortage", timeout=60)
     def calculate_shortage_score(
         cls,
         role: str,
@@ -455,6 +458,7 @@ class LaborMarketService:
         return result
 
     @classmethod
+    @cache.cached("labor_market.salary", timeout=600)
     def get_salary_benchmark(
         cls,
         role: str,
@@ -575,6 +579,7 @@ class LaborMarketService:
         }
 
     @classmethod
+    @cache.cached("labor_market.outlook", timeout=600)
     def get_job_outlook(cls, role: str) -> Dict:
         """
         Get detailed job outlook for a role.
@@ -868,6 +873,7 @@ class LaborMarketService:
 
 
 # Synchronous wrappers for Flask routes
+@cache.cached("labor_market.overview", timeout=600)
 def get_market_overview_sync() -> Dict:
     """Synchronous wrapper for get_market_overview."""
     import asyncio
@@ -2,11 +2,31 @@
 LinkedIn Optimizer Service
 
 Provides LinkedIn profile optimization, headline generation, and visibility scoring.
+
+Profile analysis, visibility scoring and keyword coverage share one read
+of the profile (each text field lowercased once, headline keywords counted
+once), memoized in-process per profile-content hash: the UI re-requests
+them on every debounced edit, usually for content it has already sent.
 """
 
+import hashlib
+import json
 import re
+import threading
+from collections import OrderedDict
 from typing import Dict, List, Optional
 
+# orjson is optional — it only speeds up building the profile-content key
+try:
+    import orjson
+
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Profiles whose analysis is kept per process
+ANALYSIS_CACHE_SIZE = 1024
+
 
 class LinkedInService:
     """
@@ -139,6 +159,28 @@ class LinkedInService:
         "transformed",
     ]
 
+    # Every industry keyword once, in first-seen order (built at import;
+    # each is tested as a substring of the lowercased text)
+    ALL_KEYWORDS = tuple(
+        dict.fromkeys(keyword for keywords in INDUSTRY_KEYWORDS.values() for keyword in keywords)
+    )
+
+    # Suggested for industries without their own list
+    GENERIC_KEYWORDS = ["professional", "experienced", "dedicated", "results-driven"]
+
+    KEYWORD_USAGE_TIPS = [
+        "Include 3-5 keywords in your headline",
+        "Weave keywords naturally into your summary",
+        "Use keywords in experience descriptions",
+        "Add relevant keywords as skills",
+    ]
+
+    VALUE_PROPOSITION_WORDS = ("help", "specialize", "expert", "leader")
+    CTA_PHRASES = ("reach out", "connect", "let's chat", "contact")
+
+    _analysis_cache = OrderedDict()
+    _analysis_lock = threading.Lock()
+
     @classmethod
     def analyze_profile(
         cls,
@@ -151,21 +193,134 @@ class LinkedInService:
             profile_data: Dictionary with profile sections
 
         Returns:
-            Analysis with scores and recommendations
+            Analysis with scores and recommendations (shared with later
+            calls for the same profile; treat as read-only)
+        """
+        return cls._analyze(profile_data)["analysis"]
+
+    @classmethod
+    def build_report(
+        cls,
+        profile_data: Dict,
+        current_role: Optional[str] = None,
+        target_role: Optional[str] = None,
+        industry: Optional[str] = None,
+        key_skills: Optional[List[str]] = None,
+        achievements: Optional[List[str]] = None,
+    ) -> Dict:
+        """
+        Profile analysis, visibility, keyword coverage and headline
+        suggestions from one read of the profile.
+
+        Args:
+            profile_data: Dictionary with profile sections
+            current_role: Current job title (no headlines without one)
+            target_role: Target job title (if different)
+            industry: Industry for keywords and headlines (default: the profile's)
+            key_skills: Skills to highlight (default: the profile's first three)
+            achievements: Key achievements to mention
+
+        Returns:
+            Report with analysis, visibility, keywords and headlines
         """
+        result = cls._analyze(profile_data)
+        industry = industry or profile_data.get("industry")
+
+        headlines = None
+        if current_role:
+            headlines = cls.generate_headline(
+                current_role=current_role,
+                target_role=target_role,
+                industry=industry,
+                key_skills=key_skills or (profile_data.get("skills") or [])[:3],
+                achievements=achievements,
+            )
+
+        return {
+            "analysis": result["analysis"],
+            "visibility": result["visibility"],
+            "keywords": cls._keyword_coverage(result["text"], industry),
+            "headlines": headlines,
+        }
+
+    @classmethod
+    def _analyze(cls, profile_data: Dict) -> Dict:
+        """
+        Profile analysis and visibility score, computed together from one
+        read of the profile once per profile content and kept (with the
+        lowercased text) in a per-process LRU.
+        """
+        content_key = cls._content_key(profile_data)
+        with cls._analysis_lock:
+            result = cls._analysis_cache.get(content_key)
+            if result is not None:
+                cls._analysis_cache.move_to_end(content_key)
+                return result
+
+        # Shared by every score
+        text = cls._read_text(profile_data)
+        headline_keywords = cls._count_keywords(text["headline"])
+        completeness = cls._calculate_completeness(profile_data)
+
+        result = {
+            "analysis": cls._score_profile(profile_data, text, headline_keywords, completeness),
+            "visibility": cls._score_visibility(profile_data, headline_keywords, completeness),
+            "text": text,
+        }
+        with cls._analysis_lock:
+            cls._analysis_cache[content_key] = result
+            while len(cls._analysis_cache) > ANALYSIS_CACHE_SIZE:
+                cls._analysis_cache.popitem(last=False)
+        return result
+
+    @staticmethod
+    def _content_key(profile_data: Dict) -> bytes:
+        """Digest of the profile's content, independent of key order."""
+        encoded = None
+        if HAS_ORJSON:
+            try:
+                encoded = orjson.dumps(
+                    profile_data, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+                )
+            except orjson.JSONEncodeError:
+                pass  # e.g. integers wider than 64 bits
+        if encoded is None:
+            encoded = json.dumps(profile_data, sort_keys=True, default=str).encode()
+        return hashlib.sha1(encoded).digest()
+
+    @staticmethod
+    def _read_text(profile_data: Dict) -> Dict[str, str]:
+        """Each searchable text field of the profile, lowercased once."""
+        experience = profile_data.get("experience") or []
+        return {
+            "headline": (profile_data.get("headline") or "").lower(),
+            "summary": (profile_data.get("summary") or "").lower(),
+            "experience": " ".join(exp.get("description") or "" for exp in experience).lower(),
+            "skills": " ".join(str(skill) for skill in profile_data.get("skills") or []).lower(),
+        }
+
+    @classmethod
+    def _score_profile(
+        cls, profile_data: Dict, text: Dict[str, str], headline_keywords: int, completeness: int
+    ) -> Dict:
+        """Section scores, recommendations and total for analyze_profile."""
         scores = {}
         recommendations = []
 
         # Analyze each section
-        headline_analysis = cls._analyze_headline(profile_data.get("headline", ""))
+        headline_analysis = cls._analyze_headline(
+            profile_data.get("headline", ""), text["headline"], headline_keywords
+        )
         scores["headline"] = headline_analysis["score"]
         recommendations.extend(headline_analysis["recommendations"])
 
-        summary_analysis = cls._analyze_summary(profile_data.get("summary", ""))
+        summary_analysis = cls._analyze_summary(text["summary"])
         scores["summary"] = summary_analysis["score"]
         recommendations.extend(summary_analysis["recommendations"])
 
-        experience_analysis = cls._analyze_experience(profile_data.get("experience", []))
+        experience_analysis = cls._analyze_experience(
+            profile_data.get("experience", []), text["experience"]
+        )
         scores["experience"] = experience_analysis["score"]
         recommendations.extend(experience_analysis["recommendations"])
 
@@ -175,9 +330,6 @@ class LinkedInService:
         scores["skills"] = skills_analysis["score"]
         recommendations.extend(skills_analysis["recommendations"])
 
-        # Calculate completeness
-        completeness = cls._calculate_completeness(profile_data)
-
         # Calculate total score
         total_score = int(
             scores.get("headline", 0) * 0.20
@@ -399,7 +551,8 @@ class LinkedInService:
 
         # Analyze current description
         has_metrics = bool(re.search(r"\d+%|\$\d+|\d+ (year|month|people|team)", description))
-        has_power_words = any(word in description.lower() for word in cls.POWER_WORDS)
+        description_lower = description.lower()
+        has_power_words = any(word in description_lower for word in cls.POWER_WORDS)
         bullet_count = description.count("•") + description.count("-")
 
         # Generate optimized bullets
@@ -452,14 +605,20 @@ class LinkedInService:
             profile_data: Profile information
 
         Returns:
-            Visibility score with improvement suggestions
+            Visibility score with improvement suggestions (shared with later
+            calls for the same profile; treat as read-only)
         """
+        return cls._analyze(profile_data)["visibility"]
+
+    @classmethod
+    def _score_visibility(
+        cls, profile_data: Dict, headline_keywords: int, completeness: int
+    ) -> Dict:
+        """Visibility factors and total for calculate_visibility_score."""
         score = 0
         factors = {}
 
         # Headline keywords (25 points)
-        headline = profile_data.get("headline", "")
-        headline_keywords = cls._count_keywords(headline)
         headline_score = min(25, headline_keywords * 5)
         factors["headline_keywords"] = headline_score
         score += headline_score
@@ -485,7 +644,6 @@ class LinkedInService:
         score += experience_score
 
         # Completeness (15 points)
-        completeness = cls._calculate_completeness(profile_data)
         completeness_score = int(completeness * 0.15)
         factors["completeness"] = completeness_score
         score += completeness_score
@@ -500,7 +658,7 @@ class LinkedInService:
     # Private helper methods
 
     @classmethod
-    def _analyze_headline(cls, headline: str) -> Dict:
+    def _analyze_headline(cls, headline: str, headline_lower: str, keyword_count: int) -> Dict:
         """Analyze headline quality."""
         if not headline:
             return {
@@ -518,14 +676,13 @@ class LinkedInService:
             score += 10
 
         # Check for keywords
-        keyword_count = cls._count_keywords(headline)
         if keyword_count >= 2:
             score += 20
         else:
             recommendations.append("Add industry-relevant keywords to your headline")
 
         # Check for value proposition
-        if any(word in headline.lower() for word in ["help", "specialize", "expert", "leader"]):
+        if any(word in headline_lower for word in cls.VALUE_PROPOSITION_WORDS):
             score += 15
         else:
             recommendations.append("Include a value proposition in your headline")
@@ -540,9 +697,9 @@ class LinkedInService:
         }
 
     @classmethod
-    def _analyze_summary(cls, summary: str) -> Dict:
-        """Analyze summary/about section."""
-        if not summary:
+    def _analyze_summary(cls, summary_lower: str) -> Dict:
+        """Analyze summary/about section (given lowercased)."""
+        if not summary_lower:
             return {
                 "score": 0,
                 "recommendations": ["Write a compelling About section"],
@@ -552,7 +709,7 @@ class LinkedInService:
         recommendations = []
 
         # Check length
-        word_count = len(summary.split())
+        word_count = len(summary_lower.split())
         if word_count < 50:
             recommendations.append("Expand your summary (aim for 200-300 words)")
         elif word_count >= 150:
@@ -561,23 +718,20 @@ class LinkedInService:
             score += 10
 
         # Check for metrics/numbers
-        if re.search(r"\d+", summary):
+        if re.search(r"\d+", summary_lower):
             score += 15
         else:
             recommendations.append("Add specific numbers and achievements")
 
         # Check for power words
-        power_word_count = sum(1 for word in cls.POWER_WORDS if word in summary.lower())
+        power_word_count = sum(1 for word in cls.POWER_WORDS if word in summary_lower)
         if power_word_count >= 3:
             score += 15
         else:
             recommendations.append("Use action verbs like achieved, built, led, grew")
 
         # Check for CTA
-        if any(
-            phrase in summary.lower()
-            for phrase in ["reach out", "connect", "let's chat", "contact"]
-        ):
+        if any(phrase in summary_lower for phrase in cls.CTA_PHRASES):
             score += 10
         else:
             recommendations.append("End with a call-to-action")
@@ -588,7 +742,7 @@ class LinkedInService:
         }
 
     @classmethod
-    def _analyze_experience(cls, experience: List[Dict]) -> Dict:
+    def _analyze_experience(cls, experience: List[Dict], descriptions_lower: str) -> Dict:
         """Analyze experience section."""
         if not experience:
             return {
@@ -613,14 +767,13 @@ class LinkedInService:
             recommendations.append("Add descriptions to all experience entries")
 
         # Check for metrics
-        all_descriptions = " ".join(exp.get("description", "") for exp in experience)
-        if re.search(r"\d+%|\$\d+", all_descriptions):
+        if re.search(r"\d+%|\$\d+", descriptions_lower):
             score += 15
         else:
             recommendations.append("Add quantified achievements (%, $, numbers)")
 
         # Check for bullets
-        if "•" in all_descriptions or "-" in all_descriptions:
+        if "•" in descriptions_lower or "-" in descriptions_lower:
             score += 10
         else:
             recommendations.append("Use bullet points for readability")
@@ -686,19 +839,31 @@ class LinkedInService:
 
         return int((completed / 8) * 100)
 
+    @classmethod
+    def _keyword_coverage(cls, text: Dict[str, str], industry: Optional[str]) -> Dict:
+        """Which of an industry's keywords the profile uses, and where."""
+        keywords = cls.INDUSTRY_KEYWORDS.get((industry or "").lower()) or cls.GENERIC_KEYWORDS
+        fields = {
+            field: [keyword for keyword in keywords if keyword in value]
+            for field, value in text.items()
+        }
+        used = {keyword for found in fields.values() for keyword in found}
+
+        return {
+            "industry": industry,
+            "keywords": keywords,
+            "found": [keyword for keyword in keywords if keyword in used],
+            "missing": [keyword for keyword in keywords if keyword not in used],
+            "by_section": fields,
+            "coverage_percent": int(len(used) / len(keywords) * 100),
+            "usage_tips": cls.KEYWORD_USAGE_TIPS,
+        }
+
     @staticmethod
     def _count_keywords(text: str) -> int:
-        """Count industry keywords in text."""
+        """Count distinct industry keywords in text."""
         text_lower = text.lower()
-        count = 0
-        all_keywords = set()
-        for keywords in LinkedInService.INDUSTRY_KEYWORDS.values():
-            all_keywords.update(keywords)
-
-        for keyword in all_keywords:
-            if keyword in text_lower:
-                count += 1
-        return count
+        return sum(1 for keyword in LinkedInService.ALL_KEYWORDS if keyword in text_lower)
 
     @staticmethod
     def _interpret_score(score: int) -> str:
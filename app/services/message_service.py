@@ -4,13 +4,21 @@ Message Service
 Handles message generation, quality scoring, and outreach management.
 """
 
+import uuid
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
+from sqlalchemy.orm import load_only
+
 from app.extensions import db
 from app.models.message import Message, MessageStatus
 from app.models.recruiter import Recruiter
 from app.services.scoring.message import calculate_message_quality, validate_message_length
+from app.utils.pagination import KeysetPage, keyset_order, keyset_paginate, order_clauses
+
+# Most drafts scored by one score_drafts call
+MAX_SCORE_BATCH = 100
+MAX_DRAFT_LENGTH = 10000
 
 # Message templates for AI generation context
 MESSAGE_TEMPLATES = {
@@ -171,6 +179,59 @@ class MessageService:
         Returns:
             Tuple of (message list, total count)
         """
+        query = MessageService._user_messages_query(user_id, recruiter_id, status, message_type)
+
+        total = query.count()
+
+        order = keyset_order([(Message.created_at, True)], Message.id)
+        messages = query.order_by(*order_clauses(order)).offset(offset).limit(limit).all()
+
+        return messages, total
+
+    @staticmethod
+    def get_user_messages_page(
+        user_id: str,
+        recruiter_id: Optional[str] = None,
+        status: Optional[str] = None,
+        message_type: Optional[str] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        total: str = "none",
+    ) -> KeysetPage:
+        """
+        Get one keyset-paginated page of a user's messages, newest first.
+
+        Args:
+            user_id: User's ID
+            recruiter_id: Filter by recruiter
+            status: Filter by status
+            message_type: Filter by message type
+            limit: Page size
+            cursor: next_cursor from the previous page, None for the first page
+            total: "none", "approximate" or "exact"
+
+        Returns:
+            KeysetPage of messages
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+        """
+        return keyset_paginate(
+            MessageService._user_messages_query(user_id, recruiter_id, status, message_type),
+            keyset_order([(Message.created_at, True)], Message.id),
+            sort="created",
+            limit=limit,
+            cursor=cursor,
+            total=total,
+        )
+
+    @staticmethod
+    def _user_messages_query(
+        user_id: str,
+        recruiter_id: Optional[str] = None,
+        status: Optional[str] = None,
+        message_type: Optional[str] = None,
+    ):
         query = Message.query.filter_by(user_id=user_id)
 
         if recruiter_id:
@@ -180,11 +241,7 @@ class MessageService:
         if message_type:
             query = query.filter_by(message_type=message_type)
 
-        total = query.count()
-
-        messages = query.order_by(Message.created_at.desc()).offset(offset).limit(limit).all()
-
-        return messages, total
+        return query
 
     @staticmethod
     def update_message(
@@ -406,6 +463,64 @@ class MessageService:
         """
         return validate_message_length(body, message_type)
 
+    @staticmethod
+    def score_drafts(user_id: str, drafts: List[Dict]) -> List[Dict]:
+        """
+        Score unsaved message drafts in one call.
+
+        Personalization checks use the name and company of each draft's
+        recruiter, loaded for all drafts with one query.
+
+        Args:
+            user_id: User's ID
+            drafts: Dicts with body and optional message_type and recruiter_id
+
+        Returns:
+            Quality score result per draft, in input order
+
+        Raises:
+            ValueError: If drafts is not a list of 1 to MAX_SCORE_BATCH
+                drafts, each with a body of at most MAX_DRAFT_LENGTH characters
+                and a well-formed recruiter_id if any
+        """
+        if not isinstance(drafts, list) or not 1 <= len(drafts) <= MAX_SCORE_BATCH:
+            raise ValueError(f"messages must be a list of 1 to {MAX_SCORE_BATCH} drafts")
+        for index, draft in enumerate(drafts):
+            if not isinstance(draft, dict) or not isinstance(draft.get("body"), str):
+                raise ValueError(f"messages[{index}].body is required")
+            if len(draft["body"]) > MAX_DRAFT_LENGTH:
+                raise ValueError(
+                    f"messages[{index}].body must be at most {MAX_DRAFT_LENGTH} characters"
+                )
+            if draft.get("recruiter_id"):
+                try:
+                    uuid.UUID(str(draft["recruiter_id"]))
+                except ValueError:
+                    raise ValueError(f"messages[{index}].recruiter_id must be a UUID")
+
+        recruiter_ids = {str(d["recruiter_id"]) for d in drafts if d.get("recruiter_id")}
+        recruiters = {}
+        if recruiter_ids:
+            rows = db.session.query(Recruiter.id, Recruiter.first_name, Recruiter.company).filter(
+                Recruiter.user_id == user_id, Recruiter.id.in_(recruiter_ids)
+            )
+            recruiters = {str(row.id): (row.first_name, row.company) for row in rows}
+
+        results = []
+        for draft in drafts:
+            recruiter_name, company_name = recruiters.get(
+                str(draft.get("recruiter_id")), (None, None)
+            )
+            results.append(
+                calculate_message_quality(
+                    message_text=draft["body"],
+                    message_type=draft.get("message_type") or "initial_outreach",
+                    recruiter_name=recruiter_name,
+                    company_name=company_name,
+                )
+            )
+        return results
+
     @staticmethod
     def get_quality_tips(message_type: str = "initial_outreach") -> Dict:
         """
@@ -454,7 +569,16 @@ class MessageService:
 
         Returns counts, quality averages, and effectiveness metrics.
         """
-        messages = Message.query.filter_by(user_id=user_id).all()
+        # Only the columns the stats use; bodies and context JSON stay unloaded
+        messages = (
+            Message.query.options(
+                load_only(
+                    Message.status, Message.message_type, Message.quality_score, Message.word_count
+                )
+            )
+            .filter_by(user_id=user_id)
+            .all()
+        )
 
         stats = {
             "total": len(messages),
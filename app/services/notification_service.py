@@ -3,18 +3,52 @@ Notification Service
 
 Generates and manages user notifications including follow-up reminders,
 usage warnings, and achievement notifications.
+
+Reminders and warnings are generated set-based, for one user or for every
+user in a scheduled sweep: one query per kind finds the candidates and
+anti-joins them against existing notifications by dedup_key, and all new
+rows go in with one multi-row INSERT.
+
+Unread counts are served from the Redis-backed unread_counter, which every
+write path here adjusts after committing. New notifications are also pushed
+to their users' event streams.
 """
 
 import logging
+import time
+import uuid
+from collections import Counter
 from datetime import datetime, timedelta
 
+from sqlalchemy import case, insert, literal, or_, select, union_all
+
 from app.extensions import db
 from app.models.notification import Notification, NotificationType
 from app.models.recruiter import Recruiter
-from app.models.user import User
+from app.models.user import SubscriptionTier, User
+from app.services.event_stream import EventType, event_stream
+from app.services.unread_counter import unread_counter
+from app.services.usage_meter import FEATURE_COLUMNS
+from app.utils.pagination import keyset_order, keyset_paginate, order_clauses
 
 logger = logging.getLogger(__name__)
 
+# A subject is not notified about again while its last notification is
+# unread, or for this long after it was created
+DEDUP_WINDOW = timedelta(days=7)
+
+FOLLOW_UP_AFTER = timedelta(days=7)
+FOLLOW_UPS_PER_USER = 10
+TERMINAL_STAGES = ["accepted", "declined", "offer"]
+
+USAGE_WARNING_PERCENT = 80
+# Usage type (in notifications) -> tier limit feature
+USAGE_WARNINGS = [
+    ("messages", "ai_messages"),
+    ("recruiters", "recruiters"),
+    ("tailored_resumes", "tailored_resumes"),
+]
+
 
 class NotificationService:
     """Service for managing user notifications."""
@@ -33,22 +67,69 @@ class NotificationService:
         Returns:
             Tuple of (notifications list, total count)
         """
+        query = NotificationService._notifications_query(user_id, unread_only)
+
+        total = query.count()
+        order = keyset_order([(Notification.created_at, True)], Notification.id)
+        notifications = query.order_by(*order_clauses(order)).offset(offset).limit(limit).all()
+
+        return notifications, total
+
+    @staticmethod
+    def get_notifications_page(user_id, limit=20, cursor=None, unread_only=False, total="none"):
+        """
+        Get one keyset-paginated page of notifications, newest first.
+
+        Args:
+            user_id: User UUID
+            limit: Page size
+            cursor: next_cursor from the previous page, None for the first page
+            unread_only: If True, only return unread notifications
+            total: "none", "approximate" or "exact"
+
+        Returns:
+            KeysetPage of notifications
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+        """
+        return keyset_paginate(
+            NotificationService._notifications_query(user_id, unread_only),
+            keyset_order([(Notification.created_at, True)], Notification.id),
+            sort="created",
+            limit=limit,
+            cursor=cursor,
+            total=total,
+        )
+
+    @staticmethod
+    def _notifications_query(user_id, unread_only=False):
         query = Notification.query.filter_by(user_id=user_id)
 
         if unread_only:
             query = query.filter_by(is_read=False)
 
-        total = query.count()
-        notifications = (
-            query.order_by(Notification.created_at.desc()).offset(offset).limit(limit).all()
-        )
-
-        return notifications, total
+        return query
 
     @staticmethod
     def get_unread_count(user_id):
         """Get count of unread notifications for a user."""
-        return Notification.query.filter_by(user_id=user_id, is_read=False).count()
+        return unread_counter.get(user_id)
+
+    @staticmethod
+    def wait_for_unread_count(user_id, known, timeout):
+        """
+        Long-poll for a user's unread count.
+
+        Args:
+            user_id: User UUID
+            known: Count the client already shows
+            timeout: Seconds to wait for it to change
+
+        Returns:
+            The unread count, as soon as it differs from known or after timeout
+        """
+        return unread_counter.wait_for_change(user_id, known, timeout)
 
     @staticmethod
     def mark_read(notification_id, user_id):
@@ -65,13 +146,19 @@ class NotificationService:
         Raises:
             ValueError: If notification not found or not owned by user
         """
+        # Conditional, so of concurrent requests only one counts the read
+        marked = Notification.query.filter_by(
+            id=notification_id, user_id=user_id, is_read=False
+        ).update({"is_read": True})
+        db.session.commit()
+        if marked:
+            unread_counter.adjust(user_id, -marked)
+
         notification = Notification.query.filter_by(id=notification_id, user_id=user_id).first()
 
         if not notification:
             raise ValueError("Notification not found")
 
-        notification.is_read = True
-        db.session.commit()
         return notification
 
     @staticmethod
@@ -89,6 +176,7 @@ class NotificationService:
             {"is_read": True}
         )
         db.session.commit()
+        unread_counter.reset(user_id)
         return count
 
     @staticmethod
@@ -119,10 +207,39 @@ class NotificationService:
         )
         db.session.add(notification)
         db.session.commit()
+        unread_counter.adjust(user_id, 1)
+        event_stream.publish(user_id, EventType.NOTIFICATION_CREATED, notification.to_dict())
         return notification
 
     @classmethod
-    def generate_follow_up_reminders(cls, user_id):
+    def generate_notifications(cls, user_id=None):
+        """
+        Generate follow-up reminders and usage warnings in one INSERT.
+
+        Args:
+            user_id: User UUID, or None to sweep every active user
+
+        Returns:
+            Dict with counts per kind, total_generated, seconds and per_second
+        """
+        started = time.perf_counter()
+        now = datetime.utcnow()
+
+        follow_ups = cls._follow_up_rows(user_id, now)
+        usage_warnings = cls._usage_warning_rows(user_id, now)
+        total = cls._insert(follow_ups + usage_warnings)
+
+        seconds = time.perf_counter() - started
+        return {
+            "follow_up_reminders": len(follow_ups),
+            "usage_warnings": len(usage_warnings),
+            "total_generated": total,
+            "seconds": round(seconds, 3),
+            "per_second": round(total / seconds) if seconds else 0,
+        }
+
+    @classmethod
+    def generate_follow_up_reminders(cls, user_id=None):
         """
         Generate follow-up reminder notifications based on recruiter data.
 
@@ -130,125 +247,200 @@ class NotificationService:
         and creates reminder notifications if one doesn't already exist.
 
         Args:
-            user_id: User UUID
+            user_id: User UUID, or None for every active user
 
         Returns:
             Number of new reminders generated
         """
-        # Get recruiters needing follow-up (contacted 7+ days ago, not in terminal stages)
-        cutoff = datetime.utcnow() - timedelta(days=7)
-        terminal_stages = ["accepted", "declined", "offer"]
-
-        recruiters = (
-            Recruiter.query.filter(
-                Recruiter.user_id == user_id,
-                Recruiter.is_deleted == False,  # noqa: E712
-                Recruiter.last_contact_date.isnot(None),
-                Recruiter.last_contact_date < cutoff,
-                ~Recruiter.status.in_(terminal_stages),
-            )
-            .order_by(Recruiter.last_contact_date.asc())
-            .limit(10)
-            .all()
-        )
-
-        new_count = 0
-        for recruiter in recruiters:
-            days_since = (datetime.utcnow() - recruiter.last_contact_date).days
-
-            # Check if we already have a recent reminder for this recruiter
-            existing = Notification.query.filter(
-                Notification.user_id == user_id,
-                Notification.notification_type == NotificationType.FOLLOW_UP_REMINDER.value,
-                Notification.is_read == False,  # noqa: E712
-                Notification.extra_data["recruiter_id"].astext == str(recruiter.id),
-            ).first()
-
-            if existing:
-                continue
-
-            full_name = f"{recruiter.first_name} {recruiter.last_name}".strip()
-            company = recruiter.company or "Unknown Company"
-
-            cls.create_notification(
-                user_id=user_id,
-                title=f"Follow up with {full_name}",
-                body=f"It's been {days_since} days since you last contacted {full_name} at {company}. "
-                f"Send a follow-up to keep the conversation going.",
-                notification_type=NotificationType.FOLLOW_UP_REMINDER.value,
-                action_url=f"/messages?recruiterId={recruiter.id}",
-                metadata={
-                    "recruiter_id": str(recruiter.id),
-                    "recruiter_name": full_name,
-                    "company": company,
-                    "days_since_contact": days_since,
-                },
-            )
-            new_count += 1
-
-        return new_count
+        return cls._insert(cls._follow_up_rows(user_id, datetime.utcnow()))
 
     @classmethod
-    def generate_usage_warnings(cls, user_id):
+    def generate_usage_warnings(cls, user_id=None):
         """
         Generate usage warning notifications when approaching tier limits.
 
         Creates notifications when a user has used 80%+ of any tier limit.
 
         Args:
-            user_id: User UUID
+            user_id: User UUID, or None for every active user
 
         Returns:
             Number of new warnings generated
         """
-        user = User.query.get(user_id)
-        if not user:
-            return 0
+        return cls._insert(cls._usage_warning_rows(user_id, datetime.utcnow()))
 
-        limits = user.get_tier_limits()
-        new_count = 0
+    @staticmethod
+    def _already_notified(notification_type, user_id, dedup_key, now):
+        """
+        EXISTS clause for a notification about the same subject that is
+        still unread or was created within the dedup window.
+        """
+        return (
+            db.session.query(Notification.id)
+            .filter(
+                Notification.user_id == user_id,
+                Notification.notification_type == notification_type,
+                Notification.dedup_key == dedup_key,
+                or_(
+                    Notification.is_read == False,  # noqa: E712
+                    Notification.created_at >= now - DEDUP_WINDOW,
+                ),
+            )
+            .exists()
+        )
 
-        usage_checks = [
-            ("messages", user.monthly_message_count, limits.get("ai_messages", 0)),
-            ("recruiters", user.monthly_recruiter_count, limits.get("recruiters", 0)),
-            ("tailored_resumes", user.monthly_tailoring_count, limits.get("tailored_resumes", 0)),
-        ]
+    @classmethod
+    def _follow_up_rows(cls, user_id, now):
+        """
+        New follow-up reminders: each user's most overdue recruiters, less
+        those already reminded about, found with one anti-join.
+        """
+        notification_type = NotificationType.FOLLOW_UP_REMINDER.value
+
+        # Recruiters contacted 7+ days ago, not in terminal stages
+        overdue = (
+            db.session.query(
+                Recruiter.id.label("recruiter_id"),
+                Recruiter.user_id,
+                Recruiter.first_name,
+                Recruiter.last_name,
+                Recruiter.company,
+                Recruiter.last_contact_date,
+                db.func.row_number()
+                .over(
+                    partition_by=Recruiter.user_id,
+                    order_by=(Recruiter.last_contact_date.asc(), Recruiter.id),
+                )
+                .label("overdue_rank"),
+            )
+            .join(User, User.id == Recruiter.user_id)
+            .filter(
+                User.is_active == True,  # noqa: E712
+                Recruiter.last_contact_date.isnot(None),
+                Recruiter.last_contact_date < now - FOLLOW_UP_AFTER,
+                ~Recruiter.status.in_(TERMINAL_STAGES),
+            )
+        )
+        if user_id is not None:
+            overdue = overdue.filter(Recruiter.user_id == user_id)
+        overdue = overdue.subquery()
+
+        candidates = (
+            db.session.query(overdue)
+            .filter(
+                overdue.c.overdue_rank <= FOLLOW_UPS_PER_USER,
+                ~cls._already_notified(
+                    notification_type, overdue.c.user_id, overdue.c.recruiter_id, now
+                ),
+            )
+            .all()
+        )
 
-        for name, used, limit_val in usage_checks:
-            if limit_val <= 0:
-                continue  # Unlimited
+        rows = []
+        for recruiter in candidates:
+            days_since = (now - recruiter.last_contact_date).days
+            full_name = f"{recruiter.first_name} {recruiter.last_name}".strip()
+            company = recruiter.company or "Unknown Company"
+            recruiter_id = str(recruiter.recruiter_id)
+
+            rows.append(
+                {
+                    "user_id": recruiter.user_id,
+                    "title": f"Follow up with {full_name}",
+                    "body": f"It's been {days_since} days since you last contacted {full_name} "
+                    f"at {company}. Send a follow-up to keep the conversation going.",
+                    "notification_type": notification_type,
+                    "action_url": f"/messages?recruiterId={recruiter_id}",
+                    "extra_data": {
+                        "recruiter_id": recruiter_id,
+                        "recruiter_name": full_name,
+                        "company": company,
+                        "days_since_contact": days_since,
+                    },
+                    "dedup_key": recruiter_id,
+                }
+            )
+        return rows
 
-            usage_pct = (used / limit_val) * 100 if limit_val > 0 else 0
+    @classmethod
+    def _usage_warning_rows(cls, user_id, now):
+        """
+        New usage warnings: every (user, usage type) at 80%+ of its tier
+        limit, less those already warned about, found with one anti-join.
+        """
+        notification_type = NotificationType.USAGE_WARNING.value
+
+        checks = []
+        for name, feature in USAGE_WARNINGS:
+            used = getattr(User, FEATURE_COLUMNS[feature])
+            limit = case(
+                {tier: limits[feature] for tier, limits in User.TIER_LIMITS.items()},
+                value=User.subscription_tier,
+                else_=User.TIER_LIMITS[SubscriptionTier.BASIC.value][feature],
+            )
+            check = select(
+                User.id.label("user_id"),
+                literal(name).label("usage_type"),
+                used.label("used"),
+                limit.label("limit"),
+            ).where(
+                User.is_active == True,  # noqa: E712
+                limit > 0,  # Not unlimited
+                used * 100 >= limit * USAGE_WARNING_PERCENT,
+            )
+            if user_id is not None:
+                check = check.where(User.id == user_id)
+            checks.append(check)
+        over = union_all(*checks).subquery()
+
+        candidates = (
+            db.session.query(over)
+            .filter(
+                ~cls._already_notified(notification_type, over.c.user_id, over.c.usage_type, now)
+            )
+            .all()
+        )
 
-            if usage_pct >= 80:
-                # Check if we already warned about this
-                existing = Notification.query.filter(
-                    Notification.user_id == user_id,
-                    Notification.notification_type == NotificationType.USAGE_WARNING.value,
-                    Notification.is_read == False,  # noqa: E712
-                    Notification.extra_data["usage_type"].astext == name,
-                ).first()
-
-                if existing:
-                    continue
-
-                friendly_name = name.replace("_", " ").title()
-                remaining = limit_val - used
-
-                cls.create_notification(
-                    user_id=user_id,
-                    title=f"{friendly_name} limit almost reached",
-                    body=f"You've used {used} of {limit_val} {friendly_name.lower()} this month. "
-                    f"{remaining} remaining.",
-                    notification_type=NotificationType.USAGE_WARNING.value,
-                    action_url="/settings",
-                    metadata={
-                        "usage_type": name,
-                        "used": used,
-                        "limit": limit_val,
-                        "percentage": round(usage_pct),
+        rows = []
+        for usage in candidates:
+            friendly_name = usage.usage_type.replace("_", " ").title()
+            remaining = usage.limit - usage.used
+
+            rows.append(
+                {
+                    "user_id": usage.user_id,
+                    "title": f"{friendly_name} limit almost reached",
+                    "body": f"You've used {usage.used} of {usage.limit} {friendly_name.lower()} "
+                    f"this month. {remaining} remaining.",
+                    "notification_type": notification_type,
+                    "action_url": "/settings",
+                    "extra_data": {
+                        "usage_type": usage.usage_type,
+                        "used": usage.used,
+                        "limit": usage.limit,
+                        "percentage": round(usage.used / usage.limit * 100),
                     },
-                )
-                new_count += 1
+                    "dedup_key": usage.usage_type,
+                }
+            )
+        return rows
+
+    @staticmethod
+    def _insert(rows):
+        """Insert generated notifications with one multi-row INSERT."""
+        if not rows:
+            return 0
 
-        return new_count
+        now = datetime.utcnow()
+        for row in rows:
+            row.setdefault("id", uuid.uuid4())
+            row.setdefault("is_read", False)
+            row.setdefault("created_at", now)
+        db.session.execute(insert(Notification), rows)
+        db.session.commit()
+        unread_counter.adjust_many(Counter(str(row["user_id"]) for row in rows))
+        event_stream.publish_many(
+            (row["user_id"], EventType.NOTIFICATION_CREATED, Notification(**row).to_dict())
+            for row in rows
+        )
+        return len(rows)
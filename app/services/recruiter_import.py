@@ -0,0 +1,327 @@
+"""
+Recruiter Import Service
+
+Bulk import of recruiters from CSV uploads, including LinkedIn
+"Connections.csv" exports.
+
+The upload is read as a stream, one row at a time. Each row is validated
+with the same rules as POST /api/recruiters and deduplicated against the
+user's existing recruiters (and earlier rows of the same file) by email and
+LinkedIn URL, using in-memory hash sets loaded with one query up front.
+
+Accepted rows get client-generated UUIDs, so recruiters, pipeline items,
+notes and activities are written with a handful of executemany INSERTs per
+chunk instead of a flush per recruiter. Fit and priority scores are
+calculated for the whole pipeline in one batch at the end.
+"""
+
+import codecs
+import csv
+import re
+import uuid
+from datetime import datetime
+from typing import IO, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.extensions import db
+from app.models.activity import Activity, ActivityType, PipelineItem, PipelineStage
+from app.models.recruiter import Recruiter, RecruiterNote
+from app.models.user import User
+from app.services.activity_service import ActivityService
+from app.services.recruiter_service import RecruiterService
+from app.services.scoring.engagement import calculate_engagement_score
+from app.services.usage_meter import usage_meter
+from app.utils.lexorank import spread
+from app.utils.validators import ValidationError, validate_email, validate_text_fields, validate_url
+
+# Normalized CSV header -> recruiter field. Covers our own template and
+# LinkedIn's Connections.csv ("First Name", "Email Address", "URL", ...)
+HEADER_ALIASES = {
+    "first_name": "first_name",
+    "firstname": "first_name",
+    "first": "first_name",
+    "last_name": "last_name",
+    "lastname": "last_name",
+    "last": "last_name",
+    "email": "email",
+    "email_address": "email",
+    "e_mail": "email",
+    "company": "company",
+    "company_name": "company",
+    "title": "title",
+    "position": "title",
+    "job_title": "title",
+    "linkedin_url": "linkedin_url",
+    "linkedin": "linkedin_url",
+    "profile_url": "linkedin_url",
+    "url": "linkedin_url",
+    "phone": "phone",
+    "phone_number": "phone",
+    "industries": "industries",
+    "industry": "industries",
+    "locations": "locations",
+    "location": "locations",
+    "specialty": "specialty",
+    "company_type": "company_type",
+    "source": "source",
+    "notes": "notes",
+}
+
+# Multi-value cells ("Technology; Finance"). Commas are left alone because
+# single locations contain them ("Austin, TX")
+LIST_SEPARATOR = re.compile(r"\s*[;|]\s*")
+
+MAX_IMPORT_ROWS = 25000
+MAX_REPORTED_ERRORS = 100
+INSERT_CHUNK_SIZE = 2000
+
+
+class ImportLimitError(Exception):
+    """Raised when an import would take the user past their recruiter limit."""
+
+    def __init__(self, requested: int, limit: int):
+        self.requested = requested
+        self.limit = limit
+        super().__init__(f"Importing {requested} recruiters would exceed your limit of {limit}")
+
+
+class RecruiterImportService:
+    """Service for bulk recruiter imports."""
+
+    @staticmethod
+    def import_csv(user: User, stream: IO[bytes], source: Optional[str] = None) -> Dict:
+        """
+        Import recruiters from a CSV byte stream.
+
+        Args:
+            user: User importing the recruiters
+            stream: Binary file-like object with the CSV upload
+            source: Default source for rows without one (e.g. "linkedin_export")
+
+        Returns:
+            Dict with imported, duplicates, invalid and total row counts,
+            plus the first MAX_REPORTED_ERRORS row errors
+
+        Raises:
+            ValueError: If the file has no recognizable header or too many rows
+            ImportLimitError: If the import would exceed the recruiter limit
+        """
+        seen_emails, seen_urls = RecruiterImportService._existing_keys(user.id)
+
+        accepted = []
+        errors = []
+        duplicates = invalid = total = 0
+
+        for line_number, raw in RecruiterImportService._read_rows(stream):
+            total += 1
+            if total > MAX_IMPORT_ROWS:
+                raise ValueError(f"Imports are limited to {MAX_IMPORT_ROWS} rows per file")
+
+            row, row_errors = RecruiterImportService._validate_row(raw)
+            if row_errors:
+                invalid += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append({"row": line_number, "errors": row_errors})
+                continue
+
+            email_key = row["email"]
+            url_key = _linkedin_key(row["linkedin_url"])
+            if (email_key and email_key in seen_emails) or (url_key and url_key in seen_urls):
+                duplicates += 1
+                continue
+            if email_key:
+                seen_emails.add(email_key)
+            if url_key:
+                seen_urls.add(url_key)
+
+            row["source"] = row["source"] or source
+            accepted.append(row)
+
+        if accepted:
+            if not usage_meter.consume(user, "recruiters", len(accepted)):
+                raise ImportLimitError(len(accepted), user.tier_limits.get("recruiters", 0))
+            try:
+                RecruiterImportService._insert(user.id, accepted)
+            except Exception:
+                db.session.rollback()
+                usage_meter.refund(user, "recruiters", len(accepted))
+                raise
+
+            RecruiterService.rescore_fit(user.id)
+
+        return {
+            "total_rows": total,
+            "imported": len(accepted),
+            "duplicates": duplicates,
+            "invalid": invalid,
+            "errors": errors,
+        }
+
+    @staticmethod
+    def _read_rows(stream: IO[bytes]) -> Iterator[Tuple[int, Dict]]:
+        """
+        Yield (line number, {field: value}) for each data row.
+
+        Lines before the header are skipped: LinkedIn exports start with a
+        "Notes:" preamble. The header is the first row naming a first-name
+        column.
+        """
+        text = codecs.iterdecode(stream, "utf-8-sig", errors="replace")
+        reader = csv.reader(text)
+
+        columns = None
+        for record in reader:
+            if columns is None:
+                mapped = [HEADER_ALIASES.get(_normalize_header(cell)) for cell in record]
+                if "first_name" in mapped:
+                    columns = mapped
+                continue
+
+            if not any(cell.strip() for cell in record):
+                continue
+            yield reader.line_num, {
+                field: value for field, value in zip(columns, record) if field is not None
+            }
+
+        if columns is None:
+            raise ValueError("CSV must have a header row with a First Name column")
+
+    @staticmethod
+    def _validate_row(raw: Dict) -> Tuple[Dict, List[str]]:
+        """Validate one row with the single-create rules plus email/URL format checks."""
+        row, errors = validate_text_fields(raw, RecruiterService.FIELD_SCHEMA)
+        if errors:
+            return row, errors
+
+        try:
+            if row["email"]:
+                row["email"] = validate_email(row["email"])
+            if row["linkedin_url"]:
+                url = row["linkedin_url"]
+                if not url.lower().startswith(("http://", "https://")):
+                    url = f"https://{url}"
+                row["linkedin_url"] = validate_url(url, "linkedin_url")
+        except ValidationError as e:
+            return row, [str(e)]
+
+        for field in ("industries", "locations"):
+            value = (raw.get(field) or "").strip()
+            row[field] = [item for item in LIST_SEPARATOR.split(value) if item] if value else []
+            if any(len(item) > 100 for item in row[field]):
+                errors.append(f"{field} entries must be less than 100 characters")
+
+        return row, errors
+
+    @staticmethod
+    def _existing_keys(user_id) -> Tuple[set, set]:
+        """Emails and LinkedIn URLs already in the user's CRM, normalized."""
+        emails, urls = set(), set()
+        result = db.session.execute(
+            select(Recruiter.email, Recruiter.linkedin_url).where(Recruiter.user_id == user_id)
+        )
+        for email, linkedin_url in result:
+            if email:
+                emails.add(email.strip().lower())
+            key = _linkedin_key(linkedin_url)
+            if key:
+                urls.add(key)
+        return emails, urls
+
+    @staticmethod
+    def _insert(user_id, rows: List[Dict]) -> None:
+        """Bulk-insert recruiters and their pipeline items, notes and activities."""
+        now = datetime.utcnow()
+        engagement = calculate_engagement_score(0, 0, 0)
+        new_stage = PipelineStage.NEW.value
+        # Imported cards go to the end of the New column, in file order
+        ranks = spread(ActivityService.last_rank(user_id, new_stage), None, len(rows))
+
+        for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+            recruiters, items, notes, activities = [], [], [], []
+
+            chunk = rows[start : start + INSERT_CHUNK_SIZE]
+            for row, rank in zip(chunk, ranks[start : start + INSERT_CHUNK_SIZE]):
+                recruiter_id = uuid.uuid4()
+                recruiters.append(
+                    {
+                        "id": recruiter_id,
+                        "user_id": user_id,
+                        "first_name": row["first_name"],
+                        "last_name": row["last_name"],
+                        "email": row["email"],
+                        "company": row["company"],
+                        "title": row["title"],
+                        "linkedin_url": row["linkedin_url"],
+                        "phone": row["phone"],
+                        "industries": row["industries"],
+                        "locations": row["locations"],
+                        "specialty": row["specialty"],
+                        "company_type": row["company_type"],
+                        "source": row["source"],
+                        "status": new_stage,
+                        "engagement_score": engagement["total_score"],
+                        "engagement_components": engagement["components"],
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                )
+                items.append(
+                    {
+                        "id": uuid.uuid4(),
+                        "user_id": user_id,
+                        "recruiter_id": recruiter_id,
+                        "stage": new_stage,
+                        "position": 0,
+                        "rank": rank,
+                        "entered_stage_at": now,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                )
+                activities.append(
+                    {
+                        "id": uuid.uuid4(),
+                        "user_id": user_id,
+                        "recruiter_id": recruiter_id,
+                        "activity_type": ActivityType.RECRUITER_ADDED.value,
+                        "description": f"Imported {row['first_name']} {row['last_name']}",
+                        "extra_data": {"import": True},
+                        "pipeline_stage": new_stage,
+                        "created_at": now,
+                    }
+                )
+                if row["notes"]:
+                    notes.append(
+                        {
+                            "id": uuid.uuid4(),
+                            "recruiter_id": recruiter_id,
+                            "content": row["notes"],
+                            "note_type": "general",
+                            "created_at": now,
+                            "updated_at": now,
+                        }
+                    )
+
+            db.session.execute(Recruiter.__table__.insert(), recruiters)
+            db.session.execute(PipelineItem.__table__.insert(), items)
+            db.session.execute(Activity.__table__.insert(), activities)
+            if notes:
+                db.session.execute(RecruiterNote.__table__.insert(), notes)
+
+        db.session.commit()
+
+
+def _normalize_header(cell: str) -> str:
+    return re.sub(r"[\s-]+", "_", cell.strip().lower())
+
+
+def _linkedin_key(url: Optional[str]) -> Optional[str]:
+    """Canonical form of a LinkedIn URL: no scheme, www, query or trailing slash."""
+    if not url:
+        return None
+    key = url.strip().lower().split("?", 1)[0].split("#", 1)[0].rstrip("/")
+    key = re.sub(r"^https?://", "", key)
+    if key.startswith("www."):
+        key = key[4:]
+    return key or None
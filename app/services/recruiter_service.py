@@ -4,22 +4,88 @@ Recruiter CRM Service
 Handles recruiter management, engagement tracking, and fit scoring.
 """
 
+import heapq
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
+from sqlalchemy import bindparam, case, func, select, update
+
 from app.extensions import db
-from app.models.activity import PipelineItem, PipelineStage
+from app.models.activity import ActivityType, PipelineItem, PipelineStage
 from app.models.recruiter import Recruiter, RecruiterNote
+from app.models.user import User
+from app.services.activity_buffer import ActivityBuffer, activity_row
+from app.services.activity_service import ActivityService
 from app.services.scoring.engagement import (
+    FitProfile,
     calculate_engagement_score,
     calculate_fit_score,
     calculate_priority_score,
+    score_fits,
+    score_priorities,
 )
+from app.utils.lexorank import between
+from app.utils.pagination import KeysetPage, keyset_order, keyset_paginate, order_clauses
 
 
 class RecruiterService:
     """Service for recruiter CRM management."""
 
+    # Pipeline stages that get follow-up recommendations
+    FOLLOW_UP_STAGES = [
+        PipelineStage.CONTACTED.value,
+        PipelineStage.RESPONDED.value,
+        PipelineStage.INTERVIEWING.value,
+    ]
+
+    # Columns score_priorities() reads, in its row order
+    PRIORITY_INPUTS = (
+        Recruiter.last_contact_date,
+        Recruiter.next_action,
+        Recruiter.messages_sent,
+        Recruiter.has_responded,
+        Recruiter.engagement_score,
+        Recruiter.fit_score,
+        Recruiter.status,
+    )
+
+    # Text field rules for creating a recruiter (validate_text_fields schema)
+    FIELD_SCHEMA = {
+        "first_name": {"required": True, "max_length": 100},
+        "last_name": {"required": True, "max_length": 100},
+        "email": {"required": False, "max_length": 254},
+        "company": {"required": False, "max_length": 200},
+        "title": {"required": False, "max_length": 200},
+        "linkedin_url": {"required": False, "max_length": 500},
+        "phone": {"required": False, "max_length": 30},
+        "specialty": {"required": False, "max_length": 200},
+        "company_type": {"required": False, "max_length": 50},
+        "source": {"required": False, "max_length": 200},
+        "notes": {"required": False, "max_length": 5000},
+    }
+
+    # Columns score_fits() reads, in its row order
+    FIT_INPUTS = (
+        Recruiter.industries,
+        Recruiter.locations,
+        Recruiter.specialty,
+        Recruiter.company_type,
+        Recruiter.salary_range_min,
+        Recruiter.salary_range_max,
+    )
+
+    # List sort orders as (column, descending); each is backed by a
+    # (user_id, ..., id) index (migration 008)
+    SORT_ORDERS = {
+        "priority": [(Recruiter.priority_score, True)],
+        "name": [(Recruiter.last_name, False), (Recruiter.first_name, False)],
+        "company": [(Recruiter.company, False)],
+        "last_contact": [(Recruiter.last_contact_date, True)],
+        "engagement": [(Recruiter.engagement_score, True)],
+        "fit": [(Recruiter.fit_score, True)],
+        "created": [(Recruiter.created_at, True)],
+    }
+
     @staticmethod
     def create_recruiter(
         user_id: str,
@@ -85,6 +151,7 @@ class RecruiterService:
             recruiter_id=recruiter.id,
             stage=PipelineStage.NEW.value,
             position=0,
+            rank=between(ActivityService.last_rank(user_id, PipelineStage.NEW.value), None),
         )
         db.session.add(pipeline_item)
 
@@ -97,6 +164,16 @@ class RecruiterService:
             )
             db.session.add(note)
 
+        ActivityBuffer.add(
+            activity_row(
+                user_id,
+                ActivityType.RECRUITER_ADDED.value,
+                description=f"Added {recruiter.full_name}",
+                recruiter_id=recruiter.id,
+                pipeline_stage=PipelineStage.NEW.value,
+            )
+        )
+
         db.session.commit()
 
         return recruiter
@@ -124,13 +201,61 @@ class RecruiterService:
             status: Filter by pipeline status
             industry: Filter by industry
             location: Filter by location
-            sort_by: Sort field (priority, name, company, last_contact)
+            sort_by: Sort field (priority, name, company, last_contact, engagement, fit)
             limit: Maximum results
             offset: Pagination offset
 
         Returns:
             Tuple of (recruiter list, total count)
         """
+        query = RecruiterService._user_recruiters_query(user_id, status)
+
+        # Get total count before pagination
+        total = query.count()
+
+        order = RecruiterService._sort_order(sort_by)
+        recruiters = query.order_by(*order_clauses(order)).offset(offset).limit(limit).all()
+
+        return recruiters, total
+
+    @staticmethod
+    def get_user_recruiters_page(
+        user_id: str,
+        status: Optional[str] = None,
+        sort_by: str = "priority",
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        total: str = "none",
+    ) -> KeysetPage:
+        """
+        Get one keyset-paginated page of a user's recruiters.
+
+        Args:
+            user_id: User's ID
+            status: Filter by pipeline status
+            sort_by: Sort field (see SORT_ORDERS)
+            limit: Page size
+            cursor: next_cursor from the previous page, None for the first page
+            total: "none", "approximate" or "exact"
+
+        Returns:
+            KeysetPage of recruiters
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed or from another sort
+        """
+        sort_by = sort_by if sort_by in RecruiterService.SORT_ORDERS else "created"
+        return keyset_paginate(
+            RecruiterService._user_recruiters_query(user_id, status),
+            RecruiterService._sort_order(sort_by),
+            sort=sort_by,
+            limit=limit,
+            cursor=cursor,
+            total=total,
+        )
+
+    @staticmethod
+    def _user_recruiters_query(user_id: str, status: Optional[str] = None):
         query = Recruiter.query.filter_by(user_id=user_id)
 
         if status:
@@ -138,29 +263,13 @@ class RecruiterService:
 
         # Note: Industry and location filtering would need contains for JSON arrays
         # This is database-specific; simplified here
+        return query
 
-        # Get total count before pagination
-        total = query.count()
-
-        # Apply sorting
-        if sort_by == "priority":
-            query = query.order_by(Recruiter.priority_score.desc())
-        elif sort_by == "name":
-            query = query.order_by(Recruiter.last_name, Recruiter.first_name)
-        elif sort_by == "company":
-            query = query.order_by(Recruiter.company)
-        elif sort_by == "last_contact":
-            query = query.order_by(Recruiter.last_contact_date.desc())
-        elif sort_by == "engagement":
-            query = query.order_by(Recruiter.engagement_score.desc())
-        elif sort_by == "fit":
-            query = query.order_by(Recruiter.fit_score.desc())
-        else:
-            query = query.order_by(Recruiter.created_at.desc())
-
-        recruiters = query.offset(offset).limit(limit).all()
-
-        return recruiters, total
+    @staticmethod
+    def _sort_order(sort_by: str) -> list:
+        """Keyset order for a sort name; unknown names sort newest first."""
+        order = RecruiterService.SORT_ORDERS.get(sort_by, RecruiterService.SORT_ORDERS["created"])
+        return keyset_order(order, Recruiter.id)
 
     @staticmethod
     def update_recruiter(recruiter_id: str, user_id: str, **updates) -> Recruiter:
@@ -245,12 +354,18 @@ class RecruiterService:
         if new_stage not in valid_stages:
             raise ValueError(f"Invalid stage. Must be one of: {', '.join(valid_stages)}")
 
+        previous_stage = recruiter.status
         recruiter.status = new_stage
+        if previous_stage != new_stage:
+            RecruiterService._log_stage_change(recruiter, previous_stage)
 
         # Update pipeline item
         pipeline_item = PipelineItem.query.filter_by(recruiter_id=recruiter_id).first()
 
         if pipeline_item:
+            if pipeline_item.stage != new_stage:
+                # Join the end of the new stage's column
+                pipeline_item.rank = between(ActivityService.last_rank(user_id, new_stage), None)
             pipeline_item.stage = new_stage
             pipeline_item.entered_stage_at = datetime.utcnow()
             pipeline_item.days_in_stage = 0
@@ -279,10 +394,20 @@ class RecruiterService:
 
         recruiter.messages_sent = (recruiter.messages_sent or 0) + 1
         recruiter.last_contact_date = datetime.utcnow()
+        ActivityBuffer.add(
+            activity_row(
+                user_id,
+                ActivityType.MESSAGE_SENT.value,
+                description=f"Sent message to {recruiter.full_name}",
+                recruiter_id=recruiter.id,
+                message_id=message_id,
+            )
+        )
 
         # Move to contacted stage if new
         if recruiter.status == PipelineStage.NEW.value:
             recruiter.status = PipelineStage.CONTACTED.value
+            RecruiterService._log_stage_change(recruiter, PipelineStage.NEW.value)
 
         RecruiterService._update_engagement_score(recruiter)
         RecruiterService._update_priority_score(recruiter)
@@ -330,10 +455,21 @@ class RecruiterService:
         recruiter.responses_received = (recruiter.responses_received or 0) + 1
         recruiter.has_responded = True
         recruiter.last_response_date = datetime.utcnow()
+        ActivityBuffer.add(
+            activity_row(
+                user_id,
+                ActivityType.RESPONSE_RECEIVED.value,
+                description=f"{recruiter.full_name} responded",
+                recruiter_id=recruiter.id,
+                extra_data={"is_positive": is_positive},
+            )
+        )
 
         # Move to responded stage
         if recruiter.status in [PipelineStage.NEW.value, PipelineStage.CONTACTED.value]:
+            previous_stage = recruiter.status
             recruiter.status = PipelineStage.RESPONDED.value
+            RecruiterService._log_stage_change(recruiter, previous_stage)
 
         RecruiterService._update_engagement_score(recruiter)
         RecruiterService._update_priority_score(recruiter)
@@ -342,6 +478,20 @@ class RecruiterService:
 
         return recruiter
 
+    @staticmethod
+    def _log_stage_change(recruiter: Recruiter, previous_stage: str) -> None:
+        """Record a status_change activity for a recruiter's new status."""
+        ActivityBuffer.add(
+            activity_row(
+                recruiter.user_id,
+                ActivityType.STATUS_CHANGE.value,
+                description=f"Moved to {recruiter.status}",
+                recruiter_id=recruiter.id,
+                pipeline_stage=recruiter.status,
+                previous_stage=previous_stage,
+            )
+        )
+
     @staticmethod
     def calculate_fit_score(
         recruiter_id: str,
@@ -394,6 +544,96 @@ class RecruiterService:
 
         return result
 
+    @staticmethod
+    def rescore_fit(user_id: str, chunk_size: int = 1000) -> int:
+        """
+        Recalculate fit scores for all of a user's recruiters.
+
+        The user's profile is tokenized once and each chunk of recruiters is
+        scored in a single pass, then fit_score, fit_components and the
+        dependent priority_score are written with one executemany UPDATE per
+        chunk. Run after the user's target industries, roles, location or
+        salary expectation change.
+
+        Args:
+            user_id: User ID
+            chunk_size: Recruiters scored and written per batch
+
+        Returns:
+            Number of recruiters rescored
+        """
+        user = db.session.get(User, user_id)
+        if not user:
+            raise ValueError("User not found")
+
+        profile = FitProfile(
+            industries=user.target_industries or [],
+            location=user.location,
+            target_roles=user.target_roles or [],
+            salary_expectation=user.salary_expectation,
+        )
+
+        now = datetime.utcnow()
+        table = Recruiter.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("recruiter_id"))
+            .values(
+                fit_score=bindparam("fit"),
+                fit_components=bindparam("components"),
+                priority_score=bindparam("priority"),
+            )
+        )
+        # Fit feeds priority, so priority is rescored with the new fit in place
+        fit_position = RecruiterService.PRIORITY_INPUTS.index(Recruiter.fit_score)
+        fit_columns = len(RecruiterService.FIT_INPUTS)
+
+        rescored = 0
+        last_id = None
+        while True:
+            query = (
+                select(
+                    Recruiter.id,
+                    *RecruiterService.FIT_INPUTS,
+                    *RecruiterService.PRIORITY_INPUTS,
+                )
+                .where(Recruiter.user_id == user_id)
+                .order_by(Recruiter.id)
+                .limit(chunk_size)
+            )
+            if last_id is not None:
+                query = query.where(Recruiter.id > last_id)
+            rows = db.session.execute(query).all()
+            if not rows:
+                break
+
+            fits = score_fits(profile, (row[1 : fit_columns + 1] for row in rows))
+            priority_rows = []
+            for row, fit in zip(rows, fits):
+                inputs = list(row[fit_columns + 1 :])
+                inputs[fit_position] = fit["total_score"]
+                priority_rows.append(inputs)
+            priorities = score_priorities(priority_rows, now)
+
+            db.session.execute(
+                stmt,
+                [
+                    {
+                        "recruiter_id": row[0],
+                        "fit": fit["total_score"],
+                        "components": fit["components"],
+                        "priority": priority,
+                    }
+                    for row, fit, priority in zip(rows, fits, priorities)
+                ],
+            )
+            db.session.commit()
+
+            rescored += len(rows)
+            last_id = rows[-1][0]
+
+        return rescored
+
     @staticmethod
     def _update_engagement_score(recruiter: Recruiter) -> None:
         """Update engagement score based on current metrics."""
@@ -523,29 +763,35 @@ class RecruiterService:
         """
         Get recommended follow-up actions sorted by priority.
 
+        Priority decays with days since last contact, so it is scored fresh
+        for the whole active pipeline on each call (from plain column values,
+        one query) instead of trusting the stored priority_score.
+
         Returns recruiters needing follow-up with action suggestions.
         """
-        recruiters = (
-            Recruiter.query.filter_by(user_id=user_id)
-            .filter(
-                Recruiter.status.in_(
-                    [
-                        PipelineStage.CONTACTED.value,
-                        PipelineStage.RESPONDED.value,
-                        PipelineStage.INTERVIEWING.value,
-                    ]
-                )
+        now = datetime.utcnow()
+        rows = db.session.execute(
+            select(Recruiter.id, *RecruiterService.PRIORITY_INPUTS).where(
+                Recruiter.user_id == user_id,
+                Recruiter.status.in_(RecruiterService.FOLLOW_UP_STAGES),
             )
-            .order_by(Recruiter.priority_score.desc())
-            .limit(limit)
-            .all()
-        )
+        ).all()
+
+        scores = score_priorities((row[1:] for row in rows), now)
+        top = heapq.nlargest(limit, zip(scores, (row[0] for row in rows)), key=lambda pair: pair[0])
+        if not top:
+            return []
+
+        recruiters = {
+            r.id: r for r in Recruiter.query.filter(Recruiter.id.in_([rid for _, rid in top])).all()
+        }
 
         recommendations = []
-        for recruiter in recruiters:
+        for score, recruiter_id in top:
+            recruiter = recruiters[recruiter_id]
             days_since = 0
             if recruiter.last_contact_date:
-                days_since = (datetime.utcnow() - recruiter.last_contact_date).days
+                days_since = (now - recruiter.last_contact_date).days
 
             action = RecruiterService._suggest_action(recruiter, days_since)
 
@@ -555,7 +801,7 @@ class RecruiterService:
                     "recruiter_name": recruiter.full_name,
                     "company": recruiter.company,
                     "status": recruiter.status,
-                    "priority_score": recruiter.priority_score,
+                    "priority_score": score,
                     "days_since_contact": days_since,
                     "suggested_action": action["action"],
                     "action_type": action["type"],
@@ -565,6 +811,55 @@ class RecruiterService:
 
         return recommendations
 
+    @staticmethod
+    def refresh_priority_scores(chunk_size: int = 5000) -> int:
+        """
+        Recompute the stored priority_score of every recruiter.
+
+        Keeps sort_by=priority lists in step with time decay. Walks the table
+        in primary-key chunks, scores each chunk in one pass and writes only
+        the scores that changed with a single executemany UPDATE.
+
+        Returns:
+            Number of recruiters whose score changed
+        """
+        now = datetime.utcnow()
+        table = Recruiter.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("recruiter_id"))
+            .values(priority_score=bindparam("score"))
+        )
+
+        changed = 0
+        last_id = None
+        while True:
+            query = (
+                select(Recruiter.id, Recruiter.priority_score, *RecruiterService.PRIORITY_INPUTS)
+                .order_by(Recruiter.id)
+                .limit(chunk_size)
+            )
+            if last_id is not None:
+                query = query.where(Recruiter.id > last_id)
+            rows = db.session.execute(query).all()
+            if not rows:
+                break
+
+            scores = score_priorities((row[2:] for row in rows), now)
+            updates = [
+                {"recruiter_id": row[0], "score": score}
+                for row, score in zip(rows, scores)
+                if score != row[1]
+            ]
+            if updates:
+                db.session.execute(stmt, updates)
+                db.session.commit()
+                changed += len(updates)
+
+            last_id = rows[-1][0]
+
+        return changed
+
     @staticmethod
     def _suggest_action(recruiter: Recruiter, days_since: int) -> Dict:
         """Generate action suggestion based on recruiter state."""
@@ -604,7 +899,12 @@ class RecruiterService:
 
     @staticmethod
     def get_pipeline_stats(user_id: str) -> Dict:
-        """Get pipeline statistics for dashboard."""
+        """
+        Get pipeline statistics for dashboard.
+
+        One grouped aggregate over the user's recruiters; no rows (or their
+        JSON research columns) are loaded.
+        """
         stats = {
             "total": 0,
             "by_stage": {},
@@ -613,30 +913,42 @@ class RecruiterService:
             "avg_fit": 0,
         }
 
-        recruiters = Recruiter.query.filter_by(user_id=user_id).all()
-        stats["total"] = len(recruiters)
+        # Zero scores are treated as "not scored yet" and left out of averages
+        engagement = case((Recruiter.engagement_score != 0, Recruiter.engagement_score))
+        fit = case((Recruiter.fit_score != 0, Recruiter.fit_score))
+
+        rows = db.session.execute(
+            select(
+                Recruiter.status,
+                func.count(),
+                func.sum(case((Recruiter.messages_sent > 0, 1), else_=0)),
+                func.sum(case((Recruiter.has_responded.is_(True), 1), else_=0)),
+                func.sum(engagement),
+                func.count(engagement),
+                func.sum(fit),
+                func.count(fit),
+            )
+            .where(Recruiter.user_id == user_id)
+            .group_by(Recruiter.status)
+        ).all()
 
-        if not recruiters:
+        if not rows:
             return stats
 
-        # Count by stage
+        by_status = {row[0]: row[1] for row in rows}
+        stats["total"] = sum(by_status.values())
         for stage in PipelineStage:
-            count = sum(1 for r in recruiters if r.status == stage.value)
-            stats["by_stage"][stage.value] = count
-
-        # Calculate response rate
-        total_contacted = sum(1 for r in recruiters if r.messages_sent and r.messages_sent > 0)
-        total_responded = sum(1 for r in recruiters if r.has_responded)
-        if total_contacted > 0:
-            stats["response_rate"] = round((total_responded / total_contacted) * 100, 1)
-
-        # Calculate averages
-        engagement_scores = [r.engagement_score for r in recruiters if r.engagement_score]
-        fit_scores = [r.fit_score for r in recruiters if r.fit_score]
-
-        if engagement_scores:
-            stats["avg_engagement"] = round(sum(engagement_scores) / len(engagement_scores), 1)
-        if fit_scores:
-            stats["avg_fit"] = round(sum(fit_scores) / len(fit_scores), 1)
+            stats["by_stage"][stage.value] = by_status.get(stage.value, 0)
+
+        contacted, responded, engagement_sum, engagement_count, fit_sum, fit_count = (
+            sum(row[i] or 0 for row in rows) for i in range(2, 8)
+        )
+
+        if contacted > 0:
+            stats["response_rate"] = round((responded / contacted) * 100, 1)
+        if engagement_count:
+            stats["avg_engagement"] = round(engagement_sum / engagement_count, 1)
+        if fit_count:
+            stats["avg_fit"] = round(fit_sum / fit_count, 1)
 
         return stats
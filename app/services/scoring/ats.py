@@ -11,6 +11,8 @@ ats_score = compatibility(15) + keywords(15) + achievements(25) +
 import re
 from typing import Dict, List, Optional, Tuple
 
+from app.extensions import cache
+
 # ATS Score Weights (must sum to 100)
 ATS_WEIGHTS = {
     "compatibility": 15,
@@ -103,6 +105,7 @@ METRIC_PATTERNS = [
 ]
 
 
+@cache.cached("scoring.ats", timeout=3600)
 def calculate_ats_score(
     resume_text: str,
     parsed_sections: Optional[Dict] = None,
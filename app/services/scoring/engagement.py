@@ -10,8 +10,9 @@ Fit Formula:
 fit = industry(30%) + location(20%) + specialty(25%) + tier(15%) + depth(10%)
 """
 
+import sys
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 # Engagement Score Weights
 ENGAGEMENT_WEIGHTS = {
@@ -37,6 +38,18 @@ RECENCY_DECAY = {
     "cold": 60,  # 25% score within 60 days
 }
 
+# Priority multiplier by pipeline status
+PRIORITY_STATUS_MULTIPLIERS = {
+    "new": 1.0,
+    "researching": 0.8,
+    "contacted": 1.2,
+    "responded": 1.5,
+    "interviewing": 1.3,
+    "offer": 0.5,
+    "accepted": 0.1,
+    "declined": 0.1,
+}
+
 
 def calculate_engagement_score(
     messages_sent: int,
@@ -396,6 +409,167 @@ def _calculate_depth_score(
     return min(100, score)
 
 
+_REMOTE_TERMS = ("remote", "nationwide", "national", "global")
+
+
+class FitProfile:
+    """
+    A user's side of the fit score, tokenized once.
+
+    Lowercasing and word-splitting of the user's industries, location and
+    target roles happen here instead of once per recruiter, so scoring a
+    whole pipeline against the same profile (score_fits) only does the
+    recruiter-side work per row.
+    """
+
+    __slots__ = (
+        "has_industries",
+        "industries",
+        "location",
+        "location_parts",
+        "has_roles",
+        "role_words",
+        "role_terms",
+        "salary",
+    )
+
+    def __init__(
+        self,
+        industries: List[str],
+        location: Optional[str],
+        target_roles: List[str],
+        salary_expectation: Optional[int] = None,
+    ):
+        self.has_industries = bool(industries)
+        self.industries = frozenset(_intern_lower(i) for i in industries or [])
+
+        self.location = location.lower() if location else None
+        self.location_parts = frozenset(
+            part for part in (self.location or "").replace(",", " ").split() if len(part) > 2
+        )
+
+        self.has_roles = bool(target_roles)
+        role_words = [word for role in target_roles or [] for word in role.lower().split()]
+        # Only overlaps on words longer than 3 characters count as a match
+        self.role_words = frozenset(word for word in role_words if len(word) > 3)
+        self.role_terms = tuple(dict.fromkeys(word for word in role_words if len(word) > 4))
+
+        self.salary = salary_expectation
+
+
+def _intern_lower(value: str) -> str:
+    return sys.intern(value.lower())
+
+
+def score_fits(profile: FitProfile, rows: Iterable[Tuple]) -> List[Dict]:
+    """
+    Calculate fit scores for many recruiters against one profile.
+
+    Each row is (industries, locations, specialty, company_type,
+    salary_range_min, salary_range_max). Results are identical to calling
+    calculate_fit_score() per recruiter with the same user inputs.
+
+    Args:
+        profile: Pre-tokenized user profile
+        rows: Recruiter column tuples
+
+    Returns:
+        List of {"total_score", "components"} dicts in row order
+    """
+    weights = {name: weight / 100 for name, weight in FIT_WEIGHTS.items()}
+    w_industry, w_location, w_specialty = (
+        weights["industry"],
+        weights["location"],
+        weights["specialty"],
+    )
+    w_tier, w_depth = weights["tier"], weights["depth"]
+
+    user_industries = profile.industries
+    user_industry_count = len(user_industries)
+    user_location = profile.location
+    location_parts = profile.location_parts
+    role_words, role_terms = profile.role_words, profile.role_terms
+
+    # Recruiter-side strings repeat heavily across a pipeline; lower each once
+    lowered = {}
+
+    def lower(value):
+        result = lowered.get(value)
+        if result is None:
+            result = lowered[value] = sys.intern(value.lower())
+        return result
+
+    results = []
+    for industries, locations, specialty, company_type, salary_min, salary_max in rows:
+        # Industry overlap
+        if not profile.has_industries or not industries:
+            industry_score = 50
+        else:
+            overlap = len(user_industries.intersection(lower(i) for i in industries))
+            if not overlap:
+                industry_score = 20
+            elif overlap / user_industry_count >= 0.5:
+                industry_score = 100
+            elif overlap / user_industry_count >= 0.25:
+                industry_score = 75
+            else:
+                industry_score = 50
+
+        # Location match
+        if not user_location or not locations:
+            location_score = 70
+        else:
+            recruiter_locs = [lower(loc) for loc in locations]
+            if user_location in recruiter_locs:
+                location_score = 100
+            elif location_parts and any(
+                not location_parts.isdisjoint(loc.replace(",", " ").split())
+                for loc in recruiter_locs
+            ):
+                location_score = 75
+            elif any(term in loc for loc in recruiter_locs for term in _REMOTE_TERMS):
+                location_score = 80
+            else:
+                location_score = 40
+
+        # Role specialty
+        if not profile.has_roles or not specialty:
+            specialty_score = 50
+        else:
+            specialty_lower = lower(specialty)
+            if not role_words.isdisjoint(specialty_lower.split()):
+                specialty_score = 100
+            elif any(term in specialty_lower for term in role_terms):
+                specialty_score = 70
+            else:
+                specialty_score = 40
+
+        salary_range = (salary_min, salary_max) if salary_min and salary_max else None
+        tier_score = _calculate_tier_fit(profile.salary, company_type, salary_range)
+        depth_score = _calculate_depth_score(industries, locations, specialty)
+
+        results.append(
+            {
+                "total_score": int(
+                    industry_score * w_industry
+                    + location_score * w_location
+                    + specialty_score * w_specialty
+                    + tier_score * w_tier
+                    + depth_score * w_depth
+                ),
+                "components": {
+                    "industry": industry_score,
+                    "location": location_score,
+                    "specialty": specialty_score,
+                    "tier": tier_score,
+                    "depth": depth_score,
+                },
+            }
+        )
+
+    return results
+
+
 def calculate_priority_score(
     days_since_contact: int,
     pending_actions: int,
@@ -432,16 +606,7 @@ def calculate_priority_score(
     response_score = 100 if has_responded else 30
 
     # Status adjustment
-    status_multiplier = {
-        "new": 1.0,
-        "researching": 0.8,
-        "contacted": 1.2,
-        "responded": 1.5,
-        "interviewing": 1.3,
-        "offer": 0.5,
-        "accepted": 0.1,
-        "declined": 0.1,
-    }.get(status, 1.0)
+    status_multiplier = PRIORITY_STATUS_MULTIPLIERS.get(status, 1.0)
 
     # Calculate weighted score
     raw_score = (
@@ -453,3 +618,66 @@ def calculate_priority_score(
     )
 
     return int(min(100, raw_score * status_multiplier))
+
+
+def _days_since_contact_score(days: int) -> int:
+    if days < 0:
+        return 0
+    if 5 <= days <= 7:
+        return 100
+    if days < 5:
+        return 50
+    if days <= 14:
+        return 80
+    return max(20, 100 - (days - 7) * 3)
+
+
+# days_score by day; beyond the table it has decayed to its floor of 20
+_DAYS_SCORES = [_days_since_contact_score(days) for days in range(35)]
+
+
+def score_priorities(rows: Iterable[Tuple], now: Optional[datetime] = None) -> List[int]:
+    """
+    Calculate priority scores for many recruiters in one pass.
+
+    Each row is (last_contact_date, next_action, messages_sent, has_responded,
+    engagement_score, fit_score, status), i.e. plain column values rather
+    than ORM objects. Inputs are derived exactly as for a single recruiter
+    (missing scores count as 50, a reply bonus only once responded), and
+    each result equals calculate_priority_score() for that recruiter.
+
+    Args:
+        rows: Recruiter column tuples
+        now: Reference time for days since contact (default: utcnow)
+
+    Returns:
+        Priority scores (0-100) in row order
+    """
+    now = now or datetime.utcnow()
+    days_scores = _DAYS_SCORES
+    max_day = len(days_scores)
+    multipliers = PRIORITY_STATUS_MULTIPLIERS
+
+    scores = []
+    append = scores.append
+    for last_contact, next_action, messages_sent, responded, engagement, fit, status in rows:
+        days = (now - last_contact).days if last_contact else 0
+        if days < 0:
+            days_score = 0
+        elif days < max_day:
+            days_score = days_scores[days]
+        else:
+            days_score = 20
+
+        pending = (1 if next_action else 0) + (1 if not responded and messages_sent else 0)
+
+        raw_score = (
+            days_score * 0.30
+            + min(100, pending * 25) * 0.25
+            + ((engagement or 50) + (fit or 50)) // 2 * 0.20
+            + 30 * 0.15
+            + (100 if responded else 30) * 0.10
+        )
+        append(int(min(100, raw_score * multipliers.get(status or "new", 1.0))))
+
+    return scores
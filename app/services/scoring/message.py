@@ -66,6 +66,57 @@ PERSONALIZATION_TYPES = {
     "specific_detail": r"(?:noticed|saw|read|impressed by|interested in)\s+(?:your|the)",
 }
 
+# Quantified achievement patterns; every match counts
+METRIC_PATTERNS = [
+    r"\$[\d,]+[KMB]?",  # Dollar amounts
+    r"\d+%",  # Percentages
+    r"\d+x",  # Multipliers
+    r"\d{1,3}(?:,\d{3})+",  # Large numbers
+    r"\b\d+\s*(?:years?|months?|clients?|projects?|users?|customers?)\b",
+]
+
+# Tone problems, matched as plain substrings of the lowercased message
+CASUAL_INDICATORS = ["hey!", "yo", "sup", "lol", "!!!", "???", "gonna", "wanna"]
+OVERLY_FORMAL_PHRASES = ["pursuant to", "herewith", "aforementioned", "henceforth"]
+DESPERATE_PHRASES = [
+    "i really need",
+    "please help",
+    "desperate",
+    "any job",
+    "anything available",
+]
+
+
+def _any_of(patterns: List[str], flags: int = 0) -> re.Pattern:
+    """One alternation matching wherever any of the patterns would."""
+    return re.compile("|".join(f"(?:{p})" for p in patterns), flags)
+
+
+def _any_phrase(phrases: List[str]) -> re.Pattern:
+    """One alternation matching any of the literal phrases."""
+    return _any_of([re.escape(phrase) for phrase in phrases])
+
+
+# Everything above compiled once at import. Scoring runs on every save and
+# on drafts as they are typed, so each check is one pass of a compiled
+# pattern. The CTA check tries one combined scan and only counts individual
+# patterns when it matches; metric scans start at the first digit or "$".
+_CTA_RES = tuple(re.compile(p) for p in CTA_PATTERNS)
+_CTA_ANY = _any_of(CTA_PATTERNS)
+_PROFESSIONAL_RE = _any_phrase(PROFESSIONAL_PHRASES)
+_CASUAL_RE = _any_phrase(CASUAL_INDICATORS)
+_OVERLY_FORMAL_RE = _any_phrase(OVERLY_FORMAL_PHRASES)
+_DESPERATE_RE = _any_phrase(DESPERATE_PHRASES)
+_METRIC_RES = tuple(re.compile(p, re.IGNORECASE) for p in METRIC_PATTERNS)
+_METRIC_START = re.compile(r"[\d$]")  # every metric match starts with one
+
+# Names need their capitals, so "name" runs on the original text; "company"
+# ignores case there, and the rest run on the lowercased text
+_PERSONALIZATION_RES = {
+    kind: re.compile(pattern, re.IGNORECASE if kind == "company" else 0)
+    for kind, pattern in PERSONALIZATION_TYPES.items()
+}
+
 
 def calculate_message_quality(
     message_text: str,
@@ -99,13 +150,14 @@ def calculate_message_quality(
         }
 
     # Calculate each component
+    message_lower = message_text.lower()
     words_score, word_count, words_feedback = _score_word_count(message_text, message_type)
     personal_score, personal_elements, personal_feedback = _score_personalization(
-        message_text, recruiter_name, company_name
+        message_text, message_lower, recruiter_name, company_name
     )
     metrics_score, metrics_feedback = _score_metrics(message_text)
-    cta_score, has_cta, cta_feedback = _score_cta(message_text)
-    tone_score, tone_feedback = _score_tone(message_text, message_type)
+    cta_score, has_cta, cta_feedback = _score_cta(message_lower)
+    tone_score, tone_feedback = _score_tone(message_lower, message_type)
 
     # Calculate weighted total
     total_score = int(
@@ -183,7 +235,10 @@ def _score_word_count(message_text: str, message_type: str) -> Tuple[int, int, L
 
 
 def _score_personalization(
-    message_text: str, recruiter_name: Optional[str], company_name: Optional[str]
+    message_text: str,
+    message_lower: str,
+    recruiter_name: Optional[str],
+    company_name: Optional[str],
 ) -> Tuple[int, List[str], List[str]]:
     """
     Score personalization level.
@@ -194,13 +249,11 @@ def _score_personalization(
     elements_found = []
     score = 0
 
-    message_lower = message_text.lower()
-
     # Check for recruiter name
     if recruiter_name and recruiter_name.lower() in message_lower:
         score += 30
         elements_found.append("recruiter_name")
-    elif re.search(PERSONALIZATION_TYPES["name"], message_text):
+    elif _PERSONALIZATION_RES["name"].search(message_text):
         score += 20
         elements_found.append("greeting_with_name")
     else:
@@ -210,24 +263,24 @@ def _score_personalization(
     if company_name and company_name.lower() in message_lower:
         score += 30
         elements_found.append("company_name")
-    elif re.search(PERSONALIZATION_TYPES["company"], message_text, re.IGNORECASE):
+    elif _PERSONALIZATION_RES["company"].search(message_text):
         score += 20
         elements_found.append("company_mention")
     else:
         feedback.append("Mention the company name to show genuine interest")
 
     # Check for other personalization elements
-    if re.search(PERSONALIZATION_TYPES["recent_work"], message_lower):
+    if _PERSONALIZATION_RES["recent_work"].search(message_lower):
         score += 20
         elements_found.append("recent_work")
         feedback.append("✓ References specific work/content")
 
-    if re.search(PERSONALIZATION_TYPES["specific_detail"], message_lower):
+    if _PERSONALIZATION_RES["specific_detail"].search(message_lower):
         score += 20
         elements_found.append("specific_detail")
         feedback.append("✓ Includes specific details")
 
-    if re.search(PERSONALIZATION_TYPES["mutual"], message_lower):
+    if _PERSONALIZATION_RES["mutual"].search(message_lower):
         score += 15
         elements_found.append("mutual_connection")
 
@@ -249,18 +302,12 @@ def _score_metrics(message_text: str) -> Tuple[int, List[str]]:
     score = 0
 
     # Look for numbers and metrics
-    metric_patterns = [
-        r"\$[\d,]+[KMB]?",  # Dollar amounts
-        r"\d+%",  # Percentages
-        r"\d+x",  # Multipliers
-        r"\d{1,3}(?:,\d{3})+",  # Large numbers
-        r"\b\d+\s*(?:years?|months?|clients?|projects?|users?|customers?)\b",
-    ]
-
     metrics_found = 0
-    for pattern in metric_patterns:
-        matches = re.findall(pattern, message_text, re.IGNORECASE)
-        metrics_found += len(matches)
+    first = _METRIC_START.search(message_text)
+    if first:
+        # No metric can start before the first digit or "$"
+        for pattern in _METRIC_RES:
+            metrics_found += len(pattern.findall(message_text, first.start()))
 
     if metrics_found >= 3:
         score = 100
@@ -280,19 +327,17 @@ def _score_metrics(message_text: str) -> Tuple[int, List[str]]:
     return score, feedback
 
 
-def _score_cta(message_text: str) -> Tuple[int, bool, List[str]]:
+def _score_cta(message_lower: str) -> Tuple[int, bool, List[str]]:
     """
     Score call-to-action clarity.
 
     Best practice: Single, clear CTA reduces confusion.
     """
     feedback = []
-    message_lower = message_text.lower()
 
     cta_count = 0
-    for pattern in CTA_PATTERNS:
-        if re.search(pattern, message_lower):
-            cta_count += 1
+    if _CTA_ANY.search(message_lower):
+        cta_count = sum(1 for pattern in _CTA_RES if pattern.search(message_lower))
 
     if cta_count == 1:
         score = 100
@@ -310,17 +355,15 @@ def _score_cta(message_text: str) -> Tuple[int, bool, List[str]]:
     return score, has_cta, feedback
 
 
-def _score_tone(message_text: str, message_type: str) -> Tuple[int, List[str]]:
+def _score_tone(message_lower: str, message_type: str) -> Tuple[int, List[str]]:
     """
     Score professional tone and appropriateness.
     """
     feedback = []
     score = 70  # Base score
 
-    message_lower = message_text.lower()
-
     # Check for professional phrases
-    professional_count = sum(1 for phrase in PROFESSIONAL_PHRASES if phrase in message_lower)
+    professional_count = len(set(_PROFESSIONAL_RE.findall(message_lower)))
     if professional_count >= 2:
         score += 15
     elif professional_count >= 1:
@@ -330,26 +373,17 @@ def _score_tone(message_text: str, message_type: str) -> Tuple[int, List[str]]:
     issues = []
 
     # Too casual
-    casual_indicators = ["hey!", "yo", "sup", "lol", "!!!", "???", "gonna", "wanna"]
-    if any(indicator in message_lower for indicator in casual_indicators):
+    if _CASUAL_RE.search(message_lower):
         score -= 20
         issues.append("Consider more professional tone")
 
     # Too formal/stiff
-    overly_formal = ["pursuant to", "herewith", "aforementioned", "henceforth"]
-    if any(phrase in message_lower for phrase in overly_formal):
+    if _OVERLY_FORMAL_RE.search(message_lower):
         score -= 10
         issues.append("Tone may be overly formal - aim for professional but approachable")
 
     # Desperate/needy language
-    desperate = [
-        "i really need",
-        "please help",
-        "desperate",
-        "any job",
-        "anything available",
-    ]
-    if any(phrase in message_lower for phrase in desperate):
+    if _DESPERATE_RE.search(message_lower):
         score -= 30
         issues.append("Avoid desperate language - focus on value you can provide")
 
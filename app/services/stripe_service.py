@@ -14,6 +14,7 @@ from flask import current_app
 from app.extensions import db
 from app.models.user import SubscriptionTier, User
 from app.services.email_service import EmailService
+from app.services.event_stream import EventType, event_stream
 
 
 class StripeService:
@@ -365,6 +366,7 @@ class StripeService:
         user.subscription_tier = tier
         user.stripe_subscription_id = subscription_id
         db.session.commit()
+        cls._announce(user, "active")
 
         current_app.logger.info(f"User {user_id} subscribed to {tier}")
 
@@ -394,6 +396,7 @@ class StripeService:
                 subscription.get("current_period_end", 0)
             )
         db.session.commit()
+        cls._announce(user, status)
 
         return {"success": True, "message": "Subscription updated"}
 
@@ -411,6 +414,7 @@ class StripeService:
         user.stripe_subscription_id = None
         user.subscription_expires_at = None
         db.session.commit()
+        cls._announce(user, "canceled")
 
         current_app.logger.info(f"User {user.id} subscription cancelled")
 
@@ -422,6 +426,23 @@ class StripeService:
 
         return {"success": True, "message": "Subscription cancelled"}
 
+    @staticmethod
+    def _announce(user: User, status: str) -> None:
+        """Push a committed subscription change to the user's event stream."""
+        event_stream.publish(
+            user.id,
+            EventType.SUBSCRIPTION_UPDATED,
+            {
+                "tier": user.subscription_tier,
+                "status": status,
+                "expires_at": (
+                    user.subscription_expires_at.isoformat()
+                    if user.subscription_expires_at
+                    else None
+                ),
+            },
+        )
+
     @classmethod
     def _handle_payment_failed(cls, invoice: Dict) -> Dict:
         """Handle failed payment."""
@@ -0,0 +1,257 @@
+"""
+Unread Notification Counter
+
+Per-user unread notification counts cached in Redis, so the notification
+bell's polling is a GET instead of a COUNT(*) over the notifications table.
+
+Keys look like notifications:unread:<user_id>. A missing key means the
+count is unknown: the next read counts in SQL and seeds it. Writers only
+adjust keys that exist (an INCRBY on a missing key would start from zero)
+and publish the new count on one channel. Each web process subscribes with
+one thread and wakes the long-polling requests waiting on that user.
+
+A count seeded from SQL can miss a change committed between the COUNT and
+the SET; the reconcile_unread_counts task recounts cached keys in SQL and
+corrects them, bounding that drift. Without Redis every read counts in SQL
+and long-polls answer at once.
+"""
+
+import logging
+import threading
+from collections import defaultdict
+from typing import Dict, Optional
+
+import redis
+from sqlalchemy import func
+
+from app.extensions import db, redis_pool
+from app.models.notification import Notification
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1] counter; ARGV[1] delta, ARGV[2] channel, ARGV[3] user id
+_ADJUST_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return -1
+end
+local updated = redis.call('INCRBY', KEYS[1], tonumber(ARGV[1]))
+if updated < 0 then
+    redis.call('SET', KEYS[1], 0, 'KEEPTTL')
+    updated = 0
+end
+redis.call('PUBLISH', ARGV[2], ARGV[3] .. ':' .. updated)
+return updated
+"""
+
+
+class UnreadCounter:
+    """Cached unread notification counts with change notifications."""
+
+    KEY_PREFIX = "notifications:unread:"
+    CHANGES_CHANNEL = "notifications:unread-changed"
+    COUNT_TTL = 86400  # counts of users who stop checking expire after a day
+    RECONCILE_BATCH_SIZE = 1000
+
+    def __init__(self):
+        self._adjust_script = None
+        self._script_client = None
+        self._subscriber = None
+        self._subscriber_client = None
+        self._waiters = defaultdict(set)
+        self._lock = threading.Lock()
+
+    # ─── Public API ─────────────────────────────────────────────────────
+
+    def get(self, user_id) -> int:
+        """Unread notification count for a user."""
+        client = redis_pool.client
+        if client is not None:
+            try:
+                return self._get_redis(client, str(user_id))
+            except redis.RedisError as e:
+                logger.warning(f"Unread counter: Redis error ({e}), using database")
+
+        return self._count_sql(user_id)
+
+    def adjust(self, user_id, delta: int) -> None:
+        """Apply a committed change of `delta` unread notifications."""
+        self.adjust_many({user_id: delta})
+
+    def adjust_many(self, deltas: Dict) -> None:
+        """Apply committed changes for several users ({user_id: delta})."""
+        client = redis_pool.client
+        if client is None or not deltas:
+            return
+
+        try:
+            script = self._script(client)
+            pipe = client.pipeline(transaction=False)
+            for user_id, delta in deltas.items():
+                user_id = str(user_id)
+                script(
+                    keys=[self._key(user_id)],
+                    args=[delta, self.CHANGES_CHANNEL, user_id],
+                    client=pipe,
+                )
+            pipe.execute()
+        except redis.RedisError as e:
+            # Drop the cached counts; the next read recounts
+            logger.warning(f"Unread counter: Redis error ({e}), forgetting counts")
+            self._forget(client, deltas)
+
+    def reset(self, user_id) -> None:
+        """Record that all of a user's notifications have been read."""
+        self._set(redis_pool.client, str(user_id), 0)
+
+    def reconcile(self) -> Dict:
+        """
+        Recount every cached count in SQL and correct those that drifted.
+
+        Returns:
+            Dict with checked and corrected counts
+        """
+        client = redis_pool.client
+        if client is None:
+            return {"checked": 0, "corrected": 0}
+
+        checked = corrected = 0
+        batch = []
+        for key in client.scan_iter(match=f"{self.KEY_PREFIX}*", count=self.RECONCILE_BATCH_SIZE):
+            batch.append(key[len(self.KEY_PREFIX) :])
+            if len(batch) >= self.RECONCILE_BATCH_SIZE:
+                corrected += self._reconcile_batch(client, batch)
+                checked += len(batch)
+                batch = []
+        if batch:
+            corrected += self._reconcile_batch(client, batch)
+            checked += len(batch)
+
+        return {"checked": checked, "corrected": corrected}
+
+    def wait_for_change(self, user_id, known: Optional[int], timeout: float) -> int:
+        """
+        Long-poll: the user's unread count once it differs from `known`.
+
+        Returns at once if it already differs (or `known` is None), and
+        after `timeout` seconds with the unchanged count otherwise. The
+        session's database connection is released while waiting.
+        """
+        client = redis_pool.client
+        if client is None or known is None or timeout <= 0:
+            return self.get(user_id)
+
+        user_id = str(user_id)
+        changed = threading.Event()
+        # Registered before reading, so a change in between still wakes us
+        with self._lock:
+            self._waiters[user_id].add(changed)
+        try:
+            count = self.get(user_id)
+            if count != known or not self._ensure_subscriber(client):
+                return count
+            db.session.close()
+            changed.wait(timeout)
+        finally:
+            with self._lock:
+                waiters = self._waiters[user_id]
+                waiters.discard(changed)
+                if not waiters:
+                    del self._waiters[user_id]
+
+        return self.get(user_id)
+
+    # ─── Redis ──────────────────────────────────────────────────────────
+
+    def _key(self, user_id: str) -> str:
+        return f"{self.KEY_PREFIX}{user_id}"
+
+    def _script(self, client):
+        if self._script_client is not client:
+            self._adjust_script = client.register_script(_ADJUST_SCRIPT)
+            self._script_client = client
+        return self._adjust_script
+
+    def _get_redis(self, client, user_id: str) -> int:
+        cached = client.get(self._key(user_id))
+        if cached is not None:
+            return int(cached)
+
+        count = self._count_sql(user_id)
+        client.set(self._key(user_id), count, ex=self.COUNT_TTL, nx=True)
+        return count
+
+    def _set(self, client, user_id: str, count: int) -> None:
+        if client is None:
+            return
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.set(self._key(user_id), count, ex=self.COUNT_TTL)
+            pipe.publish(self.CHANGES_CHANNEL, f"{user_id}:{count}")
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Unread counter: Redis error ({e}), forgetting count")
+            self._forget(client, [user_id])
+
+    def _forget(self, client, user_ids) -> None:
+        try:
+            client.delete(*(self._key(str(user_id)) for user_id in user_ids))
+        except redis.RedisError:
+            pass  # The TTL and reconciliation still bound the drift
+
+    def _reconcile_batch(self, client, user_ids) -> int:
+        cached = client.mget([self._key(user_id) for user_id in user_ids])
+        counts = dict(
+            db.session.query(Notification.user_id, func.count(Notification.id))
+            .filter(Notification.user_id.in_(user_ids), Notification.is_read == False)  # noqa: E712
+            .group_by(Notification.user_id)
+            .all()
+        )
+        counts = {str(user_id): count for user_id, count in counts.items()}
+
+        corrected = 0
+        for user_id, value in zip(user_ids, cached):
+            actual = counts.get(user_id, 0)
+            if value is not None and int(value) != actual:
+                self._set(client, user_id, actual)
+                corrected += 1
+        return corrected
+
+    def _ensure_subscriber(self, client) -> bool:
+        """Start this process's change listener if it is not running."""
+        with self._lock:
+            if (
+                self._subscriber is not None
+                and self._subscriber_client is client
+                and self._subscriber.is_alive()
+            ):
+                return True
+            if self._subscriber is not None:
+                self._subscriber.stop()
+                self._subscriber = None
+
+            try:
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(**{self.CHANGES_CHANNEL: self._on_change})
+                self._subscriber = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+                self._subscriber_client = client
+            except redis.RedisError as e:
+                logger.warning(f"Unread counter: pub/sub unavailable ({e})")
+                return False
+            return True
+
+    def _on_change(self, message) -> None:
+        user_id, _, _ = message["data"].rpartition(":")
+        with self._lock:
+            waiters = list(self._waiters.get(user_id, ()))
+        for changed in waiters:
+            changed.set()
+
+    # ─── SQL ────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _count_sql(user_id) -> int:
+        return Notification.query.filter_by(user_id=user_id, is_read=False).count()
+
+
+# Shared instance
+unread_counter = UnreadCounter()
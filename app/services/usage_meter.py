@@ -0,0 +1,369 @@
+"""
+Usage Metering Service
+
+Atomic enforcement of per-period feature limits.
+
+With Redis available, each (user, period, counter) is a Redis key updated by
+a Lua script that checks the limit and increments in one step, so concurrent
+requests from one user can never be admitted past their limit. Keys expire
+shortly after the user's usage period ends, which is what resets them; the
+users table is brought up to date in the background by flush_to_database()
+(write-behind) instead of one row update per metered call.
+
+Without Redis the same guarantee comes from a conditional UPDATE on the
+users row (col = col + n WHERE col + n <= limit).
+
+Periods are rolled lazily on use and in bulk by reset_expired_periods(),
+so users who never come back are still reset.
+"""
+
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict
+
+import redis
+from sqlalchemy import case, select, update
+
+from app.extensions import db, redis_pool
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Feature name (as used by tier_limits) -> users table counter column
+FEATURE_COLUMNS = {
+    "recruiters": "monthly_recruiter_count",
+    "tailored_resumes": "monthly_tailoring_count",
+    "ai_messages": "monthly_message_count",
+    "research": "monthly_research_count",
+    "coach_daily": "daily_coach_count",
+    "interview_prep": "monthly_interview_prep_count",
+    "skills_gap": "monthly_research_count",  # Shares with research
+}
+
+COUNTER_COLUMNS = sorted(set(FEATURE_COLUMNS.values()) | {"monthly_resume_count"})
+
+USAGE_PERIOD = timedelta(days=30)
+
+# KEYS[1] counter, KEYS[2] dirty set
+# ARGV[1] amount, ARGV[2] limit (-1 = unlimited), ARGV[3] seed, ARGV[4] expire-at, ARGV[5] member
+_CONSUME_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    redis.call('SET', KEYS[1], ARGV[3])
+    redis.call('EXPIREAT', KEYS[1], ARGV[4])
+end
+local amount = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+local current = tonumber(redis.call('GET', KEYS[1]))
+if limit >= 0 and current + amount > limit then
+    return -1
+end
+local updated = redis.call('INCRBY', KEYS[1], amount)
+redis.call('SADD', KEYS[2], ARGV[5])
+return updated
+"""
+
+# KEYS[1] counter, KEYS[2] dirty set; ARGV[1] amount, ARGV[2] member
+_REFUND_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return -1
+end
+local updated = redis.call('DECRBY', KEYS[1], tonumber(ARGV[1]))
+if updated < 0 then
+    redis.call('SET', KEYS[1], 0, 'KEEPTTL')
+    updated = 0
+end
+redis.call('SADD', KEYS[2], ARGV[2])
+return updated
+"""
+
+
+class UsageMeter:
+    """
+    Per-user, per-period feature usage counters.
+
+    Keys look like usage:<user_id>:<period_end>:<column>, where period_end is
+    the user's usage_reset_date as a unix timestamp.
+    """
+
+    KEY_PREFIX = "usage:"
+    DIRTY_SET = "usage:dirty"
+    EXPIRY_GRACE = 86400  # keep counters a day past period end for the final flush
+
+    def __init__(self):
+        self._consume_script = None
+        self._refund_script = None
+        self._script_client = None
+
+    # ─── Public API ─────────────────────────────────────────────────────
+
+    def consume(self, user: User, feature: str, count: int = 1) -> bool:
+        """
+        Atomically reserve `count` uses of a feature if within the tier limit.
+
+        Args:
+            user: User consuming the feature
+            feature: Feature name (key of User.tier_limits)
+            count: Number of uses to reserve
+
+        Returns:
+            True if admitted (usage recorded), False if the limit would be exceeded
+        """
+        limit = user.tier_limits.get(feature, 0)
+        column = FEATURE_COLUMNS.get(feature)
+        if column is None:
+            return limit == -1 or count <= limit
+
+        self._roll_period(user)
+
+        client = redis_pool.client
+        if client is not None:
+            try:
+                return self._consume_redis(client, user, column, count, limit)
+            except redis.RedisError as e:
+                logger.warning(f"Usage meter: Redis error ({e}), using database")
+
+        return self._consume_sql(user, column, count, limit)
+
+    def refund(self, user: User, feature: str, count: int = 1) -> None:
+        """Return previously consumed uses, e.g. when the metered action failed."""
+        column = FEATURE_COLUMNS.get(feature)
+        if column is None:
+            return
+
+        client = redis_pool.client
+        if client is not None:
+            try:
+                if self._refund_redis(client, user, column, count) >= 0:
+                    return
+            except redis.RedisError as e:
+                logger.warning(f"Usage meter: Redis error ({e}), using database")
+
+        col = getattr(User, column)
+        db.session.execute(
+            update(User)
+            .where(User.id == user.id)
+            .values({column: case((col >= count, col - count), else_=0)})
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+
+    def get_usage(self, user: User) -> Dict[str, int]:
+        """
+        Current counters for a user, including uses not yet written back.
+
+        Returns:
+            Mapping of counter column -> current value
+        """
+        usage = {column: getattr(user, column) or 0 for column in COUNTER_COLUMNS}
+
+        client = redis_pool.client
+        if client is not None and user.usage_reset_date:
+            keys = [self._key(user, column) for column in COUNTER_COLUMNS]
+            try:
+                for column, value in zip(COUNTER_COLUMNS, client.mget(keys)):
+                    if value is not None:
+                        usage[column] = int(value)
+            except redis.RedisError as e:
+                logger.warning(f"Usage meter: Redis error ({e}), showing stored usage")
+
+        return usage
+
+    def flush_to_database(self, batch_size: int = 500) -> int:
+        """
+        Write dirty Redis counters back to the users table.
+
+        Values are absolute, so re-flushing is idempotent. Counters from a
+        period that has since been reset are skipped. Members of a batch
+        that fails to commit are returned to the dirty set.
+
+        Returns:
+            Number of user rows updated
+        """
+        client = redis_pool.client
+        if client is None:
+            return 0
+
+        updated = 0
+        while True:
+            members = client.spop(self.DIRTY_SET, batch_size)
+            if not members:
+                break
+
+            try:
+                updated += self._flush_members(client, members)
+            except Exception:
+                # Still dirty: the next flush writes them
+                db.session.rollback()
+                client.sadd(self.DIRTY_SET, *members)
+                raise
+
+        return updated
+
+    def reset_expired_periods(self, chunk_size: int = 1000) -> Dict[str, float]:
+        """
+        Start a new usage period for every user whose current one has ended.
+
+        Runs as set-based UPDATEs over primary-key ranges of chunk_size
+        expired users, committing after each chunk so no single transaction
+        (or lock) spans the whole table.
+
+        Args:
+            chunk_size: Maximum users reset per UPDATE
+
+        Returns:
+            Dict with rows reset, chunks, elapsed seconds and rows per second
+        """
+        started = time.monotonic()
+        now = datetime.utcnow()
+
+        values = {column: 0 for column in COUNTER_COLUMNS}
+        values["usage_reset_date"] = now + USAGE_PERIOD
+
+        rows = chunks = 0
+        last_id = None
+        while True:
+            query = (
+                select(User.id)
+                .where(User.usage_reset_date <= now)
+                .order_by(User.id)
+                .limit(chunk_size)
+            )
+            if last_id is not None:
+                query = query.where(User.id > last_id)
+            ids = db.session.execute(query).scalars().all()
+            if not ids:
+                break
+
+            result = db.session.execute(
+                update(User)
+                .where(
+                    User.id >= ids[0],
+                    User.id <= ids[-1],
+                    User.usage_reset_date <= now,
+                )
+                .values(values)
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+
+            rows += result.rowcount
+            chunks += 1
+            last_id = ids[-1]
+
+        elapsed = time.monotonic() - started
+        return {
+            "rows": rows,
+            "chunks": chunks,
+            "seconds": round(elapsed, 3),
+            "rows_per_second": round(rows / elapsed, 1) if elapsed > 0 else float(rows),
+        }
+
+    # ─── Internals ──────────────────────────────────────────────────────
+
+    def _roll_period(self, user: User) -> None:
+        """Start a new usage period if the current one has ended (or never started)."""
+        now = datetime.utcnow()
+
+        if user.usage_reset_date is None:
+            db.session.execute(
+                update(User)
+                .where(User.id == user.id, User.usage_reset_date.is_(None))
+                .values(usage_reset_date=now + USAGE_PERIOD)
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+            db.session.refresh(user)
+            return
+
+        if user.usage_reset_date > now:
+            return
+
+        # Conditional so that concurrent requests reset the period only once
+        values = {column: 0 for column in COUNTER_COLUMNS}
+        values["usage_reset_date"] = now + USAGE_PERIOD
+        db.session.execute(
+            update(User)
+            .where(User.id == user.id, User.usage_reset_date <= now)
+            .values(values)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        db.session.refresh(user)
+
+    def _flush_members(self, client, members) -> int:
+        """Write the counters of popped dirty-set members and commit."""
+        keys = [f"{self.KEY_PREFIX}{member}" for member in members]
+        values = client.mget(keys)
+
+        # Group by (user, period) so each user row is written once
+        pending = {}
+        for member, value in zip(members, values):
+            if value is None:
+                continue
+            user_id, period_end, column = member.split(":")
+            pending.setdefault((user_id, int(period_end)), {})[column] = int(value)
+
+        updated = 0
+        for (user_id, period_end), columns in pending.items():
+            period_end_at = datetime.fromtimestamp(period_end, timezone.utc).replace(tzinfo=None)
+            result = db.session.execute(
+                update(User)
+                .where(
+                    User.id == user_id,
+                    User.usage_reset_date >= period_end_at,
+                    User.usage_reset_date < period_end_at + timedelta(seconds=1),
+                )
+                .values(columns)
+                .execution_options(synchronize_session=False)
+            )
+            updated += result.rowcount
+        db.session.commit()
+        return updated
+
+    def _key(self, user: User, column: str) -> str:
+        return f"{self.KEY_PREFIX}{self._member(user, column)}"
+
+    @staticmethod
+    def _member(user: User, column: str) -> str:
+        period_end = int(user.usage_reset_date.replace(tzinfo=timezone.utc).timestamp())
+        return f"{user.id}:{period_end}:{column}"
+
+    def _scripts(self, client):
+        if self._script_client is not client:
+            self._consume_script = client.register_script(_CONSUME_SCRIPT)
+            self._refund_script = client.register_script(_REFUND_SCRIPT)
+            self._script_client = client
+        return self._consume_script, self._refund_script
+
+    def _consume_redis(self, client, user: User, column: str, count: int, limit: int) -> bool:
+        consume_script, _ = self._scripts(client)
+        member = self._member(user, column)
+        expire_at = int(user.usage_reset_date.replace(tzinfo=timezone.utc).timestamp())
+        result = consume_script(
+            keys=[f"{self.KEY_PREFIX}{member}", self.DIRTY_SET],
+            args=[count, limit, getattr(user, column) or 0, expire_at + self.EXPIRY_GRACE, member],
+        )
+        return int(result) >= 0
+
+    def _refund_redis(self, client, user: User, column: str, count: int) -> int:
+        _, refund_script = self._scripts(client)
+        member = self._member(user, column)
+        return int(
+            refund_script(keys=[f"{self.KEY_PREFIX}{member}", self.DIRTY_SET], args=[count, member])
+        )
+
+    @staticmethod
+    def _consume_sql(user: User, column: str, count: int, limit: int) -> bool:
+        col = getattr(User, column)
+        stmt = update(User).where(User.id == user.id).values({column: col + count})
+        if limit >= 0:
+            stmt = stmt.where(col + count <= limit)
+
+        result = db.session.execute(stmt.execution_options(synchronize_session=False))
+        db.session.commit()
+        return result.rowcount == 1
+
+
+# Shared instance
+usage_meter = UsageMeter()
@@ -5,6 +5,7 @@ This module defines background tasks for scheduled operations like
 weekly summaries and follow-up reminders.
 """
 
+import os
 from datetime import datetime, timedelta
 
 from celery import shared_task
@@ -13,6 +14,36 @@ from celery.utils.log import get_task_logger
 logger = get_task_logger(__name__)
 
 
+def enqueue(task, *args, inline=None):
+    """
+    Queue a task for a Celery worker from inside the web app.
+
+    Under TESTING, or if the broker cannot be reached, `inline` is called
+    with the same arguments in this process instead, so the work is never
+    dropped. Pass the service function the task wraps, not the task itself:
+    tasks build their own app.
+
+    Args:
+        task: Celery task to queue
+        *args: Task arguments (JSON-serializable)
+        inline: Callable run in-process when the task cannot be queued
+    """
+    from flask import current_app
+
+    if not current_app.config.get("TESTING"):
+        try:
+            # Binds shared tasks to the configured broker in web processes
+            import celery_app  # noqa: F401
+
+            task.delay(*args)
+            return
+        except Exception as e:
+            logger.warning(f"Could not queue {task.name} ({e}), running inline")
+
+    if inline is not None:
+        inline(*args)
+
+
 @shared_task(bind=True, max_retries=3, default_retry_delay=60)
 def send_weekly_summaries(self):
     """
@@ -194,6 +225,376 @@ def send_email_verification_reminder(self, user_id: str):
             raise self.retry(exc=exc)
 
 
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def flush_usage_counters(self):
+    """
+    Write metered usage counters from Redis back to the users table.
+
+    This task runs every minute. Enforcement happens in Redis; this keeps the
+    stored monthly counters (shown on the dashboard and used when Redis is
+    unavailable) close to real time.
+    """
+    from app import create_app
+    from app.services.usage_meter import usage_meter
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            updated = usage_meter.flush_to_database()
+            logger.info(f"Usage flush complete: {updated} users updated")
+            return {"users_updated": updated}
+
+        except Exception as exc:
+            logger.error(f"Usage flush task failed: {exc}")
+            raise self.retry(exc=exc)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def reset_expired_usage(self):
+    """
+    Start a new usage period for users whose current one has ended.
+
+    This task runs hourly so inactive users are reset too, without waiting
+    for their next metered request to roll the period lazily.
+    """
+    from app import create_app
+    from app.services.usage_meter import usage_meter
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            stats = usage_meter.reset_expired_periods()
+            logger.info(
+                f"Usage reset complete: {stats['rows']} users in {stats['chunks']} chunks "
+                f"({stats['rows_per_second']} rows/s)"
+            )
+            return stats
+
+        except Exception as exc:
+            logger.error(f"Usage reset task failed: {exc}")
+            raise self.retry(exc=exc)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def refresh_priority_scores(self):
+    """
+    Recompute stored recruiter priority scores.
+
+    This task runs nightly. Priority decays with days since last contact, so
+    without it the stored score only moves when an event touches the
+    recruiter. Follow-up recommendations score at read time and do not
+    depend on it; priority-sorted lists do.
+    """
+    from app import create_app
+    from app.services.recruiter_service import RecruiterService
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            changed = RecruiterService.refresh_priority_scores()
+            logger.info(f"Priority refresh complete: {changed} recruiters updated")
+            return {"recruiters_updated": changed}
+
+        except Exception as exc:
+            logger.error(f"Priority refresh task failed: {exc}")
+            raise self.retry(exc=exc)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def rescore_recruiter_fit(self, user_id: str):
+    """
+    Recalculate fit scores for all of a user's recruiters.
+
+    Queued when a profile change touches the inputs of the fit score
+    (target industries, target roles, location, salary expectation).
+    """
+    from app import create_app
+    from app.services.recruiter_service import RecruiterService
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            rescored = RecruiterService.rescore_fit(user_id)
+            logger.info(f"Fit rescore complete for user {user_id}: {rescored} recruiters")
+            return {"recruiters_rescored": rescored}
+
+        except Exception as exc:
+            logger.error(f"Fit rescore task failed for user {user_id}: {exc}")
+            raise self.retry(exc=exc)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def rebalance_pipeline_ranks(self):
+    """
+    Renumber Kanban stages whose rank keys have grown long.
+
+    This task runs nightly. Repeated drops at the same spot lengthen rank
+    keys; giving those stages fresh, evenly spaced keys keeps them short.
+    Unranked items are ranked at the end of their stage.
+    """
+    from app import create_app
+    from app.services.activity_service import ActivityService
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            stages = ActivityService.rebalance_ranks()
+            logger.info(f"Rank rebalance complete: {stages} stages renumbered")
+            return {"stages_rebalanced": stages}
+
+        except Exception as exc:
+            logger.error(f"Rank rebalance task failed: {exc}")
+            raise self.retry(exc=exc)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def update_days_in_stage(self):
+    """
+    Refresh stored days_in_stage for every pipeline item.
+
+    This task runs nightly, shortly after midnight UTC, as chunked
+    set-based UPDATEs over the whole pipeline_items table.
+    """
+    from app import create_app
+    from app.services.activity_service import ActivityService
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            updated = ActivityService.update_days_in_stage()
+            logger.info(f"Days-in-stage refresh complete: {updated} items updated")
+            return {"items_updated": updated}
+
+        except Exception as exc:
+            logger.error(f"Days-in-stage refresh task failed: {exc}")
+            raise self.retry(exc=exc)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def create_activity_partitions(self):
+    """
+    Create upcoming monthly partitions of the activities table.
+
+    This task runs daily so the next months' partitions always exist
+    before their first insert. It does nothing on an unpartitioned table.
+    """
+    from app import create_app
+    from app.services.activity_retention import ActivityRetentionService
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            created = ActivityRetentionService.ensure_partitions()
+            logger.info(f"Activity partitions checked: {len(created)} created")
+            return {"partitions_created": created}
+
+        except Exception as exc:
+            logger.error(f"Activity partition task failed: {exc}")
+            raise self.retry(exc=exc)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def roll_up_old_activities(self):
+    """
+    Roll activities past the retention window into daily summaries.
+
+    This task runs monthly. Expired months become per-user daily counts
+    and their partitions are dropped.
+    """
+    from app import create_app
+    from app.services.activity_retention import ActivityRetentionService
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            result = ActivityRetentionService.roll_up()
+            logger.info(
+                f"Activity roll-up complete: {result['months_rolled_up']} months, "
+                f"{result['summary_rows']} summary rows"
+            )
+            return result
+
+        except Exception as exc:
+            logger.error(f"Activity roll-up task failed: {exc}")
+            raise self.retry(exc=exc)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def drain_activity_stream(self):
+    """
+    Bulk-insert activities published to the Redis activity stream.
+
+    This task runs every few seconds. With ACTIVITY_LOG_MODE = "stream",
+    requests publish their activities instead of writing them; this is the
+    consumer that writes them in large batches. In other modes nothing is
+    published, so it returns without starting the app.
+    """
+    if os.environ.get("ACTIVITY_LOG_MODE", "buffer") != "stream":
+        return {"activities_written": 0}
+
+    from app import create_app
+    from app.services.activity_buffer import ActivityBuffer
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            written = ActivityBuffer.drain_stream()
+            if written:
+                logger.info(f"Activity stream drained: {written} activities written")
+            return {"activities_written": written}
+
+        except Exception as exc:
+            logger.error(f"Activity stream drain failed: {exc}")
+            raise self.retry(exc=exc)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def build_data_export(self, export_id: int):
+    """
+    Build the ZIP for a DSAR data export request.
+
+    Queued by POST /api/profile/export. Progress is recorded on the
+    DataExportRequest while tables are streamed into the archive, and the
+    user is emailed a download link when it is ready.
+    """
+    from app import create_app
+    from app.services.account_service import run_data_export
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            result = run_data_export(export_id)
+            logger.info(f"Data export {export_id} finished: {result.get('error', 'ready')}")
+            return result
+
+        except Exception as exc:
+            logger.error(f"Data export task failed for request {export_id}: {exc}")
+            raise self.retry(exc=exc)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def process_expired_deletions(self):
+    """
+    Queue hard deletes for accounts past their deletion grace period.
+
+    This task runs daily. Each account gets its own delete_expired_account
+    task, so the worker pool deletes several at once. Deletions that failed
+    or lost their worker part-way are queued again and resume.
+    """
+    from app import create_app
+    from app.services.account_service import find_expired_deletions, hard_delete_user
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            user_ids = find_expired_deletions()
+            for user_id in user_ids:
+                enqueue(delete_expired_account, user_id, inline=hard_delete_user)
+
+            logger.info(f"Queued {len(user_ids)} account deletions")
+            return {"queued": len(user_ids)}
+
+        except Exception as exc:
+            logger.error(f"Expired deletion task failed: {exc}")
+            raise self.retry(exc=exc)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=300)
+def delete_expired_account(self, user_id: str):
+    """
+    Permanently delete one account and all of its data.
+
+    Rows are deleted in batches with progress saved on the user's
+    AccountDeletionJob, so a retry continues where the last attempt stopped.
+    """
+    from app import create_app
+    from app.services.account_service import hard_delete_user
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            result = hard_delete_user(user_id)
+            if result.get("status_code") == 500:
+                raise RuntimeError(result.get("details", result["error"]))
+
+            logger.info(f"Account deletion for user {user_id}: {result.get('error', 'done')}")
+            return result
+
+        except Exception as exc:
+            logger.error(f"Account deletion task failed for user {user_id}: {exc}")
+            raise self.retry(exc=exc)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def generate_notifications(self):
+    """
+    Generate follow-up reminders and usage warnings for every active user.
+
+    This task runs hourly. Candidates are found and deduplicated set-based
+    and inserted together, so a sweep costs a few queries, not a few per user.
+    """
+    from app import create_app
+    from app.services.notification_service import NotificationService
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            result = NotificationService.generate_notifications()
+
+            logger.info(
+                f"Generated {result['total_generated']} notifications "
+                f"({result['follow_up_reminders']} follow-ups, "
+                f"{result['usage_warnings']} usage warnings) in {result['seconds']}s, "
+                f"{result['per_second']}/s"
+            )
+            return result
+
+        except Exception as exc:
+            logger.error(f"Notification generation task failed: {exc}")
+            raise self.retry(exc=exc)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def reconcile_unread_counts(self):
+    """
+    Correct cached unread notification counts that drifted from the database.
+
+    This task runs every 15 minutes, recounting only users whose count is
+    cached in Redis.
+    """
+    from app import create_app
+    from app.services.unread_counter import unread_counter
+
+    app = create_app()
+
+    with app.app_context():
+        try:
+            result = unread_counter.reconcile()
+
+            logger.info(
+                f"Unread counts reconciled: {result['corrected']} of "
+                f"{result['checked']} corrected"
+            )
+            return result
+
+        except Exception as exc:
+            logger.error(f"Unread count reconciliation failed: {exc}")
+            raise self.retry(exc=exc)
+
+
 def _generate_weekly_priorities(user, stats: dict) -> list:
     """Generate personalized priority recommendations based on user activity."""
     priorities = []
@@ -6,13 +6,40 @@ and other common patterns.
 """
 
 from functools import wraps
+from typing import Optional
 
-from flask import jsonify
+from flask import g, jsonify, make_response
 from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
 
 from app.models.user import SubscriptionTier, User
 
 
+def load_current_user() -> Optional[User]:
+    """
+    Load the authenticated user, at most once per request.
+
+    The user is memoized on flask.g, so stacked decorators and the route body
+    share a single users-table query. Requires the JWT to be verified already
+    (by @jwt_required or verify_jwt_in_request).
+
+    Returns:
+        User object or None if the token's user no longer exists
+    """
+    user_id = get_jwt_identity()
+    loaded = g.get("_current_user")
+    if loaded is not None and loaded[0] == user_id:
+        return loaded[1]
+
+    user = User.query.get(user_id) if user_id else None
+    g._current_user = (user_id, user)
+    return user
+
+
+def clear_current_user(exc=None) -> None:
+    """Forget the memoized user at the end of a request."""
+    g.pop("_current_user", None)
+
+
 def admin_required(fn):
     """
     Decorator to require admin privileges.
@@ -28,8 +55,7 @@ def admin_required(fn):
     @wraps(fn)
     def wrapper(*args, **kwargs):
         verify_jwt_in_request()
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = load_current_user()
 
         if not user:
             return (
@@ -80,8 +106,7 @@ def subscription_required(*allowed_tiers):
         @wraps(fn)
         def wrapper(*args, **kwargs):
             verify_jwt_in_request()
-            current_user_id = get_jwt_identity()
-            user = User.query.get(current_user_id)
+            user = load_current_user()
 
             if not user:
                 return (
@@ -123,6 +148,10 @@ def feature_limit(feature_name: str, count: int = 1):
     """
     Decorator to check and enforce feature usage limits.
 
+    Usage is reserved atomically before the route runs, so concurrent
+    requests cannot overshoot the limit, and is refunded if the route
+    fails (error status or exception).
+
     Usage:
         @app.route('/api/messages/generate', methods=['POST'])
         @jwt_required()
@@ -138,9 +167,10 @@ def feature_limit(feature_name: str, count: int = 1):
     def decorator(fn):
         @wraps(fn)
         def wrapper(*args, **kwargs):
+            from app.services.usage_meter import usage_meter
+
             verify_jwt_in_request()
-            current_user_id = get_jwt_identity()
-            user = User.query.get(current_user_id)
+            user = load_current_user()
 
             if not user:
                 return (
@@ -154,7 +184,7 @@ def feature_limit(feature_name: str, count: int = 1):
                     404,
                 )
 
-            if not user.can_use_feature(feature_name, count):
+            if not usage_meter.consume(user, feature_name, count):
                 limits = user.tier_limits
                 return (
                     jsonify(
@@ -170,7 +200,16 @@ def feature_limit(feature_name: str, count: int = 1):
                     429,
                 )
 
-            return fn(*args, **kwargs)
+            try:
+                response = make_response(fn(*args, **kwargs))
+            except Exception:
+                usage_meter.refund(user, feature_name, count)
+                raise
+
+            if response.status_code >= 400:
+                usage_meter.refund(user, feature_name, count)
+
+            return response
 
         return wrapper
 
@@ -186,8 +225,7 @@ def get_current_user():
     """
     try:
         verify_jwt_in_request()
-        current_user_id = get_jwt_identity()
-        return User.query.get(current_user_id)
+        return load_current_user()
     except Exception:
         return None
 
@@ -207,8 +245,7 @@ def verified_email_required(fn):
     @wraps(fn)
     def wrapper(*args, **kwargs):
         verify_jwt_in_request()
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = load_current_user()
 
         if not user:
             return (
@@ -254,8 +291,7 @@ def onboarding_completed_required(fn):
     @wraps(fn)
     def wrapper(*args, **kwargs):
         verify_jwt_in_request()
-        current_user_id = get_jwt_identity()
-        user = User.query.get(current_user_id)
+        user = load_current_user()
 
         if not user:
             return (
@@ -0,0 +1,99 @@
+"""
+Lexicographic Rank Keys
+
+Ordering keys for drag-and-drop lists (LexoRank style). Items sort by a
+string key instead of an integer position, and a key can always be made
+between any two neighbours, so moving a card rewrites only that card's row
+instead of renumbering the column.
+
+Keys are base-36 digit strings (0-9, a-z) compared bytewise and never end
+in "0", which guarantees there is room before every key. Inserts at either
+end step a single digit, so keys grow by about one character per 35
+appends (18 prepends); repeated inserts between the same two neighbours
+grow by about one per 5. Long keys are fixed by rebalancing: spread()
+hands out short, evenly spaced keys for a whole list.
+"""
+
+from typing import List, Optional
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+
+_VALUES = {digit: value for value, digit in enumerate(DIGITS)}
+
+
+def between(before: Optional[str], after: Optional[str]) -> str:
+    """
+    Return a key that sorts strictly between two keys.
+
+    Args:
+        before: Key of the previous item, or None for the start of the list
+        after: Key of the next item, or None for the end of the list
+
+    Raises:
+        ValueError: If before does not sort before after, or a key is malformed
+    """
+    before = before or ""
+    for key in (before, after):
+        if key and (key[-1] == "0" or any(c not in _VALUES for c in key)):
+            raise ValueError(f"Invalid rank key: {key!r}")
+    if after is not None and after <= before:
+        raise ValueError(f"Rank {before!r} does not sort before {after!r}")
+
+    if after is None and before:
+        return _increment(before)
+    if not before and after is not None:
+        return _decrement(after)
+    return _midpoint(before, after)
+
+
+def spread(before: Optional[str], after: Optional[str], count: int) -> List[str]:
+    """
+    Return `count` ascending keys between two keys, as short as possible.
+
+    Keys are made by repeated bisection, so their length grows with
+    log(count) rather than with count.
+    """
+    if count <= 0:
+        return []
+    middle = between(before, after)
+    left = (count - 1) // 2
+    return spread(before, middle, left) + [middle] + spread(middle, after, count - 1 - left)
+
+
+def _increment(key: str) -> str:
+    """Shortest step after key: bump the first digit that is not "z"."""
+    for i, digit in enumerate(key):
+        if digit != DIGITS[-1]:
+            return key[:i] + DIGITS[_VALUES[digit] + 1]
+    return key + DIGITS[1]
+
+
+def _decrement(key: str) -> str:
+    """Shortest step before key: lower the first digit above "1"."""
+    for i, digit in enumerate(key):
+        if _VALUES[digit] > 1:
+            return key[:i] + DIGITS[_VALUES[digit] - 1]
+    return _midpoint("", key)
+
+
+def _midpoint(low: str, high: Optional[str]) -> str:
+    """Midpoint of low < high, where a missing high is one past the end."""
+    if high is not None:
+        # Keep the shared prefix; low is implicitly padded with "0"
+        shared = 0
+        while shared < len(high) and (low[shared] if shared < len(low) else "0") == high[shared]:
+            shared += 1
+        if shared:
+            return high[:shared] + _midpoint(low[shared:], high[shared:])
+
+    low_digit = _VALUES[low[0]] if low else 0
+    high_digit = _VALUES[high[0]] if high is not None else BASE
+
+    if high_digit - low_digit > 1:
+        return DIGITS[(low_digit + high_digit) // 2]
+
+    # Adjacent first digits: the answer starts with one of them
+    if high is not None and len(high) > 1:
+        return high[:1]
+    return DIGITS[low_digit] + _midpoint(low[1:], None)
@@ -0,0 +1,220 @@
+"""
+Keyset Pagination
+
+Cursor-based pagination for per-user list endpoints. Instead of
+OFFSET n (which scans and discards n rows) each page continues from the
+sort key of the last row returned, so page 500 costs the same as page 1
+when an index matches the sort order.
+
+Sort orders are lists of (column, descending) pairs. The primary key is
+appended as a tie-breaker so the order is total, and nullable columns sort
+NULLS LAST in both directions.
+
+Cursors are opaque to clients: URL-safe base64 of the sort name and the
+last row's key values.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, false, func, or_, select
+
+# Approximate totals stop counting here and report "at least" this many
+APPROXIMATE_COUNT_CAP = 1000
+
+TOTAL_MODES = ("none", "approximate", "exact")
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor is malformed or belongs to another sort."""
+
+
+@dataclass
+class KeysetPage:
+    """One page of keyset-paginated results."""
+
+    items: List[Any]
+    next_cursor: Optional[str]
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+
+    @property
+    def has_more(self) -> bool:
+        return self.next_cursor is not None
+
+    def to_dict(self, items_key: str, limit: int) -> dict:
+        """Response payload in the shape list endpoints already return."""
+        data = {
+            items_key: [item.to_dict() for item in self.items],
+            "limit": limit,
+            "next_cursor": self.next_cursor,
+            "has_more": self.has_more,
+        }
+        if self.total is not None:
+            data["total"] = self.total
+            data["total_is_estimate"] = self.total_is_estimate
+        return data
+
+
+def encode_cursor(sort: str, values: Sequence[Any]) -> str:
+    """Encode a sort name and key values into an opaque cursor string."""
+    payload = json.dumps(
+        {"s": sort, "v": [_dump(value) for value in values]}, separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor().
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or was issued for a different sort
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = [_load(value) for value in payload["v"]]
+    except (binascii.Error, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+    if payload.get("s") != sort:
+        raise InvalidCursorError("Cursor does not match the requested sort order")
+    return values
+
+
+def keyset_order(order: Sequence[Tuple[Any, bool]], pk) -> List[Tuple[Any, bool]]:
+    """Append the primary key tie-breaker in the direction of the leading column."""
+    return list(order) + [(pk, order[0][1] if order else False)]
+
+
+def order_clauses(order: Sequence[Tuple[Any, bool]]) -> list:
+    """ORDER BY clauses for a keyset order, NULLS LAST on nullable columns."""
+    clauses = []
+    for column, descending in order:
+        clause = column.desc() if descending else column.asc()
+        if _nullable(column):
+            clause = clause.nulls_last()
+        clauses.append(clause)
+    return clauses
+
+
+def keyset_paginate(
+    query,
+    order: Sequence[Tuple[Any, bool]],
+    sort: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    total: str = "none",
+) -> KeysetPage:
+    """
+    Fetch one page of a query in keyset order.
+
+    Args:
+        query: Filtered Flask-SQLAlchemy query (no ORDER BY/LIMIT applied)
+        order: Full keyset order including the primary key (see keyset_order)
+        sort: Name of the sort order, bound into cursors
+        limit: Page size
+        cursor: Cursor from the previous page, or None for the first page
+        total: "none", "approximate" (capped count) or "exact"
+
+    Returns:
+        KeysetPage with items, the next cursor and the optional total
+    """
+    page_total, estimate = None, False
+    if total == "exact":
+        page_total = count_rows(query)
+    elif total == "approximate":
+        page_total = count_rows(query, cap=APPROXIMATE_COUNT_CAP)
+        estimate = page_total >= APPROXIMATE_COUNT_CAP
+
+    if cursor:
+        query = query.filter(_after(order, decode_cursor(cursor, sort)))
+
+    # One extra row tells us whether there is a next page without counting
+    rows = query.order_by(*order_clauses(order)).limit(limit + 1).all()
+    items = rows[:limit]
+
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(sort, [getattr(last, column.key) for column, _ in order])
+
+    return KeysetPage(
+        items=items, next_cursor=next_cursor, total=page_total, total_is_estimate=estimate
+    )
+
+
+def count_rows(query, cap: Optional[int] = None) -> int:
+    """
+    Count a query's rows, optionally stopping at `cap`.
+
+    A capped count reads at most `cap` index entries, so it stays cheap for
+    users with very large lists.
+    """
+    if cap is None:
+        return query.order_by(None).count()
+
+    subquery = query.order_by(None).limit(cap).subquery()
+    return query.session.execute(select(func.count()).select_from(subquery)).scalar()
+
+
+def parse_total_mode(value: Optional[str]) -> str:
+    """Normalize the ?total= query parameter."""
+    value = (value or "none").lower()
+    return value if value in TOTAL_MODES else "none"
+
+
+def _after(order: Sequence[Tuple[Any, bool]], values: Sequence[Any]):
+    """
+    WHERE clause selecting rows strictly after `values` in keyset order.
+
+    Expanded lexicographic comparison: (a > x) OR (a = x AND b > y) ...,
+    with NULLs treated as sorting after every value.
+    """
+    if len(values) != len(order):
+        raise InvalidCursorError("Invalid cursor")
+
+    branches = []
+    for i, ((column, descending), value) in enumerate(zip(order, values)):
+        if value is None:
+            # Nothing sorts after NULL on this column; only ties continue
+            continue
+        beyond = column < value if descending else column > value
+        if _nullable(column):
+            beyond = or_(beyond, column.is_(None))
+        ties = [
+            prior.is_(None) if prior_value is None else prior == prior_value
+            for (prior, _), prior_value in zip(order[:i], values[:i])
+        ]
+        branches.append(and_(*ties, beyond))
+
+    return or_(*branches) if branches else false()
+
+
+def _nullable(column) -> bool:
+    return getattr(column.expression, "nullable", True)
+
+
+def _dump(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)  # UUIDs
+
+
+def _load(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        raise ValueError("Unknown cursor value")
+    return value
@@ -0,0 +1,92 @@
+"""
+Portable SQL Expressions
+
+Date arithmetic compiled per database, so set-based UPDATEs and aggregates
+can run in SQL on both PostgreSQL (production) and SQLite (tests and
+local development).
+"""
+
+from sqlalchemy import literal_column
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+from sqlalchemy.types import Date, Integer
+
+# Units accepted by date_bucket
+BUCKETS = ("day", "week", "month")
+
+
+class days_since(FunctionElement):
+    """
+    Whole days elapsed from a timestamp column to `now`.
+
+    Matches Python's (now - value).days, i.e. complete 24-hour periods,
+    not calendar-date differences.
+
+    Usage:
+        days_since(datetime.utcnow(), PipelineItem.entered_stage_at)
+    """
+
+    type = Integer()
+    name = "days_since"
+    inherit_cache = True
+
+
+@compiles(days_since)
+def _days_since_sqlite(element, compiler, **kw):
+    now, value = list(element.clauses)
+    days = (
+        f"(julianday({compiler.process(now, **kw)}) - julianday({compiler.process(value, **kw)}))"
+    )
+    # floor() without relying on SQLite's optional math functions
+    return f"(CAST({days} AS INTEGER) - ({days} < CAST({days} AS INTEGER)))"
+
+
+@compiles(days_since, "postgresql")
+def _days_since_postgresql(element, compiler, **kw):
+    now, value = list(element.clauses)
+    return (
+        f"CAST(floor(extract(epoch FROM (CAST({compiler.process(now, **kw)} AS timestamp) - "
+        f"{compiler.process(value, **kw)})) / 86400) AS INTEGER)"
+    )
+
+
+class date_bucket(FunctionElement):
+    """
+    Start date of the day, ISO week (Monday) or month containing a timestamp.
+
+    Equivalent to date_trunc(unit, value)::date, for GROUP BY time series.
+
+    Usage:
+        date_bucket("week", Activity.created_at)
+    """
+
+    type = Date()
+    name = "date_bucket"
+    inherit_cache = True
+
+    def __init__(self, unit, value, **kw):
+        if unit not in BUCKETS:
+            raise ValueError(f"Unsupported bucket: {unit}")
+        super().__init__(literal_column(f"'{unit}'"), value, **kw)
+
+
+def _bucket_parts(element, compiler, **kw):
+    unit, value = list(element.clauses)
+    return unit.name.strip("'"), compiler.process(value, **kw)
+
+
+@compiles(date_bucket)
+def _date_bucket_sqlite(element, compiler, **kw):
+    unit, value = _bucket_parts(element, compiler, **kw)
+    if unit == "week":
+        # Step back six days, then forward to the next Monday
+        return f"date({value}, '-6 days', 'weekday 1')"
+    if unit == "month":
+        return f"date({value}, 'start of month')"
+    return f"date({value})"
+
+
+@compiles(date_bucket, "postgresql")
+def _date_bucket_postgresql(element, compiler, **kw):
+    unit, value = _bucket_parts(element, compiler, **kw)
+    return f"CAST(date_trunc('{unit}', {value}) AS DATE)"
@@ -40,6 +40,9 @@ DANGEROUS_PATTERNS = [
     r"\bsubprocess\.",
 ]
 
+# All of the above as one case-insensitive alternation, compiled once
+DANGEROUS_PATTERN = re.compile("|".join(f"(?:{p})" for p in DANGEROUS_PATTERNS), re.IGNORECASE)
+
 # Email validation pattern (RFC 5322 simplified)
 EMAIL_PATTERN = re.compile(r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$")
 
@@ -275,13 +278,7 @@ def contains_dangerous_patterns(value: str) -> bool:
     if not value:
         return False
 
-    value_lower = value.lower()
-
-    for pattern in DANGEROUS_PATTERNS:
-        if re.search(pattern, value_lower, re.IGNORECASE):
-            return True
-
-    return False
+    return DANGEROUS_PATTERN.search(value.lower()) is not None
 
 
 def validate_list(
@@ -53,9 +53,67 @@ def create_celery_app():
                 "task": "app.tasks.check_follow_up_reminders",
                 "schedule": crontab(hour=10, minute=0),
             },
+            # Write metered usage counters back to the users table every minute
+            "flush-usage-counters": {
+                "task": "app.tasks.flush_usage_counters",
+                "schedule": 60.0,
+            },
+            # Refresh pipeline days-in-stage nightly at 12:15 AM UTC
+            "update-days-in-stage": {
+                "task": "app.tasks.update_days_in_stage",
+                "schedule": crontab(hour=0, minute=15),
+            },
+            # Re-decay stored recruiter priority scores nightly at 3 AM UTC
+            "refresh-priority-scores": {
+                "task": "app.tasks.refresh_priority_scores",
+                "schedule": crontab(hour=3, minute=0),
+            },
+            # Renumber Kanban stages whose rank keys have grown long, nightly at 3:30 AM UTC
+            "rebalance-pipeline-ranks": {
+                "task": "app.tasks.rebalance_pipeline_ranks",
+                "schedule": crontab(hour=3, minute=30),
+            },
+            # Create upcoming monthly activity partitions daily at 1 AM UTC
+            "create-activity-partitions": {
+                "task": "app.tasks.create_activity_partitions",
+                "schedule": crontab(hour=1, minute=0),
+            },
+            # Roll expired activity months into daily summaries on the 1st at 4 AM UTC
+            "roll-up-old-activities": {
+                "task": "app.tasks.roll_up_old_activities",
+                "schedule": crontab(hour=4, minute=0, day_of_month=1),
+            },
+            # Hard-delete accounts past their grace period daily at 2 AM UTC
+            "process-expired-deletions": {
+                "task": "app.tasks.process_expired_deletions",
+                "schedule": crontab(hour=2, minute=0),
+            },
+            # Generate follow-up reminders and usage warnings hourly at :30
+            "generate-notifications": {
+                "task": "app.tasks.generate_notifications",
+                "schedule": crontab(minute=30),
+            },
+            # Correct drifted cached unread notification counts every 15 minutes
+            "reconcile-unread-counts": {
+                "task": "app.tasks.reconcile_unread_counts",
+                "schedule": crontab(minute="*/15"),
+            },
+            # Roll over expired usage periods at the top of every hour
+            "reset-expired-usage": {
+                "task": "app.tasks.reset_expired_usage",
+                "schedule": crontab(minute=0),
+            },
         },
     )
 
+    # Write activities published to the Redis stream every 5 seconds; only
+    # stream mode publishes them
+    if os.environ.get("ACTIVITY_LOG_MODE", "buffer") == "stream":
+        celery.conf.beat_schedule["drain-activity-stream"] = {
+            "task": "app.tasks.drain_activity_stream",
+            "schedule": 5.0,
+        }
+
     return celery
 
 
@@ -12,6 +12,13 @@ import {
 import { api } from '../../lib/api';
 import { useAuth } from '../../contexts/AuthContext';
 
+interface ExportState {
+  status: 'pending' | 'processing' | 'completed' | 'failed' | 'expired';
+  download_token: string | null;
+  file_size_bytes: number | null;
+  progress_percent: number;
+}
+
 /**
  * DataPrivacySettings - Settings panel for account deletion + data export.
  *
@@ -43,6 +50,7 @@ export function DataPrivacySettings() {
   const [exportError, setExportError] = useState('');
   const [exportToken, setExportToken] = useState<string | null>(null);
   const [exportSize, setExportSize] = useState<number | null>(null);
+  const [exportProgress, setExportProgress] = useState(0);
 
   // -------------------------------------------
   // Account Deletion
@@ -105,10 +113,23 @@ export function DataPrivacySettings() {
     setExportLoading(true);
     setExportError('');
     setExportStatus('processing');
+    setExportProgress(0);
 
     try {
+      // The export is built in the background; poll until it finishes
       const res = await api.post('/profile/export');
-      const data = res.data?.data || res.data;
+      let data: ExportState = res.data?.data || res.data;
+
+      while (data.status === 'pending' || data.status === 'processing') {
+        setExportProgress(data.progress_percent);
+        await new Promise((resolve) => setTimeout(resolve, 2000));
+        const statusRes = await api.get('/profile/export/status');
+        data = statusRes.data?.data || statusRes.data;
+      }
+
+      if (data.status !== 'completed') {
+        throw new Error('Export failed');
+      }
 
       setExportStatus('completed');
       setExportToken(data.download_token);
@@ -229,7 +250,7 @@ export function DataPrivacySettings() {
           {exportLoading ? (
             <>
               <Loader2 className="h-4 w-4 animate-spin" />
-              Generating export...
+              Generating export... {exportProgress > 0 && `${exportProgress}%`}
             </>
           ) : (
             <>
@@ -53,16 +53,6 @@ export function NotificationBell() {
   const dropdownRef = useRef<HTMLDivElement>(null);
   const navigate = useNavigate();
 
-  const fetchUnreadCount = useCallback(async () => {
-    try {
-      const response = await notificationApi.getUnreadCount();
-      const count = response.data.data?.count ?? response.data.count ?? 0;
-      setUnreadCount(count);
-    } catch {
-      // Silently fail -- bell just won't show a badge
-    }
-  }, []);
-
   const fetchNotifications = useCallback(async () => {
     setIsLoading(true);
     try {
@@ -76,16 +66,35 @@ export function NotificationBell() {
     }
   }, []);
 
-  // Poll unread count every 60 seconds
+  // Keep the unread badge current: long-poll when the server allows it
+  // (it answers as soon as the count changes), otherwise poll every 60 seconds
   useEffect(() => {
-    fetchUnreadCount();
-    const interval = setInterval(fetchUnreadCount, 60000);
-    return () => clearInterval(interval);
-  }, [fetchUnreadCount]);
+    let cancelled = false;
+    let timer: ReturnType<typeof setTimeout>;
+    let known: number | undefined;
+    let longPoll = 0;
 
-  // Generate notifications on mount (fires once)
-  useEffect(() => {
-    notificationApi.generate().catch(() => {});
+    const refresh = async () => {
+      try {
+        const response = await notificationApi.getUnreadCount(
+          longPoll > 0 && known !== undefined ? { wait: longPoll, known } : undefined
+        );
+        const data = response.data.data ?? response.data;
+        known = data.count ?? 0;
+        longPoll = data.long_poll ?? 0;
+        if (!cancelled) setUnreadCount(known ?? 0);
+      } catch {
+        // Silently fail -- bell just won't show a badge
+        longPoll = 0;
+      }
+      if (!cancelled) timer = setTimeout(refresh, longPoll > 0 ? 0 : 60000);
+    };
+
+    refresh();
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
   }, []);
 
   // Fetch full list when dropdown opens
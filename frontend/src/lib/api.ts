@@ -29,6 +29,30 @@ api.interceptors.request.use(
   (error) => Promise.reject(error)
 );
 
+// Exchange the refresh token for a new access token. Returns null without a
+// refresh token; if the refresh fails, tokens are cleared and the user is
+// sent to log in again.
+const refreshAccessToken = async (): Promise<string | null> => {
+  const refreshToken = localStorage.getItem('refresh_token');
+  if (!refreshToken) return null;
+
+  try {
+    const response = await axios.post(`${API_BASE_URL}/auth/refresh`, {}, {
+      headers: { Authorization: `Bearer ${refreshToken}` },
+    });
+
+    const { access_token } = response.data.data;
+    localStorage.setItem('access_token', access_token);
+    return access_token;
+  } catch (_refreshError) {
+    // Refresh failed, clear tokens and redirect to login
+    localStorage.removeItem('access_token');
+    localStorage.removeItem('refresh_token');
+    window.location.href = '/login';
+    return null;
+  }
+};
+
 // Response interceptor to handle token refresh
 api.interceptors.response.use(
   (response) => response,
@@ -39,26 +63,12 @@ api.interceptors.response.use(
     if (error.response?.status === 401 && !originalRequest._retry) {
       originalRequest._retry = true;
 
-      try {
-        const refreshToken = localStorage.getItem('refresh_token');
-        if (refreshToken) {
-          const response = await axios.post(`${API_BASE_URL}/auth/refresh`, {}, {
-            headers: { Authorization: `Bearer ${refreshToken}` },
-          });
-
-          const { access_token } = response.data.data;
-          localStorage.setItem('access_token', access_token);
-
-          if (originalRequest.headers) {
-            originalRequest.headers.Authorization = `Bearer ${access_token}`;
-          }
-          return api(originalRequest);
+      const access_token = await refreshAccessToken();
+      if (access_token) {
+        if (originalRequest.headers) {
+          originalRequest.headers.Authorization = `Bearer ${access_token}`;
         }
-      } catch (_refreshError) {
-        // Refresh failed, clear tokens and redirect to login
-        localStorage.removeItem('access_token');
-        localStorage.removeItem('refresh_token');
-        window.location.href = '/login';
+        return api(originalRequest);
       }
     }
 
@@ -289,18 +299,110 @@ export const linkedinApi = {
   }) => api.post('/linkedin/visibility', data),
 
   getKeywords: (industry: string) => api.get(`/linkedin/keywords/${industry}`),
+
+  // Analysis, visibility, keyword coverage and headline options in one request
+  getReport: (data: {
+    headline?: string;
+    summary?: string;
+    experience?: Array<{ title: string; company: string; description: string }>;
+    skills?: string[];
+    education?: Array<{ school: string; degree: string }>;
+    photo?: boolean;
+    location?: string;
+    industry?: string;
+    current_role?: string;
+    target_role?: string;
+    key_skills?: string[];
+    achievements?: string[];
+  }) => api.post('/linkedin/report', data),
 };
 
 // Notification API
 export const notificationApi = {
   list: (params?: { limit?: number; offset?: number; unread_only?: boolean }) =>
     api.get('/notifications', { params }),
-  getUnreadCount: () => api.get('/notifications/unread-count'),
+  // With wait, the server holds the request until the count differs from known
+  getUnreadCount: (params?: { wait?: number; known?: number }) =>
+    api.get('/notifications/unread-count', { params }),
   markRead: (id: string) => api.put(`/notifications/${id}/read`),
   markAllRead: () => api.put('/notifications/read-all'),
   generate: () => api.post('/notifications/generate'),
 };
 
+// Events API: server-pushed changes (Server-Sent Events). Uses fetch, not
+// EventSource, so the Authorization header can be sent.
+export interface StreamEvent {
+  id: string;
+  type: string;
+  data: Record<string, unknown>;
+}
+
+export const eventsApi = {
+  // Calls onEvent for each event until the returned function is called.
+  // Reconnects after the server's retry interval, resuming after the last event.
+  subscribe: (onEvent: (event: StreamEvent) => void): (() => void) => {
+    const controller = new AbortController();
+    let lastEventId = '';
+    let retryMs = 30000;
+
+    const read = async (retryAuth = true): Promise<void> => {
+      const headers: Record<string, string> = { Accept: 'text/event-stream' };
+      const token = localStorage.getItem('access_token');
+      if (token) headers.Authorization = `Bearer ${token}`;
+      if (lastEventId) headers['Last-Event-ID'] = lastEventId;
+
+      const response = await fetch(`${API_BASE_URL}/events/stream`, {
+        headers,
+        signal: controller.signal,
+      });
+      // Expired access token: refresh it like the axios interceptor, then retry
+      if (response.status === 401 && retryAuth && (await refreshAccessToken())) {
+        return read(false);
+      }
+      if (!response.ok || !response.body) throw new Error(`Event stream: ${response.status}`);
+
+      const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+      let buffer = '';
+      for (;;) {
+        const { value, done } = await reader.read();
+        if (done) return;
+        buffer += value;
+        let end;
+        while ((end = buffer.indexOf('\n\n')) >= 0) {
+          const block = buffer.slice(0, end);
+          buffer = buffer.slice(end + 2);
+          const event: StreamEvent = { id: '', type: '', data: {} };
+          for (const line of block.split('\n')) {
+            const sep = line.indexOf(': ');
+            const [field, text] = sep >= 0 ? [line.slice(0, sep), line.slice(sep + 2)] : [line, ''];
+            if (field === 'retry') retryMs = Number(text) || retryMs;
+            else if (field === 'id') event.id = text;
+            else if (field === 'event') event.type = text;
+            else if (field === 'data') event.data = JSON.parse(text);
+          }
+          if (!event.type) continue;
+          lastEventId = event.id || lastEventId;
+          onEvent(event);
+        }
+      }
+    };
+
+    const loop = async () => {
+      while (!controller.signal.aborted) {
+        try {
+          await read();
+        } catch {
+          if (controller.signal.aborted) return;
+        }
+        await new Promise((resolve) => setTimeout(resolve, retryMs));
+      }
+    };
+    loop();
+
+    return () => controller.abort();
+  },
+};
+
 // Admin API
 export const adminApi = {
   login: (data: { email: string; password: string }) =>
@@ -1,6 +1,6 @@
 import { useEffect, useState, useRef } from 'react';
 import { Link } from 'react-router-dom';
-import { dashboardApi, activityApi, laborMarketApi, authApi } from '../lib/api';
+import { dashboardApi, activityApi, laborMarketApi, authApi, eventsApi } from '../lib/api';
 import { useAuth } from '../contexts/AuthContext';
 import { useTour } from '../contexts/TourContext';
 import {
@@ -38,7 +38,7 @@ interface HighDemandRole {
 }
 
 export function Dashboard() {
-  const { user } = useAuth();
+  const { user, refreshUser } = useAuth();
   const { startTour, shouldShowTour, markTourSeen } = useTour();
   const [dashboardData, setDashboardData] = useState<DashboardData | null>(null);
   const [recentActivities, setRecentActivities] = useState<Activity[]>([]);
@@ -81,6 +81,36 @@ export function Dashboard() {
     fetchData();
   }, []);
 
+  // Refresh the pipeline and recent activity when the server pushes a change
+  useEffect(() => {
+    let refetch: ReturnType<typeof setTimeout> | undefined;
+    const unsubscribe = eventsApi.subscribe((event) => {
+      if (event.type === 'subscription.updated') {
+        refreshUser();
+        return;
+      }
+      if (event.type === 'stream.ready') return;
+      // Debounced: a batch move sends several events at once
+      clearTimeout(refetch);
+      refetch = setTimeout(async () => {
+        try {
+          const [dashboardRes, activitiesRes] = await Promise.all([
+            dashboardApi.getDashboard(),
+            activityApi.getRecent(5),
+          ]);
+          setDashboardData(dashboardRes.data.data || dashboardRes.data);
+          setRecentActivities(activitiesRes.data.data?.activities || activitiesRes.data.activities || []);
+        } catch {
+          // Keep showing the last data; the next event retries
+        }
+      }, 500);
+    });
+    return () => {
+      clearTimeout(refetch);
+      unsubscribe();
+    };
+  }, []);
+
   // Auto-start tour for new users after onboarding
   useEffect(() => {
     if (!isLoading && !tourStarted.current && user?.onboarding_completed && shouldShowTour()) {
@@ -0,0 +1,24 @@
+"""Add index on users.usage_reset_date for the bulk usage reset
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "007"
+down_revision = "006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # reset_expired_periods() scans for usage_reset_date <= now every hour;
+    # without an index that is a full scan of the users table.
+    op.create_index("ix_users_usage_reset_date", "users", ["usage_reset_date"])
+
+
+def downgrade():
+    op.drop_index("ix_users_usage_reset_date", table_name="users")
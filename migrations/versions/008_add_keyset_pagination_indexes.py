@@ -0,0 +1,56 @@
+"""Add composite indexes backing keyset pagination of list endpoints
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "008"
+down_revision = "007"
+branch_labels = None
+depends_on = None
+
+# Each index matches one (user_id, sort key..., id) order used by
+# app.utils.pagination, including NULLS LAST on nullable sort columns, so a
+# page is a single index range scan instead of a sort of the user's rows.
+INDEXES = {
+    "ix_recruiters_user_priority": "recruiters (user_id, priority_score DESC NULLS LAST, id DESC)",
+    "ix_recruiters_user_name": "recruiters (user_id, last_name, first_name, id)",
+    "ix_recruiters_user_company": "recruiters (user_id, company NULLS LAST, id)",
+    "ix_recruiters_user_last_contact": (
+        "recruiters (user_id, last_contact_date DESC NULLS LAST, id DESC)"
+    ),
+    "ix_recruiters_user_engagement": (
+        "recruiters (user_id, engagement_score DESC NULLS LAST, id DESC)"
+    ),
+    "ix_recruiters_user_fit": "recruiters (user_id, fit_score DESC NULLS LAST, id DESC)",
+    "ix_recruiters_user_created": "recruiters (user_id, created_at DESC NULLS LAST, id DESC)",
+    "ix_messages_user_created": "messages (user_id, created_at DESC NULLS LAST, id DESC)",
+    "ix_activities_user_created": "activities (user_id, created_at DESC NULLS LAST, id DESC)",
+    "ix_notifications_user_created": (
+        "notifications (user_id, created_at DESC NULLS LAST, id DESC)"
+    ),
+}
+
+
+def upgrade():
+    for name, definition in INDEXES.items():
+        op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {definition};")
+
+    # Unread-only notification lists
+    op.execute(
+        """
+        CREATE INDEX IF NOT EXISTS ix_notifications_user_unread_created
+            ON notifications (user_id, created_at DESC NULLS LAST, id DESC)
+            WHERE is_read = false;
+    """
+    )
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_notifications_user_unread_created;")
+    for name in reversed(list(INDEXES)):
+        op.execute(f"DROP INDEX IF EXISTS {name};")
@@ -0,0 +1,47 @@
+"""Add lexicographic rank keys to pipeline items
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-18
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "009"
+down_revision = "008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Rank keys are compared bytewise; the "C" collation keeps locale rules
+    # from reordering them
+    op.add_column("pipeline_items", sa.Column("rank", sa.String(64, collation="C"), nullable=True))
+
+    # Backfill in each column's current order. Six hex digits plus "i" is a
+    # valid base-36 rank key (no trailing "0") with room between neighbours
+    op.execute(
+        """
+        UPDATE pipeline_items AS p
+        SET rank = lpad(to_hex(o.n), 6, '0') || 'i'
+        FROM (
+            SELECT id,
+                   row_number() OVER (
+                       PARTITION BY user_id, stage ORDER BY position, created_at, id
+                   ) AS n
+            FROM pipeline_items
+        ) AS o
+        WHERE p.id = o.id;
+    """
+    )
+
+    op.create_index(
+        "ix_pipeline_items_user_stage_rank", "pipeline_items", ["user_id", "stage", "rank"]
+    )
+
+
+def downgrade():
+    op.drop_index("ix_pipeline_items_user_stage_rank", table_name="pipeline_items")
+    op.drop_column("pipeline_items", "rank")
@@ -0,0 +1,28 @@
+"""Add covering index for activity time-series aggregation
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "010"
+down_revision = "009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # GROUP BY activity_type, date_trunc(bucket, created_at) over one user's
+    # range reads only this index (index-only scan once the table is vacuumed)
+    op.create_index(
+        "ix_activities_user_created_type",
+        "activities",
+        ["user_id", "created_at", "activity_type"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_activities_user_created_type", table_name="activities")
@@ -0,0 +1,116 @@
+"""Partition activities by month and add daily activity summaries
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-18
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "011"
+down_revision = "010"
+branch_labels = None
+depends_on = None
+
+# Indexes on the parent table; PostgreSQL creates a matching index on every
+# partition, including ones made later by ActivityRetentionService
+INDEXES = {
+    "ix_activities_user_id": "(user_id)",
+    "ix_activities_activity_type": "(activity_type)",
+    "ix_activities_recruiter_id": "(recruiter_id)",
+    "ix_activities_pipeline_stage": "(pipeline_stage)",
+    "ix_activities_created_at": "(created_at)",
+    "ix_activities_user_created": "(user_id, created_at DESC NULLS LAST, id DESC)",
+    "ix_activities_user_created_type": "(user_id, created_at, activity_type)",
+}
+
+FOREIGN_KEYS = {
+    "activities_user_id_fkey": "(user_id) REFERENCES users (id)",
+    "activities_recruiter_id_fkey": "(recruiter_id) REFERENCES recruiters (id)",
+    "activities_resume_id_fkey": "(resume_id) REFERENCES resumes (id)",
+    "activities_message_id_fkey": "(message_id) REFERENCES messages (id)",
+}
+
+
+def _add_indexes_and_keys():
+    for name, columns in INDEXES.items():
+        op.execute(f"CREATE INDEX {name} ON activities {columns};")
+    for name, definition in FOREIGN_KEYS.items():
+        op.execute(f"ALTER TABLE activities ADD CONSTRAINT {name} FOREIGN KEY {definition};")
+
+
+def upgrade():
+    op.create_table(
+        "activity_daily_summaries",
+        sa.Column(
+            "user_id",
+            sa.String(36),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+        ),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("activity_type", sa.String(50), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+    # The partition key must be part of the primary key and never NULL
+    op.execute("UPDATE activities SET created_at = now() WHERE created_at IS NULL;")
+    op.execute("ALTER TABLE activities RENAME TO activities_unpartitioned;")
+    op.execute(
+        "ALTER TABLE activities_unpartitioned "
+        "RENAME CONSTRAINT activities_pkey TO activities_unpartitioned_pkey;"
+    )
+    op.execute(
+        """
+        CREATE TABLE activities (LIKE activities_unpartitioned INCLUDING DEFAULTS)
+            PARTITION BY RANGE (created_at);
+        ALTER TABLE activities ALTER COLUMN created_at SET NOT NULL;
+        ALTER TABLE activities ADD CONSTRAINT activities_pkey PRIMARY KEY (id, created_at);
+    """
+    )
+
+    # One partition per month from the oldest row through three months
+    # ahead; the default partition catches anything outside those ranges
+    # until the partition task creates its month
+    op.execute(
+        """
+        DO $$
+        DECLARE
+            m timestamp := date_trunc(
+                'month', coalesce((SELECT min(created_at) FROM activities_unpartitioned), now())
+            );
+            last_month timestamp := date_trunc('month', now()) + interval '3 months';
+        BEGIN
+            WHILE m <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF activities FOR VALUES FROM (%L) TO (%L)',
+                    'activities_p' || to_char(m, 'YYYY_MM'), m, m + interval '1 month'
+                );
+                m := m + interval '1 month';
+            END LOOP;
+        END $$;
+        CREATE TABLE activities_default PARTITION OF activities DEFAULT;
+    """
+    )
+
+    op.execute("INSERT INTO activities SELECT * FROM activities_unpartitioned;")
+    op.execute("DROP TABLE activities_unpartitioned;")
+    _add_indexes_and_keys()
+
+
+def downgrade():
+    op.execute(
+        """
+        CREATE TABLE activities_unpartitioned (LIKE activities INCLUDING DEFAULTS);
+        INSERT INTO activities_unpartitioned SELECT * FROM activities;
+        DROP TABLE activities;
+        ALTER TABLE activities_unpartitioned RENAME TO activities;
+        ALTER TABLE activities ALTER COLUMN created_at DROP NOT NULL;
+        ALTER TABLE activities ADD CONSTRAINT activities_pkey PRIMARY KEY (id);
+    """
+    )
+    _add_indexes_and_keys()
+
+    op.drop_table("activity_daily_summaries")
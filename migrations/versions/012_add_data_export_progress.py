@@ -0,0 +1,34 @@
+"""Add progress tracking to data export requests
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-18
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "012"
+down_revision = "011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "data_export_requests", sa.Column("current_section", sa.String(50), nullable=True)
+    )
+    op.add_column(
+        "data_export_requests",
+        sa.Column("records_exported", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "data_export_requests", sa.Column("records_total", sa.BigInteger(), nullable=True)
+    )
+
+
+def downgrade():
+    op.drop_column("data_export_requests", "records_total")
+    op.drop_column("data_export_requests", "records_exported")
+    op.drop_column("data_export_requests", "current_section")
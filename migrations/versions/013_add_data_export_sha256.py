@@ -0,0 +1,23 @@
+"""Add archive hash to data export requests
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "013"
+down_revision = "012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("data_export_requests", sa.Column("file_sha256", sa.String(64), nullable=True))
+
+
+def downgrade():
+    op.drop_column("data_export_requests", "file_sha256")
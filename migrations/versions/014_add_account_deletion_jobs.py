@@ -0,0 +1,43 @@
+"""Add account deletion jobs for resumable hard deletes
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "014"
+down_revision = "013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "account_deletion_jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.String(36), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False, server_default="pending"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("current_table", sa.String(50), nullable=True),
+        sa.Column("rows_deleted", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("files_deleted", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index(
+        "ix_account_deletion_jobs_user_id", "account_deletion_jobs", ["user_id"], unique=True
+    )
+    op.create_index("ix_account_deletion_jobs_status", "account_deletion_jobs", ["status"])
+
+
+def downgrade():
+    op.drop_index("ix_account_deletion_jobs_status", table_name="account_deletion_jobs")
+    op.drop_index("ix_account_deletion_jobs_user_id", table_name="account_deletion_jobs")
+    op.drop_table("account_deletion_jobs")
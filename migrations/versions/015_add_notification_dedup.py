@@ -0,0 +1,41 @@
+"""Add notification dedup keys and the (user_id, type, created_at) index
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-19
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "015"
+down_revision = "014"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("notifications", sa.Column("dedup_key", sa.String(64), nullable=True))
+
+    # Existing generated notifications keep their subject in metadata
+    op.execute(
+        """
+        UPDATE notifications SET dedup_key = CASE notification_type
+                WHEN 'follow_up_reminder' THEN metadata->>'recruiter_id'
+                WHEN 'usage_warning' THEN metadata->>'usage_type'
+            END
+        WHERE notification_type IN ('follow_up_reminder', 'usage_warning');
+    """
+    )
+
+    op.create_index(
+        "ix_notifications_user_type_created",
+        "notifications",
+        ["user_id", "notification_type", "created_at"],
+    )
+
+
+def downgrade():
+    op.drop_index("ix_notifications_user_type_created", table_name="notifications")
+    op.drop_column("notifications", "dedup_key")
@@ -0,0 +1,23 @@
+"""Add the (user_id, id) index account deletion batches walk
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-19
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "016"
+down_revision = "015"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Created on the partitioned parent, so PostgreSQL adds it to every partition
+    op.create_index("ix_activities_user_id_id", "activities", ["user_id", "id"])
+
+
+def downgrade():
+    op.drop_index("ix_activities_user_id_id", table_name="activities")
@@ -4,11 +4,12 @@ Pytest Configuration and Fixtures
 Provides shared fixtures for testing the Jobezie application.
 """
 
+import fakeredis
 import pytest
 from flask_jwt_extended import create_access_token
 
 from app import create_app
-from app.extensions import db
+from app.extensions import db, redis_pool, token_blocklist
 from app.models.user import User
 
 
@@ -30,6 +31,19 @@ def client(app):
     return app.test_client()
 
 
+@pytest.fixture(scope="function")
+def fake_redis(app):
+    """Bind an in-process fake Redis server to the shared connection pool."""
+    client = fakeredis.FakeRedis(decode_responses=True)
+    redis_pool.set_client(client)
+    token_blocklist.init_app(app)
+
+    yield client
+
+    redis_pool.close()
+    token_blocklist.init_app(app)
+
+
 @pytest.fixture(scope="function")
 def db_session(app):
     """Provide database session for tests."""
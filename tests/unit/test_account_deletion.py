@@ -0,0 +1,250 @@
+"""
+Account Deletion Unit Tests
+
+Tests for batched hard deletes of expired accounts, resuming interrupted
+deletions from their job record, and parallel file cleanup, including
+rows per batch when deleting a large account.
+"""
+
+import os
+import uuid
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models.account_deletion_job import AccountDeletionJob
+from app.models.activity import Activity, ActivityDailySummary, PipelineItem
+from app.models.data_export_request import DataExportRequest
+from app.models.message import Message
+from app.models.notification import Notification
+from app.models.recruiter import Recruiter, RecruiterNote
+from app.models.resume import Resume, ResumeVersion
+from app.models.user import User
+from app.services import account_service
+from app.services.account_service import (
+    find_expired_deletions,
+    hard_delete_user,
+    process_expired_deletions,
+)
+
+USER_TABLES = [
+    Activity,
+    ActivityDailySummary,
+    PipelineItem,
+    RecruiterNote,
+    Message,
+    ResumeVersion,
+    Resume,
+    Recruiter,
+    Notification,
+    DataExportRequest,
+]
+
+
+@pytest.fixture
+def file_dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(account_service, "RESUME_DIR", str(tmp_path))
+    monkeypatch.setattr(account_service, "DELETE_BATCH_SIZE", 10)
+    return tmp_path
+
+
+def expired_user(email):
+    """A user whose deletion grace period ended yesterday."""
+    user = User(email=email, first_name="Gone", last_name="User")
+    user.set_password("TestPassword123")
+    user.deletion_requested_at = datetime.utcnow() - timedelta(days=31)
+    user.deletion_scheduled_for = datetime.utcnow() - timedelta(days=1)
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def add_activities(user_id, count):
+    db.session.execute(
+        Activity.__table__.insert(),
+        [
+            {
+                "id": str(uuid.uuid4()),
+                "user_id": str(user_id),
+                "activity_type": "message_sent",
+                "created_at": datetime(2026, 10, 1),
+            }
+            for _ in range(count)
+        ],
+    )
+    db.session.commit()
+
+
+def add_user_data(user, file_dir, activities=25):
+    """Rows in every user table, with a resume upload and an export ZIP on disk."""
+    recruiter = Recruiter(user_id=user.id, first_name="Jane", last_name="Doe")
+    resume_path = file_dir / f"{user.id}.pdf"
+    export_path = file_dir / f"{user.id}.zip"
+    resume_path.write_bytes(b"%PDF")
+    export_path.write_bytes(b"PK")
+    resume = Resume(user_id=user.id, file_path=str(resume_path))
+    db.session.add_all([recruiter, resume])
+    db.session.flush()
+
+    first = Message(user_id=user.id, recruiter_id=recruiter.id, body="Hi")
+    db.session.add(first)
+    db.session.flush()
+    db.session.add_all(
+        [
+            Message(
+                user_id=user.id, recruiter_id=recruiter.id, body="Again", parent_message_id=first.id
+            ),
+            Resume(user_id=user.id, source_resume_id=resume.id),
+            ResumeVersion(resume_id=resume.id, version_number=1),
+            RecruiterNote(recruiter_id=recruiter.id, content="Met at a meetup"),
+            PipelineItem(user_id=user.id, recruiter_id=recruiter.id, stage="new"),
+            Notification(user_id=user.id, title="Reminder"),
+            ActivityDailySummary(
+                user_id=user.id, day=date(2025, 1, 1), activity_type="message_sent", count=4
+            ),
+            DataExportRequest(user_id=user.id, file_path=str(export_path)),
+        ]
+    )
+    db.session.commit()
+    add_activities(user.id, activities)
+    return [resume_path, export_path]
+
+
+def count_rows(model):
+    return db.session.query(model).count()
+
+
+def count_deletes(table, fn):
+    """Run fn and count DELETE statements against table."""
+    deletes = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(f"DELETE FROM {table.upper()} "):
+            deletes.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        fn()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+    return len(deletes)
+
+
+class TestHardDelete:
+    """Tests for batched deletion of expired accounts."""
+
+    def test_expired_account_deleted_in_batches(self, app, test_user, file_dirs):
+        """Test every user table is emptied in bounded batches and files are removed."""
+        user = expired_user("gone@example.com")
+        paths = add_user_data(user, file_dirs)
+        add_user_data(test_user, file_dirs, activities=3)
+        rows_before = {model: count_rows(model) for model in USER_TABLES}
+
+        results = {}
+        deletes = count_deletes("activities", lambda: results.update(process_expired_deletions()))
+
+        assert results["processed"] == 1
+        assert results["results"][0]["files_deleted"] == 2
+        assert deletes == 3  # 25 activities, 10 per batch
+        # Rolled-up history goes too, though SQLite ignores its FK cascade
+        assert count_rows(ActivityDailySummary) == 1
+        assert db.session.get(User, user.id) is None
+        assert not any(path.exists() for path in paths)
+
+        # Only the other user's rows remain
+        rows_after = {model: count_rows(model) for model in USER_TABLES}
+        assert rows_after[Activity] == 3
+        assert all(rows_after[model] * 2 == rows_before[model] for model in USER_TABLES[1:])
+
+        job = AccountDeletionJob.query.filter_by(user_id=user.id).one()
+        assert (job.status, job.attempts, job.current_table) == ("completed", 1, None)
+        assert job.rows_deleted == sum(rows_before.values()) - sum(rows_after.values())
+
+    def test_interrupted_deletion_resumes(self, app, file_dirs):
+        """Test a deletion that fails part-way keeps its progress and finishes on retry."""
+        user = expired_user("gone@example.com")
+        add_user_data(user, file_dirs)
+        deletes = []
+
+        def fail_second_batch(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("DELETE FROM activities"):
+                deletes.append(statement)
+                if len(deletes) == 2:
+                    raise RuntimeError("connection lost")
+
+        event.listen(db.engine, "before_cursor_execute", fail_second_batch)
+        try:
+            result = hard_delete_user(user.id)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", fail_second_batch)
+
+        job = AccountDeletionJob.query.filter_by(user_id=user.id).one()
+        assert result["status_code"] == 500
+        assert (job.status, job.current_table) == ("failed", "activities")
+        assert "connection lost" in job.error_message
+        assert count_rows(Activity) == 15  # the first batch stayed deleted
+        assert find_expired_deletions() == [str(user.id)]
+
+        result = hard_delete_user(user.id)
+
+        db.session.refresh(job)
+        assert result["message"] == "Account permanently deleted"
+        assert (job.status, job.attempts) == ("completed", 2)
+        assert count_rows(Activity) == count_rows(Message) == 0
+        assert job.rows_deleted == result["rows_deleted"]
+
+    def test_running_deletion_not_claimed_twice(self, app, file_dirs):
+        """Test a deletion in progress is skipped until it stops saving progress."""
+        user = expired_user("gone@example.com")
+        job = AccountDeletionJob(user_id=user.id, status="deleting", attempts=1)
+        db.session.add(job)
+        db.session.commit()
+
+        assert find_expired_deletions() == []
+        assert hard_delete_user(user.id)["status_code"] == 409
+
+        job.updated_at = datetime.utcnow() - timedelta(hours=1)
+        db.session.commit()
+
+        assert find_expired_deletions() == [str(user.id)]
+        assert hard_delete_user(user.id)["message"] == "Account permanently deleted"
+
+    def test_scheduling_rules(self, app, test_user, file_dirs):
+        """Test only expired accounts are picked, and repeated failures are given up on."""
+        expired = expired_user("gone@example.com")
+        given_up = expired_user("stuck@example.com")
+        db.session.add(AccountDeletionJob(user_id=given_up.id, status="failed", attempts=5))
+        test_user.deletion_requested_at = datetime.utcnow()
+        test_user.deletion_scheduled_for = datetime.utcnow() + timedelta(days=29)
+        db.session.commit()
+
+        assert find_expired_deletions() == [str(expired.id)]
+
+
+@pytest.mark.slow
+class TestLargeDeletion:
+    """Deleting a large account. Set BENCH_DELETE_ACTIVITIES to scale."""
+
+    def test_batches_bound_rows_per_delete(self, app, monkeypatch):
+        """Test no batched DELETE removes more than DELETE_BATCH_SIZE rows."""
+        count = int(os.environ.get("BENCH_DELETE_ACTIVITIES", 100000))
+        monkeypatch.setattr(account_service, "DELETE_BATCH_SIZE", 5000)
+        user = expired_user("user@example.com")
+        add_activities(user.id, count)
+        deleted = []
+
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("DELETE FROM ACTIVITIES"):
+                deleted.append(cursor.rowcount)
+
+        event.listen(db.engine, "after_cursor_execute", after_cursor_execute)
+        try:
+            hard_delete_user(user.id)
+        finally:
+            event.remove(db.engine, "after_cursor_execute", after_cursor_execute)
+
+        assert count_rows(Activity) == 0
+        assert sum(deleted) == count
+        assert max(deleted) <= account_service.DELETE_BATCH_SIZE
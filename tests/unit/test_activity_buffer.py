@@ -0,0 +1,188 @@
+"""
+Activity Buffer Unit Tests
+
+Tests for request-scoped activity buffering, the teardown flush, the
+Redis stream mode and its draining consumer, and commits per logged
+activity at volume.
+"""
+
+import os
+
+import pytest
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models.activity import Activity
+from app.models.recruiter import Recruiter
+from app.services import activity_buffer
+from app.services.activity_buffer import ActivityBuffer, activity_row
+from app.services.activity_service import ActivityService
+from app.services.recruiter_service import RecruiterService
+
+
+def count_activity_writes(fn):
+    """Run fn and count INSERT statements against activities and COMMITs."""
+    counts = {"inserts": 0, "commits": 0}
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("INSERT INTO ACTIVITIES"):
+            counts["inserts"] += 1
+
+    def commit(conn):
+        counts["commits"] += 1
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(db.engine, "commit", commit)
+    try:
+        fn()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+        event.remove(db.engine, "commit", commit)
+    return counts
+
+
+def add_recruiter(user_id, name="Jane"):
+    recruiter = Recruiter(user_id=user_id, first_name=name, last_name="Doe", status="new")
+    db.session.add(recruiter)
+    db.session.commit()
+    return str(recruiter.id)
+
+
+class TestOutsideRequests:
+    """Tests for direct writes when no request buffer is open."""
+
+    def test_log_activity_writes_immediately(self, app, test_user):
+        """Test service calls outside a request commit the row at once."""
+        activity = ActivityService.log_activity(test_user.id, "note_added", description="Hi")
+
+        stored = db.session.get(Activity, activity.id)
+        assert stored.description == "Hi"
+        assert stored.created_at == activity.created_at
+
+    def test_recruiter_flows_log_activities(self, app, test_user):
+        """Test sends and responses log their activity and any stage change."""
+        recruiter_id = add_recruiter(test_user.id)
+
+        RecruiterService.record_message_sent(recruiter_id, test_user.id)
+        RecruiterService.record_response(recruiter_id, test_user.id, is_positive=False)
+
+        logged = [
+            (a.activity_type, a.previous_stage, a.pipeline_stage)
+            for a in Activity.query.order_by(Activity.created_at)
+        ]
+        assert logged == [
+            ("message_sent", None, None),
+            ("status_change", "new", "contacted"),
+            ("response_received", None, None),
+            ("status_change", "contacted", "responded"),
+        ]
+
+
+class TestRequestBuffer:
+    """Tests for buffering during a request and the teardown flush."""
+
+    def test_one_insert_per_request(self, client, auth_headers, test_user):
+        """Test a request's activities are written by one INSERT after the response."""
+        recruiter_id = add_recruiter(test_user.id)
+
+        counts = count_activity_writes(
+            lambda: client.post(
+                f"/api/recruiters/{recruiter_id}/message-sent", json={}, headers=auth_headers
+            )
+        )
+
+        assert counts["inserts"] == 1
+        assert sorted(a.activity_type for a in Activity.query) == ["message_sent", "status_change"]
+
+    def test_logged_activity_returned_and_written(self, client, auth_headers):
+        """Test the log endpoint returns the buffered row, written at teardown."""
+        response = client.post(
+            "/api/activities",
+            json={"activity_type": "note_added", "description": "Buffered"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 201
+        activity_id = response.get_json()["data"]["activity"]["id"]
+        assert db.session.get(Activity, activity_id).description == "Buffered"
+
+    def test_failed_request_discards_buffer(self, app, test_user):
+        """Test rows buffered by a request that raised are not written."""
+        with app.test_request_context():
+            ActivityBuffer.start()
+            ActivityBuffer.add(activity_row(test_user.id, "note_added"))
+            assert ActivityBuffer.flush(RuntimeError("boom")) == 0
+
+        assert Activity.query.count() == 0
+
+
+class TestStreamMode:
+    """Tests for publishing to and draining the Redis activity stream."""
+
+    def test_publish_then_drain(self, client, auth_headers, fake_redis, app, test_user):
+        """Test stream mode defers writes to the drain task."""
+        app.config["ACTIVITY_LOG_MODE"] = "stream"
+        recruiter_id = add_recruiter(test_user.id)
+
+        client.post(f"/api/recruiters/{recruiter_id}/message-sent", json={}, headers=auth_headers)
+
+        assert Activity.query.count() == 0
+        assert fake_redis.xlen(activity_buffer.STREAM_KEY) == 2
+
+        assert ActivityBuffer.drain_stream() == 2
+        assert sorted(a.activity_type for a in Activity.query) == ["message_sent", "status_change"]
+        assert fake_redis.xlen(activity_buffer.STREAM_KEY) == 0
+        assert ActivityBuffer.drain_stream() == 0
+
+    def test_unacknowledged_entries_are_reclaimed(self, app, fake_redis, test_user, monkeypatch):
+        """Test a dead consumer's batch is written once by the next drain."""
+        monkeypatch.setattr(activity_buffer, "STREAM_CLAIM_IDLE_MS", 0)
+        row = activity_row(test_user.id, "note_added")
+        ActivityBuffer._publish(fake_redis, [row, row])
+        fake_redis.xgroup_create(
+            activity_buffer.STREAM_KEY, activity_buffer.STREAM_GROUP, id="0", mkstream=True
+        )
+        # Another worker reads the batch and dies before acknowledging it
+        fake_redis.xreadgroup(
+            activity_buffer.STREAM_GROUP, "dead-worker", {activity_buffer.STREAM_KEY: ">"}
+        )
+
+        ActivityBuffer.drain_stream()
+
+        assert [str(a.id) for a in Activity.query] == [row["id"]]
+        assert (
+            fake_redis.xpending(activity_buffer.STREAM_KEY, activity_buffer.STREAM_GROUP)["pending"]
+            == 0
+        )
+
+    def test_falls_back_to_database_without_redis(self, client, auth_headers, app):
+        """Test stream mode writes directly when Redis is unavailable."""
+        app.config["ACTIVITY_LOG_MODE"] = "stream"
+
+        client.post("/api/activities", json={"activity_type": "note_added"}, headers=auth_headers)
+
+        assert Activity.query.count() == 1
+
+
+@pytest.mark.slow
+class TestBufferAtVolume:
+    """Commits for many logged activities. Set BENCH_REQUEST_ACTIVITIES to scale."""
+
+    def test_buffered_vs_per_row_commits(self, app, test_user):
+        """Test buffering many activities costs one commit instead of one each."""
+        count = int(os.environ.get("BENCH_REQUEST_ACTIVITIES", 2000))
+
+        def per_row():
+            for _ in range(count):
+                ActivityService.log_activity(test_user.id, "note_added")
+
+        def buffered():
+            with app.test_request_context():
+                ActivityBuffer.start()
+                for _ in range(count):
+                    ActivityService.log_activity(test_user.id, "note_added")
+                ActivityBuffer.flush()
+
+        assert count_activity_writes(per_row)["commits"] == count
+        assert count_activity_writes(buffered)["commits"] == 1
+        assert Activity.query.count() == 2 * count
@@ -0,0 +1,163 @@
+"""
+Activity Retention Unit Tests
+
+Tests for rolling expired activity months into daily summaries, reads that
+combine summaries with live activities, and recent-window activity lists.
+Partition DDL is PostgreSQL-only; on SQLite the roll-up deletes rows.
+"""
+
+from datetime import date, datetime, timedelta
+
+from app.extensions import db
+from app.models.activity import Activity, ActivityDailySummary
+from app.services.activity_retention import ActivityRetentionService, add_months, month_start
+from app.services.activity_service import ActivityService
+
+NOW = datetime(2026, 10, 18, 12, 0)
+
+
+def add_activities(user_id, rows, first=0):
+    """Bulk-insert (created_at, activity_type) activities for a user."""
+    db.session.execute(
+        Activity.__table__.insert(),
+        [
+            {
+                "id": f"{first + i:08d}-0000-4000-8000-{str(user_id)[-12:]}",
+                "user_id": str(user_id),
+                "activity_type": activity_type,
+                "created_at": created_at,
+            }
+            for i, (created_at, activity_type) in enumerate(rows)
+        ],
+    )
+    db.session.commit()
+
+
+def summaries():
+    """All summary rows as (day, activity_type) -> count."""
+    return {(row.day, row.activity_type): row.count for row in ActivityDailySummary.query}
+
+
+class TestMonthArithmetic:
+    """Tests for the month helpers."""
+
+    def test_month_start_and_add_months(self):
+        """Test month starts and offsets across year boundaries."""
+        assert month_start(NOW) == datetime(2026, 10, 1)
+        assert add_months(datetime(2026, 10, 1), -13) == datetime(2025, 9, 1)
+        assert add_months(datetime(2026, 12, 1), 1) == datetime(2027, 1, 1)
+        assert ActivityRetentionService.partition_name(datetime(2026, 3, 1)) == (
+            "activities_p2026_03"
+        )
+
+
+class TestRollUp:
+    """Tests for ActivityRetentionService.roll_up."""
+
+    def test_expired_months_become_daily_summaries(self, app, test_user):
+        """Test months before the cutoff are summarized per day and removed."""
+        add_activities(
+            test_user.id,
+            [
+                (datetime(2026, 6, 3, 9), "message_sent"),
+                (datetime(2026, 6, 3, 17), "message_sent"),
+                (datetime(2026, 6, 30, 23, 59), "note_added"),
+                (datetime(2026, 7, 1, 0, 0), "note_added"),
+                (datetime(2026, 8, 2), "message_sent"),
+            ],
+        )
+
+        result = ActivityRetentionService.roll_up(retention_months=2, now=NOW)
+
+        assert result["cutoff"] == "2026-08-01T00:00:00"
+        assert result["months_rolled_up"] == 2
+        assert summaries() == {
+            (date(2026, 6, 3), "message_sent"): 2,
+            (date(2026, 6, 30), "note_added"): 1,
+            (date(2026, 7, 1), "note_added"): 1,
+        }
+        assert [a.created_at for a in Activity.query] == [datetime(2026, 8, 2)]
+
+    def test_rerun_and_late_rows_merge(self, app, test_user):
+        """Test a second run is a no-op and late rows add to existing counts."""
+        add_activities(test_user.id, [(datetime(2026, 6, 3, 9), "message_sent")])
+        ActivityRetentionService.roll_up(retention_months=2, now=NOW)
+
+        assert (
+            ActivityRetentionService.roll_up(retention_months=2, now=NOW)["months_rolled_up"] == 0
+        )
+
+        add_activities(test_user.id, [(datetime(2026, 6, 3, 20), "message_sent")], first=10)
+        ActivityRetentionService.roll_up(retention_months=2, now=NOW)
+
+        assert summaries() == {(date(2026, 6, 3), "message_sent"): 2}
+
+    def test_retention_from_config(self, app, test_user):
+        """Test the default window comes from ACTIVITY_RETENTION_MONTHS."""
+        app.config["ACTIVITY_RETENTION_MONTHS"] = 1
+        add_activities(test_user.id, [(datetime(2026, 8, 5), "note_added")])
+
+        result = ActivityRetentionService.roll_up(now=NOW)
+
+        assert result["months_rolled_up"] == 1
+        assert Activity.query.count() == 0
+
+    def test_no_partitions_on_sqlite(self, app):
+        """Test partition upkeep is skipped on an unpartitioned table."""
+        assert ActivityRetentionService.is_partitioned() is False
+        assert ActivityRetentionService.ensure_partitions() == []
+
+
+class TestReadsAfterRollUp:
+    """Tests that counts and series include rolled-up days."""
+
+    def test_series_and_counts_unchanged_by_roll_up(self, app, test_user):
+        """Test a series over expired months reads the same before and after."""
+        now = datetime.utcnow()
+        rows = [(now - timedelta(days=d, hours=d % 5), "message_sent") for d in range(0, 200, 3)]
+        rows += [(now - timedelta(days=d), "note_added") for d in range(1, 200, 7)]
+        add_activities(test_user.id, rows)
+        start = month_start(now - timedelta(days=200))
+
+        def read():
+            return (
+                ActivityService.get_activity_series(test_user.id, start, now, bucket="month"),
+                ActivityService.get_activity_series(
+                    test_user.id, start, now, activity_types=["note_added"]
+                ),
+                ActivityService._counts_by_type(test_user.id, start),
+            )
+
+        before = read()
+        result = ActivityRetentionService.roll_up(retention_months=2)
+
+        assert result["months_rolled_up"] >= 4
+        assert read() == before
+
+
+class TestRecentWindow:
+    """Tests for recent-first activity lists."""
+
+    def test_falls_back_to_older_history(self, app, test_user):
+        """Test users with few recent activities still get their latest ones."""
+        now = datetime.utcnow()
+        add_activities(
+            test_user.id,
+            [(now - timedelta(days=1), "note_added")]
+            + [(now - timedelta(days=300 + i), "message_sent") for i in range(5)],
+        )
+
+        recent = ActivityService.get_recent_activities(test_user.id, limit=3)
+
+        assert [a.activity_type for a in recent] == ["note_added", "message_sent", "message_sent"]
+        assert recent[1].created_at > recent[2].created_at
+
+    def test_full_recent_window(self, app, test_user):
+        """Test a full page from the recent window is the newest rows."""
+        now = datetime.utcnow()
+        add_activities(test_user.id, [(now - timedelta(hours=i), "note_added") for i in range(12)])
+
+        timeline = ActivityService.get_activity_timeline(test_user.id, limit=10)
+
+        assert len(timeline) == 10
+        assert timeline[0]["timestamp"] == now.isoformat()
@@ -0,0 +1,280 @@
+"""
+Activity Series Unit Tests
+
+Tests for SQL-side activity aggregation: the date_bucket expression, the
+time-series query API, counts, the weekly summary and the series endpoint,
+including at 100k activities per user.
+"""
+
+import os
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import event, literal, select
+from sqlalchemy.dialects import postgresql
+
+from app.extensions import db
+from app.models.activity import Activity
+from app.services.activity_service import ActivityService
+from app.utils.sql import date_bucket
+
+
+def add_activities(user_id, rows, first=0):
+    """Bulk-insert (created_at, activity_type) activities for a user."""
+    db.session.execute(
+        Activity.__table__.insert(),
+        [
+            {
+                "id": f"{first + i:08d}-0000-4000-8000-{str(user_id)[-12:]}",
+                "user_id": str(user_id),
+                "activity_type": activity_type,
+                "created_at": created_at,
+            }
+            for i, (created_at, activity_type) in enumerate(rows)
+        ],
+    )
+    db.session.commit()
+
+
+class TestDateBucket:
+    """Tests for the date_bucket SQL expression."""
+
+    def test_matches_python_bucket_starts(self, app):
+        """Test SQLite buckets agree with the service's Python calendar."""
+        moment = datetime(2026, 10, 11, 23, 59, 59)
+        for offset in range(40):
+            value = moment + timedelta(days=offset)
+            for unit in ("day", "week", "month"):
+                stored = db.session.execute(select(date_bucket(unit, literal(value)))).scalar()
+                assert stored == ActivityService._bucket_start(value, unit), (value, unit)
+
+    def test_postgresql_uses_date_trunc(self):
+        """Test the PostgreSQL form is date_trunc cast to date."""
+        sql = str(
+            select(date_bucket("month", literal(datetime(2026, 1, 1)))).compile(
+                dialect=postgresql.dialect()
+            )
+        )
+
+        assert "CAST(date_trunc('month'," in sql
+
+    def test_rejects_unknown_unit(self):
+        """Test only day, week and month are accepted."""
+        with pytest.raises(ValueError):
+            date_bucket("hour", Activity.created_at)
+
+
+class TestActivitySeries:
+    """Tests for ActivityService.get_activity_series."""
+
+    def test_daily_buckets_zero_filled(self, app, test_user):
+        """Test each day in range appears once, counted by type."""
+        start = datetime(2026, 3, 1)
+        add_activities(
+            test_user.id,
+            [
+                (start + timedelta(hours=1), "message_sent"),
+                (start + timedelta(hours=20), "message_sent"),
+                (start + timedelta(days=2, hours=5), "response_received"),
+            ],
+        )
+
+        result = ActivityService.get_activity_series(test_user.id, start, start + timedelta(days=4))
+
+        assert [b["bucket"] for b in result["series"]] == [
+            "2026-03-01",
+            "2026-03-02",
+            "2026-03-03",
+            "2026-03-04",
+        ]
+        assert [b["total"] for b in result["series"]] == [2, 0, 1, 0]
+        assert result["series"][0]["by_type"] == {"message_sent": 2}
+        assert result["totals"] == {"message_sent": 2, "response_received": 1}
+        assert result["total"] == 3
+
+    def test_weeks_and_months(self, app, test_user):
+        """Test weekly buckets start on Monday and monthly on the 1st."""
+        add_activities(
+            test_user.id,
+            [
+                (datetime(2026, 3, 1, 12), "note_added"),  # Sunday
+                (datetime(2026, 3, 2, 12), "note_added"),  # Monday
+                (datetime(2026, 4, 30, 12), "note_added"),
+            ],
+        )
+        start, end = datetime(2026, 2, 25), datetime(2026, 5, 1)
+
+        weekly = ActivityService.get_activity_series(test_user.id, start, end, bucket="week")
+        monthly = ActivityService.get_activity_series(test_user.id, start, end, bucket="month")
+
+        assert weekly["series"][0] == {
+            "bucket": "2026-02-23",
+            "total": 1,
+            "by_type": {"note_added": 1},
+        }
+        assert weekly["series"][1]["bucket"] == "2026-03-02"
+        assert weekly["series"][1]["total"] == 1
+        assert [(b["bucket"], b["total"]) for b in monthly["series"]] == [
+            ("2026-02-01", 0),
+            ("2026-03-01", 2),
+            ("2026-04-01", 1),
+        ]
+
+    def test_range_types_and_users(self, app, test_user, second_user):
+        """Test the end is exclusive, types filter and other users are excluded."""
+        start = datetime(2026, 3, 1)
+        add_activities(
+            test_user.id,
+            [
+                (start, "message_sent"),
+                (start, "note_added"),
+                (start + timedelta(days=1), "message_sent"),
+            ],
+        )
+        add_activities(second_user.id, [(start, "message_sent")])
+
+        result = ActivityService.get_activity_series(
+            test_user.id, start, start + timedelta(days=1), activity_types=["message_sent"]
+        )
+
+        assert result["totals"] == {"message_sent": 1}
+        assert len(result["series"]) == 1
+
+    def test_invalid_arguments(self, app, test_user):
+        """Test bad buckets, empty ranges and oversized ranges raise ValueError."""
+        start = datetime(2026, 3, 1)
+
+        with pytest.raises(ValueError):
+            ActivityService.get_activity_series(test_user.id, start, bucket="hour")
+        with pytest.raises(ValueError):
+            ActivityService.get_activity_series(test_user.id, start, start)
+        with pytest.raises(ValueError):
+            ActivityService.get_activity_series(test_user.id, start, start + timedelta(days=400))
+
+
+class TestCountsAndSummary:
+    """Tests for the GROUP BY counts and weekly summary."""
+
+    def test_counts_and_weekly_summary(self, app, test_user):
+        """Test counts by type and the weekly summary come from SQL aggregates."""
+        now = datetime.utcnow()
+        add_activities(
+            test_user.id,
+            [(now - timedelta(days=1), "message_sent")] * 6
+            + [(now - timedelta(days=2), "response_received")]
+            + [(now - timedelta(days=20), "recruiter_added")]
+            + [(now - timedelta(days=40), "message_sent")],
+        )
+
+        counts = ActivityService.get_activity_counts(test_user.id, days=30)
+        summary = ActivityService.get_weekly_summary(test_user.id)
+
+        assert counts["total"] == 8
+        assert counts["by_type"]["message_sent"] == 6
+        assert counts["by_type"]["recruiter_added"] == 1
+        assert counts["by_type"]["offer_received"] == 0
+        assert summary["total_activities"] == 7
+        assert summary["messages_sent"] == 6
+        assert summary["responses_received"] == 1
+        assert summary["recruiters_added"] == 0
+        assert summary["highlights"] == [
+            "Received 1 response(s)",
+            "Sent 6 messages - great outreach!",
+        ]
+
+
+class TestSeriesEndpoint:
+    """Tests for GET /api/activities/series."""
+
+    def test_weekly_series(self, client, auth_headers, test_user):
+        """Test a weekly series for an explicit range."""
+        add_activities(test_user.id, [(datetime(2026, 3, 4, 9), "message_sent")])
+
+        response = client.get(
+            "/api/activities/series?bucket=week&start=2026-03-01T00:00:00Z"
+            "&end=2026-03-15T00:00:00Z&types=message_sent",
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        data = response.get_json()["data"]
+        assert [b["bucket"] for b in data["series"]] == ["2026-02-23", "2026-03-02", "2026-03-09"]
+        assert data["totals"] == {"message_sent": 1}
+
+    def test_default_range_is_30_days(self, client, auth_headers):
+        """Test the default is daily buckets over the last 30 days."""
+        response = client.get("/api/activities/series", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert len(response.get_json()["data"]["series"]) == 31
+
+    def test_bad_parameters(self, client, auth_headers):
+        """Test invalid buckets and dates return 400."""
+        for query in ("bucket=year", "start=yesterday"):
+            response = client.get(f"/api/activities/series?{query}", headers=auth_headers)
+            assert response.status_code == 400
+
+    def test_dashboard_weekly_stats_uses_series(self, client, auth_headers, test_user):
+        """Test the dashboard's daily activity counts match the series."""
+        add_activities(test_user.id, [(datetime.utcnow(), "note_added")] * 3)
+
+        response = client.get("/api/dashboard/stats/weekly", headers=auth_headers)
+
+        daily = response.get_json()["data"]["daily"]
+        assert [d["activities"] for d in daily] == [0, 0, 0, 0, 0, 0, 3]
+
+
+@pytest.mark.slow
+class TestSeriesAtScale:
+    """Aggregation over many activities. Set BENCH_USER_ACTIVITIES to scale."""
+
+    def test_100k_activities_per_user(self, app, test_user):
+        """Test counts, summary and series each take a fixed few aggregate queries."""
+        count = int(os.environ.get("BENCH_USER_ACTIVITIES", 100000))
+        types = ["message_sent", "note_added", "status_change", "response_received"]
+        now = datetime.utcnow()
+        batch = 50000
+        for first in range(0, count, batch):
+            add_activities(
+                test_user.id,
+                [
+                    # Spread evenly over the past year
+                    (now - timedelta(seconds=(first + i) * 31536000 // count), types[i % 4])
+                    for i in range(min(batch, count - first))
+                ],
+                first=first,
+            )
+
+        queries = {}
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        calls = {
+            "counts_30d": lambda: ActivityService.get_activity_counts(test_user.id, 30),
+            "counts_365d": lambda: ActivityService.get_activity_counts(test_user.id, 365),
+            "weekly_summary": lambda: ActivityService.get_weekly_summary(test_user.id),
+            "series_day_365": lambda: ActivityService.get_activity_series(
+                test_user.id, now - timedelta(days=365)
+            ),
+            "series_week_365": lambda: ActivityService.get_activity_series(
+                test_user.id, now - timedelta(days=365), bucket="week"
+            ),
+            "series_month_365": lambda: ActivityService.get_activity_series(
+                test_user.id, now - timedelta(days=365), bucket="month"
+            ),
+        }
+        event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            for name, call in calls.items():
+                statements.clear()
+                assert call()
+                queries[name] = len(statements)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+        series = calls["series_month_365"]()
+        assert series["total"] == count
+        assert max(queries.values()) <= 4
+        assert date.fromisoformat(series["series"][-1]["bucket"]) == now.date().replace(day=1)
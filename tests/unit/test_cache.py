@@ -0,0 +1,263 @@
+"""
+Cache Layer Unit Tests
+
+Tests for the two-tier cache: namespacing and versioning, the Redis tier,
+single-flight stampede protection, early refresh and metrics.
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from app.cache import TwoTierCache
+from app.extensions import cache
+
+
+@pytest.fixture
+def local_cache(app):
+    """Enable the in-process tier only."""
+    app.config["CACHE_TYPE"] = "simple"
+    cache.init_app(app)
+    yield cache
+    cache.clear_local()
+
+
+@pytest.fixture
+def redis_cache(app, fake_redis):
+    """Enable both tiers against the fake Redis server."""
+    app.config["CACHE_TYPE"] = "redis"
+    cache.init_app(app)
+    yield cache
+    cache.clear_local()
+
+
+class TestCachedDecorator:
+    """Tests for the cached() decorator."""
+
+    def test_disabled_cache_always_computes(self, app):
+        """Test CACHE_TYPE=null bypasses caching."""
+        calls = []
+
+        @cache.cached("tests.disabled")
+        def compute(x):
+            calls.append(x)
+            return {"x": x}
+
+        compute(1)
+        compute(1)
+
+        assert len(calls) == 2
+
+    def test_repeated_calls_hit_cache(self, local_cache):
+        """Test a second call with the same arguments is served from cache."""
+        calls = []
+
+        @local_cache.cached("tests.repeat")
+        def compute(x, y=2):
+            calls.append(x)
+            return {"sum": x + y}
+
+        assert compute(1) == {"sum": 3}
+        assert compute(1, y=2) == {"sum": 3}
+        assert compute(x=1) == {"sum": 3}
+        assert compute(2) == {"sum": 4}
+
+        assert calls == [1, 2]
+
+    def test_hits_return_independent_copies(self, local_cache):
+        """Test mutating a cached result does not corrupt the cache."""
+
+        @local_cache.cached("tests.copies")
+        def compute():
+            return {"items": [1, 2]}
+
+        first = compute()
+        first["items"].append(3)
+
+        assert compute() == {"items": [1, 2]}
+
+    def test_invalidate_single_call(self, local_cache):
+        """Test invalidate() drops only the entry for the given arguments."""
+        calls = []
+
+        @local_cache.cached("tests.invalidate")
+        def compute(x):
+            calls.append(x)
+            return x
+
+        compute(1)
+        compute(2)
+        compute.invalidate(1)
+        compute(1)
+        compute(2)
+
+        assert calls == [1, 2, 1]
+
+
+class TestRedisTier:
+    """Tests for the shared Redis tier."""
+
+    def test_value_shared_across_processes(self, redis_cache, fake_redis):
+        """Test a value written by one worker is read by another."""
+        redis_cache.set("tests.shared", "k", {"v": 1})
+
+        other_worker = TwoTierCache()
+        other_worker.enabled = True
+        other_worker.use_redis = True
+        other_worker.version = redis_cache.version
+
+        assert other_worker.get("tests.shared", "k") == {"v": 1}
+        assert other_worker.stats()["tests.shared"]["redis_hits"] == 1
+
+    def test_version_bump_invalidates(self, app, redis_cache):
+        """Test entries written under an older version are not served."""
+        redis_cache.set("tests.version", "k", "old")
+
+        app.config["CACHE_VERSION"] = "next-release"
+        redis_cache.init_app(app)
+
+        assert redis_cache.get("tests.version", "k") is None
+
+    def test_invalidate_namespace(self, redis_cache, fake_redis):
+        """Test a namespace can be dropped without touching others."""
+        redis_cache.set("tests.ns_a", "1", "a1")
+        redis_cache.set("tests.ns_a", "2", "a2")
+        redis_cache.set("tests.ns_b", "1", "b1")
+
+        removed = redis_cache.invalidate_namespace("tests.ns_a")
+
+        assert removed == 2
+        assert redis_cache.get("tests.ns_a", "1") is None
+        assert redis_cache.get("tests.ns_b", "1") == "b1"
+
+
+class TestStampedeProtection:
+    """Tests for single-flight and early refresh."""
+
+    def test_concurrent_misses_compute_once(self, redis_cache):
+        """Test simultaneous misses for one key trigger a single computation."""
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return "value"
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    redis_cache.get_or_compute("tests.flight", "k", compute)
+                )
+            )
+            for _ in range(20)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == ["value"] * 20
+
+    def test_entry_near_expiry_refreshed_early(self, local_cache, monkeypatch):
+        """Test an expensive entry about to expire is recomputed before expiry."""
+        full_key = local_cache.make_key("tests.early", "k")
+        # Took 10s to compute and expires in 1s: XFetch refreshes it for any
+        # draw above 1 - e^-0.1, so pin the draw to keep the test deterministic
+        monkeypatch.setattr("app.cache.random.random", lambda: 0.5)
+        expires_at = time.time() + 1
+        local_cache._local.set(full_key, ('"stale"', 10.0, expires_at), expires_at)
+
+        value = local_cache.get_or_compute("tests.early", "k", lambda: "fresh")
+
+        assert value == "fresh"
+        assert local_cache.stats()["tests.early"]["early_refreshes"] == 1
+
+    def test_local_copy_keeps_redis_expiry(self, redis_cache, monkeypatch):
+        """Test a hot key read from the local tier is not refreshed long before its expiry."""
+        monkeypatch.setattr("app.cache.random.random", lambda: 0.5)
+        # XFetch looks ~35s ahead (as for a 50s computation at beta 1): past
+        # the local tier's 30s, well short of the hour-long TTL
+        monkeypatch.setattr(redis_cache, "early_refresh_beta", 1000)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.05)
+            return "value"
+
+        redis_cache.get_or_compute("tests.hot", "k", compute, timeout=3600)
+        for _ in range(50):
+            redis_cache.get_or_compute("tests.hot", "k", compute, timeout=3600)
+
+        stats = redis_cache.stats()["tests.hot"]
+        assert len(calls) == 1
+        assert (stats["local_hits"], stats["early_refreshes"]) == (50, 0)
+
+    def test_redis_entry_near_expiry_refreshed_early(self, redis_cache, fake_redis, monkeypatch):
+        """Test an entry near its Redis expiry is refreshed by a process reading it from Redis."""
+        monkeypatch.setattr("app.cache.random.random", lambda: 0.5)
+        full_key = redis_cache.make_key("tests.early_redis", "k")
+        envelope = json.dumps({"v": '"stale"', "d": 10.0, "e": time.time() + 1})
+        fake_redis.set(full_key, envelope, ex=1)
+
+        value = redis_cache.get_or_compute("tests.early_redis", "k", lambda: "fresh")
+
+        assert value == "fresh"
+        assert json.loads(json.loads(fake_redis.get(full_key))["v"]) == "fresh"
+        assert redis_cache.stats()["tests.early_redis"]["early_refreshes"] == 1
+
+    def test_waits_for_leader_in_other_process(self, redis_cache, fake_redis):
+        """Test a miss while another process holds the lock waits for its value."""
+        full_key = redis_cache.make_key("tests.leader", "k")
+        fake_redis.set(f"{full_key}:lock", "1", px=10000)
+        other_process = TwoTierCache()
+        other_process.enabled = other_process.use_redis = True
+        other_process.version = redis_cache.version
+        leader = threading.Timer(0.3, other_process.set, ("tests.leader", "k", "from leader"))
+        leader.start()
+
+        value = redis_cache.get_or_compute("tests.leader", "k", lambda: "computed here")
+        leader.join()
+
+        stats = redis_cache.stats()["tests.leader"]
+        assert value == "from leader"
+        assert (stats["misses"], stats["redis_hits"], stats["local_hits"]) == (1, 0, 0)
+        assert redis_cache.get("tests.leader", "k") == "from leader"  # kept locally
+        assert redis_cache.stats()["tests.leader"]["local_hits"] == 1
+
+
+class TestMetrics:
+    """Tests for hit/miss/latency metrics."""
+
+    def test_hits_and_misses_counted(self, local_cache):
+        """Test stats report hits, misses and hit ratio per namespace."""
+        local_cache.get_or_compute("tests.metrics", "k", lambda: 1)
+        local_cache.get_or_compute("tests.metrics", "k", lambda: 1)
+        local_cache.get_or_compute("tests.metrics", "k", lambda: 1)
+
+        stats = local_cache.stats()["tests.metrics"]
+        assert stats["misses"] == 1
+        assert stats["local_hits"] == 2
+        assert stats["hit_ratio"] == pytest.approx(0.6667)
+
+    def test_labor_market_reads_use_cache(self, client, auth_headers, local_cache):
+        """Test labor-market shortage lookups are cached."""
+        for _ in range(2):
+            response = client.get(
+                "/api/labor-market/shortage?role=software engineer", headers=auth_headers
+            )
+            assert response.status_code == 200
+
+        stats = local_cache.stats()["labor_market.shortage"]
+        assert stats["misses"] == 1
+        assert stats["local_hits"] == 1
+
+    def test_stats_endpoint_requires_admin(self, client, auth_headers):
+        """Test non-admin users cannot read cache metrics."""
+        response = client.get("/api/admin/cache/stats", headers=auth_headers)
+
+        assert response.status_code == 403
@@ -0,0 +1,365 @@
+"""
+Data Export Unit Tests
+
+Tests for queuing DSAR exports, streaming tables into the ZIP with
+progress on the request, failure handling and conditional, ranged
+downloads, including a large history and a large download.
+"""
+
+import hashlib
+import json
+import os
+import zipfile
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models.activity import Activity, ActivityDailySummary
+from app.models.data_export_request import DataExportRequest
+from app.models.resume import Resume
+from app.services import account_service
+from app.services.account_service import create_data_export, run_data_export
+
+
+@pytest.fixture
+def export_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(account_service, "EXPORT_DIR", str(tmp_path))
+    return tmp_path
+
+
+def add_activities(user_id, count, first=0):
+    """Bulk-insert count activities for a user, in chunks."""
+    start = datetime(2026, 10, 1)
+    for chunk in range(first, first + count, 10000):
+        db.session.execute(
+            Activity.__table__.insert(),
+            [
+                {
+                    "id": f"{i:08d}-0000-4000-8000-{str(user_id)[-12:]}",
+                    "user_id": str(user_id),
+                    "activity_type": "message_sent",
+                    "description": f"Sent message {i}",
+                    "extra_data": {"n": i},
+                    "created_at": start + timedelta(minutes=i),
+                }
+                for i in range(chunk, min(chunk + 10000, first + count))
+            ],
+        )
+    db.session.commit()
+
+
+def completed_export(user_id, export_dir, size=None):
+    """A completed export; with size, backed by that many random bytes."""
+    export_id = create_data_export(user_id)["id"]
+    if size is None:
+        run_data_export(export_id)
+        return db.session.get(DataExportRequest, export_id)
+
+    export = db.session.get(DataExportRequest, export_id)
+    export.file_path = str(export_dir / "export.zip")
+    with open(export.file_path, "wb") as f:
+        f.write(os.urandom(size))
+    export.file_sha256 = account_service._file_sha256(export.file_path)
+    export.status = "completed"
+    export.completed_at = datetime.utcnow()
+    db.session.commit()
+    return export
+
+
+def read_zip(path):
+    with zipfile.ZipFile(path) as zf:
+        return {name: zf.read(name).decode() for name in zf.namelist()}
+
+
+class TestRequestExport:
+    """Tests for POST /api/profile/export and the status endpoint."""
+
+    def test_export_built_and_reported(self, client, auth_headers, test_user, export_dir):
+        """Test a request queues the build (inline under TESTING) and reports completion."""
+        add_activities(test_user.id, 3)
+
+        response = client.post("/api/profile/export", headers=auth_headers)
+
+        assert response.status_code == 202
+        data = response.get_json()["data"]
+        assert data["status"] == "completed"
+        assert data["progress_percent"] == 100
+        assert data["records_exported"] == data["records_total"] == 3
+
+        export = DataExportRequest.query.one()
+        files = read_zip(export.file_path)
+        activities = json.loads(files["activities.json"])
+        assert [a["description"] for a in activities] == [f"Sent message {i}" for i in range(3)]
+        assert json.loads(files["engagement.json"]) == {"streaks": [], "milestones": []}
+        assert json.loads(files["metadata.json"])["record_counts"]["activities"] == 3
+        assert json.loads(files["profile.json"])["email"] == test_user.email
+
+        status = client.get("/api/profile/export/status", headers=auth_headers).get_json()
+        assert status["data"]["download_token"] == export.download_token
+
+    def test_one_active_export_at_a_time(self, client, auth_headers, test_user, export_dir):
+        """Test a pending export blocks another request."""
+        assert "id" in create_data_export(test_user.id)
+
+        response = client.post("/api/profile/export", headers=auth_headers)
+
+        assert response.status_code == 409
+
+    def test_stale_export_does_not_block(self, app, test_user, export_dir):
+        """Test an export that never finished is failed and a new one accepted."""
+        stale_id = create_data_export(test_user.id)["id"]
+        stale = db.session.get(DataExportRequest, stale_id)
+        stale.status = "processing"
+        stale.created_at = datetime.utcnow() - account_service.EXPORT_STALE_AFTER
+        db.session.commit()
+
+        result = create_data_export(test_user.id)
+
+        assert result["id"] != stale_id
+        assert db.session.get(DataExportRequest, stale_id).status == "failed"
+
+
+class TestRunDataExport:
+    """Tests for building the archive."""
+
+    def test_tables_match_previous_format(self, app, test_user, export_dir):
+        """Test streamed entries are byte-identical to serializing whole lists."""
+        add_activities(test_user.id, 5)
+        export_id = create_data_export(test_user.id)["id"]
+
+        run_data_export(export_id)
+
+        rows = db.session.execute(
+            db.text("SELECT * FROM activities WHERE user_id = :uid ORDER BY id"),
+            {"uid": str(test_user.id)},
+        ).fetchall()
+        expected = account_service._to_json([dict(row._mapping) for row in rows])
+        files = read_zip(db.session.get(DataExportRequest, export_id).file_path)
+        assert files["activities.json"] == expected
+        assert files["recruiters.json"] == "[]"
+
+    def test_resume_files_and_scores_exported(
+        self, app, test_user, export_dir, tmp_path, monkeypatch
+    ):
+        """Test uploaded resume files and their ATS scores are in the archive."""
+        resume_dir = tmp_path / "uploads"
+        resume_dir.mkdir()
+        monkeypatch.setattr(account_service, "RESUME_DIR", str(resume_dir))
+        (resume_dir / "stored.pdf").write_bytes(b"%PDF resume")
+        db.session.add(
+            Resume(
+                user_id=test_user.id,
+                title="Main",
+                file_name="My Resume.pdf",
+                file_path="uploads/stored.pdf",
+                ats_total_score=72,
+            )
+        )
+        db.session.commit()
+        export_id = create_data_export(test_user.id)["id"]
+
+        result = run_data_export(export_id)
+
+        assert "error" not in result
+        export = db.session.get(DataExportRequest, export_id)
+        with zipfile.ZipFile(export.file_path) as zf:
+            assert zf.read("resumes/My Resume.pdf") == b"%PDF resume"
+            scores = json.loads(zf.read("scores.json"))
+        assert [s["ats_total_score"] for s in scores["ats_scores"]] == [72]
+
+    def test_activity_summaries_exported(self, app, test_user, export_dir):
+        """Test rolled-up activity counts are exported in day order."""
+        for day in (2, 1):
+            db.session.add(
+                ActivityDailySummary(
+                    user_id=test_user.id,
+                    day=date(2025, 1, day),
+                    activity_type="message_sent",
+                    count=day,
+                )
+            )
+        db.session.commit()
+        export_id = create_data_export(test_user.id)["id"]
+
+        run_data_export(export_id)
+
+        files = read_zip(db.session.get(DataExportRequest, export_id).file_path)
+        summaries = json.loads(files["activity_daily_summaries.json"])
+        assert [(s["day"], s["count"]) for s in summaries] == [("2025-01-01", 1), ("2025-01-02", 2)]
+
+    def test_progress_committed_per_batch(self, app, test_user, export_dir, monkeypatch):
+        """Test progress is saved after every batch of rows."""
+        monkeypatch.setattr(account_service, "EXPORT_BATCH_SIZE", 10)
+        add_activities(test_user.id, 25)
+        export_id = create_data_export(test_user.id)["id"]
+
+        seen = []
+
+        def record(mapper, connection, target):
+            seen.append((target.status, target.current_section, target.records_exported))
+
+        event.listen(DataExportRequest, "after_update", record)
+        try:
+            run_data_export(export_id)
+        finally:
+            event.remove(DataExportRequest, "after_update", record)
+
+        assert ("processing", "activities", 10) in seen
+        assert ("processing", "activities", 20) in seen
+        assert ("processing", "activities", 25) in seen
+        assert seen[-1] == ("completed", None, 25)
+
+    def test_failure_marks_request_and_removes_file(self, app, test_user, export_dir, monkeypatch):
+        """Test a failed build records the error and leaves no partial ZIP."""
+        export_id = create_data_export(test_user.id)["id"]
+
+        def broken(user_id):
+            raise RuntimeError("disk full")
+
+        monkeypatch.setattr(account_service, "_export_scores", broken)
+
+        result = run_data_export(export_id)
+
+        export = db.session.get(DataExportRequest, export_id)
+        assert result["status_code"] == 500
+        assert (export.status, export.error_message) == ("failed", "disk full")
+        assert os.listdir(export_dir) == []
+
+    def test_finished_requests_not_rebuilt(self, app, test_user, export_dir):
+        """Test a repeated task for a finished request does nothing."""
+        export_id = create_data_export(test_user.id)["id"]
+        run_data_export(export_id)
+
+        assert run_data_export(export_id)["status_code"] == 404
+        assert len(os.listdir(export_dir)) == 1
+
+
+class TestDownloadExport:
+    """Tests for GET /api/profile/export/download/<token>."""
+
+    def url(self, export):
+        return f"/api/profile/export/download/{export.download_token}"
+
+    def test_full_download_tagged_with_hash(self, client, test_user, export_dir):
+        """Test the archive is served whole with its SHA-256 as the ETag."""
+        export = completed_export(test_user.id, export_dir)
+        with open(export.file_path, "rb") as f:
+            content = f.read()
+
+        response = client.get(self.url(export))
+
+        assert response.status_code == 200
+        assert response.data == content
+        assert export.file_sha256 == hashlib.sha256(content).hexdigest()
+        assert response.headers["ETag"] == f'"{export.file_sha256}"'
+        assert "private" in response.headers["Cache-Control"]
+        assert "jobezie_data_export.zip" in response.headers["Content-Disposition"]
+
+    def test_interrupted_download_resumed(self, client, test_user, export_dir):
+        """Test a download can be fetched in ranges and resumed with If-Range."""
+        export = completed_export(test_user.id, export_dir, size=10000)
+        etag = f'"{export.file_sha256}"'
+
+        first = client.get(self.url(export), headers={"Range": "bytes=0-4095"})
+        rest = client.get(self.url(export), headers={"Range": "bytes=4096-", "If-Range": etag})
+
+        assert (first.status_code, rest.status_code) == (206, 206)
+        assert first.headers["Accept-Ranges"] == "bytes"
+        assert first.headers["Content-Range"] == "bytes 0-4095/10000"
+        assert rest.headers["Content-Range"] == "bytes 4096-9999/10000"
+        with open(export.file_path, "rb") as f:
+            assert first.data + rest.data == f.read()
+
+    def test_changed_file_sent_whole(self, client, test_user, export_dir):
+        """Test a range with a stale If-Range validator gets the full file."""
+        export = completed_export(test_user.id, export_dir, size=1000)
+
+        response = client.get(
+            self.url(export), headers={"Range": "bytes=500-", "If-Range": '"stale"'}
+        )
+
+        assert response.status_code == 200
+        assert len(response.data) == 1000
+
+    def test_conditional_and_unsatisfiable_requests(self, client, test_user, export_dir):
+        """Test a matching ETag gets 304 and a range past the end gets 416."""
+        export = completed_export(test_user.id, export_dir, size=1000)
+
+        cached = client.get(self.url(export), headers={"If-None-Match": f'"{export.file_sha256}"'})
+        past_end = client.get(self.url(export), headers={"Range": "bytes=5000-"})
+
+        assert (cached.status_code, cached.data) == (304, b"")
+        assert past_end.status_code == 416
+
+    def test_unhashed_export_hashed_on_download(self, client, test_user, export_dir):
+        """Test exports built before hashing get their ETag on first download."""
+        export = completed_export(test_user.id, export_dir, size=1000)
+        export.file_sha256 = None
+        db.session.commit()
+
+        response = client.get(self.url(export))
+
+        with open(export.file_path, "rb") as f:
+            expected = hashlib.sha256(f.read()).hexdigest()
+        assert db.session.get(DataExportRequest, export.id).file_sha256 == expected
+        assert response.headers["ETag"] == f'"{expected}"'
+
+    def test_handed_to_nginx(self, app, client, test_user, export_dir):
+        """Test with an accel prefix the worker sends headers only."""
+        app.config["EXPORT_ACCEL_REDIRECT_PREFIX"] = "/internal/exports/"
+        export = completed_export(test_user.id, export_dir, size=1000)
+
+        response = client.get(self.url(export))
+
+        assert response.status_code == 200
+        assert response.data == b""
+        assert response.headers["X-Accel-Redirect"] == "/internal/exports/export.zip"
+        assert response.headers["Content-Type"] == "application/zip"
+        assert "jobezie_data_export.zip" in response.headers["Content-Disposition"]
+
+
+@pytest.mark.slow
+class TestLargeExport:
+    """Export of a large history. Set BENCH_EXPORT_ACTIVITIES to scale."""
+
+    def test_progress_saved_per_batch(self, app, test_user, export_dir):
+        """Test the export is written and its progress saved one batch at a time."""
+        count = int(os.environ.get("BENCH_EXPORT_ACTIVITIES", 20000))
+        add_activities(test_user.id, count)
+        export_id = create_data_export(test_user.id)["id"]
+        commits = []
+
+        def on_commit(conn):
+            commits.append(conn)
+
+        event.listen(db.engine, "commit", on_commit)
+        try:
+            run_data_export(export_id)
+        finally:
+            event.remove(db.engine, "commit", on_commit)
+
+        assert db.session.get(DataExportRequest, export_id).records_exported == count
+        # One progress commit per full batch of activities
+        assert len(commits) >= count // account_service.EXPORT_BATCH_SIZE
+
+
+@pytest.mark.slow
+class TestLargeDownload:
+    """Download of a large export. Set BENCH_DOWNLOAD_MB to scale."""
+
+    def test_streamed_resumed_and_handed_off(self, app, client, test_user, export_dir):
+        """Test a large file is streamed whole or resumed, or left to nginx to send."""
+        size = int(os.environ.get("BENCH_DOWNLOAD_MB", 50)) * 2**20
+        export = completed_export(test_user.id, export_dir, size=size)
+        url = f"/api/profile/export/download/{export.download_token}"
+
+        full = client.get(url)
+        half = client.get(url, headers={"Range": f"bytes={size // 2}-"})
+        app.config["EXPORT_ACCEL_REDIRECT_PREFIX"] = "/internal/exports/"
+        accel = client.get(url)
+
+        assert len(full.data) == size and len(half.data) == size - size // 2
+        assert accel.headers["X-Accel-Redirect"]
+        assert accel.data == b""  # the worker sends no bytes
@@ -0,0 +1,148 @@
+"""
+Days-in-Stage Unit Tests
+
+Tests for the set-based days_in_stage refresh, the portable days_since
+expression and read-time derivation, including a refresh of 100k items.
+"""
+
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import column, literal, select
+from sqlalchemy.dialects import postgresql
+
+from app.extensions import db
+from app.models.activity import PipelineItem
+from app.models.recruiter import Recruiter
+from app.services.activity_service import ActivityService
+from app.utils.sql import days_since
+
+AGES = [
+    timedelta(0),
+    timedelta(hours=23, minutes=59, seconds=59),
+    timedelta(days=1),
+    timedelta(days=1, microseconds=1),
+    timedelta(days=13, hours=23),
+    timedelta(days=14, minutes=1),
+    timedelta(days=400),
+    timedelta(hours=-3),
+]
+
+
+def add_items(user_id, entered_at, first=0):
+    """Bulk-insert pipeline items (and a recruiter) with the given entered_stage_at values."""
+    recruiter_id = f"{first:08d}-0000-4000-8000-{str(user_id)[-12:]}"
+    db.session.execute(
+        Recruiter.__table__.insert(),
+        [{"id": recruiter_id, "user_id": str(user_id), "first_name": "R", "last_name": "X"}],
+    )
+    db.session.execute(
+        PipelineItem.__table__.insert(),
+        [
+            {
+                "id": f"{first + i:08d}-0000-4000-9000-000000000000",
+                "user_id": str(user_id),
+                "recruiter_id": recruiter_id,
+                "stage": "contacted",
+                "days_in_stage": 0,
+                "entered_stage_at": entered,
+            }
+            for i, entered in enumerate(entered_at)
+        ],
+    )
+    db.session.commit()
+
+
+class TestDaysSince:
+    """Tests for the days_since SQL expression."""
+
+    def test_matches_python_days(self, app):
+        """Test SQLite results equal timedelta.days, including boundaries and negatives."""
+        now = datetime(2026, 6, 1, 12, 0)
+
+        for age in AGES:
+            value = db.session.execute(
+                select(days_since(literal(now), literal(now - age)))
+            ).scalar()
+            assert value == age.days, age
+
+    def test_postgresql_compiles_to_epoch_floor(self):
+        """Test the PostgreSQL form floors elapsed seconds over 86400."""
+        sql = str(
+            select(days_since(datetime(2026, 1, 1), column("entered_stage_at"))).compile(
+                dialect=postgresql.dialect()
+            )
+        )
+
+        assert "floor(extract(epoch FROM" in sql
+        assert "/ 86400" in sql
+
+
+class TestUpdateDaysInStage:
+    """Tests for ActivityService.update_days_in_stage."""
+
+    def test_all_users_in_chunks(self, app, test_user, second_user):
+        """Test every user's items are refreshed across chunk boundaries."""
+        now = datetime.utcnow()
+        add_items(test_user.id, [now - age for age in AGES])
+        add_items(second_user.id, [now - timedelta(days=d) for d in (3, 30)], first=100)
+
+        updated = ActivityService.update_days_in_stage(chunk_size=3)
+
+        stored = dict(db.session.execute(select(PipelineItem.id, PipelineItem.days_in_stage)).all())
+        assert updated == sum(1 for age in AGES if age.days != 0) + 2
+        assert sorted(stored.values()) == sorted([age.days for age in AGES] + [3, 30])
+
+    def test_unchanged_rows_not_rewritten(self, app, test_user):
+        """Test a second run in the same day updates nothing."""
+        now = datetime.utcnow()
+        add_items(test_user.id, [now - timedelta(days=d, hours=1) for d in range(5)] + [None])
+
+        assert ActivityService.update_days_in_stage() == 4
+        assert ActivityService.update_days_in_stage() == 0
+
+    def test_single_user(self, app, test_user, second_user):
+        """Test user_id limits the refresh to that user's items."""
+        now = datetime.utcnow()
+        add_items(test_user.id, [now - timedelta(days=2)])
+        add_items(second_user.id, [now - timedelta(days=9)], first=100)
+
+        assert ActivityService.update_days_in_stage(test_user.id) == 1
+
+        other = PipelineItem.query.filter_by(user_id=second_user.id).one()
+        assert other.days_in_stage == 0
+
+    def test_read_time_value(self, app, test_user):
+        """Test API dicts report days in stage as of now, not the stored value."""
+        add_items(test_user.id, [datetime.utcnow() - timedelta(days=6, hours=2)])
+
+        item = PipelineItem.query.one()
+
+        assert item.days_in_stage == 0
+        assert item.to_dict()["days_in_stage"] == 6
+        assert ActivityService.get_pipeline(test_user.id)["contacted"][0]["days_in_stage"] == 6
+
+
+@pytest.mark.slow
+class TestDaysInStageAtScale:
+    """Refresh of many items. Set BENCH_PIPELINE_ITEMS=5000000 for the 5M run."""
+
+    def test_refresh_updates_stale_rows(self, app, test_user):
+        """Test the chunked set-based refresh updates every stale row."""
+        count = int(os.environ.get("BENCH_PIPELINE_ITEMS", 100000))
+        now = datetime.utcnow()
+        batch = 50000
+        for first in range(0, count, batch):
+            size = min(batch, count - first)
+            add_items(
+                test_user.id,
+                [now - timedelta(days=(first + i) % 60, hours=1) for i in range(size)],
+                first=first,
+            )
+
+        updated = ActivityService.update_days_in_stage()
+
+        # Items with i % 60 == 0 entered today and already hold 0
+        assert updated == count - (count + 59) // 60
+        assert ActivityService.update_days_in_stage() == 0
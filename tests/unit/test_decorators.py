@@ -0,0 +1,83 @@
+"""
+Decorator Unit Tests
+
+Tests for the request-scoped current-user loader shared by the route
+decorators and route bodies.
+"""
+
+from datetime import datetime, timedelta
+
+from flask import jsonify
+from flask_jwt_extended import create_access_token, jwt_required
+from sqlalchemy import event
+
+from app.extensions import db
+from app.utils.decorators import (
+    feature_limit,
+    load_current_user,
+    onboarding_completed_required,
+    subscription_required,
+    verified_email_required,
+)
+
+
+def count_user_queries(app, client, *request_args, **request_kwargs):
+    """Issue a request and count SELECT statements against the users table."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        response = client.get(*request_args, **request_kwargs)
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+    user_selects = [
+        s for s in statements if s.lstrip().upper().startswith("SELECT") and "FROM users" in s
+    ]
+    return response, len(user_selects)
+
+
+class TestCurrentUserLoader:
+    """Tests for load_current_user and the decorators built on it."""
+
+    def test_stacked_decorators_query_user_once(self, app, client, test_user_pro, fake_redis):
+        """Test four stacked decorators plus the route body share one users query."""
+
+        @app.route("/api/_test/stacked")
+        @jwt_required()
+        @subscription_required("pro", "expert")
+        @verified_email_required
+        @onboarding_completed_required
+        @feature_limit("research")
+        def stacked():
+            user = load_current_user()
+            return jsonify({"success": True, "data": {"email": user.email}})
+
+        test_user_pro.email_verified = True
+        test_user_pro.onboarding_completed = True
+        test_user_pro.usage_reset_date = datetime.utcnow() + timedelta(days=30)
+        db.session.commit()
+
+        token = create_access_token(identity=str(test_user_pro.id))
+        headers = {"Authorization": f"Bearer {token}"}
+
+        response, user_queries = count_user_queries(
+            app, client, "/api/_test/stacked", headers=headers
+        )
+
+        assert response.status_code == 200
+        assert response.get_json()["data"]["email"] == "pro@example.com"
+        assert user_queries == 1
+
+    def test_user_not_shared_between_requests(self, app, client, auth_headers, second_user):
+        """Test the memoized user is dropped at the end of each request."""
+        first = client.get("/api/auth/me", headers=auth_headers)
+        token = create_access_token(identity=str(second_user.id))
+        second = client.get("/api/auth/me", headers={"Authorization": f"Bearer {token}"})
+
+        assert first.get_json()["data"]["user"]["email"] == "test@example.com"
+        assert second.get_json()["data"]["user"]["email"] == second_user.email
@@ -0,0 +1,265 @@
+"""
+Event Stream Unit Tests
+
+Tests for per-user event history in Redis, the Server-Sent Events endpoint
+and resuming it from Last-Event-ID, the services that publish events, and
+the queries of stream reconnects against re-fetching the dashboard.
+"""
+
+import json
+import os
+import threading
+import time
+
+import pytest
+from sqlalchemy import event
+
+from app.extensions import db, limiter
+from app.services.activity_service import ActivityService
+from app.services.event_stream import EventType, event_stream
+from app.services.notification_service import NotificationService
+from app.services.stripe_service import StripeService
+from tests.unit.test_pipeline_ranks import add_column
+
+
+def parse_sse(body):
+    """Events of an SSE body as dicts with id, event and data."""
+    events = []
+    for block in body.split("\n\n"):
+        fields = {}
+        for line in block.splitlines():
+            name, _, value = line.partition(": ")
+            if name in ("id", "event", "data"):
+                fields[name] = value
+        if "event" in fields:
+            fields["data"] = json.loads(fields["data"])
+            events.append(fields)
+    return events
+
+
+def stream(client, auth_headers, last_event_id=None):
+    headers = dict(auth_headers)
+    if last_event_id:
+        headers["Last-Event-ID"] = last_event_id
+    response = client.get("/api/events/stream", headers=headers)
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+    return response.get_data(as_text=True)
+
+
+class TestEventHistory:
+    """Tests for publishing and reading a user's events."""
+
+    def test_read_after_id(self, app, fake_redis):
+        """Test events are kept per user, in order, and read after a given id."""
+        for i in range(3):
+            event_stream.publish("user-a", EventType.ACTIVITY_LOGGED, {"n": i})
+        event_stream.publish("user-b", EventType.ACTIVITY_LOGGED, {"n": 9})
+
+        events = event_stream.read("user-a", "0-0")
+        assert [e["data"]["n"] for e in events] == [0, 1, 2]
+        assert [e["type"] for e in events] == ["activity.logged"] * 3
+        assert [e["data"]["n"] for e in event_stream.read("user-a", events[0]["id"])] == [1, 2]
+        assert fake_redis.ttl(f"{event_stream.STREAM_PREFIX}user-a") > 0
+
+    def test_without_redis(self, app):
+        """Test publishing is a no-op and reads are empty when Redis is unavailable."""
+        event_stream.publish("user-a", EventType.ACTIVITY_LOGGED, {})
+
+        assert event_stream.read("user-a", "0-0") == []
+        assert event_stream.wait("user-a", "0-0", timeout=5) == []
+
+    def test_wait_woken_by_publish(self, app, fake_redis):
+        """Test a waiting reader returns as soon as an event is published."""
+        result = {}
+
+        def wait():
+            with app.app_context():
+                began = time.monotonic()
+                result["events"] = event_stream.wait("user-a", "0-0", timeout=10)
+                result["seconds"] = time.monotonic() - began
+
+        waiter = threading.Thread(target=wait)
+        waiter.start()
+        time.sleep(0.3)
+        event_stream.publish("user-a", EventType.PIPELINE_MOVED, {"stage": "new"})
+        waiter.join(timeout=10)
+
+        assert [e["data"] for e in result["events"]] == [{"stage": "new"}]
+        assert result["seconds"] < 5
+
+
+class TestStreamEndpoint:
+    """Tests for GET /api/events/stream."""
+
+    def test_ready_then_resume(self, client, auth_headers, test_user, fake_redis):
+        """Test a new stream starts at the newest event and a reconnect gets what it missed."""
+        event_stream.publish(test_user.id, EventType.ACTIVITY_LOGGED, {"n": 1})
+
+        first = parse_sse(stream(client, auth_headers))
+        assert [e["event"] for e in first] == ["stream.ready"]
+        event_stream.publish(test_user.id, EventType.ACTIVITY_LOGGED, {"n": 2})
+        event_stream.publish(test_user.id, EventType.NOTIFICATION_CREATED, {"n": 3})
+
+        resumed = parse_sse(stream(client, auth_headers, last_event_id=first[0]["id"]))
+
+        assert [e["event"] for e in resumed] == [
+            "stream.ready",
+            "activity.logged",
+            "notification.created",
+        ]
+        assert resumed[0]["id"] == first[0]["id"]
+        assert [e["data"] for e in resumed[1:]] == [{"n": 2}, {"n": 3}]
+        assert parse_sse(stream(client, auth_headers, resumed[-1]["id"]))[0]["event"] == (
+            "stream.ready"
+        )
+
+    def test_reset_when_history_trimmed(self, client, auth_headers, test_user, fake_redis):
+        """Test a client behind the kept history is told to re-fetch."""
+        for i in range(4):
+            event_stream.publish(test_user.id, EventType.ACTIVITY_LOGGED, {"n": i})
+        behind = event_stream.read(test_user.id, "0-0")[0]["id"]
+        # Trimmed to one entry, so the stream still knows its last id
+        fake_redis.xtrim(f"{event_stream.STREAM_PREFIX}{test_user.id}", maxlen=1)
+        event_stream.publish(test_user.id, EventType.ACTIVITY_LOGGED, {"n": 4})
+
+        events = parse_sse(stream(client, auth_headers, last_event_id=behind))
+
+        assert [e["event"] for e in events] == ["stream.reset"]
+        assert events[0]["id"] == event_stream.read(test_user.id, "0-0")[-1]["id"]
+
+    def test_reset_when_history_expired(self, client, auth_headers, test_user, fake_redis):
+        """Test a client whose stream expired and restarted is told to re-fetch."""
+        key = f"{event_stream.STREAM_PREFIX}{test_user.id}"
+        event_stream.publish(test_user.id, EventType.ACTIVITY_LOGGED, {"n": 0})
+        behind = event_stream.read(test_user.id, "0-0")[0]["id"]
+        fake_redis.delete(key)
+        milliseconds = int(behind.split("-")[0])
+        for i in (1, 2):
+            fake_redis.xadd(
+                key, {"type": "activity.logged", "data": "{}"}, id=f"{milliseconds + i}-0"
+            )
+
+        events = parse_sse(stream(client, auth_headers, last_event_id=behind))
+
+        assert [e["event"] for e in events] == ["stream.reset"]
+        assert events[0]["id"] == f"{milliseconds + 2}-0"
+
+    def test_invalid_last_event_id_ignored(self, client, auth_headers, test_user, fake_redis):
+        """Test a malformed Last-Event-ID starts from the newest event."""
+        event_stream.publish(test_user.id, EventType.ACTIVITY_LOGGED, {})
+
+        events = parse_sse(stream(client, auth_headers, last_event_id="garbage"))
+
+        assert [e["event"] for e in events] == ["stream.ready"]
+
+    def test_held_stream_pushes_events(self, app, client, auth_headers, test_user, fake_redis):
+        """Test with EVENT_STREAM_SECONDS set, events published while open are sent."""
+        app.config["EVENT_STREAM_SECONDS"] = 1
+        user_id = test_user.id
+        publisher = threading.Timer(
+            0.3, event_stream.publish, (user_id, EventType.PIPELINE_MOVED, {"stage": "new"})
+        )
+        publisher.start()
+
+        began = time.monotonic()
+        events = parse_sse(stream(client, auth_headers))
+
+        assert [e["event"] for e in events] == ["stream.ready", "pipeline.moved"]
+        assert time.monotonic() - began < 5
+
+    def test_without_redis(self, client, auth_headers):
+        """Test the endpoint answers with an empty stream when Redis is unavailable."""
+        assert [e["event"] for e in parse_sse(stream(client, auth_headers))] == ["stream.ready"]
+
+
+class TestPublishers:
+    """Tests for events published by services."""
+
+    def test_pipeline_move(self, client, auth_headers, test_user, fake_redis):
+        """Test a move publishes the moved items and their stage change activities."""
+        ids = add_column(test_user.id, 3)
+
+        client.post(
+            "/api/activities/pipeline/move",
+            json={"item_ids": [ids[2]], "stage": "responded"},
+            headers=auth_headers,
+        )
+
+        events = event_stream.read(test_user.id, "0-0")
+        assert [e["type"] for e in events] == ["pipeline.moved", "activity.logged"]
+        assert events[0]["data"]["stage"] == "responded"
+        assert [item["id"] for item in events[0]["data"]["items"]] == [ids[2]]
+        assert events[1]["data"]["description"] == "Moved to responded"
+
+    def test_pipeline_move_outside_request(self, app, test_user, fake_redis):
+        """Test a move outside a request announces its activities after committing."""
+        ids = add_column(test_user.id, 1)
+
+        ActivityService.move_pipeline_item(test_user.id, ids[0], "responded")
+        ActivityService.log_activity(test_user.id, "message_sent")
+
+        types = [e["type"] for e in event_stream.read(test_user.id, "0-0")]
+        assert types == ["pipeline.moved", "activity.logged", "activity.logged"]
+
+    def test_notifications(self, app, test_user, fake_redis):
+        """Test created and generated notifications are published."""
+        created = NotificationService.create_notification(test_user.id, "Hello")
+        NotificationService._insert(
+            [{"user_id": test_user.id, "title": "Generated", "notification_type": "system"}]
+        )
+
+        events = event_stream.read(test_user.id, "0-0")
+        assert [e["type"] for e in events] == ["notification.created"] * 2
+        assert events[0]["data"]["id"] == str(created.id)
+        assert events[1]["data"]["title"] == "Generated"
+        assert events[1]["data"]["is_read"] is False
+
+    def test_subscription_webhooks(self, app, test_user, fake_redis):
+        """Test subscription webhook handlers publish the user's new tier."""
+        test_user.stripe_customer_id = "cus_123"
+        db.session.commit()
+
+        StripeService._handle_checkout_completed(
+            {"metadata": {"user_id": str(test_user.id), "tier": "pro"}, "subscription": "sub_1"}
+        )
+        StripeService._handle_subscription_deleted({"customer": "cus_123"})
+
+        events = event_stream.read(test_user.id, "0-0")
+        assert [e["type"] for e in events] == ["subscription.updated"] * 2
+        assert [e["data"]["tier"] for e in events] == ["pro", "basic"]
+        assert events[1]["data"]["status"] == "canceled"
+
+
+@pytest.mark.slow
+class TestManyRefreshes:
+    """Cost of refreshing an open dashboard. Set BENCH_EVENT_REQUESTS to scale."""
+
+    def test_reconnect_vs_dashboard_refetch(
+        self, client, auth_headers, test_user, fake_redis, monkeypatch
+    ):
+        """Test checking the stream for changes runs no queries, unlike the dashboard."""
+        count = int(os.environ.get("BENCH_EVENT_REQUESTS", 300))
+        monkeypatch.setattr(limiter, "enabled", False)
+        add_column(test_user.id, 50)
+        user_id = test_user.id
+        for i in range(20):
+            NotificationService.create_notification(user_id, f"Note {i}")
+
+        def count_queries(path):
+            statements = []
+
+            def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+                statements.append(statement)
+
+            event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+            try:
+                for _ in range(count):
+                    response = client.get(path, headers=auth_headers)
+                    response.get_data()
+            finally:
+                event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+            assert response.status_code == 200
+            return len(statements)
+
+        assert count_queries("/api/events/stream") == 0 < count_queries("/api/dashboard")
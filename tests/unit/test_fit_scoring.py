@@ -0,0 +1,173 @@
+"""
+Fit Scoring Unit Tests
+
+Tests for the batch fit scorer, the bulk rescore of a user's recruiters,
+the profile-change trigger, and both at 10k recruiters.
+"""
+
+import itertools
+import os
+
+import pytest
+
+from app.extensions import db
+from app.models.recruiter import Recruiter
+from app.services.recruiter_service import RecruiterService
+from app.services.scoring.engagement import (
+    FitProfile,
+    calculate_fit_score,
+    calculate_priority_score,
+    score_fits,
+)
+
+PROFILES = [
+    ([], None, [], None),
+    (["Technology", "Finance"], "New York, NY", ["Software Engineer"], 150000),
+    (["healthcare", "Biotech", "Retail", "Finance"], "Austin", ["Data Scientist", "ML"], 60000),
+    (["FinTech"], "remote", ["Product Manager", "engineering lead"], 250000),
+]
+
+RECRUITER_ROWS = list(
+    itertools.product(
+        [[], ["technology"], ["Finance", "Healthcare", "Retail"], ["Energy"]],
+        [[], ["New York, NY"], ["Austin TX", "Dallas"], ["Nationwide"], ["Chicago"]],
+        [None, "", "Software Engineering", "data science", "Sales"],
+        [None, "Executive Search", "agency", "corporate"],
+        [None, 90000],
+        [None, 0, 200000],
+    )
+)
+
+
+def reference_fit(profile, row):
+    """Score one recruiter the way RecruiterService.calculate_fit_score does."""
+    industries, locations, specialty, company_type, salary_min, salary_max = row
+    return calculate_fit_score(
+        user_industries=profile[0],
+        user_location=profile[1],
+        user_target_roles=profile[2],
+        user_salary_expectation=profile[3],
+        recruiter_industries=industries or [],
+        recruiter_locations=locations or [],
+        recruiter_specialty=specialty,
+        recruiter_company_type=company_type,
+        recruiter_salary_range=(salary_min, salary_max) if salary_min and salary_max else None,
+    )
+
+
+def add_recruiters(user_id, count):
+    """Bulk-insert recruiters cycling through RECRUITER_ROWS."""
+    db.session.execute(
+        Recruiter.__table__.insert(),
+        [
+            {
+                "id": f"{i:08d}-0000-4000-8000-000000000000",
+                "user_id": str(user_id),
+                "first_name": f"R{i}",
+                "last_name": "Recruiter",
+                "industries": row[0],
+                "locations": row[1],
+                "specialty": row[2],
+                "company_type": row[3],
+                "salary_range_min": row[4],
+                "salary_range_max": row[5],
+            }
+            for i, row in zip(range(count), itertools.cycle(RECRUITER_ROWS))
+        ],
+    )
+    db.session.commit()
+
+
+class TestScoreFits:
+    """Tests for score_fits."""
+
+    @pytest.mark.parametrize("profile", PROFILES)
+    def test_matches_single_scorer(self, profile):
+        """Test every recruiter input combination scores the same as calculate_fit_score."""
+        results = score_fits(FitProfile(*profile), RECRUITER_ROWS)
+
+        assert results == [reference_fit(profile, row) for row in RECRUITER_ROWS]
+
+
+class TestRescoreFit:
+    """Tests for RecruiterService.rescore_fit."""
+
+    def test_writes_fit_and_priority(self, app, test_user):
+        """Test fit, components and the dependent priority are stored for every recruiter."""
+        test_user.target_industries = ["Technology"]
+        test_user.target_roles = ["Software Engineer"]
+        test_user.location = "New York, NY"
+        db.session.commit()
+        profile = (["Technology"], "New York, NY", ["Software Engineer"], None)
+        add_recruiters(test_user.id, 7)
+
+        assert RecruiterService.rescore_fit(test_user.id, chunk_size=3) == 7
+
+        db.session.expire_all()
+        recruiters = Recruiter.query.filter_by(user_id=test_user.id).order_by(Recruiter.id).all()
+        for recruiter, row in zip(recruiters, RECRUITER_ROWS):
+            expected = reference_fit(profile, row)
+            assert recruiter.fit_score == expected["total_score"]
+            assert recruiter.fit_components == expected["components"]
+            assert recruiter.priority_score == calculate_priority_score(
+                days_since_contact=0,
+                pending_actions=0,
+                engagement_score=50,
+                fit_score=expected["total_score"] or 50,
+                has_responded=False,
+                status="new",
+            )
+
+    def test_scoped_to_user(self, app, test_user, second_user):
+        """Test other users' recruiters are left alone."""
+        add_recruiters(second_user.id, 3)
+
+        assert RecruiterService.rescore_fit(test_user.id) == 0
+        assert all(r.fit_components == {} for r in Recruiter.query.all())
+
+
+class TestProfileChangeTrigger:
+    """Tests for rescoring on PUT /api/auth/profile."""
+
+    def test_target_change_rescores(self, client, auth_headers, test_user):
+        """Test changing target industries rescores the pipeline."""
+        add_recruiters(test_user.id, 3)
+
+        response = client.put(
+            "/api/auth/profile",
+            json={"target_industries": ["Technology"]},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert all(r.fit_components for r in Recruiter.query.all())
+
+    def test_unrelated_change_does_not_rescore(self, client, auth_headers, test_user):
+        """Test editing a field the fit score ignores leaves scores untouched."""
+        add_recruiters(test_user.id, 3)
+
+        response = client.put("/api/auth/profile", json={"phone": "555-0100"}, headers=auth_headers)
+
+        assert response.status_code == 200
+        assert all(r.fit_components == {} for r in Recruiter.query.all())
+
+
+@pytest.mark.slow
+class TestFitScoringAtScale:
+    """Batch vs per-recruiter fit scoring at 10k recruiters. Set BENCH_FIT_RECRUITERS to scale."""
+
+    def test_batch_scorer_matches_per_row(self, app, test_user):
+        """Test the batch scorer matches per-recruiter scoring and the rescore covers every row."""
+        count = int(os.environ.get("BENCH_FIT_RECRUITERS", 10000))
+        profile = PROFILES[1]
+        rows = list(itertools.islice(itertools.cycle(RECRUITER_ROWS), count))
+
+        single = [reference_fit(profile, row) for row in rows]
+        assert score_fits(FitProfile(*profile), rows) == single
+
+        test_user.target_industries, test_user.location = profile[0], profile[1]
+        test_user.target_roles, test_user.salary_expectation = profile[2], profile[3]
+        db.session.commit()
+        add_recruiters(test_user.id, count)
+
+        assert RecruiterService.rescore_fit(test_user.id) == count
@@ -0,0 +1,181 @@
+"""
+JSON Provider Unit Tests
+
+Tests for the orjson-backed JSON provider, the API envelope added without
+reparsing response bodies, and a large pipeline payload.
+"""
+
+import json
+import os
+import uuid
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from flask import Response, jsonify
+from flask.json.provider import DefaultJSONProvider
+
+from app.json_provider import FastJSONProvider
+
+SAMPLE = {
+    "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "created_at": datetime(2026, 10, 18, 9, 30, 15, 123456),
+    "due": date(2026, 11, 1),
+    "amount": Decimal("12.50"),
+    "nested": {"z": [1, 2.5, None, True], "a": "text", "empty": []},
+}
+
+
+@dataclass
+class Point:
+    x: int
+    y: int
+
+
+def add_route(app, path, view):
+    app.add_url_rule(path, path, view)
+
+
+class TestEncoding:
+    """Tests that encoding matches Flask's default provider."""
+
+    def test_matches_default_provider(self, app):
+        """Test output is byte-identical for ASCII content, compact or indented."""
+        fast, default = FastJSONProvider(app), DefaultJSONProvider(app)
+
+        for value in (SAMPLE, [Point(1, 2)], {1: "int key"}, "plain", None):
+            assert fast.dumps(value) == default.dumps(value, separators=(",", ":"))
+            for compact in (True, False):
+                fast.compact = default.compact = compact
+                assert fast.response(value).get_data() == default.response(value).get_data()
+
+    def test_non_ascii_written_as_utf8(self, app):
+        """Test non-ASCII text is UTF-8 rather than escaped, and reads back the same."""
+        provider = FastJSONProvider(app)
+        provider.compact = True
+
+        body = provider.response({"name": "Zoë"}).get_data()
+
+        assert body == '{"name":"Zoë"}\n'.encode()
+        assert json.loads(body) == {"name": "Zoë"}
+
+    def test_stdlib_fallbacks(self, app):
+        """Test values and input orjson rejects go through the standard library."""
+        provider = FastJSONProvider(app)
+
+        assert provider.dumps({"big": 2**70}) == '{"big":1180591620717411303424}'
+        assert provider.dumps({"b": 1, "a": 2}, indent=None) == '{"a": 2, "b": 1}'
+        assert provider.loads('{"big": 1180591620717411303424}') == {"big": 2**70}
+        with pytest.raises(ValueError):
+            provider.loads("{not json")
+        with pytest.raises(TypeError):
+            provider.dumps({"when": timedelta(days=1)})
+
+    def test_request_json_parsed(self, client, auth_headers):
+        """Test request bodies are decoded by the provider."""
+        response = client.post(
+            "/api/activities",
+            data='{"activity_type": "note_added", "description": "Zoë"}'.encode(),
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 201
+        assert response.get_json()["data"]["activity"]["description"] == "Zoë"
+
+
+class TestEnvelope:
+    """Tests for wrapping API responses without parsing them."""
+
+    def test_wrapped_response_untouched(self, app, client, monkeypatch):
+        """Test an already wrapped body is neither parsed nor rewritten."""
+        add_route(app, "/api/_test/wrapped", lambda: jsonify({"success": True, "data": SAMPLE}))
+        parsed = []
+        monkeypatch.setattr(Response, "get_json", lambda self, **kw: parsed.append(kw))
+
+        body = client.get("/api/_test/wrapped").get_data()
+
+        assert parsed == []
+        assert body == app.json.response({"success": True, "data": SAMPLE}).get_data()
+
+    def test_unwrapped_success_spliced(self, app, client):
+        """Test a bare success payload is wrapped around its serialized body."""
+        app.json.compact = True
+        add_route(app, "/api/_test/bare", lambda: jsonify([1, {"b": "é"}]))
+
+        response = client.get("/api/_test/bare")
+
+        assert response.get_data() == '{"success":true,"data":[1,{"b":"é"}]}\n'.encode()
+        assert response.content_length == len(response.get_data())
+
+    def test_unwrapped_error_wrapped(self, app, client):
+        """Test a bare error payload becomes the error envelope."""
+        add_route(app, "/api/_test/error", lambda: (jsonify({"error": "nope"}), 404))
+
+        response = client.get("/api/_test/error")
+
+        assert response.status_code == 404
+        assert response.get_json() == {"success": False, "error": "nope", "message": "nope"}
+
+    def test_other_json_responses_still_parsed(self, app, client):
+        """Test JSON bodies not built by jsonify are wrapped as before."""
+        add_route(
+            app,
+            "/api/_test/raw",
+            lambda: Response('{"count": 2}', mimetype="application/json"),
+        )
+
+        assert client.get("/api/_test/raw").get_json() == {"success": True, "data": {"count": 2}}
+
+
+def pipeline_payload(target_bytes):
+    """A Kanban pipeline response body of roughly target_bytes."""
+    now = datetime(2026, 10, 18)
+    item = {
+        "recruiter_name": "Jane Doe",
+        "company": "Acme Corporation",
+        "rank": "0|hzzzzz:",
+        "priority_score": 73.5,
+        "days_in_stage": 12,
+        "last_activity_date": now.isoformat(),
+        "next_action": "Follow up on the platform engineer role",
+        "next_action_date": (now + timedelta(days=3)).isoformat(),
+        "engagement_score": 64,
+        "fit_score": 81,
+    }
+    per_item = len(json.dumps(item)) + 120
+    stages = ["new", "researching", "contacted", "responded", "interviewing"]
+    pipeline = {stage: [] for stage in stages}
+    for i in range(target_bytes // per_item):
+        pipeline[stages[i % len(stages)]].append(
+            dict(item, id=str(uuid.uuid4()), recruiter_id=str(uuid.uuid4()), position=i)
+        )
+    return pipeline
+
+
+@pytest.mark.slow
+class TestLargePayload:
+    """Serialization and envelope of a large response. Set BENCH_JSON_BYTES to scale."""
+
+    def test_large_pipeline_response(self, app, client):
+        """Test the fast provider serves a 1MB pipeline as the same JSON as the default one."""
+        payload = pipeline_payload(int(os.environ.get("BENCH_JSON_BYTES", 1_000_000)))
+        add_route(app, "/api/_bench/wrapped", lambda: jsonify({"success": True, "data": payload}))
+        add_route(app, "/api/_bench/bare", lambda: jsonify(payload))
+
+        results = {}
+        for name, provider in (
+            ("default", DefaultJSONProvider(app)),
+            ("fast", FastJSONProvider(app)),
+        ):
+            provider.compact = True  # as in production
+            app.json = provider
+            for path in ("wrapped", "bare"):
+                response = client.get(f"/api/_bench/{path}")
+                assert response.get_json()["data"]["new"][0] == payload["new"][0]
+                results[(name, path)] = response.get_data()
+
+        for path in ("wrapped", "bare"):
+            fast, default = results[("fast", path)], results[("default", path)]
+            assert json.loads(fast) == json.loads(default)
+            assert len(fast) <= len(default)
@@ -0,0 +1,233 @@
+"""
+LinkedIn Analysis Unit Tests
+
+Tests for the precomputed keyword matcher, the analysis pass shared by
+profile analysis and visibility scoring, its per-content memo, and the
+combined /api/linkedin/report endpoint, including many requests.
+"""
+
+import os
+
+import pytest
+
+from app.extensions import db, limiter
+from app.services import linkedin_service
+from app.services.linkedin_service import LinkedInService
+
+PROFILE = {
+    "headline": "Senior Software Engineer | Cloud Architecture & Data Platforms | Helping teams",
+    "summary": (
+        "I led engineering teams building cloud data systems and grew revenue 40% while "
+        "improving reliability. Let's connect. "
+    )
+    * 15,
+    "experience": [
+        {
+            "title": "Staff Engineer",
+            "company": "Acme",
+            "description": "• Built a data platform for 5M users\n• Reduced costs 30%",
+        }
+    ]
+    * 3,
+    "skills": ["Python", "AWS", "Kubernetes", "SQL", "Terraform", "Go"],
+    "education": [{"school": "State University"}],
+    "photo": True,
+    "location": "Austin, TX",
+    "industry": "technology",
+}
+
+
+@pytest.fixture(autouse=True)
+def empty_analysis_cache():
+    LinkedInService._analysis_cache.clear()
+    yield
+    LinkedInService._analysis_cache.clear()
+
+
+def count_passes(monkeypatch):
+    """Count analysis passes by counting headline keyword scans."""
+    calls = []
+    original = LinkedInService._count_keywords
+    monkeypatch.setattr(
+        LinkedInService,
+        "_count_keywords",
+        staticmethod(lambda text: calls.append(text) or original(text)),
+    )
+    return calls
+
+
+class TestKeywordMatcher:
+    """Tests for counting industry keywords."""
+
+    def test_distinct_keywords_counted_once(self):
+        """Test each keyword counts once, case-insensitively, including nested ones."""
+        assert LinkedInService._count_keywords("Healthcare") == 3  # healthcare, health, care
+        assert LinkedInService._count_keywords("Data data DATA") == 1
+        assert LinkedInService._count_keywords("Growth via business development") == 2
+        assert LinkedInService._count_keywords("") == 0
+
+    def test_keyword_universe_deduplicated(self):
+        """Test keywords shared by industries appear once in the precomputed tuple."""
+        assert LinkedInService.ALL_KEYWORDS.count("growth") == 1
+        assert set(LinkedInService.ALL_KEYWORDS) == {
+            keyword
+            for keywords in LinkedInService.INDUSTRY_KEYWORDS.values()
+            for keyword in keywords
+        }
+
+
+class TestSharedAnalysis:
+    """Tests for the single memoized pass behind analysis and visibility."""
+
+    def test_analysis_and_visibility_share_one_pass(self, monkeypatch):
+        """Test scoring a profile for both endpoints analyzes it once."""
+        passes = count_passes(monkeypatch)
+
+        analysis = LinkedInService.analyze_profile(PROFILE)
+        visibility = LinkedInService.calculate_visibility_score(dict(reversed(PROFILE.items())))
+
+        assert len(passes) == 1
+        assert analysis["section_scores"]["headline"] == 90
+        assert visibility["factors"]["headline_keywords"] == 20
+        assert visibility["factors"]["completeness"] == 15
+
+    def test_changed_content_reanalyzed(self, monkeypatch):
+        """Test an edit to any field produces a fresh analysis."""
+        passes = count_passes(monkeypatch)
+        edited = {**PROFILE, "skills": PROFILE["skills"] + ["Rust"]}
+
+        before = LinkedInService.calculate_visibility_score(PROFILE)
+        after = LinkedInService.calculate_visibility_score(edited)
+
+        assert len(passes) == 2
+        assert after["factors"]["skills"] == before["factors"]["skills"] + 2
+
+    def test_memo_bounded(self, monkeypatch):
+        """Test the least recently used profile is evicted past the limit."""
+        monkeypatch.setattr(linkedin_service, "ANALYSIS_CACHE_SIZE", 2)
+        passes = count_passes(monkeypatch)
+        profiles = [{"headline": f"Engineer {i}"} for i in range(3)]
+
+        for profile in profiles + profiles[2:] + profiles[:1]:
+            LinkedInService.analyze_profile(profile)
+
+        assert len(LinkedInService._analysis_cache) == 2
+        assert [text for text in passes] == ["engineer 0", "engineer 1", "engineer 2", "engineer 0"]
+
+    def test_empty_profile(self, client, auth_headers):
+        """Test the endpoint scores an empty profile."""
+        response = client.post("/api/linkedin/analyze", json={}, headers=auth_headers)
+
+        data = response.get_json()["data"]
+        assert data["total_score"] == 0
+        assert data["section_scores"] == {"headline": 0, "summary": 0, "experience": 0, "skills": 0}
+
+
+class TestReport:
+    """Tests for the combined profile report."""
+
+    def test_report_matches_separate_endpoints(self, client, auth_headers, monkeypatch):
+        """Test the report reads the profile once and agrees with each endpoint."""
+        passes = count_passes(monkeypatch)
+        body = {**PROFILE, "current_role": "Software Engineer", "key_skills": ["Python", "AWS"]}
+
+        report = client.post("/api/linkedin/report", json=body, headers=auth_headers)
+        report = report.get_json()["data"]
+
+        assert len(passes) == 1
+        separate = {
+            "analysis": client.post("/api/linkedin/analyze", json=PROFILE, headers=auth_headers),
+            "visibility": client.post(
+                "/api/linkedin/visibility", json=PROFILE, headers=auth_headers
+            ),
+            "headlines": client.post(
+                "/api/linkedin/headline/generate", json=body, headers=auth_headers
+            ),
+        }
+        for name, response in separate.items():
+            assert report[name] == response.get_json()["data"]
+        assert len(passes) == 1
+
+    def test_keyword_coverage(self, client, auth_headers):
+        """Test industry keywords are reported as found, by section, or missing."""
+        response = client.post("/api/linkedin/report", json=PROFILE, headers=auth_headers)
+
+        keywords = response.get_json()["data"]["keywords"]
+        assert keywords["industry"] == "technology"
+        assert keywords["keywords"] == LinkedInService.INDUSTRY_KEYWORDS["technology"]
+        assert keywords["found"] == [
+            "software",
+            "engineering",
+            "cloud",
+            "data",
+            "systems",
+            "architecture",
+        ]
+        assert keywords["by_section"]["headline"] == ["software", "cloud", "data", "architecture"]
+        assert keywords["by_section"]["experience"] == ["data"]
+        assert keywords["by_section"]["skills"] == []
+        assert keywords["coverage_percent"] == 60
+        assert keywords["missing"] == ["developer", "agile", "product", "technical"]
+
+    def test_falls_back_to_user_profile(self, client, auth_headers, test_user):
+        """Test headline options and industry come from the user when not sent."""
+        test_user.current_role = "Data Analyst"
+        test_user.target_industries = ["finance"]
+        db.session.commit()
+
+        response = client.post(
+            "/api/linkedin/report", json={"headline": "Risk Analyst"}, headers=auth_headers
+        )
+
+        data = response.get_json()["data"]
+        assert data["keywords"]["industry"] == "finance"
+        assert data["keywords"]["found"] == ["risk"]
+        assert data["headlines"]["best_option"]["text"].startswith("Data Analyst | ")
+        assert data["analysis"]["section_scores"]["headline"] == 50
+
+    def test_no_role_no_headlines(self, client, auth_headers):
+        """Test the report omits headline options without a role, using generic keywords."""
+        response = client.post("/api/linkedin/report", json={}, headers=auth_headers)
+
+        data = response.get_json()["data"]
+        assert data["headlines"] is None
+        assert data["keywords"]["keywords"] == LinkedInService.GENERIC_KEYWORDS
+        assert data["visibility"]["visibility_score"] == 0
+
+
+@pytest.mark.slow
+class TestManyRequests:
+    """Analysis passes over many requests. Set BENCH_LINKEDIN_REQUESTS to scale."""
+
+    def test_each_content_analyzed_once(self, client, auth_headers, monkeypatch):
+        """Test a repeated profile is analyzed once and each new one once."""
+        count = int(os.environ.get("BENCH_LINKEDIN_REQUESTS", 500))
+        monkeypatch.setattr(limiter, "enabled", False)
+        LinkedInService._analysis_cache.clear()
+        passes = count_passes(monkeypatch)
+
+        for profile in [{**PROFILE, "n": i} for i in range(count)]:
+            LinkedInService.analyze_profile(profile)
+            LinkedInService.calculate_visibility_score(profile)
+        new_content_passes = len(passes)
+        passes.clear()
+        for _ in range(count):
+            response = client.post("/api/linkedin/analyze", json=PROFILE, headers=auth_headers)
+        assert response.status_code == 200
+
+        assert (new_content_passes, len(passes)) == (count, 1)
+
+    def test_report_per_edit(self, client, auth_headers, monkeypatch):
+        """Test one report request per edit analyzes each distinct profile once."""
+        count = int(os.environ.get("BENCH_LINKEDIN_REQUESTS", 500))
+        monkeypatch.setattr(limiter, "enabled", False)
+        # Every keystroke changes the headline; the rest of the profile is unchanged
+        edits = [{**PROFILE, "headline": PROFILE["headline"][: 20 + i % 60]} for i in range(count)]
+        LinkedInService._analysis_cache.clear()
+        passes = count_passes(monkeypatch)
+
+        for profile in edits:
+            response = client.post("/api/linkedin/report", json=profile, headers=auth_headers)
+        assert response.status_code == 200
+
+        assert len(passes) == len({profile["headline"] for profile in edits})
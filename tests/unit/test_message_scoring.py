@@ -0,0 +1,127 @@
+"""
+Message Scoring Unit Tests
+
+Tests for the precompiled message quality checks and the batch scoring
+endpoint.
+"""
+
+import pytest
+
+from app.extensions import db
+from app.models.recruiter import Recruiter
+from app.models.user import User
+from app.services.message_service import MAX_SCORE_BATCH
+from app.services.scoring.message import (
+    _score_cta,
+    _score_metrics,
+    _score_tone,
+    calculate_message_quality,
+)
+
+DRAFT = (
+    "Hi Sarah, I hope this message finds you well. I noticed your recent article on "
+    "platform teams at Acme. Over 5 years I grew revenue 25% and cut costs by $1.2M "
+    "across 12 clients. Would you be open to a brief call next week? Thank you for "
+    "your time. Best regards"
+)
+
+
+def add_recruiter(user_id, first_name, company):
+    recruiter = Recruiter(user_id=user_id, first_name=first_name, last_name="Doe", company=company)
+    db.session.add(recruiter)
+    db.session.commit()
+    return str(recruiter.id)
+
+
+class TestCompiledChecks:
+    """Tests that the combined patterns score like the individual ones."""
+
+    def test_cta_counts_each_pattern(self):
+        """Test one CTA scores full marks and several are counted separately."""
+        assert _score_cta("would you be open to a call?")[:2] == (100, True)
+        assert _score_cta("would you be open to a call? let me know if so")[:2] == (60, True)
+        assert _score_cta("thanks for reading")[:2] == (20, False)
+
+    def test_metrics_counted_per_pattern(self):
+        """Test overlapping metric patterns each count, starting at the first digit or $."""
+        # $1,200 is both a dollar amount and a large number
+        assert _score_metrics("I saved $1,200 in fees")[0] == 80
+        assert _score_metrics("Raised $,")[0] == 50
+        assert _score_metrics("a5 years, 3X faster, 40% up")[0] == 80
+        assert _score_metrics("No numbers here")[0] == 20
+
+    def test_tone_phrases(self):
+        """Test tone phrase lists still match as substrings."""
+        assert _score_tone("best regards and sincerely", "follow_up")[0] == 85
+        assert _score_tone("please help, gonna need any job", "follow_up")[0] == 20
+
+    def test_personalization_case_rules(self):
+        """Test greetings need a capitalized name while company mentions ignore case."""
+        result = calculate_message_quality("Hi Sarah, I love the work AT acme")
+        assert result["personalization_elements"] == ["greeting_with_name", "company_mention"]
+
+        result = calculate_message_quality("hi sarah")
+        assert "greeting_with_name" not in result["personalization_elements"]
+
+
+class TestScoreBatch:
+    """Tests for POST /api/messages/score-batch."""
+
+    def test_scores_in_request_order(self, client, auth_headers, test_user):
+        """Test each draft is scored like a single call and echoed with its id."""
+        recruiter_id = add_recruiter(test_user.id, "Sarah", "Acme")
+        drafts = [
+            {"id": "a", "body": DRAFT, "recruiter_id": recruiter_id},
+            {"id": "b", "body": "", "message_type": "follow_up"},
+            {"body": "Hey! lol, let me know if you have openings"},
+        ]
+
+        response = client.post(
+            "/api/messages/score-batch", json={"messages": drafts}, headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        results = response.get_json()["data"]["results"]
+        assert [r["id"] for r in results] == ["a", "b", None]
+        expected = calculate_message_quality(DRAFT, "initial_outreach", "Sarah", "Acme")
+        assert results[0]["score"] == expected["total_score"]
+        assert results[0]["components"] == expected["components"]
+        assert results[1]["score"] == 0
+        assert results[2]["has_cta"] is True
+
+    def test_other_users_recruiters_ignored(self, client, auth_headers, app):
+        """Test another user's recruiter adds no personalization."""
+        other = User(email="other@example.com", first_name="Other", last_name="User")
+        other.set_password("TestPassword123")
+        db.session.add(other)
+        db.session.commit()
+        recruiter_id = add_recruiter(other.id, "Sarah", "Acme")
+
+        response = client.post(
+            "/api/messages/score-batch",
+            json={"messages": [{"body": DRAFT, "recruiter_id": recruiter_id}]},
+            headers=auth_headers,
+        )
+
+        result = response.get_json()["data"]["results"][0]
+        assert result["score"] == calculate_message_quality(DRAFT)["total_score"]
+
+    @pytest.mark.parametrize(
+        "messages",
+        [
+            None,
+            [],
+            [{"body": "x"}] * (MAX_SCORE_BATCH + 1),
+            [{"message_type": "follow_up"}],
+            [{"body": "x" * 10001}],
+            [{"body": "x", "recruiter_id": "not-a-uuid"}],
+        ],
+    )
+    def test_rejects_invalid_batches(self, client, auth_headers, messages):
+        """Test missing, empty, oversized, bodiless or malformed batches are rejected."""
+        response = client.post(
+            "/api/messages/score-batch", json={"messages": messages}, headers=auth_headers
+        )
+
+        assert response.status_code == 400
+        assert response.get_json()["success"] is False
@@ -0,0 +1,215 @@
+"""
+Notification Generation Unit Tests
+
+Tests for set-based follow-up reminders and usage warnings: deduplication
+against existing notifications and the all-users sweep with a single
+INSERT, including statements per run across many users.
+"""
+
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models.notification import Notification, NotificationType
+from app.models.recruiter import Recruiter
+from app.models.user import User
+from app.services.notification_service import NotificationService
+
+
+def make_user(email, tier="basic", messages=0):
+    user = User(email=email, first_name="Test", last_name="User")
+    user.set_password("TestPassword123")
+    user.subscription_tier = tier
+    user.monthly_message_count = messages
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def add_recruiters(user_id, days_ago, count=1, status="contacted"):
+    recruiters = [
+        Recruiter(
+            user_id=user_id,
+            first_name="Jane",
+            last_name=f"Doe {i}",
+            company="Acme",
+            status=status,
+            last_contact_date=datetime.utcnow() - timedelta(days=days_ago + i),
+        )
+        for i in range(count)
+    ]
+    db.session.add_all(recruiters)
+    db.session.commit()
+    return recruiters
+
+
+def notifications(notification_type):
+    return Notification.query.filter_by(notification_type=notification_type.value).all()
+
+
+def count_statements(fn):
+    """Run fn and return its result and the SQL statements it executed."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.lstrip().split()[0].upper())
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        result = fn()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+    return result, statements
+
+
+class TestFollowUpReminders:
+    """Tests for follow-up reminder generation."""
+
+    def test_overdue_recruiters_reminded_once(self, app, test_user):
+        """Test overdue recruiters get one reminder, others none, and reruns add nothing."""
+        overdue = add_recruiters(test_user.id, days_ago=10)[0]
+        add_recruiters(test_user.id, days_ago=2)
+        add_recruiters(test_user.id, days_ago=30, status="declined")
+
+        assert NotificationService.generate_follow_up_reminders(test_user.id) == 1
+        assert NotificationService.generate_follow_up_reminders(test_user.id) == 0
+
+        (reminder,) = notifications(NotificationType.FOLLOW_UP_REMINDER)
+        assert reminder.title == "Follow up with Jane Doe 0"
+        assert reminder.body.startswith("It's been 10 days since you last contacted")
+        assert reminder.dedup_key == str(overdue.id)
+        assert reminder.extra_data["recruiter_id"] == str(overdue.id)
+        assert reminder.action_url == f"/messages?recruiterId={overdue.id}"
+
+    def test_capped_to_most_overdue(self, app, test_user):
+        """Test each user is reminded about at most their 10 most overdue recruiters."""
+        add_recruiters(test_user.id, days_ago=8, count=12)
+
+        assert NotificationService.generate_follow_up_reminders(test_user.id) == 10
+        titles = {n.title for n in notifications(NotificationType.FOLLOW_UP_REMINDER)}
+        assert "Follow up with Jane Doe 11" in titles
+        assert "Follow up with Jane Doe 0" not in titles
+
+    def test_read_reminder_repeated_after_window(self, app, test_user):
+        """Test a read reminder suppresses a new one for the dedup window only."""
+        add_recruiters(test_user.id, days_ago=10)
+        NotificationService.generate_follow_up_reminders(test_user.id)
+        (reminder,) = notifications(NotificationType.FOLLOW_UP_REMINDER)
+        reminder.is_read = True
+        db.session.commit()
+
+        assert NotificationService.generate_follow_up_reminders(test_user.id) == 0
+
+        reminder.created_at = datetime.utcnow() - timedelta(days=8)
+        db.session.commit()
+
+        assert NotificationService.generate_follow_up_reminders(test_user.id) == 1
+
+
+class TestUsageWarnings:
+    """Tests for usage warning generation."""
+
+    def test_warned_at_80_percent(self, app):
+        """Test users at 80%+ of a limited tier are warned once."""
+        near = make_user("near@example.com", messages=8)
+        make_user("under@example.com", messages=7)
+        make_user("unlimited@example.com", tier="expert", messages=500)
+        make_user("unknown@example.com", tier="legacy", messages=9)
+
+        assert NotificationService.generate_usage_warnings() == 2
+        assert NotificationService.generate_usage_warnings() == 0
+
+        warning = Notification.query.filter_by(user_id=near.id).one()
+        assert warning.title == "Messages limit almost reached"
+        assert warning.body == "You've used 8 of 10 messages this month. 2 remaining."
+        assert warning.extra_data == {
+            "usage_type": "messages",
+            "used": 8,
+            "limit": 10,
+            "percentage": 80,
+        }
+        assert warning.dedup_key == "messages"
+
+    def test_inactive_users_skipped(self, app):
+        """Test deactivated accounts are not warned."""
+        user = make_user("inactive@example.com", messages=10)
+        user.is_active = False
+        db.session.commit()
+
+        assert NotificationService.generate_usage_warnings() == 0
+
+
+class TestSweep:
+    """Tests for generating notifications for every user at once."""
+
+    def test_sweep_queries_independent_of_user_count(self, app):
+        """Test a sweep runs the same statements for 2 or 20 users, with one INSERT."""
+        for run, user_count in enumerate((2, 20)):
+            users = [make_user(f"u{run}-{i}@example.com", messages=9) for i in range(user_count)]
+            for user in users:
+                add_recruiters(user.id, days_ago=10, count=2)
+
+            result, statements = count_statements(NotificationService.generate_notifications)
+
+            assert result["follow_up_reminders"] == 2 * user_count
+            assert result["usage_warnings"] == user_count
+            assert result["total_generated"] == 3 * user_count
+            assert result["per_second"] > 0
+            assert statements.count("INSERT") == 1
+            assert len(statements) <= 4
+
+    def test_generate_endpoint(self, client, auth_headers, test_user):
+        """Test the endpoint generates for the current user only."""
+        add_recruiters(test_user.id, days_ago=10)
+        other = make_user("other@example.com")
+        add_recruiters(other.id, days_ago=10)
+
+        response = client.post("/api/notifications/generate", headers=auth_headers)
+
+        assert response.get_json()["data"] == {
+            "follow_up_reminders": 1,
+            "usage_warnings": 0,
+            "total_generated": 1,
+        }
+        assert Notification.query.filter_by(user_id=other.id).count() == 0
+
+
+@pytest.mark.slow
+class TestManyUsers:
+    """Generation across many users. Set BENCH_NOTIFICATION_USERS to scale."""
+
+    def test_sweep_vs_per_user(self, app):
+        """Test one sweep runs a fixed number of statements, however many users it covers."""
+        user_count = int(os.environ.get("BENCH_NOTIFICATION_USERS", 300))
+        users = []
+        for i in range(user_count):
+            user = User(email=f"bench{i}@example.com", first_name="Bench", last_name="User")
+            user.password_hash = "x"
+            user.monthly_message_count = 9
+            users.append(user)
+        db.session.add_all(users)
+        db.session.commit()
+        for user in users:
+            add_recruiters(user.id, days_ago=10, count=5)
+
+        def per_user():
+            return sum(
+                NotificationService.generate_notifications(user.id)["total_generated"]
+                for user in users
+            )
+
+        def sweep():
+            return NotificationService.generate_notifications()["total_generated"]
+
+        statements = {}
+        for name, fn in (("per_user", per_user), ("sweep", sweep)):
+            Notification.query.delete()
+            db.session.commit()
+            generated, statements[name] = count_statements(fn)
+            assert generated == 6 * user_count
+
+        assert len(statements["per_user"]) >= user_count
+        assert len(statements["sweep"]) <= 10
@@ -0,0 +1,229 @@
+"""
+Keyset Pagination Unit Tests
+
+Tests for cursor encoding, NULL-safe keyset ordering, the cursor-mode list
+endpoints, and reaching a deep page of a large table without an OFFSET.
+"""
+
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, text
+
+from app.extensions import db
+from app.models.activity import Activity
+from app.models.notification import Notification
+from app.models.recruiter import Recruiter
+from app.services.activity_service import ActivityService
+from app.services.recruiter_service import RecruiterService
+from app.utils.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+
+def walk_pages(fetch, limit):
+    """Follow next_cursor until exhausted; return all items in order."""
+    items, cursor = [], None
+    while True:
+        page = fetch(cursor=cursor, limit=limit)
+        items.extend(page.items)
+        if not page.has_more:
+            return items
+        cursor = page.next_cursor
+
+
+class TestCursorEncoding:
+    """Tests for opaque cursor strings."""
+
+    def test_round_trip(self):
+        """Test datetimes, ints, strings and NULLs survive encoding."""
+        values = [datetime(2026, 3, 1, 12, 30, 5, 123), 42, "abc", None]
+
+        assert decode_cursor(encode_cursor("created", values), "created") == values
+
+    def test_rejects_garbage(self):
+        """Test malformed cursors raise InvalidCursorError."""
+        with pytest.raises(InvalidCursorError):
+            decode_cursor("not-a-cursor!!", "created")
+
+    def test_rejects_cursor_from_other_sort(self):
+        """Test a cursor cannot be replayed against a different sort order."""
+        cursor = encode_cursor("priority", [50, "id"])
+
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor, "name")
+
+
+class TestKeysetOrdering:
+    """Tests that walking cursors visits every row exactly once, in order."""
+
+    def test_nullable_sort_with_ties(self, app, test_user):
+        """Test last_contact sort handles NULLs and duplicate values."""
+        base = datetime(2026, 1, 1)
+        for i in range(23):
+            # Three rows share each date; every fourth has never been contacted
+            contact = None if i % 4 == 0 else base + timedelta(days=i // 3)
+            db.session.add(
+                Recruiter(
+                    user_id=test_user.id,
+                    first_name=f"R{i}",
+                    last_name="Recruiter",
+                    last_contact_date=contact,
+                )
+            )
+        db.session.commit()
+
+        walked = walk_pages(
+            lambda cursor, limit: RecruiterService.get_user_recruiters_page(
+                test_user.id, sort_by="last_contact", cursor=cursor, limit=limit
+            ),
+            limit=4,
+        )
+        offset_order, total = RecruiterService.get_user_recruiters(
+            test_user.id, sort_by="last_contact", limit=100
+        )
+
+        assert total == 23
+        assert [r.id for r in walked] == [r.id for r in offset_order]
+        dates = [r.last_contact_date for r in walked]
+        assert dates[-6:] == [None] * 6
+        assert dates[:-6] == sorted(dates[:-6], reverse=True)
+
+    def test_multi_column_ascending_sort(self, app, test_user):
+        """Test the name sort (last_name, first_name) pages in ascending order."""
+        for last, first in [("B", "x"), ("A", "z"), ("B", "a"), ("A", "a"), ("C", "m")] * 2:
+            db.session.add(Recruiter(user_id=test_user.id, first_name=first, last_name=last))
+        db.session.commit()
+
+        walked = walk_pages(
+            lambda cursor, limit: RecruiterService.get_user_recruiters_page(
+                test_user.id, sort_by="name", cursor=cursor, limit=limit
+            ),
+            limit=3,
+        )
+
+        names = [(r.last_name, r.first_name) for r in walked]
+        assert len({r.id for r in walked}) == 10
+        assert names == sorted(names)
+
+
+class TestCursorEndpoints:
+    """Tests for cursor mode on the list endpoints."""
+
+    def test_notifications_cursor_mode(self, client, auth_headers, test_user):
+        """Test ?cursor= pages through notifications with next_cursor."""
+        for i in range(5):
+            db.session.add(
+                Notification(
+                    user_id=test_user.id,
+                    notification_type="system",
+                    title=f"Notice {i}",
+                    body="Body",
+                )
+            )
+        db.session.commit()
+
+        first = client.get("/api/notifications?cursor=&limit=3", headers=auth_headers)
+        data = first.get_json()["data"]
+
+        assert first.status_code == 200
+        assert len(data["notifications"]) == 3
+        assert data["has_more"] is True
+        assert "total" not in data
+
+        second = client.get(
+            f"/api/notifications?cursor={data['next_cursor']}&limit=3", headers=auth_headers
+        )
+        data2 = second.get_json()["data"]
+
+        assert len(data2["notifications"]) == 2
+        assert data2["has_more"] is False
+        assert data2["next_cursor"] is None
+
+    def test_approximate_total(self, client, auth_headers, test_user):
+        """Test total=approximate returns a count with an estimate flag."""
+        for i in range(3):
+            db.session.add(Recruiter(user_id=test_user.id, first_name=f"R{i}", last_name="X"))
+        db.session.commit()
+
+        response = client.get("/api/recruiters?cursor=&total=approximate", headers=auth_headers)
+        data = response.get_json()["data"]
+
+        assert data["total"] == 3
+        assert data["total_is_estimate"] is False
+
+    def test_invalid_cursor_is_bad_request(self, client, auth_headers):
+        """Test a tampered cursor returns 400."""
+        response = client.get("/api/messages?cursor=garbage", headers=auth_headers)
+
+        assert response.status_code == 400
+        assert response.get_json()["success"] is False
+
+    def test_offset_mode_unchanged(self, client, auth_headers):
+        """Test requests without cursor keep the offset response shape."""
+        response = client.get("/api/activities?offset=0", headers=auth_headers)
+        data = response.get_json()["data"]
+
+        assert response.status_code == 200
+        assert {"activities", "total", "offset", "has_more"} <= set(data)
+
+
+@pytest.mark.slow
+class TestDeepPage:
+    """Last page of a large table, OFFSET vs keyset. Set BENCH_ROWS to scale up."""
+
+    def test_deep_page_without_offset(self, app, test_user):
+        """Test keyset reaches the last page by seeking, without an OFFSET to skip."""
+        rows = int(os.environ.get("BENCH_ROWS", 5000))
+        limit = 50
+        start = datetime(2025, 1, 1)
+
+        db.session.execute(
+            Activity.__table__.insert(),
+            [
+                {
+                    "id": f"{i:08d}-0000-4000-8000-000000000000",
+                    "user_id": str(test_user.id),
+                    "activity_type": "message_sent",
+                    "created_at": start + timedelta(minutes=i),
+                }
+                for i in range(rows)
+            ],
+        )
+        # SQLite sorts NULLs first ascending, so a plain index scanned
+        # backwards gives the DESC NULLS LAST order migration 008 indexes
+        db.session.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_bench_activities_user_created "
+                "ON activities (user_id, created_at, id)"
+            )
+        )
+        db.session.commit()
+
+        deep_offset = rows - limit
+        offset_page, _ = ActivityService.get_user_activities(
+            test_user.id, limit=limit, offset=deep_offset
+        )
+
+        # Cursor for the row just before the last page
+        anchor = offset_page[0]
+        cursor = encode_cursor(
+            "created",
+            [anchor.created_at + timedelta(microseconds=1), "ffffffff-ffff-4fff-bfff-ffffffffffff"],
+        )
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append((statement.upper(), parameters))
+
+        event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            keyset_page = ActivityService.get_user_activities_page(
+                test_user.id, limit=limit, cursor=cursor
+            )
+        finally:
+            event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+        assert [a.id for a in keyset_page.items] == [a.id for a in offset_page]
+        # SQLite renders LIMIT with an OFFSET; keyset always binds it to 0
+        (statement, parameters), *_ = statements
+        assert "LIMIT" in statement and parameters[-1] == 0
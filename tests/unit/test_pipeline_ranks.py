@@ -0,0 +1,258 @@
+"""
+Pipeline Rank Unit Tests
+
+Tests for lexicographic rank keys, single and batch Kanban moves, stage
+rebalancing, including moves within a 2k-card column.
+"""
+
+import os
+import random
+
+import pytest
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models.activity import Activity, PipelineItem
+from app.models.recruiter import Recruiter
+from app.services.activity_service import ActivityService
+from app.utils.lexorank import between, spread
+
+
+def add_column(user_id, count, stage="new", ranked=True):
+    """Bulk-insert a stage of pipeline items (and their recruiters); return item ids in order."""
+    ranks = spread(None, None, count) if ranked else [None] * count
+    recruiters, items = [], []
+    for i, rank in enumerate(ranks):
+        recruiter_id = f"{i:08d}-0000-4000-8000-{stage[:4].encode().hex():0>12}"
+        recruiters.append(
+            {
+                "id": recruiter_id,
+                "user_id": str(user_id),
+                "first_name": f"R{i}",
+                "last_name": "Card",
+                "status": stage,
+            }
+        )
+        items.append(
+            {
+                "id": f"{i:08d}-0000-4000-9000-{stage[:4].encode().hex():0>12}",
+                "user_id": str(user_id),
+                "recruiter_id": recruiter_id,
+                "stage": stage,
+                "position": i,
+                "rank": rank,
+            }
+        )
+    db.session.execute(Recruiter.__table__.insert(), recruiters)
+    db.session.execute(PipelineItem.__table__.insert(), items)
+    db.session.commit()
+    return [item["id"] for item in items]
+
+
+def column_ids(user_id, stage):
+    """Item ids of a stage in board order."""
+    return [str(item["id"]) for item in ActivityService.get_pipeline(user_id)[stage]]
+
+
+def count_updates(fn):
+    """Run fn and count UPDATE statements against pipeline_items."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("UPDATE PIPELINE_ITEMS"):
+            statements.append(parameters if executemany else [parameters])
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        result = fn()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+    return result, sum(len(params) for params in statements)
+
+
+class TestRankKeys:
+    """Tests for app.utils.lexorank."""
+
+    def test_random_inserts_stay_ordered(self):
+        """Test keys made at random spots always sort between their neighbours."""
+        rng = random.Random(7)
+        keys = []
+        for _ in range(3000):
+            i = rng.randint(0, len(keys))
+            before = keys[i - 1] if i else None
+            after = keys[i] if i < len(keys) else None
+            key = between(before, after)
+            assert (before is None or before < key) and (after is None or key < after)
+            assert not key.endswith("0")
+            keys.insert(i, key)
+
+    def test_spread_is_short_and_ordered(self):
+        """Test spread keys are unique, ascending, bounded and short."""
+        keys = spread("b", "c", 2000)
+
+        assert keys == sorted(set(keys))
+        assert "b" < keys[0] and keys[-1] < "c"
+        assert max(len(key) for key in keys) <= 4
+
+    def test_rejects_unordered_bounds(self):
+        """Test bounds that are not ascending raise ValueError."""
+        with pytest.raises(ValueError):
+            between("m", "m")
+        with pytest.raises(ValueError):
+            between("m", "a")
+
+
+class TestMovePipelineItem:
+    """Tests for single-item moves."""
+
+    def test_move_within_stage_updates_one_row(self, app, test_user):
+        """Test reordering writes only the moved item."""
+        ids = add_column(test_user.id, 50)
+
+        _, updates = count_updates(
+            lambda: ActivityService.move_pipeline_item(
+                test_user.id, ids[40], "new", after_id=ids[2]
+            )
+        )
+
+        assert updates == 1
+        order = column_ids(test_user.id, "new")
+        assert order[:4] == [ids[0], ids[1], ids[2], ids[40]]
+        assert len(order) == 50
+
+    def test_position_and_before(self, app, test_user):
+        """Test numeric positions and before_id place the item correctly."""
+        ids = add_column(test_user.id, 5)
+
+        ActivityService.move_pipeline_item(test_user.id, ids[4], "new", new_position=0)
+        assert column_ids(test_user.id, "new") == [ids[4], ids[0], ids[1], ids[2], ids[3]]
+
+        ActivityService.move_pipeline_item(test_user.id, ids[4], "new", new_position=2)
+        assert column_ids(test_user.id, "new") == [ids[0], ids[1], ids[4], ids[2], ids[3]]
+
+        ActivityService.move_pipeline_item(test_user.id, ids[0], "new", before_id=ids[3])
+        assert column_ids(test_user.id, "new") == [ids[1], ids[4], ids[2], ids[0], ids[3]]
+
+    def test_stage_change_logs_and_updates_recruiter(self, app, test_user):
+        """Test moving across stages updates status and logs the change."""
+        ids = add_column(test_user.id, 3)
+
+        item = ActivityService.move_pipeline_item(test_user.id, ids[1], "contacted")
+
+        assert item.stage == "contacted"
+        assert db.session.get(Recruiter, item.recruiter_id).status == "contacted"
+        activity = Activity.query.filter_by(activity_type="status_change").one()
+        assert activity.previous_stage == "new"
+        assert column_ids(test_user.id, "contacted") == [ids[1]]
+
+    def test_unranked_neighbours_trigger_rebalance(self, app, test_user):
+        """Test moves next to unranked items rank the stage first."""
+        ids = add_column(test_user.id, 4, ranked=False)
+
+        ActivityService.move_pipeline_item(test_user.id, ids[0], "new", after_id=ids[2])
+
+        assert column_ids(test_user.id, "new") == [ids[1], ids[2], ids[0], ids[3]]
+        assert PipelineItem.query.filter(PipelineItem.rank.is_(None)).count() == 0
+
+    def test_other_users_items(self, app, test_user, second_user):
+        """Test another user's item cannot be moved."""
+        ids = add_column(second_user.id, 2)
+
+        with pytest.raises(ValueError):
+            ActivityService.move_pipeline_item(test_user.id, ids[0], "contacted")
+
+
+class TestBatchMove:
+    """Tests for moving several items at once."""
+
+    def test_block_lands_in_given_order(self, app, test_user):
+        """Test selected items move together, one row update each."""
+        ids = add_column(test_user.id, 10)
+
+        _, updates = count_updates(
+            lambda: ActivityService.move_pipeline_items(
+                test_user.id, [ids[9], ids[5], ids[7]], "new", after_id=ids[0]
+            )
+        )
+
+        assert updates == 3
+        assert column_ids(test_user.id, "new")[:5] == [ids[0], ids[9], ids[5], ids[7], ids[1]]
+
+    def test_endpoint(self, client, auth_headers, test_user):
+        """Test POST /api/activities/pipeline/move moves items across stages."""
+        ids = add_column(test_user.id, 4)
+
+        response = client.post(
+            "/api/activities/pipeline/move",
+            json={"item_ids": [ids[3], ids[1]], "stage": "responded"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert [i["id"] for i in response.get_json()["data"]["items"]] == [ids[3], ids[1]]
+        assert column_ids(test_user.id, "responded") == [ids[3], ids[1]]
+
+    def test_endpoint_rejects_missing_ids(self, client, auth_headers):
+        """Test item_ids is required."""
+        response = client.post(
+            "/api/activities/pipeline/move", json={"stage": "new"}, headers=auth_headers
+        )
+
+        assert response.status_code == 400
+
+
+class TestRebalance:
+    """Tests for the rank rebalance job."""
+
+    def test_long_keys_are_renumbered(self, app, test_user):
+        """Test stages with long keys get short keys in the same order."""
+        ids = add_column(test_user.id, 3)
+        # Keep dropping a card between the same two neighbours
+        for i in range(120):
+            ActivityService.move_pipeline_item(
+                test_user.id, ids[2 if i % 2 else 1], "new", after_id=ids[0]
+            )
+        order = column_ids(test_user.id, "new")
+        assert max(len(item.rank) for item in PipelineItem.query) > 16
+
+        assert ActivityService.rebalance_ranks() == 1
+
+        assert column_ids(test_user.id, "new") == order
+        assert max(len(item.rank) for item in PipelineItem.query) <= 2
+        assert ActivityService.rebalance_ranks() == 0
+
+    def test_new_recruiters_append_to_column(self, client, auth_headers, test_user):
+        """Test created recruiters are ranked at the end of the New column."""
+        for name in ("First", "Second"):
+            client.post(
+                "/api/recruiters",
+                json={"first_name": name, "last_name": "Card"},
+                headers=auth_headers,
+            )
+
+        names = [
+            item["recruiter_name"] for item in ActivityService.get_pipeline(test_user.id)["new"]
+        ]
+        assert names == ["First Card", "Second Card"]
+
+
+@pytest.mark.slow
+class TestLargeColumn:
+    """Moves within a large column. Set BENCH_COLUMN_CARDS to scale."""
+
+    def test_moves_in_2k_card_column(self, app, test_user):
+        """Test a move costs one row update regardless of column size."""
+        count = int(os.environ.get("BENCH_COLUMN_CARDS", 2000))
+        moves = 200
+        ids = add_column(test_user.id, count)
+        rng = random.Random(11)
+
+        def run():
+            for _ in range(moves):
+                item_id, anchor = rng.sample(ids, 2)
+                ActivityService.move_pipeline_item(test_user.id, item_id, "new", after_id=anchor)
+
+        _, updates = count_updates(run)
+
+        assert updates == moves
+        assert len(column_ids(test_user.id, "new")) == count
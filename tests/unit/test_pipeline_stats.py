@@ -0,0 +1,144 @@
+"""
+Pipeline Statistics Unit Tests
+
+Tests that the SQL-aggregated pipeline stats match the per-row definitions,
+including at 5k recruiters per user.
+"""
+
+import os
+
+import pytest
+
+from app.extensions import db
+from app.models.activity import PipelineItem, PipelineStage
+from app.models.recruiter import Recruiter
+from app.services.activity_service import ActivityService
+from app.services.recruiter_service import RecruiterService
+
+
+def add_recruiters(user_id, count):
+    """Bulk-insert recruiters with a spread of stages, scores and responses."""
+    stages = [stage.value for stage in PipelineStage]
+    db.session.execute(
+        Recruiter.__table__.insert(),
+        [
+            {
+                "id": f"{i:08d}-0000-4000-8000-000000000000",
+                "user_id": str(user_id),
+                "first_name": f"R{i}",
+                "last_name": "Recruiter",
+                "status": stages[i % len(stages)],
+                "engagement_score": (i * 7) % 101,
+                "fit_score": None if i % 9 == 0 else (i * 13) % 101,
+                "messages_sent": i % 4,
+                "has_responded": i % 5 == 0,
+                "research_data": {"summary": "x" * 500, "posts": ["y" * 200] * 5},
+            }
+            for i in range(count)
+        ],
+    )
+    db.session.commit()
+
+
+def stats_from_rows(recruiters):
+    """Reference implementation: the per-row definitions of each metric."""
+    contacted = sum(1 for r in recruiters if r.messages_sent and r.messages_sent > 0)
+    responded = sum(1 for r in recruiters if r.has_responded)
+    engagement = [r.engagement_score for r in recruiters if r.engagement_score]
+    fit = [r.fit_score for r in recruiters if r.fit_score]
+    return {
+        "total": len(recruiters),
+        "by_stage": {
+            stage.value: sum(1 for r in recruiters if r.status == stage.value)
+            for stage in PipelineStage
+        },
+        "response_rate": round(responded / contacted * 100, 1) if contacted else 0,
+        "avg_engagement": round(sum(engagement) / len(engagement), 1) if engagement else 0,
+        "avg_fit": round(sum(fit) / len(fit), 1) if fit else 0,
+    }
+
+
+class TestRecruiterPipelineStats:
+    """Tests for RecruiterService.get_pipeline_stats."""
+
+    def test_matches_row_by_row_definition(self, app, test_user):
+        """Test aggregates equal the per-row calculation, zero scores excluded."""
+        add_recruiters(test_user.id, 57)
+
+        stats = RecruiterService.get_pipeline_stats(test_user.id)
+
+        assert stats == stats_from_rows(Recruiter.query.filter_by(user_id=test_user.id).all())
+
+    def test_empty_pipeline(self, app, test_user):
+        """Test a user with no recruiters gets the zeroed shape."""
+        stats = RecruiterService.get_pipeline_stats(test_user.id)
+
+        assert stats == {
+            "total": 0,
+            "by_stage": {},
+            "response_rate": 0,
+            "avg_engagement": 0,
+            "avg_fit": 0,
+        }
+
+    def test_scoped_to_user(self, app, test_user, second_user):
+        """Test other users' recruiters are not counted."""
+        add_recruiters(second_user.id, 5)
+
+        assert RecruiterService.get_pipeline_stats(test_user.id)["total"] == 0
+
+
+class TestActivityPipelineStats:
+    """Tests for ActivityService.get_pipeline_stats."""
+
+    def test_stage_counts_and_averages(self, app, test_user):
+        """Test counts, average days, next actions and stale items per stage."""
+        recruiter = Recruiter(user_id=test_user.id, first_name="A", last_name="B")
+        db.session.add(recruiter)
+        db.session.flush()
+        items = [
+            ("new", 2, "Send intro"),
+            ("new", None, None),
+            ("contacted", 20, ""),
+            ("contacted", 15, "Follow up"),
+            ("contacted", 1, None),
+        ]
+        for stage, days, action in items:
+            db.session.add(
+                PipelineItem(
+                    user_id=test_user.id,
+                    recruiter_id=recruiter.id,
+                    stage=stage,
+                    days_in_stage=days,
+                    next_action=action,
+                )
+            )
+        db.session.commit()
+
+        stats = ActivityService.get_pipeline_stats(test_user.id)
+
+        assert stats["total"] == 5
+        assert stats["by_stage"]["new"] == 2
+        assert stats["by_stage"]["contacted"] == 3
+        assert stats["by_stage"]["interviewing"] == 0
+        assert stats["avg_days_in_stage"]["new"] == 1.0
+        assert stats["avg_days_in_stage"]["contacted"] == 12.0
+        assert stats["items_needing_action"] == 2
+        assert stats["stale_items"] == 2
+
+
+@pytest.mark.slow
+class TestPipelineStatsAtScale:
+    """Stats at 5k recruiters. Set BENCH_RECRUITERS to scale."""
+
+    def test_aggregate_matches_row_loading(self, app, test_user):
+        """Test the aggregate matches loading every recruiter, without loading their rows."""
+        user_id = test_user.id
+        add_recruiters(user_id, int(os.environ.get("BENCH_RECRUITERS", 5000)))
+        expected = stats_from_rows(Recruiter.query.filter_by(user_id=user_id).all())
+        db.session.expunge_all()
+
+        stats = RecruiterService.get_pipeline_stats(user_id)
+
+        assert stats == expected
+        assert not any(isinstance(obj, Recruiter) for obj in db.session.identity_map.values())
@@ -0,0 +1,186 @@
+"""
+Priority Scoring Unit Tests
+
+Tests for the batch priority scorer, read-time follow-up ranking and the
+set-based refresh of stored priority scores.
+"""
+
+import itertools
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.extensions import db
+from app.models.activity import PipelineItem
+from app.models.recruiter import Recruiter
+from app.services.activity_service import ActivityService
+from app.services.recruiter_service import RecruiterService
+from app.services.scoring.engagement import calculate_priority_score, score_priorities
+
+NOW = datetime(2026, 6, 1, 12, 0)
+
+
+def reference_score(last_contact, next_action, messages_sent, responded, engagement, fit, status):
+    """Score one recruiter the way RecruiterService._update_priority_score does."""
+    pending = (1 if next_action else 0) + (1 if not responded and messages_sent else 0)
+    return calculate_priority_score(
+        days_since_contact=(NOW - last_contact).days if last_contact else 0,
+        pending_actions=pending,
+        engagement_score=engagement or 50,
+        fit_score=fit or 50,
+        has_responded=responded or False,
+        status=status or "new",
+    )
+
+
+class TestScorePriorities:
+    """Tests for score_priorities."""
+
+    def test_matches_single_scorer(self):
+        """Test every input combination scores the same as calculate_priority_score."""
+        contacts = [None] + [
+            NOW - timedelta(days=d, hours=5) for d in (-2, 0, 4, 5, 7, 8, 14, 15, 33, 34, 90)
+        ]
+        rows = list(
+            itertools.product(
+                contacts,
+                [None, "", "Follow up"],
+                [None, 0, 2],
+                [None, False, True],
+                [None, 0, 40, 100],
+                [None, 0, 75],
+                ["new", "contacted", "responded", "declined", None, "unknown"],
+            )
+        )
+
+        assert score_priorities(rows, NOW) == [reference_score(*row) for row in rows]
+
+
+class TestFollowUpRecommendations:
+    """Tests for read-time ranking in get_follow_up_recommendations."""
+
+    def test_ranks_by_fresh_score_not_stored(self, app, test_user):
+        """Test a stale stored priority does not decide the order."""
+        now = datetime.utcnow()
+        in_window = Recruiter(
+            user_id=test_user.id,
+            first_name="Due",
+            last_name="Now",
+            status="contacted",
+            messages_sent=1,
+            last_contact_date=now - timedelta(days=6),
+            priority_score=0,
+        )
+        gone_cold = Recruiter(
+            user_id=test_user.id,
+            first_name="Gone",
+            last_name="Cold",
+            status="contacted",
+            messages_sent=1,
+            last_contact_date=now - timedelta(days=60),
+            priority_score=100,
+        )
+        db.session.add_all([in_window, gone_cold])
+        db.session.commit()
+
+        recommendations = RecruiterService.get_follow_up_recommendations(test_user.id)
+
+        assert [r["recruiter_name"] for r in recommendations] == ["Due Now", "Gone Cold"]
+        assert recommendations[0]["priority_score"] > recommendations[1]["priority_score"]
+        assert recommendations[0]["days_since_contact"] == 6
+
+    def test_only_active_stages(self, app, test_user):
+        """Test new and closed recruiters are not recommended."""
+        db.session.add_all(
+            [
+                Recruiter(user_id=test_user.id, first_name="A", last_name="New", status="new"),
+                Recruiter(
+                    user_id=test_user.id, first_name="B", last_name="Done", status="declined"
+                ),
+            ]
+        )
+        db.session.commit()
+
+        assert RecruiterService.get_follow_up_recommendations(test_user.id) == []
+
+
+class TestStoredScoreRefresh:
+    """Tests for the set-based recompute of stored scores."""
+
+    def test_refresh_updates_only_changed_scores(self, app, test_user):
+        """Test stale scores are rewritten and current ones left alone."""
+        stale = Recruiter(
+            user_id=test_user.id,
+            first_name="Stale",
+            last_name="Score",
+            status="contacted",
+            last_contact_date=datetime.utcnow() - timedelta(days=30),
+            priority_score=99,
+        )
+        db.session.add(stale)
+        db.session.commit()
+        current = Recruiter(user_id=test_user.id, first_name="Current", last_name="Score")
+        db.session.add(current)
+        db.session.commit()
+        RecruiterService._update_priority_score(current)
+        db.session.commit()
+
+        assert RecruiterService.refresh_priority_scores(chunk_size=1) == 1
+
+        db.session.expire_all()
+        assert stale.priority_score == reference_score(
+            NOW - timedelta(days=30), None, 0, False, 0, 0, "contacted"
+        )
+
+    def test_pipeline_item_scores(self, app, test_user):
+        """Test update_priority_scores writes item and recruiter scores in bulk."""
+        recruiter = Recruiter(
+            user_id=test_user.id,
+            first_name="Piped",
+            last_name="Recruiter",
+            last_contact_date=datetime.utcnow() - timedelta(days=6),
+        )
+        db.session.add(recruiter)
+        db.session.flush()
+        item = PipelineItem(
+            user_id=test_user.id,
+            recruiter_id=recruiter.id,
+            stage="contacted",
+            next_action="Follow up",
+            priority_score=0,
+        )
+        db.session.add(item)
+        db.session.commit()
+
+        assert ActivityService.update_priority_scores(test_user.id) == 1
+        assert ActivityService.update_priority_scores(test_user.id) == 0
+
+        db.session.expire_all()
+        assert item.priority_score == recruiter.priority_score > 0
+
+
+@pytest.mark.slow
+class TestPriorityScoringAtScale:
+    """Batch vs per-row scoring. Set BENCH_PRIORITY_ROWS=1000000 for the 1M run."""
+
+    def test_batch_scorer_matches_per_row(self):
+        """Test the batch scorer matches per-recruiter scoring on the same rows."""
+        count = int(os.environ.get("BENCH_PRIORITY_ROWS", 100000))
+        statuses = ["contacted", "responded", "interviewing"]
+        rows = [
+            (
+                NOW - timedelta(days=i % 45),
+                "Follow up" if i % 3 == 0 else None,
+                i % 4,
+                i % 5 == 0,
+                i % 101,
+                (i * 7) % 101,
+                statuses[i % 3],
+            )
+            for i in range(count)
+        ]
+
+        single = [reference_score(*row) for row in rows]
+
+        assert score_priorities(rows, NOW) == single
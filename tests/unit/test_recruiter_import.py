@@ -0,0 +1,228 @@
+"""
+Recruiter Import Unit Tests
+
+Tests for CSV/LinkedIn-export parsing, validation, deduplication, the bulk
+insert and the import endpoint, including a 10k-row file.
+"""
+
+import io
+import os
+
+import pytest
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models.activity import Activity, PipelineItem
+from app.models.recruiter import Recruiter, RecruiterNote
+from app.models.user import User
+from app.services.recruiter_import import (
+    INSERT_CHUNK_SIZE,
+    ImportLimitError,
+    RecruiterImportService,
+)
+
+LINKEDIN_EXPORT = (
+    "Notes:\n"
+    '"When exporting your connection data, you may notice that some of the email '
+    'addresses are missing."\n'
+    "\n"
+    "First Name,Last Name,URL,Email Address,Company,Position,Connected On\n"
+    "Jane,Doe,https://www.linkedin.com/in/janedoe,jane@talent.com,Talent Co,"
+    "Technical Recruiter,01 Mar 2026\n"
+    "John,Smith,https://www.linkedin.com/in/jsmith/,,Hire Inc,Sourcer,02 Mar 2026\n"
+)
+
+
+def csv_stream(text):
+    return io.BytesIO(text.encode("utf-8"))
+
+
+class TestImportParsing:
+    """Tests for reading and validating rows."""
+
+    def test_linkedin_export(self, app, test_user):
+        """Test the preamble is skipped and LinkedIn columns are mapped."""
+        result = RecruiterImportService.import_csv(test_user, csv_stream(LINKEDIN_EXPORT))
+
+        assert result["imported"] == 2
+        jane = Recruiter.query.filter_by(email="jane@talent.com").one()
+        assert jane.title == "Technical Recruiter"
+        assert jane.company == "Talent Co"
+        assert jane.linkedin_url == "https://www.linkedin.com/in/janedoe"
+
+    def test_template_columns_and_lists(self, app, test_user):
+        """Test our template headers, list cells and notes."""
+        text = (
+            "first_name,last_name,industries,locations,specialty,notes\n"
+            'Ann,Lee,Technology; Finance,"Austin, TX|Remote",Software Engineering,Met at meetup\n'
+        )
+
+        result = RecruiterImportService.import_csv(test_user, csv_stream(text), source="csv")
+
+        assert result["imported"] == 1
+        recruiter = Recruiter.query.filter_by(first_name="Ann").one()
+        assert recruiter.industries == ["Technology", "Finance"]
+        assert recruiter.locations == ["Austin, TX", "Remote"]
+        assert recruiter.source == "csv"
+        assert RecruiterNote.query.filter_by(recruiter_id=recruiter.id).one().content == (
+            "Met at meetup"
+        )
+
+    def test_invalid_rows_reported(self, app, test_user):
+        """Test rows failing validation are skipped with their line numbers."""
+        text = (
+            "First Name,Last Name,Email\n"
+            "Ok,Row,ok@example.com\n"
+            ",Missing,first@example.com\n"
+            "Bad,Email,not-an-email\n"
+            "<script>alert(1)</script>,X,\n"
+        )
+
+        result = RecruiterImportService.import_csv(test_user, csv_stream(text))
+
+        assert result["imported"] == 1
+        assert result["invalid"] == 3
+        assert [error["row"] for error in result["errors"]] == [3, 4, 5]
+
+    def test_missing_header(self, app, test_user):
+        """Test a file without a first-name column is rejected."""
+        with pytest.raises(ValueError):
+            RecruiterImportService.import_csv(test_user, csv_stream("a,b\n1,2\n"))
+
+
+class TestImportDeduplication:
+    """Tests for email and LinkedIn URL deduplication."""
+
+    def test_dedup_against_existing_and_within_file(self, app, test_user):
+        """Test existing recruiters and repeated rows are skipped."""
+        db.session.add(
+            Recruiter(
+                user_id=test_user.id,
+                first_name="Existing",
+                last_name="One",
+                email="Jane@Talent.com",
+            )
+        )
+        db.session.commit()
+        text = (
+            "First Name,Last Name,Email,LinkedIn URL\n"
+            "Jane,Doe,jane@talent.com,\n"
+            "Sam,Poe,sam@x.com,linkedin.com/in/sampoe\n"
+            "Sam,Again,,https://www.linkedin.com/in/SamPoe/?trk=abc\n"
+        )
+
+        result = RecruiterImportService.import_csv(test_user, csv_stream(text))
+
+        assert result["imported"] == 1
+        assert result["duplicates"] == 2
+
+    def test_other_users_do_not_count(self, app, test_user, second_user):
+        """Test duplicates are per user."""
+        # The user fixtures come from different app contexts; load both here
+        other = db.session.get(User, second_user.id)
+        user = db.session.get(User, test_user.id)
+        RecruiterImportService.import_csv(other, csv_stream(LINKEDIN_EXPORT))
+
+        result = RecruiterImportService.import_csv(user, csv_stream(LINKEDIN_EXPORT))
+
+        assert result["imported"] == 2
+
+
+class TestImportWrites:
+    """Tests for the bulk insert and scoring."""
+
+    def test_related_rows_and_scores(self, app, test_user):
+        """Test each recruiter gets a pipeline item, an activity and fit scores."""
+        test_user.target_industries = ["Technology"]
+        db.session.commit()
+
+        RecruiterImportService.import_csv(test_user, csv_stream(LINKEDIN_EXPORT))
+
+        recruiters = Recruiter.query.filter_by(user_id=test_user.id).all()
+        assert len(recruiters) == 2
+        assert PipelineItem.query.filter_by(user_id=test_user.id).count() == 2
+        assert Activity.query.filter_by(activity_type="recruiter_added").count() == 2
+        assert all(r.fit_components and r.engagement_components for r in recruiters)
+
+    def test_limit_exceeded(self, app, test_user):
+        """Test an import past the tier limit writes nothing."""
+        rows = "".join(f"R{i},X,r{i}@example.com\n" for i in range(10))
+
+        with pytest.raises(ImportLimitError):
+            RecruiterImportService.import_csv(
+                test_user, csv_stream("First Name,Last Name,Email\n" + rows)
+            )
+
+        assert Recruiter.query.count() == 0
+
+
+class TestImportEndpoint:
+    """Tests for POST /api/recruiters/import."""
+
+    def test_multipart_upload(self, client, auth_headers):
+        """Test a multipart CSV upload imports rows."""
+        response = client.post(
+            "/api/recruiters/import",
+            data={"file": (csv_stream(LINKEDIN_EXPORT), "Connections.csv")},
+            headers=auth_headers,
+            content_type="multipart/form-data",
+        )
+
+        assert response.status_code == 201
+        assert response.get_json()["data"]["imported"] == 2
+        assert Recruiter.query.first().source == "csv_import"
+
+    def test_over_limit_is_429(self, client, auth_headers):
+        """Test exceeding the recruiter limit returns 429."""
+        rows = "".join(f"R{i},X\n" for i in range(10))
+
+        response = client.post(
+            "/api/recruiters/import",
+            data="First Name,Last Name\n" + rows,
+            headers=auth_headers,
+            content_type="text/csv",
+        )
+
+        assert response.status_code == 429
+        assert response.get_json()["error"] == "limit_exceeded"
+
+    def test_no_file(self, client, auth_headers):
+        """Test a request without a CSV is a bad request."""
+        response = client.post("/api/recruiters/import", json={}, headers=auth_headers)
+
+        assert response.status_code == 400
+
+
+@pytest.mark.slow
+class TestLargeImport:
+    """Import of a large file. Set BENCH_IMPORT_ROWS to scale."""
+
+    def test_import_10k_rows(self, app, test_user):
+        """Test a 10k-row file is written with a few multi-row INSERTs per chunk."""
+        count = int(os.environ.get("BENCH_IMPORT_ROWS", 10000))
+        test_user.subscription_tier = "expert"
+        test_user.target_industries = ["Technology"]
+        db.session.commit()
+        lines = ["First Name,Last Name,Email,Company,Industries,Locations,Specialty"]
+        lines += [
+            f"First{i},Last{i},r{i}@example.com,Co {i % 50},Technology; Finance,"
+            f"New York NY,Software Engineering"
+            for i in range(count)
+        ]
+
+        inserts = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("INSERT"):
+                inserts.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            result = RecruiterImportService.import_csv(test_user, csv_stream("\n".join(lines)))
+        finally:
+            event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+        assert result["imported"] == count
+        assert Recruiter.query.count() == count
+        chunks = -(-count // INSERT_CHUNK_SIZE)
+        assert len(inserts) <= 5 * chunks
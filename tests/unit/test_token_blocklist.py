@@ -0,0 +1,84 @@
+"""
+Token Blocklist Unit Tests
+
+Tests for the Redis-backed blocklist, its local negative cache and
+pub/sub invalidation.
+"""
+
+import time
+
+from app.extensions import TokenBlocklist, redis_pool, token_blocklist
+
+
+def wait_for(predicate, timeout=3.0):
+    """Poll until predicate() is true or the timeout elapses."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return predicate()
+
+
+class TestInMemoryFallback:
+    """Tests for the blocklist when Redis is unavailable."""
+
+    def test_add_and_contains(self, app):
+        """Test revoked tokens are found without Redis."""
+        assert redis_pool.available is False
+
+        token_blocklist.add("fallback-jti")
+
+        assert "fallback-jti" in token_blocklist
+        assert "other-jti" not in token_blocklist
+
+
+class TestRedisBackend:
+    """Tests for the blocklist backed by the shared Redis pool."""
+
+    def test_add_writes_key_with_expiry(self, app, fake_redis):
+        """Test revocation is stored in Redis with a TTL."""
+        token_blocklist.add("redis-jti", expires_in=120)
+
+        key = f"{TokenBlocklist.BLOCKLIST_PREFIX}redis-jti"
+        assert fake_redis.get(key) == "revoked"
+        assert 0 < fake_redis.ttl(key) <= 120
+        assert "redis-jti" in token_blocklist
+
+    def test_not_revoked_answer_is_cached_locally(self, app, fake_redis):
+        """Test repeated checks for a live token skip Redis within the TTL."""
+        assert "live-jti" not in token_blocklist
+
+        # Written directly, bypassing add(), so no invalidation is broadcast
+        fake_redis.set(f"{TokenBlocklist.BLOCKLIST_PREFIX}live-jti", "revoked")
+
+        assert "live-jti" not in token_blocklist
+
+    def test_local_ttl_bounds_staleness(self, app, fake_redis):
+        """Test the local answer is re-validated once the TTL elapses."""
+        token_blocklist._local_ttl = 0
+        assert "short-jti" not in token_blocklist
+
+        fake_redis.set(f"{TokenBlocklist.BLOCKLIST_PREFIX}short-jti", "revoked")
+
+        assert "short-jti" in token_blocklist
+
+    def test_revocation_from_another_worker_invalidates(self, app, fake_redis):
+        """Test a revocation published by another process evicts the local entry."""
+        assert "shared-jti" not in token_blocklist
+
+        other_worker = TokenBlocklist(redis_pool)
+        other_worker._use_redis = True
+        other_worker.add("shared-jti")
+
+        assert wait_for(lambda: "shared-jti" in token_blocklist)
+
+    def test_logout_revokes_token(self, client, auth_headers, fake_redis):
+        """Test logout revokes the token through Redis."""
+        response = client.get("/api/auth/me", headers=auth_headers)
+        assert response.status_code == 200
+
+        client.post("/api/auth/logout", headers=auth_headers)
+
+        response = client.get("/api/auth/me", headers=auth_headers)
+        assert response.status_code == 401
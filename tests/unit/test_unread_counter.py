@@ -0,0 +1,241 @@
+"""
+Unread Counter Unit Tests
+
+Tests for the Redis-cached unread notification count: seeding from SQL,
+adjustment on every write path, reconciliation, and long-polling for
+changes, including the queries of many simulated polling clients.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.extensions import db, redis_pool
+from app.models.notification import Notification
+from app.models.recruiter import Recruiter
+from app.models.user import User
+from app.services.notification_service import NotificationService
+from app.services.unread_counter import unread_counter
+
+
+def add_notifications(user_id, count, is_read=False):
+    db.session.add_all(
+        [Notification(user_id=user_id, title=f"Note {i}", is_read=is_read) for i in range(count)]
+    )
+    db.session.commit()
+
+
+def count_queries(fn):
+    """Run fn and return its result and the number of SQL statements it executed."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        result = fn()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+    return result, len(statements)
+
+
+def cached(fake_redis, user_id):
+    value = fake_redis.get(f"{unread_counter.KEY_PREFIX}{user_id}")
+    return None if value is None else int(value)
+
+
+class TestCachedCount:
+    """Tests for serving and maintaining the cached count."""
+
+    def test_seeded_once_from_sql(self, app, test_user, fake_redis):
+        """Test the first read counts in SQL and later reads touch only Redis."""
+        add_notifications(test_user.id, 3)
+        add_notifications(test_user.id, 2, is_read=True)
+        user_id = test_user.id
+
+        first, first_queries = count_queries(lambda: unread_counter.get(user_id))
+        second, second_queries = count_queries(lambda: unread_counter.get(user_id))
+
+        assert (first, second) == (3, 3)
+        assert (first_queries, second_queries) == (1, 0)
+        assert cached(fake_redis, user_id) == 3
+
+    def test_write_paths_adjust_count(self, app, test_user, fake_redis):
+        """Test creating, reading and generating notifications keep the count exact."""
+        add_notifications(test_user.id, 2)
+        assert NotificationService.get_unread_count(test_user.id) == 2
+
+        created = NotificationService.create_notification(test_user.id, "Hello")
+        assert cached(fake_redis, test_user.id) == 3
+
+        NotificationService.mark_read(created.id, test_user.id)
+        NotificationService.mark_read(created.id, test_user.id)  # already read
+        assert cached(fake_redis, test_user.id) == 2
+
+        db.session.add(
+            Recruiter(
+                user_id=test_user.id,
+                first_name="Jane",
+                last_name="Doe",
+                status="contacted",
+                last_contact_date=datetime.utcnow() - timedelta(days=10),
+            )
+        )
+        db.session.commit()
+        NotificationService.generate_notifications(test_user.id)
+        assert cached(fake_redis, test_user.id) == 3
+
+        NotificationService.mark_all_read(test_user.id)
+        assert cached(fake_redis, test_user.id) == 0
+        assert Notification.query.filter_by(is_read=False).count() == 0
+
+    def test_concurrent_mark_read_counted_once(self, app, test_user, fake_redis):
+        """Test a notification read by another request since it was loaded is not recounted."""
+        add_notifications(test_user.id, 2)
+        assert NotificationService.get_unread_count(test_user.id) == 2
+        notification = Notification.query.filter_by(user_id=test_user.id).first()
+        assert notification.is_read is False
+
+        # The other request marks it read and decrements the count first
+        db.session.execute(
+            Notification.__table__.update()
+            .where(Notification.id == notification.id)
+            .values(is_read=True)
+        )
+        unread_counter.adjust(test_user.id, -1)
+
+        NotificationService.mark_read(notification.id, test_user.id)
+
+        assert cached(fake_redis, test_user.id) == 1
+
+    def test_uncached_counts_not_started_from_zero(self, app, test_user, fake_redis):
+        """Test a write for a user without a cached count leaves it to the next read."""
+        add_notifications(test_user.id, 4)
+
+        NotificationService.create_notification(test_user.id, "Hello")
+
+        assert cached(fake_redis, test_user.id) is None
+        assert NotificationService.get_unread_count(test_user.id) == 5
+
+    def test_without_redis(self, app, test_user):
+        """Test counts come from SQL when Redis is unavailable."""
+        add_notifications(test_user.id, 2)
+        NotificationService.create_notification(test_user.id, "Hello")
+
+        assert NotificationService.get_unread_count(test_user.id) == 3
+
+
+class TestReconcile:
+    """Tests for correcting drifted counts."""
+
+    def test_drifted_counts_corrected(self, app, test_user, fake_redis):
+        """Test cached counts are recounted and only wrong ones rewritten."""
+        other = User(email="other@example.com", first_name="Other", last_name="User")
+        other.set_password("TestPassword123")
+        db.session.add(other)
+        db.session.commit()
+        add_notifications(test_user.id, 2)
+        add_notifications(other.id, 1)
+        unread_counter.get(test_user.id)
+        unread_counter.get(other.id)
+
+        # A change the counter never saw
+        Notification.query.filter_by(user_id=test_user.id).update({"is_read": True})
+        db.session.commit()
+
+        assert unread_counter.reconcile() == {"checked": 2, "corrected": 1}
+        assert cached(fake_redis, test_user.id) == 0
+        assert cached(fake_redis, other.id) == 1
+
+
+class TestLongPoll:
+    """Tests for waiting on a count change."""
+
+    def test_wakes_on_change(self, app, test_user, fake_redis):
+        """Test a waiting request returns as soon as the count changes."""
+        user_id = str(test_user.id)
+        unread_counter.get(user_id)
+        result = {}
+
+        def wait():
+            with app.app_context():
+                began = time.monotonic()
+                result["count"] = unread_counter.wait_for_change(user_id, 0, timeout=10)
+                result["seconds"] = time.monotonic() - began
+
+        waiter = threading.Thread(target=wait)
+        waiter.start()
+        time.sleep(0.3)
+        unread_counter.adjust(user_id, 1)
+        waiter.join(timeout=10)
+
+        assert result["count"] == 1
+        assert result["seconds"] < 5
+
+    def test_times_out_unchanged(self, app, test_user, fake_redis):
+        """Test a wait with no change returns the same count after the timeout."""
+        assert unread_counter.wait_for_change(test_user.id, 0, timeout=0.2) == 0
+
+    def test_endpoint(self, app, client, auth_headers, test_user, fake_redis):
+        """Test the endpoint answers at once when the known count is stale."""
+        add_notifications(test_user.id, 2)
+        app.config["NOTIFICATION_LONG_POLL_SECONDS"] = 20
+
+        response = client.get(
+            "/api/notifications/unread-count?wait=20&known=0", headers=auth_headers
+        )
+
+        assert response.get_json()["data"] == {"count": 2, "long_poll": 20}
+
+    def test_endpoint_disabled(self, client, auth_headers, test_user):
+        """Test waits are ignored unless long-polling is enabled."""
+        add_notifications(test_user.id, 1)
+
+        response = client.get(
+            "/api/notifications/unread-count?wait=20&known=1", headers=auth_headers
+        )
+
+        assert response.get_json()["data"] == {"count": 1, "long_poll": 0}
+
+
+@pytest.mark.slow
+class TestManyPollingClients:
+    """Database load from polling clients. Set BENCH_UNREAD_CLIENTS to scale."""
+
+    def test_polling_db_queries(self, app, fake_redis):
+        """Test cached counts remove nearly all polling queries."""
+        clients = int(os.environ.get("BENCH_UNREAD_CLIENTS", 10000))
+        users = []
+        for i in range(clients // 5):  # five open tabs per user
+            user = User(email=f"poll{i}@example.com", first_name="Poll", last_name="User")
+            user.password_hash = "x"
+            users.append(user)
+        db.session.add_all(users)
+        db.session.commit()
+        user_ids = [str(user.id) for user in users]
+        for user_id in user_ids[:100]:
+            add_notifications(user_id, 3)
+
+        def poll_round():
+            for i in range(clients):
+                NotificationService.get_unread_count(user_ids[i % len(user_ids)])
+
+        def polling_rounds(rounds=3):
+            queries = []
+            for _ in range(rounds):
+                # Some users get a notification between rounds
+                for user_id in user_ids[:50]:
+                    NotificationService.create_notification(user_id, "New")
+                queries.append(count_queries(poll_round)[1])
+            return queries
+
+        redis_pool.close()  # SQL only
+        assert polling_rounds() == [clients] * 3
+        redis_pool.set_client(fake_redis)
+        # Each user's count is seeded once, then served from Redis
+        assert polling_rounds() == [len(user_ids), 0, 0]
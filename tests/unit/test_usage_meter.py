@@ -0,0 +1,245 @@
+"""
+Usage Meter Unit Tests
+
+Tests for atomic feature metering: limit enforcement, refunds, period
+rollover, Redis write-behind and behaviour under concurrent requests.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.pool import NullPool
+
+from app import create_app
+from app.config import TestingConfig, config
+from app.extensions import db
+from app.models.user import User
+from app.services.usage_meter import UsageMeter, usage_meter
+
+
+@pytest.fixture
+def file_app(tmp_path, monkeypatch):
+    """App backed by an on-disk SQLite database, so threads get their own connections."""
+
+    class FileDatabaseConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'meter.db'}"
+        SQLALCHEMY_ENGINE_OPTIONS = {"poolclass": NullPool, "connect_args": {"timeout": 30}}
+
+    monkeypatch.setitem(config, "testing-file", FileDatabaseConfig)
+    app = create_app("testing-file")
+
+    with app.app_context():
+        db.create_all()
+        user = User(email="meter@example.com", first_name="Meter", last_name="User")
+        user.set_password("TestPassword123")
+        db.session.add(user)
+        db.session.commit()
+        app.config["METER_USER_ID"] = user.id
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def consume_in_parallel(app, user_id, feature, attempts=100):
+    """Consume a feature from `attempts` threads at once; return admissions."""
+    barrier = threading.Barrier(attempts)
+
+    def attempt(_):
+        with app.app_context():
+            user = db.session.get(User, user_id)
+            barrier.wait()
+            admitted = usage_meter.consume(user, feature)
+            db.session.remove()
+            return admitted
+
+    with ThreadPoolExecutor(max_workers=attempts) as pool:
+        return sum(pool.map(attempt, range(attempts)))
+
+
+class TestDatabaseMetering:
+    """Tests for the conditional-UPDATE path used without Redis."""
+
+    def test_admits_until_limit(self, app, test_user):
+        """Test BASIC users get exactly their 5 recruiter adds."""
+        results = [usage_meter.consume(test_user, "recruiters") for _ in range(7)]
+
+        assert results == [True] * 5 + [False] * 2
+        db.session.refresh(test_user)
+        assert test_user.monthly_recruiter_count == 5
+
+    def test_unlimited_tier_still_counts(self, app, test_user_expert):
+        """Test unlimited tiers are admitted and usage is recorded."""
+        for _ in range(3):
+            assert usage_meter.consume(test_user_expert, "ai_messages") is True
+
+        db.session.refresh(test_user_expert)
+        assert test_user_expert.monthly_message_count == 3
+
+    def test_refund_never_goes_negative(self, app, test_user):
+        """Test refunds restore usage without underflowing."""
+        usage_meter.consume(test_user, "research")
+        usage_meter.refund(test_user, "research")
+        usage_meter.refund(test_user, "research")
+
+        db.session.refresh(test_user)
+        assert test_user.monthly_research_count == 0
+
+    def test_expired_period_resets_counters(self, app, test_user):
+        """Test the first use after the period ends starts a fresh period."""
+        test_user.monthly_message_count = 10
+        test_user.usage_reset_date = datetime.utcnow() - timedelta(days=1)
+        db.session.commit()
+
+        assert usage_meter.consume(test_user, "ai_messages") is True
+
+        db.session.refresh(test_user)
+        assert test_user.monthly_message_count == 1
+        assert test_user.usage_reset_date > datetime.utcnow() + timedelta(days=29)
+
+    def test_no_over_admission_under_concurrency(self, file_app):
+        """Test 100 parallel requests admit exactly the BASIC limit of 10 messages."""
+        user_id = file_app.config["METER_USER_ID"]
+
+        admitted = consume_in_parallel(file_app, user_id, "ai_messages")
+
+        assert admitted == 10
+        db.session.expire_all()
+        assert db.session.get(User, user_id).monthly_message_count == 10
+
+
+class TestRedisMetering:
+    """Tests for the Lua-script path with write-behind."""
+
+    def test_no_over_admission_under_concurrency(self, file_app, fake_redis):
+        """Test 100 parallel requests admit exactly the BASIC limit of 10 messages."""
+        user_id = file_app.config["METER_USER_ID"]
+
+        admitted = consume_in_parallel(file_app, user_id, "ai_messages")
+
+        assert admitted == 10
+        db.session.expire_all()
+        user = db.session.get(User, user_id)
+        assert usage_meter.get_usage(user)["monthly_message_count"] == 10
+
+    def test_write_behind_flushes_to_database(self, app, test_user, fake_redis):
+        """Test usage lives in Redis until flushed, then lands on the users row."""
+        for _ in range(3):
+            usage_meter.consume(test_user, "recruiters")
+
+        db.session.refresh(test_user)
+        assert test_user.monthly_recruiter_count == 0
+
+        assert usage_meter.flush_to_database() == 1
+
+        db.session.refresh(test_user)
+        assert test_user.monthly_recruiter_count == 3
+        assert fake_redis.scard(UsageMeter.DIRTY_SET) == 0
+
+    def test_failed_flush_keeps_counters_dirty(self, app, test_user, fake_redis, monkeypatch):
+        """Test counters popped for a flush whose commit fails are flushed next time."""
+        usage_meter.consume(test_user, "recruiters")
+        commit = db.session.commit
+
+        def fail():
+            raise RuntimeError("database down")
+
+        monkeypatch.setattr(db.session, "commit", fail)
+        with pytest.raises(RuntimeError):
+            usage_meter.flush_to_database()
+        monkeypatch.setattr(db.session, "commit", commit)
+
+        assert fake_redis.scard(UsageMeter.DIRTY_SET) == 1
+        assert usage_meter.flush_to_database() == 1
+        db.session.refresh(test_user)
+        assert test_user.monthly_recruiter_count == 1
+
+    def test_unflushed_usage_shown(self, client, auth_headers, test_user, fake_redis):
+        """Test the dashboard and profile report usage not yet written back."""
+        usage_meter.consume(test_user, "ai_messages", 2)
+
+        dashboard = client.get("/api/dashboard", headers=auth_headers).get_json()["data"]
+
+        assert dashboard["usage"]["messages"]["used"] == 2
+        assert test_user.to_dict(include_private=True)["usage"]["messages"] == 2
+
+    def test_counter_seeded_from_stored_usage(self, app, test_user, fake_redis):
+        """Test a new Redis counter starts from the value already on the users row."""
+        test_user.monthly_recruiter_count = 4
+        test_user.usage_reset_date = datetime.utcnow() + timedelta(days=10)
+        db.session.commit()
+
+        assert usage_meter.consume(test_user, "recruiters") is True
+        assert usage_meter.consume(test_user, "recruiters") is False
+
+    def test_counter_expires_after_period(self, app, test_user, fake_redis):
+        """Test counters carry an expiry just past the end of the usage period."""
+        usage_meter.consume(test_user, "research")
+
+        ttl = fake_redis.ttl(usage_meter._key(test_user, "monthly_research_count"))
+        assert timedelta(days=30) < timedelta(seconds=ttl) <= timedelta(days=31)
+
+
+class TestFeatureLimitDecorator:
+    """Tests for feature_limit reserving and refunding usage."""
+
+    def test_failed_request_is_refunded(self, client, auth_headers, test_user):
+        """Test a request rejected by validation does not consume usage."""
+        response = client.post("/api/recruiters", json={}, headers=auth_headers)
+
+        assert response.status_code == 400
+        db.session.refresh(test_user)
+        assert test_user.monthly_recruiter_count == 0
+
+
+class TestBulkReset:
+    """Tests for the chunked reset of expired usage periods."""
+
+    def test_resets_only_expired_users_in_chunks(self, app):
+        """Test expired users are reset across several chunks and others untouched."""
+        past = datetime.utcnow() - timedelta(days=1)
+        future = datetime.utcnow() + timedelta(days=10)
+        for i in range(7):
+            user = User(
+                email=f"expired{i}@example.com",
+                first_name="Expired",
+                last_name="User",
+                monthly_message_count=5,
+                usage_reset_date=past,
+            )
+            user.set_password("TestPassword123")
+            db.session.add(user)
+        current = User(
+            email="current@example.com",
+            first_name="Current",
+            last_name="User",
+            monthly_message_count=5,
+            usage_reset_date=future,
+        )
+        current.set_password("TestPassword123")
+        db.session.add(current)
+        db.session.commit()
+
+        stats = usage_meter.reset_expired_periods(chunk_size=3)
+
+        assert stats["rows"] == 7
+        assert stats["chunks"] == 3
+        assert stats["rows_per_second"] > 0
+
+        db.session.expire_all()
+        for user in User.query.filter(User.email.like("expired%")):
+            assert user.monthly_message_count == 0
+            assert user.usage_reset_date > datetime.utcnow() + timedelta(days=29)
+        assert db.session.get(User, current.id).monthly_message_count == 5
+        assert db.session.get(User, current.id).usage_reset_date == future
+
+    def test_nothing_to_reset(self, app, test_user):
+        """Test a run with no expired users does no work."""
+        test_user.usage_reset_date = datetime.utcnow() + timedelta(days=1)
+        db.session.commit()
+
+        stats = usage_meter.reset_expired_periods()
+
+        assert stats["rows"] == 0
+        assert stats["chunks"] == 0